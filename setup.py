@@ -89,7 +89,7 @@ setup(
     install_requires=[
         'pygame-ce>=2.5.0',
         'pygame-gui>=0.6.0',
-        'python-chess>=1.10.0',
+        'chess>=1.11.2,<1.12',  # zobrist.HashedBoard reads python-chess internals
     ],
     
     # Build dependencies
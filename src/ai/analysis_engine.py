@@ -15,6 +15,11 @@ import queue
 from src.ai.minimax_optimized import get_best_move
 from src.ai.evaluation import evaluate
 
+try:
+    import chess_engine
+except ImportError:
+    chess_engine = None
+
 
 class MoveQuality(Enum):
     """Move quality annotations"""
@@ -74,11 +79,16 @@ class AnalysisEngine:
     Chess analysis engine with caching and threading support
     """
     
-    def __init__(self, depth: int = 3, max_cache_size: int = 1000):
+    def __init__(self, depth: int = 3, max_cache_size: int = 1000, num_alternatives: int = 3):
         self.depth = depth
         self.max_cache_size = max_cache_size
+        self.num_alternatives = num_alternatives
         self._analysis_cache: Dict[str, AnalysisResult] = {}
         
+        # C++ engine (MultiPV search), created on first use; one search at a time
+        self._cpp_engine = None
+        self._cpp_lock = threading.Lock()
+        
         # Threading
         self._analysis_thread: Optional[threading.Thread] = None
         self._stop_analysis = threading.Event()
@@ -114,35 +124,50 @@ class AnalysisEngine:
         # Perform analysis
         import time
         start_time = time.time()
+        nodes_searched = 0
         
-        # Get best move and evaluation using optimized minimax
-        best_move = get_best_move(board.copy(), depth=depth, time_limit=10.0)
-        
-        # Get evaluation for best move
-        if best_move:
-            board_copy = board.copy()
-            board_copy.push(best_move)
-            evaluation = -evaluate(board_copy)  # Negate because we switched sides
+        if chess_engine is not None:
+            # One MultiPV search gives the best line, its score and the alternatives
+            num_lines = self.num_alternatives + 1 if get_alternatives else 1
+            lines, search = self._search_lines(board, depth, num_lines)
+            sign = 1 if board.turn == chess.WHITE else -1
+            
+            best_line = lines[0][0] if lines else []
+            best_move = best_line[0] if best_line else None
+            evaluation = sign * search.score
+            alternatives = [(pv[0], sign * score) for pv, score in lines[1:]]
+            nodes_searched = search.nodes
+            depth = search.depth or depth  # Completed depth (time limit may cut it short)
         else:
-            evaluation = evaluate(board)
+            # Get best move and evaluation using optimized minimax
+            best_move = get_best_move(board.copy(), depth=depth, time_limit=10.0)
+            
+            # Get evaluation for best move
+            if best_move:
+                board_copy = board.copy()
+                board_copy.push(best_move)
+                evaluation = -evaluate(board_copy)  # Negate because we switched sides
+            else:
+                evaluation = evaluate(board)
+            
+            # Get principal variation (simplified - just best move for now)
+            best_line = [best_move] if best_move else []
+            
+            # Get alternative moves if requested
+            alternatives = []
+            if get_alternatives and best_move:
+                alternatives = self._get_alternative_moves(board, depth, best_move, evaluation,
+                                                           self.num_alternatives)
         
         time_ms = int((time.time() - start_time) * 1000)
         
-        # Get principal variation (simplified - just best move for now)
-        best_line = [best_move] if best_move else []
-        
-        # Get alternative moves if requested
-        alternatives = []
-        if get_alternatives and best_move:
-            alternatives = self._get_alternative_moves(board, depth, best_move, evaluation)
-        
         result = AnalysisResult(
             position_fen=fen,
             evaluation=evaluation,
             best_move=best_move,
             best_line=best_line,
             depth=depth,
-            nodes_searched=0,  # TODO: Track in minimax
+            nodes_searched=nodes_searched,
             time_ms=time_ms,
             alternatives=alternatives
         )
@@ -155,6 +180,28 @@ class AnalysisEngine:
         
         return result
     
+    def _search_lines(self, board: chess.Board, depth: int, num_lines: int):
+        """
+        MultiPV search with the C++ engine.
+        
+        Returns:
+            ([(pv as chess.Moves, score for the side to move), ...] best first,
+             chess_engine.SearchResult of the search)
+        """
+        with self._cpp_lock:
+            if self._cpp_engine is None:
+                self._cpp_engine = chess_engine.SearchEngine(64)
+            
+            cpp_board = chess_engine.Board()
+            cpp_board.from_fen(board.fen())
+            pv_lines = self._cpp_engine.search_multi_pv(cpp_board, num_lines, depth, 10000,
+                                                        info_callback=lambda info: None)
+            search = self._cpp_engine.get_result()
+        
+        lines = [([chess.Move.from_uci(move.to_uci()) for move in line.pv], line.score)
+                 for line in pv_lines if not line.move.is_null()]
+        return lines, search
+    
     def _get_alternative_moves(
         self,
         board: chess.Board,
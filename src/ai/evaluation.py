@@ -1,7 +1,8 @@
 # src/ai/evaluation.py
 
 import chess
-import chess.syzygy
+
+from src.ai.tablebase import get_tablebase_service
 
 # Định nghĩa giá trị quân cờ có thể dùng ở mức module
 piece_values = {
@@ -76,25 +77,15 @@ position_values = {
     ]
 }
 
-# Load Syzygy tablebases
-try:
-    syzygy_path = r'R:\_Documents\_TDMU\KIEN_THUC_TDMU\3_year_HK2\TriTueNT\chess-ai\syzygy'
-    tablebase = chess.syzygy.open_tablebase(syzygy_path)
-except:
-    tablebase = None
-    # print("Warning: Syzygy tablebase not found in evaluation.py")
+# Shared Syzygy tablebases (AI_CONFIG['syzygy_path'])
+tablebase = get_tablebase_service()
 
 def evaluate(board):
     """Optimized evaluation function for the board state."""
     if tablebase:
-        num_pieces = len(board.piece_map())
-        if num_pieces <= 6 and not board.has_castling_rights(chess.WHITE) and not board.has_castling_rights(chess.BLACK):
-            try:
-                wdl = tablebase.probe_wdl(board)
-                if wdl is not None:
-                    return wdl * 10000
-            except Exception as e:
-                print(f"Error probing tablebase: {e}")
+        wdl = tablebase.probe_wdl(board)
+        if wdl is not None:
+            return wdl * 10000
 
     score = 0
     piece_map = board.piece_map()
@@ -0,0 +1,395 @@
+# src/ai/evaluation_bitboard.py
+"""
+Bitboard evaluation: the same scores as evaluation_optimized.evaluate_incremental,
+computed on chess.Board's integer bitboards instead of piece_at() over 64
+squares and per-piece Python loops.
+
+- Material + PST: the set bits of each piece bitboard index per-color tables
+  (piece value + PST, already mirrored for black).
+- Pawn structure, rooks, king shield, development, bishop pair: popcounts
+  against precomputed file / adjacent-file / passed-pawn / shield masks.
+- Mobility: exact legal move counts from attack masks, pins and attacked
+  king squares, without flipping board.turn or building move lists. A side
+  in check, or with an en passant capture available, is still counted by
+  python-chess (rare, and full of special cases); castling too, only while
+  that side still has castling rights.
+
+evaluate_incremental stays as the readable reference; the two must agree on
+every position (src/tests/test_evaluation_bitboard.py), and
+src/tests/evaluation_benchmark.py compares their speed.
+"""
+
+import chess
+from chess import (
+    BB_ALL, BB_SQUARES, BB_FILES, BB_RANKS, BB_RAYS,
+    BB_KNIGHT_ATTACKS, BB_KING_ATTACKS, BB_PAWN_ATTACKS,
+    BB_DIAG_ATTACKS, BB_DIAG_MASKS, BB_RANK_ATTACKS, BB_RANK_MASKS, BB_FILE_ATTACKS, BB_FILE_MASKS,
+    BB_RANK_1, BB_RANK_3, BB_RANK_4, BB_RANK_5, BB_RANK_6, BB_RANK_8, BB_FILE_A, BB_FILE_H,
+)
+
+from src.ai.evaluation_optimized import PIECE_VALUES, PST_MG, PST_EG
+from src.ai.tablebase import get_tablebase_service
+
+try:
+    popcount = int.bit_count  # Python 3.10+
+except AttributeError:
+    def popcount(bb):
+        return bin(bb).count('1')
+
+
+def _scan(bb):
+    """Squares of the set bits, lowest first."""
+    while bb:
+        lsb = bb & -bb
+        yield lsb.bit_length() - 1
+        bb ^= lsb
+
+
+# ============================================================================
+# PRECOMPUTED TABLES
+# ============================================================================
+
+def _pst_values(tables, color, piece_type):
+    table = tables[piece_type]
+    return [PIECE_VALUES[piece_type] + table[square if color == chess.WHITE else chess.square_mirror(square)]
+            for square in chess.SQUARES]
+
+
+# Indexed by color (chess.BLACK = 0, chess.WHITE = 1)
+_COLOR_INDEX = (chess.BLACK, chess.WHITE)
+
+# [color][piece_type][square] -> piece value + PST (middle game / endgame)
+PST_MG_VALUES = [[None] + [_pst_values(PST_MG, color, pt) for pt in chess.PIECE_TYPES] for color in _COLOR_INDEX]
+PST_EG_VALUES = [[None] + [_pst_values(PST_EG, color, pt) for pt in chess.PIECE_TYPES] for color in _COLOR_INDEX]
+
+# Files next to each file
+ADJACENT_FILES = [(BB_FILES[f - 1] if f > 0 else 0) | (BB_FILES[f + 1] if f < 7 else 0) for f in range(8)]
+
+
+def _passed_mask(color, square):
+    """Squares on this and the adjacent files in front of the pawn."""
+    file, rank = chess.square_file(square), chess.square_rank(square)
+    mask = 0
+    for r in (range(rank + 1, 8) if color == chess.WHITE else range(rank)):
+        for f in range(max(0, file - 1), min(7, file + 1) + 1):
+            mask |= BB_SQUARES[chess.square(f, r)]
+    return mask
+
+
+def _shield_mask(color, square):
+    """Pawn shield squares in front of a king (two ranks, three files)."""
+    file, rank = chess.square_file(square), chess.square_rank(square)
+    mask = 0
+    for r in ((rank + 1, rank + 2) if color == chess.WHITE else (rank - 1, rank - 2)):
+        for f in (file - 1, file, file + 1):
+            if 0 <= f < 8 and 0 <= r < 8:
+                mask |= BB_SQUARES[chess.square(f, r)]
+    return mask
+
+
+PASSED_MASKS = [[_passed_mask(color, sq) for sq in chess.SQUARES] for color in _COLOR_INDEX]
+SHIELD_MASKS = [[_shield_mask(color, sq) for sq in chess.SQUARES] for color in _COLOR_INDEX]
+
+CENTER_SQUARES = (chess.E4, chess.D4, chess.E5, chess.D5)
+BB_CENTER = BB_SQUARES[chess.E4] | BB_SQUARES[chess.D4] | BB_SQUARES[chess.E5] | BB_SQUARES[chess.D5]
+
+# Development: pieces still on (or off) their starting squares
+WHITE_MINOR_HOME = (BB_SQUARES[chess.B1] | BB_SQUARES[chess.G1], BB_SQUARES[chess.C1] | BB_SQUARES[chess.F1])
+BLACK_MINOR_HOME = (BB_SQUARES[chess.B8] | BB_SQUARES[chess.G8], BB_SQUARES[chess.C8] | BB_SQUARES[chess.F8])
+
+# Shared Syzygy tablebases (AI_CONFIG['syzygy_path'])
+tablebase = get_tablebase_service()
+
+
+# ============================================================================
+# EVALUATION TERMS
+# ============================================================================
+
+def game_phase(board):
+    """Calculate game phase (0=endgame, 256=opening)."""
+    phase = (popcount(board.knights | board.bishops) + 2 * popcount(board.rooks)
+             + 4 * popcount(board.queens))
+    return min(phase, 24) * 256 // 24
+
+
+def evaluate_piece_square_tables(board, phase):
+    """Material and PST, interpolated by game phase."""
+    score_mg = 0
+    score_eg = 0
+    pieces = (board.pawns, board.knights, board.bishops, board.rooks, board.queens, board.kings)
+
+    for color in chess.COLORS:
+        occupied = board.occupied_co[color]
+        mg_tables = PST_MG_VALUES[color]
+        eg_tables = PST_EG_VALUES[color]
+        mg = eg = 0
+        for piece_type, bb in enumerate(pieces, 1):
+            bb &= occupied
+            if bb:
+                mg_table = mg_tables[piece_type]
+                eg_table = eg_tables[piece_type]
+                while bb:
+                    lsb = bb & -bb
+                    square = lsb.bit_length() - 1
+                    mg += mg_table[square]
+                    eg += eg_table[square]
+                    bb ^= lsb
+        if color == chess.WHITE:
+            score_mg += mg
+            score_eg += eg
+        else:
+            score_mg -= mg
+            score_eg -= eg
+
+    return (score_mg * phase + score_eg * (256 - phase)) // 256
+
+
+def _legal_move_count_slow(board, color):
+    """Legal moves of color with python-chess (temporarily giving it the move)."""
+    turn = board.turn
+    board.turn = color
+    try:
+        return board.legal_moves.count()
+    finally:
+        board.turn = turn
+
+
+def _castling_move_count(board, color):
+    turn = board.turn
+    board.turn = color
+    try:
+        return sum(1 for _ in board.generate_castling_moves())
+    finally:
+        board.turn = turn
+
+
+def _pawn_move_count(pawns, color, occupied, their, mask=BB_ALL):
+    """Pushes and captures of a set of pawns (promotions count four moves)."""
+    empty = ~occupied & BB_ALL
+    if color == chess.WHITE:
+        single = (pawns << 8) & empty
+        double = (single << 8) & empty & (BB_RANK_3 | BB_RANK_4)
+        captures = (((pawns & ~BB_FILE_A) << 7) & their & mask, ((pawns & ~BB_FILE_H) << 9) & their & mask)
+        promotion_rank = BB_RANK_8
+    else:
+        single = (pawns >> 8) & empty
+        double = (single >> 8) & empty & (BB_RANK_6 | BB_RANK_5)
+        captures = (((pawns & ~BB_FILE_H) >> 7) & their & mask, ((pawns & ~BB_FILE_A) >> 9) & their & mask)
+        promotion_rank = BB_RANK_1
+
+    count = popcount(double & mask)
+    for targets in (single & mask,) + captures:
+        promotions = targets & promotion_rank
+        count += popcount(targets) + 3 * popcount(promotions)
+    return count
+
+
+def legal_move_count(board, color):
+    """Number of legal moves color would have with the move (len(list(board.legal_moves)))."""
+    our = board.occupied_co[color]
+    kings = board.kings & our
+    if not kings or kings & (kings - 1):
+        return _legal_move_count_slow(board, color)
+    king = kings.bit_length() - 1
+    them = not color
+    their = board.occupied_co[them]
+    occupied = board.occupied
+
+    if board.attackers_mask(them, king):
+        return _legal_move_count_slow(board, color)
+
+    ep_square = board.ep_square
+    if (ep_square and not BB_SQUARES[ep_square] & occupied and
+            board.pawns & our & BB_PAWN_ATTACKS[them][ep_square] & BB_RANKS[4 if color else 3]):
+        return _legal_move_count_slow(board, color)
+
+    # Pinned pieces: only moves along the line through the king stay legal
+    rooks_and_queens = board.rooks | board.queens
+    bishops_and_queens = board.bishops | board.queens
+    snipers = ((BB_RANK_ATTACKS[king][0] & rooks_and_queens) |
+               (BB_FILE_ATTACKS[king][0] & rooks_and_queens) |
+               (BB_DIAG_ATTACKS[king][0] & bishops_and_queens)) & their
+    pinned = 0
+    for sniper in _scan(snipers):
+        b = chess.between(king, sniper) & occupied
+        if b and not b & (b - 1):
+            pinned |= b
+    pinned &= our
+
+    targets = ~our & BB_ALL
+    count = 0
+
+    for square in _scan(board.knights & our):
+        moves = BB_KNIGHT_ATTACKS[square] & targets
+        if pinned & BB_SQUARES[square]:
+            moves &= BB_RAYS[king][square]
+        count += popcount(moves)
+
+    for square in _scan((board.bishops | board.rooks | board.queens) & our):
+        bb = BB_SQUARES[square]
+        moves = 0
+        if bb & bishops_and_queens:
+            moves = BB_DIAG_ATTACKS[square][BB_DIAG_MASKS[square] & occupied]
+        if bb & rooks_and_queens:
+            moves |= (BB_RANK_ATTACKS[square][BB_RANK_MASKS[square] & occupied] |
+                      BB_FILE_ATTACKS[square][BB_FILE_MASKS[square] & occupied])
+        moves &= targets
+        if pinned & bb:
+            moves &= BB_RAYS[king][square]
+        count += popcount(moves)
+
+    # King steps to squares the opponent does not attack
+    for square in _scan(BB_KING_ATTACKS[king] & targets):
+        if not board.attackers_mask(them, square):
+            count += 1
+    if board.castling_rights & (BB_RANK_1 if color == chess.WHITE else BB_RANK_8):
+        count += _castling_move_count(board, color)
+
+    pawns = board.pawns & our
+    count += _pawn_move_count(pawns & ~pinned, color, occupied, their)
+    for square in _scan(pawns & pinned):
+        count += _pawn_move_count(BB_SQUARES[square], color, occupied, their, BB_RAYS[king][square])
+
+    return count
+
+
+def evaluate_mobility(board):
+    """Evaluate piece mobility (legal move difference)."""
+    return legal_move_count(board, chess.WHITE) - legal_move_count(board, chess.BLACK)
+
+
+def evaluate_king_safety(board):
+    """Pawn shield and attackers of each king."""
+    score = 0
+    pawns = board.pawns
+    for color in chess.COLORS:
+        king_square = board.king(color)
+        if not king_square:
+            continue  # As in evaluation_optimized (a king on a1 is skipped too)
+        safety = 10 * popcount(SHIELD_MASKS[color][king_square] & pawns & board.occupied_co[color])
+        safety -= 20 * popcount(board.attackers_mask(not color, king_square))
+        score += safety if color == chess.WHITE else -safety
+    return score
+
+
+def evaluate_pawn_structure(board):
+    """Isolated, doubled and passed pawns."""
+    score = 0
+    for color in chess.COLORS:
+        pawns = board.pawns & board.occupied_co[color]
+        if not pawns:
+            continue
+        opponent_pawns = board.pawns & board.occupied_co[not color]
+        passed_masks = PASSED_MASKS[color]
+        value = 0
+
+        for file in range(8):
+            on_file = pawns & BB_FILES[file]
+            if on_file:
+                n = popcount(on_file)
+                if not pawns & ADJACENT_FILES[file]:
+                    value -= 15 * n
+                if n > 1:
+                    value -= 10 * n
+
+        for square in _scan(pawns):
+            if not opponent_pawns & passed_masks[square]:
+                rank = square >> 3
+                value += 20 + (rank if color == chess.WHITE else 7 - rank) * 10
+
+        score += value if color == chess.WHITE else -value
+    return score
+
+
+def evaluate_rooks(board):
+    """Rooks on open / semi-open files and on the 7th rank."""
+    score = 0
+    pawns = board.pawns
+    for color in chess.COLORS:
+        own_pawns = pawns & board.occupied_co[color]
+        seventh = 6 if color == chess.WHITE else 1
+        value = 0
+        for square in _scan(board.rooks & board.occupied_co[color]):
+            file_mask = BB_FILES[square & 7]
+            if not pawns & file_mask:
+                value += 20
+            elif not own_pawns & file_mask:
+                value += 10
+            if square >> 3 == seventh:
+                value += 20
+        score += value if color == chess.WHITE else -value
+    return score
+
+
+def evaluate_bishops(board):
+    """Evaluate bishop pair."""
+    score = 0
+    if popcount(board.bishops & board.occupied_co[chess.WHITE]) >= 2:
+        score += 30
+    if popcount(board.bishops & board.occupied_co[chess.BLACK]) >= 2:
+        score -= 30
+    return score
+
+
+def evaluate_center_control(board):
+    """Pawns on and attackers of e4, d4, e5, d5."""
+    white = board.occupied_co[chess.WHITE]
+    center_pawns = board.pawns & BB_CENTER
+    score = 20 * (popcount(center_pawns & white) - popcount(center_pawns & ~white))
+    for square in CENTER_SQUARES:
+        score += 5 * (popcount(board.attackers_mask(chess.WHITE, square)) -
+                      popcount(board.attackers_mask(chess.BLACK, square)))
+    return score
+
+
+def evaluate_development(board):
+    """Minor pieces off their starting squares, early queen moves."""
+    white = board.occupied_co[chess.WHITE]
+    black = board.occupied_co[chess.BLACK]
+    knights, bishops, queens = board.knights, board.bishops, board.queens
+
+    score = 15 * (popcount(knights & white & ~WHITE_MINOR_HOME[0]) + popcount(bishops & white & ~WHITE_MINOR_HOME[1]))
+    score -= 20 * popcount(queens & white & ~BB_SQUARES[chess.D1])
+    score -= 15 * (popcount(knights & black & ~BLACK_MINOR_HOME[0]) + popcount(bishops & black & ~BLACK_MINOR_HOME[1]))
+    score += 20 * popcount(queens & black & ~BB_SQUARES[chess.D8])
+    return score
+
+
+def evaluate_castling_rights(board):
+    """Castling rights kept, king already castled."""
+    score = 0
+    if board.has_kingside_castling_rights(chess.WHITE) or board.has_queenside_castling_rights(chess.WHITE):
+        score += 20
+    if board.has_kingside_castling_rights(chess.BLACK) or board.has_queenside_castling_rights(chess.BLACK):
+        score -= 20
+    if board.king(chess.WHITE) in (chess.G1, chess.C1):
+        score += 30
+    if board.king(chess.BLACK) in (chess.G8, chess.C8):
+        score -= 30
+    return score
+
+
+def evaluate_opening_principles(board):
+    """Center, development and castling during the first 15 moves."""
+    if board.fullmove_number > 15:
+        return 0
+    return (evaluate_center_control(board) * 2 + evaluate_development(board) * 2
+            + evaluate_castling_rights(board))
+
+
+def evaluate_bitboard(board):
+    """Drop-in replacement for evaluate_incremental (same score, side to move's view)."""
+    if tablebase:
+        wdl = tablebase.probe_wdl(board)
+        if wdl is not None:
+            return wdl * 10000
+
+    score = evaluate_piece_square_tables(board, game_phase(board))
+    score += evaluate_mobility(board)
+    score += evaluate_king_safety(board)
+    score += evaluate_pawn_structure(board)
+    score += evaluate_rooks(board)
+    score += evaluate_bishops(board)
+    score += evaluate_opening_principles(board)
+
+    return score if board.turn == chess.WHITE else -score
@@ -10,7 +10,8 @@ Target: 2-3x faster than evaluation.py
 """
 
 import chess
-import chess.syzygy
+
+from src.ai.tablebase import get_tablebase_service
 
 # Piece values (centipawns)
 PIECE_VALUES = {
@@ -98,12 +99,8 @@ POSITION_TABLES = {
     chess.KING: KING_TABLE
 }
 
-# Syzygy tablebase
-try:
-    syzygy_path = r'R:\_Documents\_TDMU\KIEN_THUC_TDMU\3_year_HK2\TriTueNT\chess-ai\syzygy'
-    TABLEBASE = chess.syzygy.open_tablebase(syzygy_path)
-except:
-    TABLEBASE = None
+# Shared Syzygy tablebases (AI_CONFIG['syzygy_path'])
+TABLEBASE = get_tablebase_service()
 
 
 # Global evaluation cache
@@ -129,15 +126,10 @@ def evaluate_fast(board):
     - Bitboard operations
     """
     # 1. Tablebase probe (endgame) - DISABLED for speed
-    # if TABLEBASE:
-    #     num_pieces = chess.popcount(board.occupied)
-    #     if num_pieces <= 6:
-    #         try:
-    #             wdl = TABLEBASE.probe_wdl(board)
-    #             if wdl is not None:
-    #                 return wdl * 10000
-    #         except:
-    #             pass
+    # if TABLEBASE and chess.popcount(board.occupied) <= TABLEBASE.max_pieces:
+    #     wdl = TABLEBASE.probe_wdl(board)
+    #     if wdl is not None:
+    #         return wdl * 10000
     
     # 2. Check evaluation cache - DISABLED for speed (cache lookups are expensive)
     # zobrist = chess.polyglot.zobrist_hash(board)
@@ -13,8 +13,8 @@ Optimized evaluation function with:
 """
 
 import chess
-import chess.syzygy
-import os
+
+from src.ai.tablebase import get_tablebase_service
 
 # Piece values
 PIECE_VALUES = {
@@ -139,16 +139,8 @@ PST_EG = {
     chess.KING: PST_KING_EG
 }
 
-# Load Syzygy tablebases
-try:
-    syzygy_path = os.path.join(os.path.dirname(__file__), "..", "..", "syzygy")
-    syzygy_path = os.path.abspath(syzygy_path)
-    if os.path.exists(syzygy_path):
-        tablebase = chess.syzygy.open_tablebase(syzygy_path)
-    else:
-        tablebase = None
-except Exception:
-    tablebase = None
+# Shared Syzygy tablebases (AI_CONFIG['syzygy_path'])
+tablebase = get_tablebase_service()
 
 
 class EvaluationCache:
@@ -482,13 +474,10 @@ def evaluate_incremental(board):
     """Main evaluation function with all components."""
     
     # Probe tablebase for positions with few pieces
-    if tablebase and len(board.piece_map()) <= 6:
-        try:
-            wdl = tablebase.probe_wdl(board)
-            if wdl is not None:
-                return wdl * 10000  # Convert to centipawns
-        except:
-            pass
+    if tablebase:
+        wdl = tablebase.probe_wdl(board)
+        if wdl is not None:
+            return wdl * 10000  # Convert to centipawns
     
     # Calculate game phase
     phase = game_phase(board)
@@ -3,6 +3,8 @@ import chess
 from concurrent.futures import ProcessPoolExecutor
 from collections import defaultdict
 from src.ai.evaluation import evaluate, piece_values
+from src.ai.shared_tt import SharedTranspositionTable
+import os
 import time
 import random
 import math
@@ -45,8 +47,30 @@ def get_zobrist_hash(board):
         hash_value ^= zobrist_table[('en_passant', chess.square_file(board.ep_square))]
     return hash_value
 
-# Transposition table
-transposition_table = {}
+# Transposition table (SharedTranspositionTable, shared by the root workers)
+transposition_table = None
+TT_SIZE_MB = 64
+
+# Nodes searched by this process for the current root move, and by all
+# workers in the last get_best_move call
+nodes_searched = 0
+last_search_nodes = 0
+
+# Bound type of a score searched with the window (alpha, beta)
+def tt_bound(score, alpha, beta):
+    if score >= beta:
+        return SharedTranspositionTable.LOWER_BOUND
+    if score <= alpha:
+        return SharedTranspositionTable.UPPER_BOUND
+    return SharedTranspositionTable.EXACT
+
+# True if a stored entry decides the window (alpha, beta) by itself
+def tt_cutoff(entry, alpha, beta):
+    if entry['bound'] == SharedTranspositionTable.EXACT:
+        return True
+    if entry['bound'] == SharedTranspositionTable.LOWER_BOUND:
+        return entry['score'] >= beta
+    return entry['score'] <= alpha
 
 # Placeholder for NNUE evaluation
 def nnue_evaluate(board):
@@ -84,11 +108,14 @@ def order_moves(board, killer_moves_for_depth, history_heuristic_table):
 
 # Quiescence search function
 def quiescence_search(board, alpha, beta, transposition_table):
+    global nodes_searched
+    nodes_searched += 1
     hash_value = get_zobrist_hash(board)
-    if hash_value in transposition_table:
-        stored_entry = transposition_table[hash_value]
-        if stored_entry['depth'] >= 0:
-            return stored_entry['eval']
+    alpha_orig = alpha
+    stored_entry = transposition_table.probe(hash_value)
+    if stored_entry is not None:
+        if stored_entry['depth'] >= 0 and tt_cutoff(stored_entry, alpha, beta):
+            return stored_entry['score']
     stand_pat = evaluate(board)
     if stand_pat >= beta:
         return beta
@@ -105,7 +132,7 @@ def quiescence_search(board, alpha, beta, transposition_table):
                 return beta
             if score > alpha:
                 alpha = score
-    transposition_table[hash_value] = {'eval': alpha, 'depth': 0, 'type': 'exact'}
+    transposition_table.store(hash_value, 0, alpha, tt_bound(alpha, alpha_orig, beta))
     return alpha
 
 # Null move pruning function
@@ -121,18 +148,21 @@ def null_move_pruning(board, depth, alpha, beta, transposition_table):
 
 # Minimax function with alpha-beta pruning
 def minimax(board, depth, alpha, beta, maximizing_player, killer_moves, history_heuristic_table, transposition_table):
+    global nodes_searched
+    nodes_searched += 1
     hash_value = get_zobrist_hash(board)
-    if hash_value in transposition_table:
-        stored_entry = transposition_table[hash_value]
+    alpha_orig, beta_orig = alpha, beta
+    stored_entry = transposition_table.probe(hash_value)
+    if stored_entry is not None:
         if stored_entry['depth'] >= depth:
-            if stored_entry['type'] == 'exact':
-                return stored_entry['eval']
-            elif stored_entry['type'] == 'lowerbound':
-                alpha = max(alpha, stored_entry['eval'])
-            elif stored_entry['type'] == 'upperbound':
-                beta = min(beta, stored_entry['eval'])
+            if stored_entry['bound'] == SharedTranspositionTable.EXACT:
+                return stored_entry['score']
+            elif stored_entry['bound'] == SharedTranspositionTable.LOWER_BOUND:
+                alpha = max(alpha, stored_entry['score'])
+            elif stored_entry['bound'] == SharedTranspositionTable.UPPER_BOUND:
+                beta = min(beta, stored_entry['score'])
             if alpha >= beta:
-                return stored_entry['eval']
+                return stored_entry['score']
     if depth == 0 or board.is_game_over():
         return quiescence_search(board, alpha, beta, transposition_table)
     null_move_value = null_move_pruning(board, depth, alpha, beta, transposition_table)
@@ -153,10 +183,11 @@ def minimax(board, depth, alpha, beta, maximizing_player, killer_moves, history_
                 killer_moves.setdefault(depth, []).append(move)
                 break
         eval_to_store = max_eval
-        tt_type = 'exact'
+        # Bound from the original window: the table is shared by all root workers
+        tt_type = tt_bound(eval_to_store, alpha_orig, beta_orig)
         if best_move_local:
             history_heuristic_table[(best_move_local.from_square, best_move_local.to_square)] += math.log(depth + 1)
-        transposition_table[hash_value] = {'eval': eval_to_store, 'depth': depth, 'type': tt_type}
+        transposition_table.store(hash_value, depth, eval_to_store, tt_type, best_move_local)
         return max_eval
     else:
         min_eval = float('inf')
@@ -173,31 +204,90 @@ def minimax(board, depth, alpha, beta, maximizing_player, killer_moves, history_
                 killer_moves.setdefault(depth, []).append(move)
                 break
         eval_to_store = min_eval
-        tt_type = 'exact'
+        # Bound from the original window: the table is shared by all root workers
+        tt_type = tt_bound(eval_to_store, alpha_orig, beta_orig)
         if best_move_local:
             history_heuristic_table[(best_move_local.from_square, best_move_local.to_square)] += math.log(depth + 1)
-        transposition_table[hash_value] = {'eval': eval_to_store, 'depth': depth, 'type': tt_type}
+        transposition_table.store(hash_value, depth, eval_to_store, tt_type, best_move_local)
         return min_eval
 
-# Function to get the best move
-def get_best_move(board, depth):
+# Worker task: search one root move, returns (eval, nodes)
+def search_root_move(board, depth, killer_moves, history_heuristic_table, transposition_table):
+    global nodes_searched
+    nodes_searched = 0
+    if transposition_table is None:
+        # Isolated worker: private table for this move only
+        with SharedTranspositionTable(TT_SIZE_MB) as private_table:
+            eval = minimax(board, depth, -float('inf'), float('inf'), False, killer_moves, history_heuristic_table, private_table)
+    else:
+        eval = minimax(board, depth, -float('inf'), float('inf'), False, killer_moves, history_heuristic_table, transposition_table)
+    return eval, nodes_searched
+
+# Lazy-SMP worker task: search every root move, worker i of n starting i/n of the way
+# through the move list, so each one finds the later moves already in the shared table;
+# returns (best_move, eval, nodes)
+def search_root(board, depth, worker_index, workers, transposition_table):
+    global nodes_searched
+    nodes_searched = 0
+    history_heuristic_table = defaultdict(int)
+    moves = order_moves(board, [], history_heuristic_table)
+    shift = worker_index * len(moves) // workers
+    moves = moves[shift:] + moves[:shift]
+    private_table = SharedTranspositionTable(TT_SIZE_MB) if transposition_table is None else None
+    table = transposition_table if private_table is None else private_table
     best_move = None
     max_eval = -float('inf')
-    killer_moves = {}
-    history_heuristic_table = defaultdict(int)
-    global transposition_table
-    transposition_table = {}
-    with ProcessPoolExecutor() as executor:
-        futures = []
-        move_results = []
-        for move in order_moves(board, killer_moves.get(1, []), history_heuristic_table):
+    try:
+        for move in moves:
             board.push(move)
-            futures.append(executor.submit(minimax, board.copy(), depth - 1, -float('inf'), float('inf'), False, killer_moves, history_heuristic_table, transposition_table))
+            eval = minimax(board, depth - 1, -float('inf'), float('inf'), False, {}, history_heuristic_table, table)
             board.pop()
-            move_results.append(move)
-        for i, future in enumerate(futures):
-            eval = future.result()
             if eval > max_eval:
                 max_eval = eval
-                best_move = move_results[i]
-    return best_move
\ No newline at end of file
+                best_move = move
+    finally:
+        if private_table is not None:
+            private_table.close()
+    return best_move, max_eval, nodes_searched
+
+# Function to get the best move
+# shared_tt=False gives every task its own table (no sharing between workers)
+# lazy_smp=True: every worker searches the whole root and the move of worker 0 is played
+def get_best_move(board, depth, shared_tt=True, max_workers=None, lazy_smp=False):
+    best_move = None
+    max_eval = -float('inf')
+    killer_moves = {}
+    history_heuristic_table = defaultdict(int)
+    global transposition_table, last_search_nodes
+    transposition_table = SharedTranspositionTable(TT_SIZE_MB) if shared_tt else None
+    last_search_nodes = 0
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            # The shared table is pickled by name: workers attach to the same memory
+            if lazy_smp:
+                workers = max_workers or os.cpu_count() or 1
+                futures = [executor.submit(search_root, board.copy(), depth, i, workers, transposition_table) for i in range(workers)]
+                for i, future in enumerate(futures):
+                    move, eval, nodes = future.result()
+                    last_search_nodes += nodes
+                    if i == 0:
+                        best_move = move
+                return best_move
+            futures = []
+            move_results = []
+            for move in order_moves(board, killer_moves.get(1, []), history_heuristic_table):
+                board.push(move)
+                futures.append(executor.submit(search_root_move, board.copy(), depth - 1, killer_moves, history_heuristic_table, transposition_table))
+                board.pop()
+                move_results.append(move)
+            for i, future in enumerate(futures):
+                eval, nodes = future.result()
+                last_search_nodes += nodes
+                if eval > max_eval:
+                    max_eval = eval
+                    best_move = move_results[i]
+    finally:
+        if transposition_table is not None:
+            transposition_table.close()
+            transposition_table = None
+    return best_move
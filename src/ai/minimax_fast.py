@@ -18,6 +18,7 @@ import chess.polyglot
 import time
 from collections import defaultdict
 from src.ai.evaluation_fast import evaluate_fast, evaluate_fast_material_only
+from src.ai.transposition_table import TranspositionTable
 
 # Constants
 MATE_SCORE = 30000
@@ -34,64 +35,6 @@ PIECE_VALUES = {
 }
 
 
-class TranspositionTable:
-    """Optimized TT with better replacement strategy."""
-    EXACT = 0
-    LOWER_BOUND = 1
-    UPPER_BOUND = 2
-    
-    def __init__(self, size_mb=256):
-        self.size = (size_mb * 1024 * 1024) // 40  # ~40 bytes per entry
-        self.table = {}
-        self.hits = 0
-        self.misses = 0
-    
-    def probe(self, zobrist_hash):
-        """Probe TT for position."""
-        if zobrist_hash in self.table:
-            self.hits += 1
-            return self.table[zobrist_hash]
-        self.misses += 1
-        return None
-    
-    def store(self, zobrist_hash, depth, score, bound, best_move):
-        """Store position in TT with depth-preferred replacement."""
-        if len(self.table) >= self.size:
-            if zobrist_hash not in self.table:
-                # Replace random entry (simplified)
-                # In production, use age + depth replacement
-                if len(self.table) > self.size * 1.2:
-                    # Clear 20% of entries
-                    keys = list(self.table.keys())
-                    for k in keys[:len(keys)//5]:
-                        del self.table[k]
-        
-        # Store new entry
-        self.table[zobrist_hash] = {
-            'depth': depth,
-            'score': score,
-            'bound': bound,
-            'best_move': best_move
-        }
-    
-    def clear(self):
-        """Clear TT."""
-        self.table.clear()
-        self.hits = 0
-        self.misses = 0
-    
-    def get_stats(self):
-        """Get TT statistics."""
-        total = self.hits + self.misses
-        hit_rate = (self.hits / total * 100) if total > 0 else 0
-        return {
-            'size': len(self.table),
-            'hits': self.hits,
-            'misses': self.misses,
-            'hit_rate': hit_rate
-        }
-
-
 class SearchInfo:
     """Search information and statistics."""
     def __init__(self, max_time=None, max_depth=None):
@@ -16,7 +16,9 @@ import time
 import random
 import math
 from collections import defaultdict
-from src.ai.evaluation_optimized import evaluate_incremental, EvaluationCache
+from src.ai.evaluation_optimized import EvaluationCache
+from src.ai.evaluation_bitboard import evaluate_bitboard
+from src.ai.transposition_table import TranspositionTable
 
 # Constants
 MATE_SCORE = 100000
@@ -63,61 +65,14 @@ def get_zobrist_hash(board):
     return hash_value
 
 
-class TranspositionTable:
-    """Persistent transposition table with aging."""
-    
-    EXACT = 0
-    LOWER_BOUND = 1
-    UPPER_BOUND = 2
-    
-    def __init__(self, size_mb=256):
-        # Estimate: each entry ~50 bytes, so 1MB ≈ 20K entries
-        self.max_entries = (size_mb * 1024 * 1024) // 50
-        self.table = {}
-        self.current_age = 0
-    
-    def clear(self):
-        """Clear the table."""
-        self.table.clear()
-        self.current_age = 0
-    
-    def new_search(self):
-        """Increment age for new search."""
-        self.current_age += 1
-        # Clean old entries if table is too large
-        if len(self.table) > self.max_entries:
-            self._clean_old_entries()
-    
-    def _clean_old_entries(self):
-        """Remove old entries to free space."""
-        # Remove entries older than 8 searches
-        old_keys = [k for k, v in self.table.items() if self.current_age - v['age'] > 8]
-        for key in old_keys[:len(old_keys)//2]:  # Remove half of old entries
-            del self.table[key]
-    
-    def store(self, zobrist_hash, depth, score, bound_type, best_move=None):
-        """Store position in transposition table."""
-        self.table[zobrist_hash] = {
-            'depth': depth,
-            'score': score,
-            'bound': bound_type,
-            'best_move': best_move,
-            'age': self.current_age
-        }
-    
-    def probe(self, zobrist_hash):
-        """Probe transposition table."""
-        return self.table.get(zobrist_hash)
-
-
 class SearchInfo:
     """Information for search management."""
     
-    def __init__(self, time_limit=10.0):
+    def __init__(self, time_limit=10.0, tt=None):
         self.start_time = time.time()
         self.time_limit = time_limit
         self.nodes = 0
-        self.tt = TranspositionTable(256)
+        self.tt = tt if tt is not None else TranspositionTable(256)
         self.killer_moves = [[None, None] for _ in range(MAX_PLY)]
         self.history = defaultdict(int)
         self.countermoves = {}  # Countermove heuristic
@@ -274,7 +229,7 @@ def quiescence_search(board, alpha, beta, info, ply):
         return 0
     
     # Stand pat score
-    stand_pat = evaluate_incremental(board)
+    stand_pat = evaluate_bitboard(board)
     
     if stand_pat >= beta:
         return beta
@@ -404,7 +359,7 @@ def alpha_beta(board, depth, alpha, beta, info, ply, do_null=True):
     
     # Razoring - if eval is very low, go straight to quiescence
     if depth <= 3 and not in_check and abs(alpha) < MATE_SCORE - 100:
-        eval_score = evaluate_incremental(board)
+        eval_score = evaluate_bitboard(board)
         razor_margin = [0, 300, 400, 600][depth]
         
         if eval_score + razor_margin < alpha:
@@ -416,7 +371,7 @@ def alpha_beta(board, depth, alpha, beta, info, ply, do_null=True):
     # Futility pruning
     futility = False
     if depth <= 3 and not in_check and abs(alpha) < MATE_SCORE - 100:
-        eval_score = evaluate_incremental(board)
+        eval_score = evaluate_bitboard(board)
         if eval_score + futility_pruning_margin(depth) <= alpha:
             futility = True
     
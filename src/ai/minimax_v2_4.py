@@ -14,7 +14,8 @@ import time
 import random
 import math
 from collections import defaultdict
-from src.ai.evaluation_optimized import evaluate_incremental, EvaluationCache
+from src.ai.evaluation_optimized import EvaluationCache
+from src.ai.evaluation_bitboard import evaluate_bitboard
 from src.ai.correction_history import CorrectionHistory
 
 # Import base classes từ minimax_optimized
@@ -339,7 +340,7 @@ def alpha_beta_advanced(board, depth, alpha, beta, info, ply, do_null=True):
         depth += 1
     
     # ========== NEW v2.5: Static Eval with Correction History ==========
-    static_eval = evaluate_incremental(board)
+    static_eval = evaluate_bitboard(board)
     
     # Apply correction from history if available
     if hasattr(info, 'correction_history'):
@@ -375,7 +376,7 @@ def alpha_beta_advanced(board, depth, alpha, beta, info, ply, do_null=True):
     
     # Razoring
     if depth <= 3 and not in_check and abs(alpha) < MATE_SCORE - 100:
-        eval_score = evaluate_incremental(board)
+        eval_score = evaluate_bitboard(board)
         razor_margin = [0, 300, 400, 600][depth]
         
         if eval_score + razor_margin < alpha:
@@ -386,7 +387,7 @@ def alpha_beta_advanced(board, depth, alpha, beta, info, ply, do_null=True):
     # Futility pruning
     futility = False
     if depth <= 3 and not in_check and abs(alpha) < MATE_SCORE - 100:
-        eval_score = evaluate_incremental(board)
+        eval_score = evaluate_bitboard(board)
         if eval_score + futility_pruning_margin(depth) <= alpha:
             futility = True
     
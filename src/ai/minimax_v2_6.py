@@ -24,16 +24,23 @@ import chess
 import time
 import random
 import math
+import threading
+import atexit
 from collections import defaultdict
-from src.ai.evaluation_optimized import evaluate_incremental, EvaluationCache
+from src.ai.evaluation_optimized import EvaluationCache
+from src.ai.evaluation_bitboard import evaluate_bitboard
 from src.ai.correction_history import CorrectionHistory
 
 # Import base classes từ minimax_optimized
 from src.ai.minimax_optimized import (
     MATE_SCORE, MAX_PLY, INFINITY, PIECE_VALUES,
-    get_zobrist_hash, TranspositionTable, SearchInfo,
+    SearchInfo,
     see, score_move, quiescence_search
 )
+from src.ai.transposition_table import TranspositionTable
+from src.ai.zobrist import HashedBoard
+from src.ai.time_manager import TimeManager
+from src.utils.config import AI_CONFIG
 
 
 # ============================================================================
@@ -91,8 +98,8 @@ class ContinuationHistory:
 
 class EnhancedSearchInfo(SearchInfo):
     """Extended SearchInfo with Continuation History and improved stats."""
-    def __init__(self):
-        super().__init__()
+    def __init__(self, tt=None):
+        super().__init__(tt=tt)
         
         # NEW: Continuation History
         self.continuation_history = ContinuationHistory()
@@ -117,11 +124,49 @@ class EnhancedSearchInfo(SearchInfo):
             self.pv = [[None] * MAX_PLY for _ in range(MAX_PLY)]
             self.pv_length = [0] * MAX_PLY
         
+        # Time manager of the running search, and nodes spent on its root best move
+        self.time_manager = None
+        self.root_best_nodes = 0
+        
         # Initialize TT stats if not exists
         if not hasattr(self, 'tt_hits'):
             self.tt_hits = 0
             self.cut_nodes = 0
     
+    def new_search(self):
+        """
+        Reset the per-search state. The TT, history, countermoves, continuation
+        and correction history are kept, so the next search starts warm.
+        """
+        self.start_time = time.time()
+        self.nodes = 0
+        self.stopped = False
+        self.last_move = None
+        self.killer_moves = [[None, None] for _ in range(MAX_PLY)]
+        self.pv = [[None] * MAX_PLY for _ in range(MAX_PLY)]
+        self.pv_length = [0] * MAX_PLY
+        self.improving = [False] * MAX_PLY
+        self.prev_static_evals = [0] * MAX_PLY
+        self.static_evals = {}
+        self.time_manager = None
+        self.root_best_nodes = 0
+        self.lmp_cutoffs = 0
+        self.razoring_cutoffs = 0
+        self.continuation_hits = 0
+        self.multicut_cutoffs = 0
+        self.tt_hits = 0
+        self.cut_nodes = 0
+        self.tt.new_search()
+    
+    def check_time(self):
+        """Stop on request or at the time manager's hard limit (none while pondering)."""
+        time_manager = self.time_manager
+        if time_manager is None:
+            return super().check_time()
+        if time_manager.stop_requested or (self.nodes % 2048 == 0 and time_manager.hard_limit_reached()):
+            self.stopped = True
+        return self.stopped
+    
     def update_pv(self, ply, move):
         """Update Principal Variation."""
         self.pv[ply][ply] = move
@@ -278,7 +323,7 @@ def enhanced_razoring(board, depth, alpha, info, ply):
     }
     
     razor_margin = razor_margins.get(depth, 0)
-    eval_score = evaluate_incremental(board)
+    eval_score = evaluate_bitboard(board)
     
     if eval_score + razor_margin < alpha:
         # Verify with qsearch
@@ -332,13 +377,20 @@ def multicut_pruning_enhanced(board, depth, beta, info, ply, ordered_moves):
 # ENHANCED ASPIRATION WINDOWS - Stockfish Style (+30-50 Elo)
 # ============================================================================
 
-def enhanced_aspiration_windows(board, max_depth, time_limit, info):
+def enhanced_aspiration_windows(board, max_depth, time_limit, info, time_manager=None):
     """
     Stockfish-style aspiration windows with dynamic widening.
+    
+    Args:
+        time_manager: TimeManager for clock-based games (None: fixed time_limit)
     """
-    start_time = time.time()
+    if time_manager is None:
+        time_manager = TimeManager(move_time=time_limit)
+    time_manager.start()
+    start_time = time_manager.start_time
     info.start_time = start_time
-    info.time_limit = time_limit
+    info.time_limit = time_manager.maximum
+    info.time_manager = time_manager  # Hard stop inside a depth
     
     best_score = 0
     best_move = None
@@ -356,13 +408,14 @@ def enhanced_aspiration_windows(board, max_depth, time_limit, info):
         
         research_count = 0
         max_researches = 4
+        depth_start_nodes = info.nodes
         
         while True:
+            info.root_best_nodes = 0
             score = alpha_beta_enhanced(board, depth, alpha, beta, info, ply=0, do_null=True)
             
-            # Check if we're out of time
-            elapsed = time.time() - start_time
-            if elapsed > time_limit * 0.8:
+            # Out of time inside the depth: keep the last completed one
+            if info.stopped:
                 return best_move, best_score
             
             # Success - score within window
@@ -385,6 +438,7 @@ def enhanced_aspiration_windows(board, max_depth, time_limit, info):
                 
                 if score <= alpha:
                     # Failed low
+                    time_manager.note_fail_low()
                     alpha = max(alpha - delta, -INFINITY)
                     beta = (alpha + beta) // 2
                 elif score >= beta:
@@ -402,8 +456,10 @@ def enhanced_aspiration_windows(board, max_depth, time_limit, info):
         print(f"depth {depth} score cp {best_score} nodes {info.nodes} "
               f"nps {nps} time {int(elapsed*1000)} pv {pv_str}")
         
-        # Early exit if using 80% of time
-        if elapsed > time_limit * 0.8:
+        # Time manager: stop early on a stable best move, extend on instability
+        depth_nodes = info.nodes - depth_start_nodes
+        node_share = info.root_best_nodes / depth_nodes if depth_nodes else 0.0
+        if time_manager.stop_after_iteration(depth, best_move, best_score, node_share):
             break
     
     # Fallback: if no best_move from PV, pick first legal move
@@ -454,8 +510,8 @@ def alpha_beta_enhanced(board, depth, alpha, beta, info, ply, do_null=True):
     if board.is_repetition(2):
         return 0 if ply == 0 else -50
     
-    # Transposition table probe
-    zobrist_hash = get_zobrist_hash(board)
+    # Transposition table probe (key maintained incrementally by HashedBoard)
+    zobrist_hash = board.zobrist_hash()
     tt_entry = info.tt.probe(zobrist_hash)
     hash_move = None
     
@@ -483,7 +539,7 @@ def alpha_beta_enhanced(board, depth, alpha, beta, info, ply, do_null=True):
         depth += 1
     
     # Static eval with correction history
-    static_eval = evaluate_incremental(board)
+    static_eval = evaluate_bitboard(board)
     
     if hasattr(info, 'correction_history'):
         prev_move = info.last_move if hasattr(info, 'last_move') else None
@@ -569,6 +625,7 @@ def alpha_beta_enhanced(board, depth, alpha, beta, info, ply, do_null=True):
         # Save previous last_move
         prev_last_move = info.last_move if hasattr(info, 'last_move') else None
         info.last_move = move
+        nodes_before = info.nodes
         
         board.push(move)
         
@@ -604,6 +661,8 @@ def alpha_beta_enhanced(board, depth, alpha, beta, info, ply, do_null=True):
                 alpha = score
                 bound_type = TranspositionTable.EXACT
                 info.update_pv(ply, move)
+                if ply == 0:
+                    info.root_best_nodes = info.nodes - nodes_before
                 
                 if score >= beta:
                     bound_type = TranspositionTable.LOWER_BOUND
@@ -649,18 +708,29 @@ def alpha_beta_enhanced(board, depth, alpha, beta, info, ply, do_null=True):
 # ITERATIVE DEEPENING (Enhanced with better aspiration windows)
 # ============================================================================
 
-def iterative_deepening_v2_6(board, max_depth=10, time_limit=5.0):
+def iterative_deepening_v2_6(board, max_depth=10, time_limit=5.0, time_manager=None, info=None):
     """
     Main search entry point for v2.6 with all enhancements.
+    
+    Args:
+        info: EnhancedSearchInfo to search with (new if None); holds the PV afterwards
     """
-    info = EnhancedSearchInfo()
-    info.correction_history = CorrectionHistory()
+    if info is None:
+        info = EnhancedSearchInfo()
+        info.correction_history = CorrectionHistory()
+
+    # Search on a copy that keeps its Zobrist key up to date on push/pop
+    if not isinstance(board, HashedBoard):
+        board = HashedBoard.from_board(board)
     
-    print(f"Starting EURY v2.6 search (max_depth={max_depth}, time={time_limit}s)")
+    if time_manager is not None:
+        print(f"Starting EURY v2.6 search (max_depth={max_depth}, time={time_manager})")
+    else:
+        print(f"Starting EURY v2.6 search (max_depth={max_depth}, time={time_limit}s)")
     print("=" * 70)
     
     # Use enhanced aspiration windows
-    best_move, best_score = enhanced_aspiration_windows(board, max_depth, time_limit, info)
+    best_move, best_score = enhanced_aspiration_windows(board, max_depth, time_limit, info, time_manager)
     
     # Apply gravity to all history tables
     info.apply_history_gravity()
@@ -681,23 +751,247 @@ def iterative_deepening_v2_6(board, max_depth=10, time_limit=5.0):
     return best_move
 
 
+def expected_reply(board, info, best_move):
+    """Second move of the PV if it follows best_move and is legal, else None."""
+    if best_move is None or info.pv_length[0] < 2 or info.pv[0][0] != best_move:
+        return None
+    reply = info.pv[0][1]
+    board = board.copy(stack=False)
+    board.push(best_move)
+    return reply if reply is not None and reply in board.legal_moves else None
+
+
+# ============================================================================
+# PERSISTENT ENGINE
+# ============================================================================
+
+class SearchEngine:
+    """
+    Long-lived v2.6 search state.
+    
+    The TT, history, countermoves, continuation and correction history are
+    kept between searches, so every move starts from the work of the earlier
+    ones (a repeated opening, even in the next game, starts warm). The TT can
+    be saved to disk and memory-mapped back with save_tt()/load_tt().
+    """
+    
+    def __init__(self, tt_size_mb=256):
+        self.tt_size_mb = tt_size_mb
+        self._lock = threading.Lock()  # One search at a time (GUI thread, ponder thread)
+        self.clear()
+    
+    def clear(self):
+        """Forget everything learned so far (TT and all histories)."""
+        info = EnhancedSearchInfo(tt=TranspositionTable(self.tt_size_mb))
+        info.correction_history = CorrectionHistory()
+        self.info = info
+    
+    def search(self, board, depth=6, time_limit=5.0, time_manager=None):
+        """
+        Search with the kept state.
+        
+        Args:
+            time_manager: TimeManager (None: fixed time_limit)
+        
+        Returns:
+            (best move, expected reply or None)
+        """
+        with self._lock:
+            info = self.info
+            info.new_search()
+            best_move = iterative_deepening_v2_6(board, depth, time_limit, time_manager, info)
+            return best_move, expected_reply(board, info, best_move)
+    
+    def get_best_move_and_ponder(self, board, depth=6, time_limit=5.0, time_left=None, increment=0.0,
+                                 moves_to_go=0):
+        """Best move and expected reply; arguments as for get_best_move."""
+        time_manager = None
+        if time_left is not None:
+            time_manager = TimeManager.from_clock(board, time_left, increment, moves_to_go, max_time=time_limit)
+        return self.search(board, depth, time_limit, time_manager)
+    
+    def get_best_move(self, board, depth=6, time_limit=5.0, time_left=None, increment=0.0, moves_to_go=0):
+        """Best move; arguments as for the module-level get_best_move."""
+        return self.get_best_move_and_ponder(board, depth, time_limit, time_left, increment, moves_to_go)[0]
+    
+    @property
+    def tt(self):
+        return self.info.tt
+    
+    def save_tt(self, path):
+        """Write the TT to a raw binary file."""
+        with self._lock:
+            self.info.tt.save(path)
+    
+    def load_tt(self, path):
+        """
+        Replace the TT with one saved by save_tt (memory-mapped, copy-on-write).
+        
+        Raises:
+            ValueError: Not a TT file
+        """
+        table = TranspositionTable.load(path)
+        with self._lock:
+            self.info.tt = table
+
+
+_default_engine = None
+
+
+def get_engine():
+    """
+    Shared engine behind get_best_move (created on first use).
+    
+    AI_CONFIG['search_workers'] > 1 selects the process-pool ParallelSearch,
+    with AI_CONFIG['tt_size_mb'] split between the workers.
+    """
+    global _default_engine
+    if _default_engine is None:
+        workers = AI_CONFIG.get('search_workers', 1)
+        tt_size_mb = AI_CONFIG.get('tt_size_mb', 256)
+        if workers > 1:
+            from src.ai.parallel_search import ParallelSearch
+            _default_engine = ParallelSearch(workers, max(1, tt_size_mb // workers))
+            atexit.register(_default_engine.close)
+        else:
+            _default_engine = SearchEngine(tt_size_mb)
+    return _default_engine
+
+
 # ============================================================================
 # MAIN ENTRY POINT
 # ============================================================================
 
-def get_best_move(board, depth=6, time_limit=5.0):
+def get_best_move(board, depth=6, time_limit=5.0, time_left=None, increment=0.0, moves_to_go=0):
     """
-    Get best move using EURY v2.6 engine.
+    Get best move using EURY v2.6 engine (the shared engine, so its TT and
+    histories carry over from earlier moves).
     
     Args:
-        board: chess.Board position
+        board: chess.Board position (searched on a HashedBoard copy)
         depth: Maximum search depth
-        time_limit: Time limit in seconds
+        time_limit: Time limit in seconds (the most a clock-based move may use)
+        time_left: Seconds on the side to move's clock; None searches for time_limit
+        increment: Seconds added per move
+        moves_to_go: Moves to the next time control (0 = sudden death)
     
     Returns:
         chess.Move: Best move found
     """
-    return iterative_deepening_v2_6(board, depth, time_limit)
+    return get_engine().get_best_move(board, depth, time_limit, time_left, increment, moves_to_go)
+
+
+def get_best_move_and_ponder(board, depth=6, time_limit=5.0, time_left=None, increment=0.0, moves_to_go=0):
+    """
+    Like get_best_move, plus the expected reply to ponder on.
+    
+    Returns:
+        (best move, expected reply or None)
+    """
+    return get_engine().get_best_move_and_ponder(board, depth, time_limit, time_left, increment, moves_to_go)
+
+
+# ============================================================================
+# PONDERING
+# ============================================================================
+
+class Ponderer:
+    """
+    Search the expected reply while the opponent thinks.
+    
+    start() assumes the opponent plays the expected reply and searches the
+    resulting position on a background thread without a time limit. If the
+    opponent does play it, ponderhit() turns the search into a normal timed
+    one (ponder time counts toward the budget, so the answer is often ready
+    at once) and wait() returns its result. Otherwise ponder_miss() aborts it.
+    The search runs on the engine that plays the moves (SearchEngine or
+    ParallelSearch), so its TT entries help the next move either way.
+    """
+    
+    def __init__(self, engine=None):
+        """
+        Args:
+            engine: SearchEngine or ParallelSearch to search with (None: the shared engine)
+        """
+        self.engine = engine
+        self.ponder_move = None
+        self._thread = None
+        self._time_manager = None
+        self._result = (None, None)
+    
+    @property
+    def is_pondering(self):
+        return self._thread is not None
+    
+    def start(self, board, ponder_move, depth=6, time_limit=5.0, time_left=None, increment=0.0, moves_to_go=0):
+        """
+        Args:
+            board: Position after our move (opponent to move)
+            ponder_move: Expected reply
+            depth, time_limit, time_left, increment, moves_to_go: As for get_best_move,
+                applied to our next move once the ponder move is played
+        
+        Returns:
+            True if pondering started (ponder_move is legal)
+        """
+        self.ponder_miss()
+        if ponder_move is None or ponder_move not in board.legal_moves:
+            return False
+        
+        position = board.copy()
+        position.push(ponder_move)
+        if time_left is not None:
+            time_manager = TimeManager.from_clock(position, time_left, increment, moves_to_go,
+                                                  max_time=time_limit, ponder=True)
+        else:
+            time_manager = TimeManager(move_time=time_limit, ponder=True)
+        engine = self.engine or get_engine()
+        
+        def run():
+            self._result = engine.search(position, depth, time_limit, time_manager)
+        
+        self.ponder_move = ponder_move
+        self._time_manager = time_manager
+        self._result = (None, None)
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        return True
+    
+    def ponderhit(self):
+        """The opponent played ponder_move: continue on our clock (then call wait())."""
+        time_manager = self._time_manager
+        if time_manager is None:
+            return
+        # Budget already spent while pondering: stop now if a depth has completed
+        if time_manager.ponderhit() and time_manager.last_best_move is not None:
+            time_manager.stop()
+    
+    def ponder_miss(self):
+        """The opponent played another move: abort the ponder search."""
+        if self._thread is None:
+            return
+        self._time_manager.stop()
+        self._thread.join()
+        self._reset()
+    
+    def wait(self):
+        """
+        Finish the search after ponderhit().
+        
+        Returns:
+            (best move, expected reply or None)
+        """
+        if self._thread is None:
+            return None, None
+        self._thread.join()
+        result = self._result
+        self._reset()
+        return result
+    
+    def _reset(self):
+        self.ponder_move = None
+        self._thread = None
+        self._time_manager = None
 
 
 if __name__ == "__main__":
@@ -1,14 +1,244 @@
 #src/AI/opening_book.py
+"""
+Polyglot opening books.
+
+PolyglotBook maps a .bin file once and keeps its keys in a sorted in-memory
+index, so a lookup is a binary search with no file I/O. OpeningBookService
+merges several books by priority (the first book that knows a position
+answers), caches recent lookups and picks moves by weight or at random.
+
+Boards may be chess.Board objects (including HashedBoard) or C++
+chess_engine.Board objects, which are converted through their FEN.
+"""
+
+import os
+import mmap
+import random
+import threading
+from collections import OrderedDict
+
+import chess
 import chess.polyglot
+import numpy as np
+
+# Polyglot entry: key, move, weight, learn (big-endian, 16 bytes)
+ENTRY_DTYPE = np.dtype([('key', '>u8'), ('move', '>u2'), ('weight', '>u2'), ('learn', '>u4')])
+
+# Books shipped in opening_bin/, strongest / most curated first
+DEFAULT_BOOK_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "opening_bin"))
+DEFAULT_BOOK_ORDER = ["gm2600.bin", "Elo2400.bin", "Performance.bin",
+                      "final-book.bin", "varied.bin", "gavibook-small.bin"]
+
+
+def _to_chess_board(board):
+    """chess.Board for a python-chess or C++ board."""
+    if isinstance(board, chess.Board):
+        return board
+    return chess.Board(board.to_fen())
+
+
+def _zobrist_key(board):
+    """Polyglot key, using the incremental key of a HashedBoard if present."""
+    if hasattr(board, 'zobrist_hash'):
+        return board.zobrist_hash()
+    return chess.polyglot.zobrist_hash(board)
+
+
+class PolyglotBook:
+    """One memory-mapped polyglot book with an in-memory key index."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+
+        size = os.fstat(self._file.fileno()).st_size
+        count = size // ENTRY_DTYPE.itemsize  # Ignore a truncated last entry
+        if count:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._entries = np.frombuffer(self._mmap, dtype=ENTRY_DTYPE, count=count)
+        else:
+            self._mmap = None
+            self._entries = np.zeros(0, dtype=ENTRY_DTYPE)
+
+        # Native-endian sorted key index (books are sorted; keep a permutation if not)
+        self._keys = self._entries['key'].astype(np.uint64)
+        self._order = None
+        if count > 1 and np.any(self._keys[1:] < self._keys[:-1]):
+            self._order = np.argsort(self._keys, kind='stable')
+            self._keys = self._keys[self._order]
+
+    def __len__(self):
+        return len(self._keys)
+
+    def lookup(self, key):
+        """
+        Raw entries for a key.
+
+        Returns:
+            List of (raw_move, weight) tuples, highest weight first
+        """
+        key = np.uint64(key)
+        lo = int(np.searchsorted(self._keys, key, side='left'))
+        hi = int(np.searchsorted(self._keys, key, side='right'))
+        if lo == hi:
+            return []
+
+        rows = self._entries[lo:hi] if self._order is None else self._entries[self._order[lo:hi]]
+        entries = [(int(move), int(weight)) for move, weight in zip(rows['move'], rows['weight'])]
+        entries.sort(key=lambda entry: -entry[1])
+        return entries
+
+    def close(self):
+        """Release the mapping and the file."""
+        self._entries = np.zeros(0, dtype=ENTRY_DTYPE)
+        self._keys = np.zeros(0, dtype=np.uint64)
+        self._order = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+
+class OpeningBookService:
+    """Persistent book service: several books by priority plus an LRU of lookups."""
+
+    def __init__(self, paths, cache_size=1024, seed=None):
+        """
+        Args:
+            paths: Book files, highest priority first (missing files are skipped)
+            cache_size: Number of positions kept in the lookup cache
+            seed: Random seed for weighted/random selection
+        """
+        self.books = [PolyglotBook(path) for path in paths if os.path.exists(path)]
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()  # GUI AI thread and main thread may share the service
+        self._rng = random.Random(seed)
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_directory(cls, directory=DEFAULT_BOOK_DIR, order=DEFAULT_BOOK_ORDER, **kwargs):
+        """All .bin books in a directory; names in order come first (no books if it is missing)."""
+        if not os.path.isdir(directory):
+            return cls([], **kwargs)
+        names = sorted(name for name in os.listdir(directory) if name.endswith('.bin'))
+        ranked = [name for name in order if name in names] + [name for name in names if name not in order]
+        return cls([os.path.join(directory, name) for name in ranked], **kwargs)
+
+    def lookup(self, key):
+        """Raw (raw_move, weight) entries of the first book that knows the key."""
+        with self._lock:
+            entries = self._cache.get(key)
+            if entries is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return entries
+
+            self.misses += 1
+            entries = ()
+            for book in self.books:
+                found = book.lookup(key)
+                if found:
+                    entries = tuple(found)
+                    break
+
+            self._cache[key] = entries
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            return entries
+
+    def get_moves(self, board, minimum_weight=1):
+        """
+        Legal book moves for a position.
+
+        Returns:
+            List of (chess.Move, weight), highest weight first
+        """
+        board = _to_chess_board(board)
+        moves = []
+
+        for raw_move, weight in self.lookup(_zobrist_key(board)):
+            if weight < minimum_weight:
+                continue
+
+            # Polyglot: to bits 0-5, from bits 6-11, promotion 12-14 (1 = knight);
+            # castling is encoded as king takes rook
+            promotion = (raw_move >> 12) & 0x7
+            move = board._from_chess960(board.chess960, (raw_move >> 6) & 0x3F, raw_move & 0x3F,
+                                        promotion + 1 if promotion else None)
+            if board.is_legal(move):
+                moves.append((move, weight))
+
+        return moves
+
+    def get_move(self, board, mode='best', minimum_weight=1):
+        """
+        Pick a book move.
+
+        Args:
+            board: chess.Board or chess_engine.Board
+            mode: 'best' (highest weight), 'weighted' (random by weight) or 'random'
+
+        Returns:
+            chess.Move or None if the position is not in any book
+        """
+        moves = self.get_moves(board, minimum_weight)
+        if not moves:
+            return None
+
+        if mode == 'best':
+            return moves[0][0]
+        if mode == 'random':
+            return self._rng.choice(moves)[0]
+        if mode == 'weighted':
+            return self._rng.choices([move for move, _ in moves],
+                                     weights=[weight for _, weight in moves])[0]
+        raise ValueError(f"Unknown book selection mode: {mode}")
+
+    def get_move_uci(self, board, mode='best', minimum_weight=1):
+        """Book move as a UCI string (for the C++ engine), or None."""
+        move = self.get_move(board, mode, minimum_weight)
+        return move.uci() if move else None
+
+    def get_stats(self):
+        """Cache statistics."""
+        total = self.hits + self.misses
+        return {
+            'books': len(self.books),
+            'entries': sum(len(book) for book in self.books),
+            'cached': len(self._cache),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits / total * 100) if total > 0 else 0
+        }
+
+    def close(self):
+        """Close all books."""
+        for book in self.books:
+            book.close()
+        self.books = []
+        self._cache.clear()
+
+
+_default_service = None
+
+
+def get_book_service():
+    """Shared service over the books in opening_bin/ (opened on first use)."""
+    global _default_service
+    if _default_service is None:
+        _default_service = OpeningBookService.from_directory()
+    return _default_service
+
 
 class OpeningBook:
-    def __init__(self, book_path):
+    """Single-book wrapper kept for the GUI (opens the book once)."""
+
+    def __init__(self, book_path, mode='best'):
         self.book_path = book_path
+        self.mode = mode
+        self.service = OpeningBookService([book_path])
 
     def get_move(self, board):
-        with chess.polyglot.open_reader(self.book_path) as reader:
-            try:
-                entry = reader.find(board)
-                return entry.move
-            except IndexError:
-                return None
\ No newline at end of file
+        return self.service.get_move(board, self.mode)
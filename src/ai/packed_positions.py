@@ -0,0 +1,208 @@
+#src/AI/packed_positions.py
+"""
+Fixed-size packed positions.
+
+Every position is 32 bytes (the layout of the C++ Board.to_packed):
+
+    0-7    occupancy bitboard (little-endian)
+    8-23   one nibble per occupied square, A1 upwards, low nibble first:
+           color * 6 + piece type (0-5 white P..K, 6-11 black)
+    24     side to move (0 white, 1 black)
+    25     castling rights (1 white O-O, 2 white O-O-O, 4 black O-O, 8 black O-O-O)
+    26     en passant square, 64 if none
+    27     halfmove clock (saturates at 255)
+    28-29  fullmove number (little-endian)
+    30-31  reserved, zero
+
+A file of packed positions is just the records back to back, so it can be
+memory-mapped and handed to chess_engine (Board.from_packed, Evaluator.
+evaluate_batch) without copying or parsing FENs.
+"""
+
+import os
+import mmap
+
+import chess
+import numpy as np
+
+try:
+    import chess_engine
+except ImportError:
+    chess_engine = None
+
+PACKED_SIZE = 32
+NO_EP_SQUARE = 64
+
+# Castling rook square -> packed castling bit
+_CASTLING_BITS = ((chess.H1, 1), (chess.A1, 2), (chess.H8, 4), (chess.A8, 8))
+
+
+def pack_board(board):
+    """
+    32-byte encoding of a chess.Board or chess_engine.Board.
+
+    Raises:
+        ValueError: The position has more than 32 pieces
+    """
+    if not isinstance(board, chess.Board):
+        return board.to_packed()
+
+    occupied = board.occupied
+    if chess.popcount(occupied) > 32:
+        raise ValueError("Cannot pack a position with more than 32 pieces")
+
+    data = bytearray(PACKED_SIZE)
+    data[0:8] = occupied.to_bytes(8, 'little')
+
+    for index, square in enumerate(chess.scan_forward(occupied)):
+        piece = board.piece_at(square)
+        code = (0 if piece.color == chess.WHITE else 6) + piece.piece_type - 1
+        data[8 + index // 2] |= code << 4 if index & 1 else code
+
+    ep_square = board.ep_square if board.has_legal_en_passant() else None
+    data[24] = 0 if board.turn == chess.WHITE else 1
+    data[25] = sum(bit for square, bit in _CASTLING_BITS if board.castling_rights & chess.BB_SQUARES[square])
+    data[26] = NO_EP_SQUARE if ep_square is None else ep_square
+    data[27] = min(board.halfmove_clock, 255)
+    data[28:30] = (board.fullmove_number & 0xFFFF).to_bytes(2, 'little')
+    return bytes(data)
+
+
+def unpack_board(data, index=0):
+    """
+    chess.Board from packed bytes.
+
+    Args:
+        data: Any buffer holding one or more packed positions
+        index: Which position to read
+
+    Raises:
+        ValueError: Malformed record
+    """
+    record = memoryview(data).cast('B')[index * PACKED_SIZE:(index + 1) * PACKED_SIZE]
+    if len(record) != PACKED_SIZE:
+        raise ValueError("Packed position is truncated")
+
+    occupied = int.from_bytes(record[0:8], 'little')
+    if chess.popcount(occupied) > 32:
+        raise ValueError("Packed position has more than 32 pieces")
+
+    board = chess.Board(None)
+    for i, square in enumerate(chess.scan_forward(occupied)):
+        code = (record[8 + i // 2] >> (4 * (i & 1))) & 0xF
+        if code >= 12:
+            raise ValueError(f"Invalid piece code {code} in packed position")
+        board.set_piece_at(square, chess.Piece(code % 6 + 1, code < 6))
+
+    if record[24] > 1 or record[25] > 15 or record[26] > NO_EP_SQUARE:
+        raise ValueError("Invalid state bytes in packed position")
+
+    board.turn = record[24] == 0
+    board.castling_rights = 0
+    for square, bit in _CASTLING_BITS:
+        if record[25] & bit:
+            board.castling_rights |= chess.BB_SQUARES[square]
+    board.ep_square = None if record[26] == NO_EP_SQUARE else record[26]
+    board.halfmove_clock = record[27]
+    board.fullmove_number = int.from_bytes(record[28:30], 'little')
+    return board
+
+
+def write_packed(path, boards, append=False):
+    """
+    Write positions (chess.Board, chess_engine.Board or FEN strings) to a packed file.
+
+    Returns:
+        Number of positions written
+    """
+    count = 0
+    with open(path, 'ab' if append else 'wb') as f:
+        for board in boards:
+            if isinstance(board, str):
+                board = chess.Board(board)
+            f.write(pack_board(board))
+            count += 1
+    return count
+
+
+class PackedPositionFile:
+    """Read-only, memory-mapped file of packed positions."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+
+        size = os.fstat(self._file.fileno()).st_size
+        if size % PACKED_SIZE:
+            self._file.close()
+            raise ValueError(f"{path}: size is not a multiple of {PACKED_SIZE} bytes")
+
+        if size:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._data = np.frombuffer(self._mmap, dtype=np.uint8).reshape(-1, PACKED_SIZE)
+        else:
+            self._mmap = None
+            self._data = np.zeros((0, PACKED_SIZE), dtype=np.uint8)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __getitem__(self, index):
+        """Raw record(s): a (32,) or (n, 32) uint8 view into the mapping."""
+        return self._data[index]
+
+    @property
+    def array(self):
+        """All records as an (n, 32) uint8 view."""
+        return self._data
+
+    def board(self, index):
+        """Position as a chess.Board."""
+        return unpack_board(self._data[index])
+
+    def cpp_board(self, index, board=None):
+        """
+        Position as a chess_engine.Board, read in place from the mapping.
+
+        Args:
+            board: Board to load into (a new one if None)
+        """
+        if chess_engine is None:
+            raise RuntimeError("chess_engine is not available")
+        if board is None:
+            board = chess_engine.Board()
+        if not board.from_packed(self._data, index):
+            raise ValueError(f"Invalid packed position at index {index}")
+        return board
+
+    def boards(self, start=0, stop=None):
+        """Iterate chess.Board objects over a range of records."""
+        for index in range(start, len(self) if stop is None else min(stop, len(self))):
+            yield self.board(index)
+
+    def fens(self, start=0, stop=None):
+        """Iterate FENs over a range of records."""
+        for board in self.boards(start, stop):
+            yield board.fen()
+
+    def evaluate(self, start=0, stop=None, threads=1, detailed=False):
+        """
+        Native evaluation of a range of records (no copies, GIL released).
+
+        Returns:
+            int16 array, or a structured EvalBreakdown array if detailed
+        """
+        if chess_engine is None:
+            raise RuntimeError("chess_engine is not available")
+        records = self._data[start:stop]
+        if detailed:
+            return chess_engine.Evaluator.evaluate_detailed_batch(records, threads)
+        return chess_engine.Evaluator.evaluate_batch(records, threads)
+
+    def close(self):
+        """Release the mapping and the file (views handed out must be dropped first)."""
+        self._data = np.zeros((0, PACKED_SIZE), dtype=np.uint8)
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
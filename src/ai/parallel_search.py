@@ -0,0 +1,337 @@
+# src/ai/parallel_search.py
+"""
+Root-parallel v2.6 search on a long-lived pool of worker processes.
+
+The v2.6 search is pure Python and runs under the GIL, so ParallelSearch
+splits it across processes instead of threads:
+
+- The pool starts once (per ParallelSearch, normally once per session).
+  Every worker keeps its own EnhancedSearchInfo (TT, history, countermoves,
+  continuation and correction history) between searches, like
+  minimax_v2_6.SearchEngine, so later moves start warm.
+- Iterative deepening runs in the driver. At each depth the first root move
+  (best of the previous depth) is searched alone with a full window; the
+  other root moves are only handed out once it has a score ("young brothers
+  wait"), one task per move.
+- The best root score so far (alpha) lives in a small shared memory block.
+  A worker takes the current alpha when it starts a move and searches it
+  with a null window; only moves that beat alpha are searched again. An
+  exact score above alpha is published for the moves that start later. The
+  update is not locked: a lost update only leaves alpha lower (less
+  pruning), never wrong, because the driver picks the best move from the
+  exact scores the workers return.
+- The same block carries a stop flag that the workers poll in check_time,
+  so a time limit, a ponder miss or close() stops every worker at once.
+
+PV and statistics of the best move's worker are merged into the driver's
+result (pv, nodes, stats).
+"""
+
+import os
+import time
+import chess
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from multiprocessing import shared_memory
+
+from src.ai.minimax_optimized import INFINITY, see
+from src.ai.minimax_v2_6 import EnhancedSearchInfo, alpha_beta_enhanced
+from src.ai.evaluation_bitboard import evaluate_bitboard
+from src.ai.correction_history import CorrectionHistory
+from src.ai.transposition_table import TranspositionTable
+from src.ai.zobrist import HashedBoard
+from src.ai.time_manager import TimeManager
+
+# Control block (int64 words)
+_SEARCH_ID = 0
+_STOP = 1
+_ALPHA = 2
+_CONTROL_BYTES = 64
+NO_ALPHA = -(1 << 62)  # _ALPHA before any root move has an exact score
+
+POLL_INTERVAL = 0.01  # Seconds between time checks while waiting for workers
+
+# Statistics summed over the workers (EnhancedSearchInfo attribute names)
+STAT_NAMES = ('tt_hits', 'cut_nodes', 'lmp_cutoffs', 'razoring_cutoffs', 'multicut_cutoffs')
+
+
+# ============================================================================
+# WORKER PROCESS
+# ============================================================================
+
+class _WorkerSearchInfo(EnhancedSearchInfo):
+    """Search state of a worker: stops when the driver raises the stop flag."""
+
+    def __init__(self, control, tt):
+        super().__init__(tt=tt)
+        self.control = control
+
+    def check_time(self):
+        if self.nodes % 256 == 0 and self.control[_STOP]:
+            self.stopped = True
+        return self.stopped
+
+
+_control_shm = None
+_info = None
+_search_id = 0
+
+
+def _init_worker(control_name, tt_size_mb):
+    """Pool initializer: attach the control block and build the search state."""
+    global _control_shm, _info
+    _control_shm = shared_memory.SharedMemory(name=control_name)
+    _info = _WorkerSearchInfo(_control_shm.buf.cast('q'), TranspositionTable(tt_size_mb))
+    _info.correction_history = CorrectionHistory()
+
+
+def _warm_up(seconds):
+    """Keep one worker busy for a moment so every process of the pool starts."""
+    time.sleep(seconds)
+    return os.getpid()
+
+
+def _search_root_move(search_id, board, move, depth, alpha):
+    """
+    Search one root move in a worker.
+
+    Args:
+        board: Root position (chess.Board with its move stack)
+        alpha: Best root score known when the task was handed out (-INFINITY: full window)
+
+    Returns:
+        (move, score, exact, pv, nodes, stats) or None if stopped; score is an
+        upper bound unless exact
+    """
+    global _search_id
+    info = _info
+    if search_id != _search_id:
+        # New search: age the tables like iterative_deepening_v2_6 does between moves
+        info.apply_history_gravity()
+        info.continuation_history.apply_gravity()
+        info.correction_history.apply_gravity()
+        info.new_search()
+        _search_id = search_id
+    info.stopped = False
+    nodes_before = info.nodes
+    stats_before = [getattr(info, name) for name in STAT_NAMES]
+
+    board = HashedBoard.from_board(board)
+    info.prev_static_evals[0] = evaluate_bitboard(board)
+    shared_alpha = info.control[_ALPHA]
+    if shared_alpha != NO_ALPHA and shared_alpha > alpha:
+        alpha = shared_alpha
+
+    info.last_move = move
+    board.push(move)
+    if alpha > -INFINITY:
+        score = -alpha_beta_enhanced(board, depth - 1, -alpha - 1, -alpha, info, 1, True)
+        if score > alpha and not info.stopped:
+            score = -alpha_beta_enhanced(board, depth - 1, -INFINITY, -alpha, info, 1, True)
+        exact = score > alpha
+    else:
+        score = -alpha_beta_enhanced(board, depth - 1, -INFINITY, INFINITY, info, 1, True)
+        exact = True
+    board.pop()
+    info.last_move = None
+
+    if info.stopped:
+        return None
+
+    pv = [move]
+    if exact:
+        pv += [info.pv[1][i] for i in range(1, info.pv_length[1]) if info.pv[1][i] is not None]
+        if -INFINITY < score < INFINITY and score > info.control[_ALPHA]:
+            info.control[_ALPHA] = int(score)
+
+    stats = tuple(getattr(info, name) - before for name, before in zip(STAT_NAMES, stats_before))
+    return move, score, exact, pv, info.nodes - nodes_before, stats
+
+
+# ============================================================================
+# DRIVER
+# ============================================================================
+
+def _initial_order(board, moves):
+    """Winning captures, promotions and checks first (before depth 1 has scores)."""
+    def key(move):
+        score = 0
+        if board.is_capture(move):
+            score += 1000 + see(board, move)
+        if move.promotion:
+            score += 800
+        if board.gives_check(move):
+            score += 100
+        return score
+    return sorted(moves, key=key, reverse=True)
+
+
+class ParallelSearch:
+    """
+    Process-pool v2.6 search (opt-in; see AI_CONFIG['search_workers']).
+
+    Same entry points as minimax_v2_6.SearchEngine: search(),
+    get_best_move(), get_best_move_and_ponder().
+    """
+
+    def __init__(self, workers=None, tt_size_mb=64):
+        """
+        Start and warm up the worker pool.
+
+        Args:
+            workers: Worker processes (None: one per CPU)
+            tt_size_mb: TT size of each worker
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self._control_shm = shared_memory.SharedMemory(create=True, size=_CONTROL_BYTES)
+        self._control = self._control_shm.buf.cast('q')
+        for i in range(len(self._control)):
+            self._control[i] = 0
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                             initargs=(self._control_shm.name, tt_size_mb))
+        self._search_id = 0
+
+        # Result of the last search
+        self.pv = []
+        self.nodes = 0
+        self.stats = dict.fromkeys(STAT_NAMES, 0)
+
+        pids = [self._executor.submit(_warm_up, 0.05) for _ in range(self.workers)]
+        self.pids = {future.result() for future in pids}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Stop the workers and free the shared memory block."""
+        if self._executor is None:
+            return
+        self._control[_STOP] = 1
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._executor = None
+        self._control.release()
+        self._control_shm.close()
+        self._control_shm.unlink()
+
+    def stop(self):
+        """Stop the running search (it keeps the last completed depth)."""
+        self._control[_STOP] = 1
+
+    def search(self, board, depth=6, time_limit=5.0, time_manager=None):
+        """
+        Iterative deepening over the worker pool.
+
+        Args:
+            time_manager: TimeManager (None: fixed time_limit)
+
+        Returns:
+            (best move, expected reply or None)
+        """
+        if time_manager is None:
+            time_manager = TimeManager(move_time=time_limit)
+        time_manager.start()
+
+        self._search_id += 1
+        self._control[_SEARCH_ID] = self._search_id
+        self._control[_STOP] = 0
+        self.pv = []
+        self.nodes = 0
+        self.stats = dict.fromkeys(STAT_NAMES, 0)
+
+        # Plain chess.Board with the move stack (repetitions) for the workers
+        root = chess.Board(board.root().fen())
+        for move in board.move_stack:
+            root.push(move)
+        moves = _initial_order(root, list(root.legal_moves))
+        if not moves:
+            return None, None
+
+        print(f"Starting EURY v2.6 parallel search (workers={self.workers}, max_depth={depth}, "
+              f"time={time_manager})")
+        print("=" * 70)
+
+        best_move = moves[0]
+        best_score = 0
+        for current_depth in range(1, depth + 1):
+            results = self._search_depth(root, moves, current_depth, time_manager)
+            if results is None:
+                break
+
+            depth_nodes = sum(result[4] for result in results)
+            self.nodes += depth_nodes
+            for result in results:
+                for name, value in zip(STAT_NAMES, result[5]):
+                    self.stats[name] += value
+
+            # Best of the exact scores; the eldest brother always has one
+            best = max((result for result in results if result[2]), key=lambda result: result[1])
+            best_move, best_score, self.pv = best[0], best[1], best[3]
+
+            # Next depth: best move first, then by score (upper bounds for the others)
+            scores = {result[0]: result[1] for result in results}
+            moves.sort(key=lambda move: (move == best_move, scores[move]), reverse=True)
+
+            elapsed = time_manager.elapsed()
+            nps = int(self.nodes / elapsed) if elapsed > 0 else 0
+            pv_str = " ".join(move.uci() for move in self.pv[:5])
+            print(f"depth {current_depth} score cp {best_score} nodes {self.nodes} "
+                  f"nps {nps} time {int(elapsed*1000)} pv {pv_str}")
+
+            node_share = best[4] / depth_nodes if depth_nodes else 0.0
+            if time_manager.stop_after_iteration(current_depth, best_move, best_score, node_share):
+                break
+
+        print("=" * 70)
+        print(f"Best move: {best_move.uci()} ({best_score}cp) | Nodes: {self.nodes:,}")
+
+        reply = self.pv[1] if len(self.pv) > 1 and self.pv[0] == best_move else None
+        return best_move, reply
+
+    def _search_depth(self, root, moves, depth, time_manager):
+        """One depth over all root moves; None if stopped first."""
+        control = self._control
+        control[_ALPHA] = NO_ALPHA
+        submit = self._executor.submit
+
+        eldest = self._collect([submit(_search_root_move, self._search_id, root, moves[0], depth, -INFINITY)],
+                               time_manager)
+        if eldest is None:
+            return None
+        alpha = eldest[0][1]
+
+        brothers = self._collect([submit(_search_root_move, self._search_id, root, move, depth, alpha)
+                                  for move in moves[1:]], time_manager)
+        if brothers is None:
+            return None
+        return eldest + brothers
+
+    def _collect(self, futures, time_manager):
+        """Wait for the tasks; on a stop or the hard limit stop the workers and return None."""
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+            if self._control[_STOP] or time_manager.stop_requested or time_manager.hard_limit_reached():
+                self._control[_STOP] = 1
+                for future in pending:
+                    future.cancel()
+                wait(pending)
+                return None
+
+        results = [future.result() for future in futures]
+        if any(result is None for result in results):
+            return None
+        return results
+
+    def get_best_move_and_ponder(self, board, depth=6, time_limit=5.0, time_left=None, increment=0.0,
+                                 moves_to_go=0):
+        """Best move and expected reply; arguments as for minimax_v2_6.get_best_move."""
+        time_manager = None
+        if time_left is not None:
+            time_manager = TimeManager.from_clock(board, time_left, increment, moves_to_go, max_time=time_limit)
+        return self.search(board, depth, time_limit, time_manager)
+
+    def get_best_move(self, board, depth=6, time_limit=5.0, time_left=None, increment=0.0, moves_to_go=0):
+        """Best move; arguments as for minimax_v2_6.get_best_move."""
+        return self.get_best_move_and_ponder(board, depth, time_limit, time_left, increment, moves_to_go)[0]
@@ -0,0 +1,95 @@
+"""
+Perft (performance test) for the move generators.
+
+Counts the leaf nodes of the legal move tree of a python-chess board, so the
+numbers can be compared with the C++ engine (Board.perft / Board.divide) and
+with the published reference totals below.
+"""
+
+import chess
+
+
+# Standard perft positions with reference node counts per depth
+# (https://www.chessprogramming.org/Perft_Results)
+PERFT_POSITIONS = [
+    {
+        'name': 'start',
+        'fen': chess.STARTING_FEN,
+        'nodes': {1: 20, 2: 400, 3: 8902, 4: 197281, 5: 4865609, 6: 119060324},
+    },
+    {
+        'name': 'kiwipete',
+        'fen': 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+        'nodes': {1: 48, 2: 2039, 3: 97862, 4: 4085603, 5: 193690690},
+    },
+    {
+        'name': 'position3',
+        'fen': '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1',
+        'nodes': {1: 14, 2: 191, 3: 2812, 4: 43238, 5: 674624, 6: 11030083},
+    },
+    {
+        'name': 'position4',
+        'fen': 'r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1',
+        'nodes': {1: 6, 2: 264, 3: 9467, 4: 422333, 5: 15833292},
+    },
+    {
+        'name': 'position5',
+        'fen': 'rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8',
+        'nodes': {1: 44, 2: 1486, 3: 62379, 4: 2103487, 5: 89941194},
+    },
+    {
+        'name': 'position6',
+        'fen': 'r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10',
+        'nodes': {1: 46, 2: 2079, 3: 89890, 4: 3894594, 5: 164075551},
+    },
+]
+
+
+def perft(board, depth):
+    """
+    Count leaf nodes of the legal move tree.
+
+    Args:
+        board: chess.Board (restored on return)
+        depth: Depth in plies
+
+    Returns:
+        Number of leaf nodes
+    """
+    if depth <= 0:
+        return 1
+
+    # Bulk counting: the last ply is just the number of legal moves
+    if depth == 1:
+        return board.legal_moves.count()
+
+    nodes = 0
+    for move in board.legal_moves:
+        board.push(move)
+        nodes += perft(board, depth - 1)
+        board.pop()
+
+    return nodes
+
+
+def divide(board, depth):
+    """
+    Perft count below each root move.
+
+    Args:
+        board: chess.Board (restored on return)
+        depth: Depth in plies
+
+    Returns:
+        Dict {uci: nodes}
+    """
+    counts = {}
+    if depth <= 0:
+        return counts
+
+    for move in board.legal_moves:
+        board.push(move)
+        counts[move.uci()] = perft(board, depth - 1)
+        board.pop()
+
+    return counts
@@ -0,0 +1,233 @@
+# src/ai/shared_tt.py
+"""
+Lock-free transposition table in shared memory for multiprocess searches.
+
+The entries are a fixed NumPy structured array (SLOT_DTYPE) inside a
+multiprocessing.shared_memory block. Pickling a table sends only the block
+name, and worker processes attach to the same memory, so root-split or
+Lazy-SMP-style workers all read and write one table without copying it or
+taking a lock.
+
+Slot layout (three 64-bit words):
+    check   zobrist key ^ data ^ score bits
+    data    bits  0-15  best move (see transposition_table.pack_move)
+            bits 16-23  depth (clamped to 0-255)
+            bits 24-25  bound (EXACT / LOWER_BOUND / UPPER_BOUND)
+            bits 26-31  age (search generation)
+            bit  32     slot in use
+    score   float64 (float evaluations round-trip exactly)
+
+Writers store the words one by one without locking, so a slot can be read
+while another process is half-way through writing it. A reader only accepts
+a slot whose words XOR back to its own key ("lockless hashing"): torn writes
+and other positions' entries are misses. Buckets of two slots and the
+replacement scheme are those of TranspositionTable.
+
+The block starts with a 64-byte header (bucket count, age); the search age
+is shared, so new_search() in the owner ages the entries for every worker.
+"""
+
+import struct
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from src.ai.transposition_table import pack_move, unpack_move
+
+SLOT_DTYPE = np.dtype([('check', '<u8'), ('data', '<u8'), ('score', '<f8')])
+SLOT_WORDS = 3
+BUCKET_SIZE = 2
+AGE_MASK = 0x3F
+
+HEADER_BYTES = 64
+_HEADER_BUCKETS = 0  # Header word indexes
+_HEADER_AGE = 1
+
+_USED = 1 << 32
+_HASH_MASK = (1 << 64) - 1
+
+_DOUBLE = struct.Struct('<d')
+_WORD = struct.Struct('<Q')
+
+# Tables this process has attached to, by block name
+_attached = {}
+
+
+def _score_bits(score):
+    return _WORD.unpack(_DOUBLE.pack(score))[0]
+
+
+def _bits_score(bits):
+    return _DOUBLE.unpack(_WORD.pack(bits))[0]
+
+
+class SharedTranspositionTable:
+    """Transposition table in a shared memory block, shared by worker processes."""
+
+    EXACT = 0
+    LOWER_BOUND = 1
+    UPPER_BOUND = 2
+
+    def __init__(self, size_mb=64):
+        """Create a new zeroed table (this process owns and unlinks it)."""
+        num_buckets = max(1, (size_mb * 1024 * 1024) // (SLOT_DTYPE.itemsize * BUCKET_SIZE))
+        num_buckets = 1 << (num_buckets.bit_length() - 1)
+        size = HEADER_BYTES + num_buckets * BUCKET_SIZE * SLOT_DTYPE.itemsize
+
+        self._shm = shared_memory.SharedMemory(create=True, size=size)
+        self.owner = True
+        self._map(num_buckets)
+        self._header[_HEADER_BUCKETS] = num_buckets
+        self._header[_HEADER_AGE] = 0
+
+    @classmethod
+    def attach(cls, name):
+        """Table created by another process (cached per process)."""
+        table = _attached.get(name)
+        if table is None:
+            table = cls.__new__(cls)
+            table._shm = shared_memory.SharedMemory(name=name)
+            table.owner = False
+            header = np.ndarray((2,), dtype=np.uint64, buffer=table._shm.buf)
+            num_buckets = int(header[_HEADER_BUCKETS])
+            del header
+            table._map(num_buckets)
+            _attached[name] = table
+        return table
+
+    def _map(self, num_buckets):
+        self.num_buckets = num_buckets
+        self._mask = num_buckets - 1
+        self.hits = 0
+        self.misses = 0
+
+        buf = self._shm.buf
+        self._header = buf[:HEADER_BYTES].cast('Q')
+        self.slots = np.ndarray((num_buckets * BUCKET_SIZE,), dtype=SLOT_DTYPE, buffer=buf, offset=HEADER_BYTES)
+        # memoryviews give plain Python ints on scalar access (much faster than numpy scalars)
+        self._words = buf[HEADER_BYTES:HEADER_BYTES + self.slots.nbytes].cast('Q')
+
+    def __reduce__(self):
+        # Workers attach by name instead of receiving a copy
+        return SharedTranspositionTable.attach, (self.name,)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def name(self):
+        """Shared memory block name."""
+        return self._shm.name
+
+    @property
+    def capacity(self):
+        """Number of entry slots."""
+        return self.num_buckets * BUCKET_SIZE
+
+    @property
+    def current_age(self):
+        return self._header[_HEADER_AGE]
+
+    def close(self):
+        """Unmap the table; the owner also frees the shared memory block."""
+        if self._shm is None:
+            return
+        _attached.pop(self._shm.name, None)
+        self.slots = None
+        self._words.release()
+        self._header.release()
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
+        self._shm = None
+
+    def clear(self):
+        """Clear the table."""
+        self.slots.fill(0)
+        self._header[_HEADER_AGE] = 0
+        self.hits = 0
+        self.misses = 0
+
+    def new_search(self):
+        """Increment age for new search (seen by every process)."""
+        self._header[_HEADER_AGE] = (self._header[_HEADER_AGE] + 1) & AGE_MASK
+
+    def probe(self, zobrist_hash):
+        """
+        Probe transposition table.
+
+        Returns:
+            dict with depth, score, bound, best_move and age, or None
+        """
+        key = zobrist_hash & _HASH_MASK
+        words = self._words
+        base = (key & self._mask) * BUCKET_SIZE * SLOT_WORDS
+
+        for offset in (base, base + SLOT_WORDS):
+            data = words[offset + 1]
+            bits = words[offset + 2]
+            if data & _USED and words[offset] ^ data ^ bits == key:
+                self.hits += 1
+                return {
+                    'depth': (data >> 16) & 0xFF,
+                    'score': _bits_score(bits),
+                    'bound': (data >> 24) & 0x3,
+                    'best_move': unpack_move(data & 0xFFFF),
+                    'age': (data >> 26) & AGE_MASK,
+                }
+
+        self.misses += 1
+        return None
+
+    def store(self, zobrist_hash, depth, score, bound, best_move=None):
+        """Store position in transposition table."""
+        key = zobrist_hash & _HASH_MASK
+        words = self._words
+        first = (key & self._mask) * BUCKET_SIZE * SLOT_WORDS
+        second = first + SLOT_WORDS
+        age = self._header[_HEADER_AGE]
+
+        old = words[first + 1]
+        old_bits = words[first + 2]
+        if old & _USED and words[first] ^ old ^ old_bits == key:
+            slot = first
+        elif words[second + 1] & _USED and words[second] ^ words[second + 1] ^ words[second + 2] == key:
+            slot = second
+        else:
+            # Depth-preferred slot: take it if empty, stale or not deeper;
+            # its previous entry moves down to the always-replace slot
+            if (not old & _USED or ((old >> 26) & AGE_MASK) != age
+                    or depth >= ((old >> 16) & 0xFF)):
+                words[second + 2] = old_bits
+                words[second + 1] = old
+                words[second] = words[first]
+                slot = first
+            else:
+                slot = second
+
+        move = pack_move(best_move)
+        if not move and words[slot] ^ words[slot + 1] ^ words[slot + 2] == key:
+            move = words[slot + 1] & 0xFFFF  # Keep the old move for this position
+
+        depth = max(0, min(255, depth))
+        data = move | (depth << 16) | ((bound & 0x3) << 24) | (age << 26) | _USED
+        bits = _score_bits(float(score))
+
+        words[slot + 1] = data
+        words[slot + 2] = bits
+        words[slot] = key ^ data ^ bits
+
+    def get_stats(self):
+        """Get TT statistics (hits and misses of this process)."""
+        total = self.hits + self.misses
+        hit_rate = (self.hits / total * 100) if total > 0 else 0
+        return {
+            'size': int(np.count_nonzero(self.slots['data'])),
+            'capacity': self.capacity,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': hit_rate
+        }
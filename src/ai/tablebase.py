@@ -0,0 +1,185 @@
+#src/AI/tablebase.py
+"""
+Syzygy endgame tablebases.
+
+TablebaseService opens the tables from AI_CONFIG['syzygy_path'] once and is
+shared by the evaluators. Positions whose material signature has no table
+file are skipped without touching python-chess, and probe results (including
+"unknown") are kept in an LRU keyed by the Zobrist hash, so repeated
+endgame evaluations do not decode the same table blocks again.
+
+Boards may be chess.Board objects (including HashedBoard) or C++
+chess_engine.Board objects, which are converted through their FEN.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+import chess
+import chess.polyglot
+import chess.syzygy
+
+from src.utils.config import AI_CONFIG
+
+REPO_ROOT = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# Cache entry for a position that could not be probed
+_UNKNOWN = object()
+
+
+def _to_chess_board(board):
+    """chess.Board for a python-chess or C++ board."""
+    if isinstance(board, chess.Board):
+        return board
+    return chess.Board(board.to_fen())
+
+
+def _zobrist_key(board):
+    """Polyglot key, using the incremental key of a HashedBoard if present."""
+    if hasattr(board, 'zobrist_hash'):
+        return board.zobrist_hash()
+    return chess.polyglot.zobrist_hash(board)
+
+
+def resolve_syzygy_path(path=None):
+    """Absolute tablebase directory (relative paths are taken from the repo root)."""
+    if path is None:
+        path = AI_CONFIG.get('syzygy_path', 'syzygy')
+    path = path.replace('\\', os.sep)
+    if not os.path.isabs(path):
+        path = os.path.join(REPO_ROOT, path)
+    return os.path.normpath(path)
+
+
+class TablebaseService:
+    """Shared Syzygy prober with a material filter and an LRU of results."""
+
+    def __init__(self, path, cache_size=65536):
+        """
+        Args:
+            path: Directory with .rtbw/.rtbz files (a missing directory disables probing)
+            cache_size: Number of positions kept in each result cache
+        """
+        self.path = path
+        self.cache_size = cache_size
+        self._wdl_cache = OrderedDict()
+        self._dtz_cache = OrderedDict()
+        self._lock = threading.Lock()  # GUI AI thread and main thread may share the service
+        self.hits = 0
+        self.misses = 0
+        self.skipped = 0
+
+        # Material signatures with a table, e.g. "KBNvK" (both orientations are tried)
+        self.wdl_tables = set()
+        self.dtz_tables = set()
+        if os.path.isdir(path):
+            for name in os.listdir(path):
+                stem, ext = os.path.splitext(name)
+                if ext == '.rtbw':
+                    self.wdl_tables.add(stem)
+                elif ext == '.rtbz':
+                    self.dtz_tables.add(stem)
+
+        self.max_pieces = max((len(name) - 1 for name in self.wdl_tables), default=0)
+        self._tablebase = None
+
+    def _open(self):
+        if self._tablebase is None:
+            self._tablebase = chess.syzygy.open_tablebase(self.path)
+        return self._tablebase
+
+    def available(self, board, tables=None):
+        """True if the position's own table exists and the position can be probed."""
+        tables = self.wdl_tables if tables is None else tables
+        if chess.popcount(board.occupied) > self.max_pieces or board.castling_rights:
+            return False
+        return (chess.syzygy.calc_key(board) in tables or
+                chess.syzygy.calc_key(board, mirror=True) in tables)
+
+    def _probe(self, board, cache, tables, probe):
+        board = _to_chess_board(board)
+        if not self.available(board, tables):
+            self.skipped += 1
+            return None
+
+        key = _zobrist_key(board)
+        with self._lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+                self.hits += 1
+                return None if value is _UNKNOWN else value
+
+            self.misses += 1
+            try:
+                value = probe(self._open(), board)
+            except (chess.syzygy.MissingTableError, KeyError):
+                # A capture or promotion leads into a table we do not have
+                value = _UNKNOWN
+
+            cache[key] = value
+            if len(cache) > self.cache_size:
+                cache.popitem(last=False)
+            return None if value is _UNKNOWN else value
+
+    def probe_wdl(self, board):
+        """
+        Win/draw/loss for the side to move.
+
+        Returns:
+            -2 loss, -1 blessed loss, 0 draw, 1 cursed win, 2 win, or None if unknown
+        """
+        return self._probe(board, self._wdl_cache, self.wdl_tables,
+                           lambda tablebase, b: tablebase.probe_wdl(b))
+
+    def probe_dtz(self, board):
+        """Distance to zeroing in plies (signed from the side to move), or None if unknown."""
+        return self._probe(board, self._dtz_cache, self.dtz_tables,
+                           lambda tablebase, b: tablebase.probe_dtz(b))
+
+    def get_stats(self):
+        """Cache statistics."""
+        total = self.hits + self.misses
+        return {
+            'tables': len(self.wdl_tables),
+            'max_pieces': self.max_pieces,
+            'cached': len(self._wdl_cache) + len(self._dtz_cache),
+            'hits': self.hits,
+            'misses': self.misses,
+            'skipped': self.skipped,
+            'hit_rate': (self.hits / total * 100) if total > 0 else 0
+        }
+
+    def clear_cache(self):
+        with self._lock:
+            self._wdl_cache.clear()
+            self._dtz_cache.clear()
+
+    def close(self):
+        """Close the tables and drop cached results."""
+        with self._lock:
+            if self._tablebase is not None:
+                self._tablebase.close()
+                self._tablebase = None
+            self._wdl_cache.clear()
+            self._dtz_cache.clear()
+
+
+_default_service = None
+
+
+def get_tablebase_service():
+    """
+    Shared service over AI_CONFIG['syzygy_path'] (created on first use).
+
+    Returns:
+        TablebaseService, or None if tablebases are disabled in the config
+    """
+    global _default_service
+    if not AI_CONFIG.get('use_endgame_tb', True):
+        return None
+    if _default_service is None:
+        _default_service = TablebaseService(resolve_syzygy_path(),
+                                            AI_CONFIG.get('tb_cache_size', 65536))
+    return _default_service
@@ -0,0 +1,171 @@
+#src/AI/time_manager.py
+"""
+Time allocation for clock-based games.
+
+Mirrors the C++ TimeManager (timeman.h), in seconds:
+
+- The remaining time, increment and moves to go give an optimum budget
+  (where a search normally ends) and a maximum (hard stop inside a depth).
+- After each completed depth the optimum is scaled: longer when the root
+  score drops or fails low, or the best move keeps changing; shorter when
+  the best move has been stable for several depths or one root move takes
+  nearly all of the nodes.
+- A depth is not started when it is unlikely to finish within the budget.
+
+Without a clock (a fixed time per move) the optimum and maximum are that
+time, and the search stops after a depth once 80% of it is used, like the
+earlier Python search loops.
+
+While pondering there is no time limit; ponderhit() starts the hard limit
+from that moment and counts the ponder time toward the optimum.
+"""
+
+import time
+
+import chess
+
+DEFAULT_MOVE_OVERHEAD = 0.03  # Seconds kept back per move for GUI lag
+
+# Sudden death: moves assumed to remain (fewer as the game goes on)
+MAX_MOVES_TO_GO = 50
+MIN_MOVES_TO_GO = 20
+
+
+def game_ply(board):
+    """Half-moves played before the position (from the fullmove number)."""
+    return 2 * (board.fullmove_number - 1) + (0 if board.turn == chess.WHITE else 1)
+
+
+class TimeManager:
+    """Optimum/maximum budgets for one move plus per-depth stop decisions."""
+
+    def __init__(self, time_left=None, increment=0.0, moves_to_go=0, move_time=None,
+                 game_ply=0, max_time=None, move_overhead=DEFAULT_MOVE_OVERHEAD, ponder=False):
+        """
+        Args:
+            time_left: Seconds on the side to move's clock (None = no clock)
+            increment: Seconds added per move
+            moves_to_go: Moves to the next time control (0 = sudden death)
+            move_time: Fixed seconds for this move (used when there is no clock)
+            game_ply: Half-moves played, see game_ply()
+            max_time: Never budget more than this per move (e.g. a difficulty level)
+            move_overhead: Seconds kept back per move
+            ponder: No time limit until ponderhit()
+        """
+        self.managed = time_left is not None
+        self.pondering = ponder
+        self.stop_requested = False
+        self.start_time = time.time()
+
+        if self.managed:
+            if moves_to_go > 0:
+                mtg = min(moves_to_go, MAX_MOVES_TO_GO)
+            else:
+                mtg = max(MIN_MOVES_TO_GO, MAX_MOVES_TO_GO - game_ply // 4)
+            safe_time = max(0.001, time_left - move_overhead)
+
+            # Even share of the time until the next control, increments included
+            share = (safe_time + max(0.0, increment) * (mtg - 1)) / mtg
+
+            # Never more than a fraction of the clock on one move (nearly all of it on the last)
+            cap = safe_time * (0.9 if mtg == 1 else 0.4)
+            self.maximum = max(0.001, min(share * 5, cap))
+            self.optimum = max(0.001, min(share, self.maximum))
+        else:
+            self.optimum = self.maximum = move_time if move_time else float('inf')
+
+        if max_time is not None:
+            self.maximum = min(self.maximum, max_time)
+            self.optimum = min(self.optimum, self.maximum)
+
+        # Iteration history
+        self.last_best_move = None
+        self.last_score = 0
+        self.stable_iterations = 0
+        self.instability = 0.0
+        self.fail_lows = 0
+
+    @classmethod
+    def from_clock(cls, board, time_left, increment=0.0, moves_to_go=0, max_time=None, ponder=False):
+        """Budgets for the side to move of board."""
+        return cls(time_left=time_left, increment=increment, moves_to_go=moves_to_go,
+                   game_ply=game_ply(board), max_time=max_time, ponder=ponder)
+
+    def start(self):
+        """Start the clock for this move."""
+        self.start_time = time.time()
+
+    def elapsed(self):
+        return time.time() - self.start_time
+
+    def stop(self):
+        """Stop the search at once (it keeps the last completed depth)."""
+        self.stop_requested = True
+
+    def hard_limit_reached(self):
+        """True once the maximum is used up (never while pondering)."""
+        return not self.pondering and self.elapsed() >= self.maximum
+
+    def ponderhit(self):
+        """
+        The pondered move was played: the hard limit runs from now and the ponder
+        time counts toward the optimum.
+        
+        Returns:
+            True if the ponder time already covers the optimum (stop at once)
+        """
+        elapsed = self.elapsed()
+        done = elapsed >= self.optimum
+        self.maximum = elapsed if done else self.maximum + elapsed
+        self.pondering = False
+        return done
+
+    def note_fail_low(self):
+        """Root aspiration search failed low during the current depth."""
+        self.fail_lows += 1
+
+    def stop_after_iteration(self, depth, best_move, score, best_move_node_share=0.0):
+        """
+        Feed a completed depth.
+
+        Args:
+            best_move_node_share: Fraction of the depth's nodes spent on best_move
+
+        Returns:
+            True if no further depth should be started
+        """
+        elapsed = self.elapsed()
+        if not self.managed:
+            return not self.pondering and elapsed > self.optimum * 0.8
+
+        first = self.last_best_move is None
+        changed = not first and best_move != self.last_best_move
+
+        # Best move instability: recent changes count more than old ones
+        self.instability = self.instability * 0.5 + (1.0 if changed else 0.0)
+        self.stable_iterations = 0 if changed or first else self.stable_iterations + 1
+        scale = 1.0 + self.instability
+
+        # Root fail-low: give a dropping score time to find a better move
+        if not first and score < self.last_score:
+            scale *= 1.0 + min(1.0, (self.last_score - score) / 100.0)
+        if self.fail_lows:
+            scale *= 1.0 + min(0.5, 0.25 * self.fail_lows)
+            self.fail_lows = 0
+
+        # Same best move for several depths, or one move takes nearly all the nodes
+        if self.stable_iterations >= 3:
+            scale *= 0.7
+        if depth >= 6 and best_move_node_share > 0.9:
+            scale *= 0.5
+
+        self.last_best_move = best_move
+        self.last_score = score
+
+        budget = min(self.maximum, self.optimum * scale)
+
+        # The next depth usually costs more than all earlier ones together
+        return not self.pondering and elapsed >= budget * 0.6
+
+    def __repr__(self):
+        return f"<TimeManager optimum={self.optimum:.3f}s maximum={self.maximum:.3f}s>"
@@ -0,0 +1,225 @@
+# src/ai/transposition_table.py
+"""
+Fixed-capacity transposition table shared by the Python searches.
+
+Entries live in two preallocated 64-bit arrays (hash keys and packed data),
+so memory stays at size_mb however long the session runs and no Python
+object is kept alive per entry.
+
+Data word layout:
+    bits  0-15  best move (from | to << 6 | promotion << 12, 0 = none)
+    bits 16-47  score (32-bit, biased)
+    bits 48-55  depth (clamped to 0-255)
+    bits 56-57  bound (EXACT / LOWER_BOUND / UPPER_BOUND)
+    bits 58-63  age (search generation)
+
+Slots are grouped in buckets of two: the first keeps the deepest entry of
+the current search, the second is always replaced.
+
+save() writes a raw dump: a 32-byte little-endian header (magic, bucket
+count, bucket size, age), then the key array, then the data array (native
+byte order). load() maps the arrays back copy-on-write, so a large table is ready
+at once and only the pages a search touches are read from disk.
+"""
+
+import os
+import struct
+
+import chess
+import numpy as np
+
+SLOT_BYTES = 16       # key + data word
+BUCKET_SIZE = 2
+AGE_MASK = 0x3F
+
+SCORE_BIAS = 1 << 31
+SCORE_LIMIT = (1 << 31) - 1  # Larger scores (e.g. -inf) are clamped
+
+_HASH_MASK = (1 << 64) - 1
+
+FILE_MAGIC = b'EURYPTT1'
+_FILE_HEADER = struct.Struct('<8sQII8x')  # magic, num_buckets, bucket size, age
+
+
+def pack_move(move):
+    """Pack a chess.Move into 16 bits (0 for None)."""
+    if move is None:
+        return 0
+    return move.from_square | (move.to_square << 6) | ((move.promotion or 0) << 12)
+
+
+def unpack_move(packed):
+    """Inverse of pack_move."""
+    if not packed:
+        return None
+    return chess.Move(packed & 0x3F, (packed >> 6) & 0x3F, (packed >> 12) or None)
+
+
+class TranspositionTable:
+    """Array-backed transposition table with depth/age replacement."""
+
+    EXACT = 0
+    LOWER_BOUND = 1
+    UPPER_BOUND = 2
+
+    def __init__(self, size_mb=256):
+        self.size_mb = size_mb
+
+        # Power-of-two bucket count so the index is a mask
+        num_buckets = max(1, (size_mb * 1024 * 1024) // (SLOT_BYTES * BUCKET_SIZE))
+        self.num_buckets = 1 << (num_buckets.bit_length() - 1)
+        self._mask = self.num_buckets - 1
+
+        self.current_age = 0
+        self.hits = 0
+        self.misses = 0
+        self._allocate()
+
+    def _allocate(self):
+        """Allocate zeroed arrays (pages are only committed once written)."""
+        capacity = self.num_buckets * BUCKET_SIZE
+        self.keys = np.zeros(capacity, dtype=np.uint64)
+        self.data = np.zeros(capacity, dtype=np.uint64)
+        # memoryviews give plain Python ints on scalar access (much faster than numpy scalars)
+        self._keys = memoryview(self.keys)
+        self._data = memoryview(self.data)
+
+    @property
+    def capacity(self):
+        """Number of entry slots."""
+        return self.num_buckets * BUCKET_SIZE
+
+    def clear(self):
+        """Clear the table."""
+        self._allocate()
+        self.current_age = 0
+        self.hits = 0
+        self.misses = 0
+
+    def new_search(self):
+        """Increment age for new search."""
+        self.current_age = (self.current_age + 1) & AGE_MASK
+
+    def probe(self, zobrist_hash):
+        """
+        Probe transposition table.
+
+        Returns:
+            dict with depth, score, bound, best_move and age, or None
+        """
+        key = zobrist_hash & _HASH_MASK
+        index = (key & self._mask) * BUCKET_SIZE
+        keys = self._keys
+
+        if keys[index] == key:
+            packed = self._data[index]
+        elif keys[index + 1] == key:
+            packed = self._data[index + 1]
+        else:
+            self.misses += 1
+            return None
+
+        if not packed:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return {
+            'depth': (packed >> 48) & 0xFF,
+            'score': ((packed >> 16) & 0xFFFFFFFF) - SCORE_BIAS,
+            'bound': (packed >> 56) & 0x3,
+            'best_move': unpack_move(packed & 0xFFFF),
+            'age': packed >> 58,
+        }
+
+    def store(self, zobrist_hash, depth, score, bound, best_move=None):
+        """Store position in transposition table."""
+        key = zobrist_hash & _HASH_MASK
+        index = (key & self._mask) * BUCKET_SIZE
+        keys = self._keys
+        data = self._data
+
+        if keys[index] == key:
+            slot = index
+        elif keys[index + 1] == key:
+            slot = index + 1
+        else:
+            # Depth-preferred slot: take it if empty, stale or not deeper;
+            # its previous entry moves down to the always-replace slot
+            old = data[index]
+            if (not old or (old >> 58) != self.current_age
+                    or depth >= ((old >> 48) & 0xFF)):
+                keys[index + 1] = keys[index]
+                data[index + 1] = old
+                slot = index
+            else:
+                slot = index + 1
+
+        move = pack_move(best_move)
+        if not move and keys[slot] == key:
+            move = data[slot] & 0xFFFF  # Keep the old move for this position
+
+        score = int(max(-SCORE_LIMIT, min(SCORE_LIMIT, score)))
+        depth = max(0, min(255, depth))
+
+        keys[slot] = key
+        data[slot] = (move
+                      | ((score + SCORE_BIAS) << 16)
+                      | (depth << 48)
+                      | ((bound & 0x3) << 56)
+                      | (self.current_age << 58))
+
+    def save(self, path):
+        """Write the table to a raw binary file (see module docstring)."""
+        with open(path, 'wb') as f:
+            f.write(_FILE_HEADER.pack(FILE_MAGIC, self.num_buckets, BUCKET_SIZE, self.current_age))
+            self.keys.tofile(f)
+            self.data.tofile(f)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Table memory-mapped from a file written by save().
+
+        Writes go to private copies of the pages; the file is never modified.
+
+        Raises:
+            ValueError: Not a table file, or truncated
+        """
+        with open(path, 'rb') as f:
+            header = f.read(_FILE_HEADER.size)
+        if len(header) != _FILE_HEADER.size:
+            raise ValueError(f"{path}: not a transposition table file")
+        magic, num_buckets, bucket_size, age = _FILE_HEADER.unpack(header)
+        if magic != FILE_MAGIC or bucket_size != BUCKET_SIZE or num_buckets & (num_buckets - 1):
+            raise ValueError(f"{path}: not a transposition table file")
+
+        capacity = num_buckets * BUCKET_SIZE
+        if os.path.getsize(path) != _FILE_HEADER.size + 2 * capacity * 8:
+            raise ValueError(f"{path}: transposition table file is truncated")
+
+        table = cls.__new__(cls)
+        table.size_mb = max(1, num_buckets * BUCKET_SIZE * SLOT_BYTES // (1024 * 1024))
+        table.num_buckets = num_buckets
+        table._mask = num_buckets - 1
+        table.current_age = age & AGE_MASK
+        table.hits = 0
+        table.misses = 0
+        table.keys = np.memmap(path, dtype=np.uint64, mode='c', offset=_FILE_HEADER.size, shape=(capacity,))
+        table.data = np.memmap(path, dtype=np.uint64, mode='c', offset=_FILE_HEADER.size + capacity * 8,
+                               shape=(capacity,))
+        table._keys = memoryview(table.keys)
+        table._data = memoryview(table.data)
+        return table
+
+    def get_stats(self):
+        """Get TT statistics."""
+        total = self.hits + self.misses
+        hit_rate = (self.hits / total * 100) if total > 0 else 0
+        return {
+            'size': int(np.count_nonzero(self.data)),
+            'capacity': self.capacity,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': hit_rate
+        }
@@ -0,0 +1,199 @@
+# src/ai/zobrist.py
+"""
+Incremental Zobrist hashing for the Python search engines.
+
+HashedBoard is a chess.Board whose polyglot Zobrist key (identical to
+chess.polyglot.zobrist_hash) is derived from the previous position's key
+instead of rescanning all 64 squares.
+
+The piece-placement part of the key is cached per ply, tagged with the
+python-chess board state that push() saved for that ply. It is updated
+from the bitboards that changed between the position before and after
+the move, so captures, castling, en passant and promotions need no
+special cases. The update runs lazily, on the first zobrist_hash() call
+at a ply. push/pop are not overridden: python-chess pushes and pops
+moves internally (gives_check, repetition claims, ...), and those probes
+cost nothing extra. Castling, en passant and side to move are cheap and
+are hashed from the current position.
+
+Methods that reset the position (set_fen, reset, set_piece_at, ...) go
+through clear_stack(), which recomputes the key from scratch.
+
+The cache reads python-chess internals (Board._stack and its _BoardState
+bitboards), so python-chess is pinned to the tested 1.11 series
+(requirements.txt, setup.py). INCREMENTAL records an import-time check of
+those internals against chess.polyglot; if it fails, zobrist_hash() hashes
+the full board instead of returning wrong keys.
+"""
+
+import chess
+import chess.polyglot
+
+_RANDOM = chess.polyglot.POLYGLOT_RANDOM_ARRAY
+
+# PIECE_KEYS[color][piece_type][square] (polyglot: black = 0, white = 1)
+PIECE_KEYS = [
+    [[0] * 64] + [[_RANDOM[64 * ((pt - 1) * 2 + color) + sq] for sq in chess.SQUARES]
+                  for pt in chess.PIECE_TYPES]
+    for color in (chess.BLACK, chess.WHITE)
+]
+CASTLING_KEYS = _RANDOM[768:772]   # White K, white Q, black K, black Q
+EN_PASSANT_KEYS = _RANDOM[772:780]  # [file]
+TURN_KEY = _RANDOM[780]             # Hashed in when white is to move
+
+# (color, piece_type) in the order of _piece_bitboards()
+_PIECE_ORDER = [(color, pt) for color in (chess.WHITE, chess.BLACK) for pt in chess.PIECE_TYPES]
+
+_hasher = chess.polyglot.ZobristHasher(_RANDOM)
+
+
+def _piece_bitboards(pos, white, black):
+    """Bitboard per (color, piece type) of a board or board state."""
+    return (pos.pawns & white, pos.knights & white, pos.bishops & white,
+            pos.rooks & white, pos.queens & white, pos.kings & white,
+            pos.pawns & black, pos.knights & black, pos.bishops & black,
+            pos.rooks & black, pos.queens & black, pos.kings & black)
+
+
+def _castling_key(castling_rights):
+    """Castling part of the key for standard chess rights."""
+    key = 0
+    if castling_rights & chess.BB_H1:
+        key ^= CASTLING_KEYS[0]
+    if castling_rights & chess.BB_A1:
+        key ^= CASTLING_KEYS[1]
+    if castling_rights & chess.BB_H8:
+        key ^= CASTLING_KEYS[2]
+    if castling_rights & chess.BB_A8:
+        key ^= CASTLING_KEYS[3]
+    return key
+
+
+class HashedBoard(chess.Board):
+    """chess.Board with an incrementally updated polyglot Zobrist key."""
+
+    @classmethod
+    def from_board(cls, board):
+        """HashedBoard with the same position and move stack as board."""
+        hashed = cls(board.root().fen(), chess960=board.chess960)
+        for move in board.move_stack:
+            hashed.push(move)
+        return hashed
+
+    def zobrist_hash(self):
+        """Current polyglot Zobrist key."""
+        if self.chess960 or not INCREMENTAL:
+            return _hasher(self)
+
+        key = self._placement_key()
+        key ^= _castling_key(self.castling_rights)
+        if self.ep_square:
+            key ^= self._ep_key()
+        if self.turn == chess.WHITE:
+            key ^= TURN_KEY
+        return key
+
+    def clear_stack(self):
+        super().clear_stack()
+        self._rehash()
+
+    def copy(self, *, stack=True):
+        board = super().copy(stack=stack)
+        if not INCREMENTAL:
+            return board
+        first = len(self._stack) - len(board._stack)
+        ply = len(self._stack)
+        self._placement_key()
+        board._piece_keys = [(None, self._piece_keys[first][1])] + self._piece_keys[first + 1:ply + 1]
+        return board
+
+    def root(self):
+        board = super().root()
+        board._rehash()
+        return board
+
+    def _rehash(self):
+        """Recompute the piece-placement key from scratch (drops the cache)."""
+        self._piece_keys = [(None, _hasher.hash_board(self))]
+
+    def _placement_key(self):
+        """Piece-placement key of the current position.
+
+        _piece_keys[ply] is (state, key), where state is the _stack entry
+        saved by the push that led to this ply (a new object on every push).
+        """
+        stack = self._stack
+        keys = self._piece_keys
+        ply = len(stack)
+
+        # Walk back to the last ply hashed on this line of play
+        known = ply
+        while known > 0 and (known >= len(keys) or keys[known][0] is not stack[known - 1]):
+            known -= 1
+
+        # Replay the bitboard deltas from there
+        key = keys[known][1]
+        for i in range(known + 1, ply + 1):
+            key ^= self._placement_delta(i)
+            entry = (stack[i - 1], key)
+            if i < len(keys):
+                keys[i] = entry
+            else:
+                keys.append(entry)
+
+        return key
+
+    def _placement_delta(self, ply):
+        """XOR of piece keys that differ between plies ply - 1 and ply."""
+        stack = self._stack
+        before = stack[ply - 1]
+        after = stack[ply] if ply < len(stack) else None
+
+        old = _piece_bitboards(before, before.occupied_w, before.occupied_b)
+        if after is None:
+            new = _piece_bitboards(self, self.occupied_co[chess.WHITE], self.occupied_co[chess.BLACK])
+        else:
+            new = _piece_bitboards(after, after.occupied_w, after.occupied_b)
+
+        delta = 0
+        for index, (old_bb, new_bb) in enumerate(zip(old, new)):
+            changed = old_bb ^ new_bb
+            if changed:
+                color, piece_type = _PIECE_ORDER[index]
+                piece_keys = PIECE_KEYS[color][piece_type]
+                for square in chess.scan_forward(changed):
+                    delta ^= piece_keys[square]
+        return delta
+
+    def _ep_key(self):
+        """En passant file key, only if a pawn could capture (polyglot rule)."""
+        ep_square = self.ep_square
+
+        if self.turn == chess.WHITE:
+            ep_mask = chess.shift_down(chess.BB_SQUARES[ep_square])
+        else:
+            ep_mask = chess.shift_up(chess.BB_SQUARES[ep_square])
+        ep_mask = chess.shift_left(ep_mask) | chess.shift_right(ep_mask)
+
+        if ep_mask & self.pawns & self.occupied_co[self.turn]:
+            return EN_PASSANT_KEYS[chess.square_file(ep_square)]
+        return 0
+
+
+def _check_internals():
+    """True if the per-ply cache gives chess.polyglot's keys with this python-chess."""
+    try:
+        board = HashedBoard()
+        for uci in ("e2e4", "d7d5", "e4d5", "g8f6", "f1b5", "c7c6", "d5c6", "d8d2", "b1d2", "e7e5"):
+            board.push_uci(uci)
+            if board._placement_key() != _hasher.hash_board(board):
+                return False
+        board.pop()
+        board.pop()
+        return board._placement_key() == _hasher.hash_board(board)
+    except (AttributeError, IndexError, TypeError):
+        return False
+
+
+# False: python-chess internals changed, zobrist_hash() falls back to a full hash
+INCREMENTAL = _check_internals()
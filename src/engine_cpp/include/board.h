@@ -23,9 +23,22 @@ struct BoardState
     Square enPassantSquare;
     uint16_t halfMoveClock;
     uint64_t hash;
+    uint64_t pawnKey;
     PieceType capturedPiece;
 };
 
+// Packed position: fixed 32 bytes, little-endian
+//   0-7    occupancy bitboard
+//   8-23   one nibble per occupied square, A1 upwards (low nibble first):
+//          color * 6 + piece type (0-5 white P..K, 6-11 black)
+//   24     side to move (0 white, 1 black)
+//   25     castling rights (CastlingRights bits)
+//   26     en passant square, 64 if none or no legal en passant capture
+//   27     halfmove clock (saturates at 255)
+//   28-29  fullmove number
+//   30-31  reserved, zero
+constexpr size_t PACKED_BOARD_SIZE = 32;
+
 class Board
 {
 private:
@@ -44,6 +57,13 @@ private:
     uint16_t halfMoveClock;
     uint32_t fullMoveNumber;
     uint64_t hash;
+    uint64_t pawnKey; // Zobrist key of the pawns only (pawn hash table)
+
+    // Running material/PST sums and game phase (see Evaluator::initTables)
+    int materialScore;
+    int psqMg;
+    int psqEg;
+    int phase;
 
     // History for unmake
     std::vector<BoardState> history;
@@ -53,6 +73,8 @@ private:
     void putPiece(Color c, PieceType pt, Square sq);
     void movePiece(Color c, PieceType pt, Square from, Square to);
     void updateHash(Square sq, Color c, PieceType pt);
+    void resetBoard();
+    void computeKeys();
 
 public:
     Board();
@@ -62,6 +84,12 @@ public:
     bool fromFEN(const std::string &fen);
     std::string toFEN() const;
 
+    // Packed 32-byte encoding (see PACKED_BOARD_SIZE). More than 32 pieces
+    // cannot be packed (toPacked returns false); fromPacked rejects
+    // malformed data and leaves the board unspecified.
+    bool toPacked(uint8_t *out) const;
+    bool fromPacked(const uint8_t *data);
+
     // Move operations
     void makeMove(const Move &move);
     void unmakeMove(const Move &move);
@@ -83,6 +111,16 @@ public:
     uint16_t getHalfMoveClock() const { return halfMoveClock; }
     uint32_t getFullMoveNumber() const { return fullMoveNumber; }
     uint64_t getHash() const { return hash; }
+    uint64_t getPawnKey() const { return pawnKey; }
+
+    // Key in the standard Polyglot scheme (opening books), computed from scratch
+    uint64_t getPolyglotKey() const;
+
+    // Incremental evaluation terms (white's point of view)
+    int getMaterialScore() const { return materialScore; }
+    int getPsqMg() const { return psqMg; }
+    int getPsqEg() const { return psqEg; }
+    int getPhase() const { return phase; }
 
     // Game state checks
     bool isCheck() const;
@@ -3,6 +3,9 @@
 
 #include "types.h"
 #include "board.h"
+#include "pawnhash.h"
+#include <string>
+#include <vector>
 
 class Evaluator
 {
@@ -22,17 +25,45 @@ public:
         Score total;
     };
 
-    // Main evaluation function
-    static Score evaluate(const Board &board);
+    // Main evaluation function (pawn structure cached in pawnTable if given)
+    static Score evaluate(const Board &board, PawnHashTable *pawnTable = nullptr);
 
     // Debug: Detailed evaluation
-    static EvalBreakdown evaluateDetailed(const Board &board);
+    static EvalBreakdown evaluateDetailed(const Board &board, PawnHashTable *pawnTable = nullptr);
+
+    // Batch evaluation for offline work (tuning, position labelling).
+    // Positions are split over `threads` workers (0 = all cores), each with
+    // its own pawn hash table. scores and details may be null; otherwise
+    // they hold one entry per position.
+    static void evaluateBatch(const std::vector<const Board *> &boards, Score *scores,
+                              EvalBreakdown *details, int threads = 1);
+
+    // Same for FENs, parsed by the workers. Invalid FENs score 0;
+    // returns the index of the first one, or -1 if all parsed.
+    static long long evaluateBatch(const std::vector<std::string> &fens, Score *scores,
+                                   EvalBreakdown *details, int threads = 1);
+
+    // Same for `count` consecutive packed positions (PACKED_BOARD_SIZE bytes each)
+    static long long evaluateBatch(const uint8_t *packed, size_t count, Score *scores,
+                                   EvalBreakdown *details, int threads = 1);
+
+    // Incremental material/PST tables, summed by Board as pieces move.
+    // Values are signed from white's point of view (black already negated).
+    static void initTables();
+    static int materialTable[2][7];  // [color][piece]
+    static int psqtMg[2][7][64];     // [color][piece][square]
+    static int psqtEg[2][7][64];     // [color][piece][square]
+    static constexpr int PHASE_WEIGHT[7] = {0, 1, 1, 2, 4, 0, 0};
+
+    // Debug: check Board's running sums against a full recompute
+    static bool verifyIncremental(const Board &board);
 
 private:
     // Component evaluations
     static Score evaluateMaterial(const Board &board);
     static Score evaluatePosition(const Board &board);
-    static Score evaluatePawnStructure(const Board &board);
+    static Score evaluatePawnStructure(const Board &board, PawnHashTable *pawnTable = nullptr);
+    static void computePawnEntry(const Board &board, PawnEntry &entry);
     static Score evaluateKingSafety(const Board &board);
     static Score evaluateMobility(const Board &board);
     static Score evaluateThreats(const Board &board);
@@ -181,8 +212,8 @@ private:
         -30, -30, 0, 0, 0, 0, -30, -30,
         -50, -30, -30, -30, -30, -30, -30, -50};
 
-    // Helper: Get PST value for a piece
-    static Score getPSTValue(PieceType pt, Square sq, Color c, int phase);
+    // Helper: Get the PST pair for a piece type
+    static void getPSTTables(PieceType pt, const Score *&mg, const Score *&eg);
     static Square flipSquare(Square sq) { return Square(sq ^ 56); }
 };
 
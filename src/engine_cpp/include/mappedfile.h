@@ -0,0 +1,36 @@
+#ifndef MAPPEDFILE_H
+#define MAPPEDFILE_H
+
+#include <cstddef>
+#include <cstdint>
+#include <string>
+
+// Read-only memory-mapped file (POSIX mmap / Windows file mapping)
+class MappedFile
+{
+private:
+    const uint8_t *data;
+    size_t bytes;
+#ifdef _WIN32
+    void *fileHandle;
+    void *mapHandle;
+#else
+    int fd;
+#endif
+
+public:
+    MappedFile();
+    ~MappedFile();
+    MappedFile(const MappedFile &) = delete;
+    MappedFile &operator=(const MappedFile &) = delete;
+
+    // Map a whole file (closes the previous one); false if missing or empty
+    bool open(const std::string &path);
+    void close();
+
+    bool isOpen() const { return data != nullptr; }
+    const uint8_t *getData() const { return data; }
+    size_t size() const { return bytes; }
+};
+
+#endif // MAPPEDFILE_H
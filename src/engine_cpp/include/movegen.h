@@ -3,6 +3,8 @@
 
 #include "types.h"
 #include "board.h"
+#include <utility>
+#include <vector>
 
 // Pre-computed attack tables
 class AttackTables
@@ -21,12 +23,20 @@ public:
     static Bitboard bishopAttacks[64][512];
     static Bitboard rookAttacks[64][4096];
 
-    // Magic numbers (pre-computed)
+    // Magic numbers (searched at init with a fixed seed)
     static uint64_t bishopMagics[64];
     static uint64_t rookMagics[64];
     static int bishopShifts[64];
     static int rookShifts[64];
 
+    // Index slider tables with PEXT instead of magics (BMI2 only)
+    static bool usePext;
+    static bool initialized;
+
+    // Square relations (for pins and check evasions)
+    static Bitboard betweenBB[64][64]; // squares strictly between two aligned squares
+    static Bitboard lineBB[64][64];    // whole line through two aligned squares
+
     // Attack getters
     static Bitboard getPawnAttacks(Color c, Square sq) { return pawnAttacks[c][sq]; }
     static Bitboard getKnightAttacks(Square sq) { return knightAttacks[sq]; }
@@ -34,15 +44,31 @@ public:
     static Bitboard getBishopAttacks(Square sq, Bitboard occupied);
     static Bitboard getRookAttacks(Square sq, Bitboard occupied);
     static Bitboard getQueenAttacks(Square sq, Bitboard occupied);
+
+    static Bitboard getBetween(Square a, Square b) { return betweenBB[a][b]; }
+    static Bitboard getLine(Square a, Square b) { return lineBB[a][b]; }
+
+    // Slider indexing mode and self-check
+    static bool cpuHasBmi2();
+    static bool setPext(bool enable);
+    static bool usesPext() { return usePext; }
+    static bool verify();
+
+private:
+    static void fillSliderTables();
 };
 
 class MoveGenerator
 {
 public:
-    // Generate all legal moves
+    // Generate all legal moves (pin/check masks, no make/unmake)
     static void generateLegalMoves(const Board &board, MoveList &moves);
 
-    // Generate only captures (for quiescence search)
+    // Generate all legal moves by making each pseudo-legal move on a copy
+    // (reference implementation, kept for cross-checking)
+    static void generateLegalMovesSlow(const Board &board, MoveList &moves);
+
+    // Generate only legal captures (for quiescence search)
     static void generateCaptures(const Board &board, MoveList &moves);
 
     // Generate only quiet moves (non-captures)
@@ -51,7 +77,16 @@ public:
     // Check if a move is legal
     static bool isLegal(const Board &board, const Move &move);
 
+    // Perft: number of leaf nodes of the legal move tree at 'depth'
+    static uint64_t perft(Board &board, int depth);
+
+    // Divide: perft count below each root move
+    static std::vector<std::pair<Move, uint64_t>> divide(Board &board, int depth);
+
 private:
+    // Legal generator shared by generateLegalMoves / generateCaptures
+    static void generateLegal(const Board &board, MoveList &moves, bool capturesOnly);
+
     // Generate pseudo-legal moves (may leave king in check)
     static void generatePseudoLegalMoves(const Board &board, MoveList &moves, bool capturesOnly = false);
 
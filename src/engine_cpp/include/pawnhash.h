@@ -0,0 +1,48 @@
+#ifndef PAWNHASH_H
+#define PAWNHASH_H
+
+#include "types.h"
+#include <memory>
+
+// Pawn hash entry: pawn-structure score and passed pawns for one pawn key
+struct PawnEntry
+{
+    uint64_t key;
+    Bitboard passed[2]; // [color] passed pawns
+    Score score;        // From white's perspective
+
+    PawnEntry() : key(0), passed{0, 0}, score(0) {}
+};
+
+// Fixed-size, always-replace pawn hash table.
+// Not thread-safe: each search thread owns its own table.
+class PawnHashTable
+{
+private:
+    std::unique_ptr<PawnEntry[]> table;
+    size_t numEntries; // Power of two
+    uint64_t hits;
+    uint64_t misses;
+
+public:
+    static constexpr size_t DEFAULT_ENTRIES = 1 << 14; // 16K entries (512 KB)
+
+    PawnHashTable(size_t entries = DEFAULT_ENTRIES);
+
+    // Entry slot for a pawn key (check entry->key to see if it holds the key)
+    PawnEntry *slot(uint64_t pawnKey) { return &table[pawnKey & (numEntries - 1)]; }
+
+    // Clear table and counters
+    void clear();
+
+    // Hit/miss counters (updated by Evaluator)
+    void recordHit() { hits++; }
+    void recordMiss() { misses++; }
+    void clearStats() { hits = misses = 0; }
+    uint64_t getHits() const { return hits; }
+    uint64_t getMisses() const { return misses; }
+
+    size_t getNumEntries() const { return numEntries; }
+};
+
+#endif // PAWNHASH_H
@@ -0,0 +1,64 @@
+#ifndef POLYGLOT_H
+#define POLYGLOT_H
+
+#include "types.h"
+#include "board.h"
+#include "mappedfile.h"
+#include <random>
+#include <string>
+#include <vector>
+
+// Standard Polyglot random numbers:
+// 0-767 pieces (64 * kind + square, kind = 2 * piece + white),
+// 768-771 castling (white OO, white OOO, black OO, black OOO),
+// 772-779 en passant file, 780 white to move
+constexpr int POLYGLOT_RANDOM_SIZE = 781;
+extern const uint64_t POLYGLOT_RANDOM[POLYGLOT_RANDOM_SIZE];
+
+// One book entry (decoded from the big-endian file)
+struct BookEntry
+{
+    uint64_t key;
+    uint16_t move; // to bits 0-5, from bits 6-11, promotion 12-14 (1 = knight)
+    uint16_t weight;
+    uint32_t learn;
+};
+
+// Read-only Polyglot book, memory-mapped once on open.
+// Lookups are a binary search over the mapped (sorted) entries.
+// Not thread-safe for getMove (random generator); probe is read-only.
+class PolyglotBook
+{
+private:
+    MappedFile file;
+    const uint8_t *data;
+    size_t numEntries;
+    std::mt19937_64 rng;
+
+    BookEntry entryAt(size_t index) const;
+
+public:
+    static constexpr size_t ENTRY_SIZE = 16;
+
+    PolyglotBook();
+
+    // Map a book file (closes the previous one); false if it cannot be opened
+    bool open(const std::string &path);
+    void close();
+    bool isOpen() const { return data != nullptr; }
+    size_t size() const { return numEntries; }
+
+    // All entries for a Polyglot key, highest weight first
+    std::vector<BookEntry> probe(uint64_t key) const;
+
+    // Legal book move for the position (null move if none):
+    // highest weight, or random in proportion to the weights
+    Move getMove(const Board &board, bool weightedRandom = false);
+
+    // Book move in engine encoding (castling is stored as king takes rook)
+    static Move decodeMove(const Board &board, uint16_t bookMove);
+
+    void seed(uint64_t value) { rng.seed(value); }
+};
+
+#endif // POLYGLOT_H
@@ -4,8 +4,17 @@
 #include "types.h"
 #include "board.h"
 #include "transposition.h"
+#include "pawnhash.h"
+#include "polyglot.h"
+#include "tablebase.h"
+#include "timeman.h"
+#include <algorithm>
 #include <chrono>
 #include <atomic>
+#include <functional>
+#include <memory>
+#include <thread>
+#include <vector>
 
 // Search statistics
 struct SearchStats
@@ -14,13 +23,18 @@ struct SearchStats
     uint64_t qNodesSearched;
     uint64_t ttHits;
     uint64_t ttMisses;
+    uint64_t pawnHits;
+    uint64_t pawnMisses;
+    uint64_t tbHits;
     uint64_t betaCutoffs;
     uint64_t firstMoveCutoffs;
     int maxDepthReached;
+    int selDepth; // Deepest ply reached, quiescence included
     double timeElapsed;
 
-    SearchStats() : nodesSearched(0), qNodesSearched(0), ttHits(0), ttMisses(0),
-                    betaCutoffs(0), firstMoveCutoffs(0), maxDepthReached(0), timeElapsed(0.0) {}
+    SearchStats() : nodesSearched(0), qNodesSearched(0), ttHits(0), ttMisses(0), pawnHits(0), pawnMisses(0),
+                    tbHits(0), betaCutoffs(0), firstMoveCutoffs(0), maxDepthReached(0), selDepth(0),
+                    timeElapsed(0.0) {}
 
     void clear()
     {
@@ -28,9 +42,13 @@ struct SearchStats
         qNodesSearched = 0;
         ttHits = 0;
         ttMisses = 0;
+        pawnHits = 0;
+        pawnMisses = 0;
+        tbHits = 0;
         betaCutoffs = 0;
         firstMoveCutoffs = 0;
         maxDepthReached = 0;
+        selDepth = 0;
         timeElapsed = 0.0;
     }
 
@@ -39,6 +57,12 @@ struct SearchStats
         return timeElapsed > 0 ? (double)nodesSearched / timeElapsed : 0.0;
     }
 
+    double getPawnHitRate() const
+    {
+        uint64_t probes = pawnHits + pawnMisses;
+        return probes > 0 ? (double)pawnHits / probes : 0.0;
+    }
+
     double getBranchingFactor() const
     {
         return betaCutoffs > 0 ? (double)firstMoveCutoffs / betaCutoffs : 0.0;
@@ -49,22 +73,107 @@ struct SearchStats
 struct SearchLimits
 {
     int maxDepth;
-    int timeLimit; // milliseconds
+    int timeLimit; // milliseconds, fixed time for this move (0 = none)
+    int timeLeft;  // milliseconds on the side to move's clock (-1 = no clock)
+    int increment; // milliseconds per move
+    int movesToGo; // moves to the next time control (0 = sudden death)
     uint64_t maxNodes;
     bool infinite;
+    bool ponder; // search without time limit until ponderhit()
+
+    SearchLimits() : maxDepth(MAX_PLY), timeLimit(0), timeLeft(-1), increment(0), movesToGo(0), maxNodes(0),
+                     infinite(false), ponder(false) {}
+};
+
+// Report sent after each completed iteration
+struct IterationInfo
+{
+    int depth;
+    int selDepth;
+    Score score;
+    uint64_t nodes;
+    uint64_t nps;
+    uint64_t tbHits;
+    int timeMs;
+    int multiPV; // 1-based line index in MultiPV mode (1 otherwise)
+    std::vector<Move> pv;
+
+    IterationInfo() : depth(0), selDepth(0), score(0), nodes(0), nps(0), tbHits(0), timeMs(0), multiPV(1) {}
+};
+
+// One root line of the last search (best first in MultiPV mode)
+struct PVLine
+{
+    Move move;
+    Score score; // Side to move
+    int depth;   // Depth the line was completed at
+    std::vector<Move> pv;
 
-    SearchLimits() : maxDepth(MAX_PLY), timeLimit(0), maxNodes(0), infinite(false) {}
+    PVLine() : score(0), depth(0) {}
 };
 
+// Outcome of a search (every search fills one, book moves included)
+struct SearchResult
+{
+    Move bestMove;
+    Move ponderMove; // Expected reply (second PV move), null if unknown
+    Score score;     // Side to move, centipawns or mate score (last completed depth)
+    bool isMate;     // score is a mate score
+    int mateIn;      // Moves to mate if isMate: > 0 side to move mates, <= 0 gets mated
+    int depth;       // Last completed depth
+    int selDepth;
+    std::vector<Move> pv;
+    uint64_t nodes;  // All threads
+    uint64_t tbHits;
+    int hashfull;    // Permille of the TT in use
+    int timeMs;
+    bool fromBook;
+
+    SearchResult() : score(0), isMate(false), mateIn(0), depth(0), selDepth(0), nodes(0), tbHits(0),
+                     hashfull(0), timeMs(0), fromBook(false) {}
+};
+
+typedef std::function<void(const IterationInfo &)> InfoCallback;
+
 class SearchEngine
 {
 private:
-    TranspositionTable tt;
+    // Transposition table (owned by the main engine, shared with helper threads)
+    std::unique_ptr<TranspositionTable> ownedTT;
+    TranspositionTable *tt;
+
     SearchStats stats;
     SearchLimits limits;
+    TimeManager timeManager;
+    uint64_t bestMoveNodes; // Nodes spent on the current root best move this depth
+
+    // Pawn structure cache (one per thread, never shared)
+    PawnHashTable pawnTable;
+
+    // Syzygy tablebases (owned by the main engine, shared with helper threads)
+    std::unique_ptr<Tablebases> ownedTablebases;
+    Tablebases *tablebases;
+    int tbProbeDepth;  // Minimum depth for probing at the largest table size
+    int tbCardinality; // Probe limit for the current search (0 = no probing)
+
+    // Root moves allowed by the tablebase ranking (empty = all)
+    std::vector<Move> rootMoves;
+
+    // MultiPV: number of root lines, the lines of the last completed depth,
+    // and the root moves already taken by earlier lines of the current depth
+    int multiPV;
+    std::vector<PVLine> pvLines;
+    std::vector<Move> excludedRootMoves;
 
     std::chrono::steady_clock::time_point startTime;
     std::atomic<bool> stopSearch;
+    std::atomic<bool> *stopSignal; // Points to the main engine's stop flag
+    std::atomic<bool> pondering;   // Time limit ignored until ponderhit()
+    std::atomic<int> ponderHitTime; // Elapsed ms at ponderhit(), -1 = none; applied by the search thread
+
+    // Lazy SMP: helper searchers (thread 0 is this engine)
+    int threadId;
+    std::vector<std::unique_ptr<SearchEngine>> helpers;
 
     // Killer moves (2 per ply)
     Move killerMoves[MAX_PLY][2];
@@ -76,28 +185,125 @@ private:
     Move pvTable[MAX_PLY][MAX_PLY];
     int pvLength[MAX_PLY];
 
+    // Asynchronous search (startSearch / wait)
+    std::thread searchThread;
+    std::atomic<bool> searching;
+    Board searchBoard;
+    Move lastBestMove;
+    Move ponderMove; // Move the running ponder search assumes (null if none)
+    SearchResult result;
+
+    // Called after each completed iteration (main thread only)
+    InfoCallback infoCallback;
+
+    // Opening book, consulted before searching (main engine only)
+    std::unique_ptr<PolyglotBook> book;
+    int bookDepth;   // Last game ply (half-move) that uses the book; 0 = no limit
+    bool bookRandom; // Weighted-random choice instead of the highest weight
+
+    // Helper searcher sharing the main engine's TT and stop flag
+    SearchEngine(SearchEngine &master, int threadId);
+
 public:
-    SearchEngine(size_t ttSizeMB = 256);
-    ~SearchEngine() = default;
+    SearchEngine(size_t ttSizeMB = 256, int threads = 1);
+    ~SearchEngine();
 
     // Main search interface
     Move getBestMove(Board &board, int maxDepth = 6, int timeLimit = 5000);
+    SearchResult search(Board &board, const SearchLimits &searchLimits);
+
+    // Result of the last finished search (after wait() for asynchronous ones)
+    const SearchResult &getResult() const { return result; }
+
+    // Asynchronous search on a copy of the board; returns immediately
+    void startSearch(const Board &board, int maxDepth = 6, int timeLimit = 5000);
+    void startSearch(const Board &board, const SearchLimits &searchLimits);
+
+    // Pondering: after playing the last result's best move on `board`, search the
+    // expected reply (result.ponderMove) in the background while the opponent thinks.
+    // The limits apply once ponderhit() is called. Returns the pondered move (null if none).
+    Move startPonder(const Board &board, const SearchLimits &searchLimits);
+
+    // Switch a ponder search to a normal timed search. The hard limit counts from
+    // now; a ponder search that already used its optimum time stops at once.
+    void ponderhit();
+
+    // Opponent played another move: abort the ponder search (the TT keeps its work)
+    void ponderMiss();
+    bool isPondering() const { return pondering; }
+    Move getPonderMove() const { return ponderMove; }
+
+    // Wait for the asynchronous search to finish and return its best move
+    Move wait();
+    bool isSearching() const { return searching; }
+
+    // Per-iteration info callback (nullptr: print "info" lines to stdout)
+    void setInfoCallback(InfoCallback callback) { infoCallback = std::move(callback); }
 
     // Stop search
-    void stop() { stopSearch = true; }
+    void stop() { *stopSignal = true; }
+
+    // Time reserved per clock-based move for GUI / network lag
+    void setMoveOverhead(int ms) { timeManager.setMoveOverhead(ms); }
+    int getMoveOverhead() const { return timeManager.getMoveOverhead(); }
+    const TimeManager &getTimeManager() const { return timeManager; }
+
+    // Opening book (Polyglot .bin, memory-mapped); false if it cannot be opened
+    bool setBook(const std::string &path);
+    void clearBook();
+    bool hasBook() const { return book != nullptr; }
+    void setBookDepth(int plies) { bookDepth = plies; }
+    int getBookDepth() const { return bookDepth; }
+    void setBookRandom(bool random) { bookRandom = random; }
+
+    // Book move for the position within the book depth (null move if none)
+    Move probeBook(const Board &board);
+
+    // Syzygy tablebases: directories separated by ';' (or ':' outside Windows).
+    // Returns the number of tables found; an empty path disables probing.
+    int setSyzygyPath(const std::string &path);
+    void setSyzygyProbeDepth(int depth) { tbProbeDepth = depth; }
+    int getSyzygyProbeDepth() const { return tbProbeDepth; }
+    Tablebases *getTablebases() const { return tablebases; }
+
+    // MultiPV: search the best `lines` root moves (1 = normal search).
+    // Each extra line costs roughly one more root search per depth.
+    void setMultiPV(int lines);
+    int getMultiPV() const { return multiPV; }
+
+    // Root lines of the last search, best first (one line unless MultiPV)
+    const std::vector<PVLine> &getPVLines() const { return pvLines; }
+
+    // Lazy SMP thread count (main thread included)
+    void setThreads(int threads);
+    int getThreads() const { return (int)helpers.size() + 1; }
 
     // Get statistics
     const SearchStats &getStats() const { return stats; }
     uint64_t getNodesSearched() const { return stats.nodesSearched; }
 
     // Clear transposition table
-    void clearTT() { tt.clear(); }
-    void resizeTT(size_t sizeMB) { tt.resize(sizeMB); }
+    void clearTT();
+    void resizeTT(size_t sizeMB);
+    int getHashfull() const { return tt->hashfull(); }
 
 private:
+    // Reset state and limits for a new search / run it (with helper threads)
+    void prepareSearch(const Board &board, const SearchLimits &searchLimits);
+    Move runSearch(Board &board);
+    void fillResult(Move bestMove, bool fromBook);
+
+    // Restrict root moves to the best tablebase-ranked ones
+    void rankRootMoves(Board &board);
+
     // Iterative deepening
     Score iterativeDeepening(Board &board, int maxDepth);
 
+    // One depth of MultiPV: a root search per line, excluding earlier lines' moves.
+    // False if stopped before the first line completed.
+    bool searchMultiPV(Board &board, int depth, int numLines, std::vector<PVLine> &lines);
+    void reportIteration(int depth, Score score, int multiPVIndex, const Move *pv, int pvLen);
+
     // Alpha-beta search
     Score alphaBeta(Board &board, int depth, Score alpha, Score beta, bool pvNode, int ply);
 
@@ -127,6 +333,9 @@ private:
 
     // Time management
     bool shouldStop();
+    void applyPonderhit();
+    bool timeUp(int depth, Move bestMove, Score score, double bestMoveNodeShare);
+    bool stopped() const { return stopSignal->load(std::memory_order_relaxed); }
     int getElapsedTime() const;
 
     // Helper functions
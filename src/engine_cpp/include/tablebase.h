@@ -0,0 +1,81 @@
+#ifndef TABLEBASE_H
+#define TABLEBASE_H
+
+#include "types.h"
+#include "board.h"
+#include <memory>
+#include <mutex>
+#include <string>
+#include <unordered_map>
+#include <utility>
+#include <vector>
+
+// Syzygy endgame tablebase prober (.rtbw WDL / .rtbz DTZ files).
+// Tables are found at init and memory-mapped on first probe.
+
+// Win/draw/loss from the side to move's point of view.
+// Cursed wins / blessed losses are draws under the 50-move rule.
+enum WDLScore : int
+{
+    WDL_LOSS = -2,
+    WDL_BLESSED_LOSS = -1,
+    WDL_DRAW = 0,
+    WDL_CURSED_WIN = 1,
+    WDL_WIN = 2
+};
+
+// Outcome of a probe
+enum ProbeState : int
+{
+    PROBE_FAIL = 0,              // Table missing or position not probeable
+    PROBE_OK = 1,
+    PROBE_CHANGE_STM = -1,       // DTZ stored for the other side to move
+    PROBE_ZEROING_BEST_MOVE = 2  // Best move is a capture or pawn move
+};
+
+constexpr int TB_PIECES = 7;
+
+struct TBTable;
+
+class Tablebases
+{
+private:
+    std::vector<std::unique_ptr<TBTable>> tables;
+    std::unordered_map<uint64_t, std::pair<TBTable *, TBTable *>> byMaterial; // key -> (WDL, DTZ)
+    std::vector<std::string> paths;
+    std::mutex mapMutex;
+    int maxCardinality;
+
+    void addTable(const std::string &code);
+    bool mapTable(TBTable &table);
+    int probeTable(const Board &board, TBTable &table, WDLScore wdl, ProbeState &result);
+    int probeTable(const Board &board, bool dtz, WDLScore wdl, ProbeState &result);
+    WDLScore search(Board &board, bool checkZeroingMoves, ProbeState &result);
+
+public:
+    Tablebases();
+    ~Tablebases();
+
+    // Find tables in one or more directories (';'-separated, or ':' outside Windows).
+    // Returns the number of WDL tables found.
+    int init(const std::string &pathList);
+    void clear();
+
+    // Largest number of pieces (kings included) with a table, 0 if none
+    int getMaxCardinality() const { return maxCardinality; }
+    int getNumTables() const { return (int)byMaterial.size() / 2; }
+
+    // WDL of the position (no castling rights); result is PROBE_FAIL if unknown
+    WDLScore probeWDL(Board &board, ProbeState &result);
+
+    // Distance to zeroing in plies, signed from the side to move:
+    // > 0 win, < 0 loss, 0 draw, |n| > 100 only wins/loses with the 50-move rule
+    int probeDTZ(Board &board, ProbeState &result);
+
+    // Rank legal root moves (higher is better) from DTZ, or WDL if DTZ is missing.
+    // Ranks: 1000 certain win ... 0 draw ... -1000 certain loss.
+    // dtzUsed tells which kind of table was used; false if any probe failed.
+    bool rankRootMoves(Board &board, std::vector<std::pair<Move, int>> &rankedMoves, bool &dtzUsed);
+};
+
+#endif // TABLEBASE_H
@@ -0,0 +1,55 @@
+#ifndef TIMEMAN_H
+#define TIMEMAN_H
+
+#include "types.h"
+
+// Time allocation for clock-based searches (wtime/btime, winc/binc, movestogo).
+//
+// init() splits the remaining time into an optimum budget (where a search
+// normally ends) and a maximum (hard stop inside an iteration). After every
+// completed depth, stopAfterIteration() scales the optimum:
+//   - longer when the root score drops (fail-low) or the best move changes
+//   - shorter when the best move has been stable for several depths or
+//     takes almost all of the root nodes
+// and tells the search not to start a depth it is unlikely to finish.
+// A fixed move time gives optimum = maximum and no dynamic stopping.
+class TimeManager
+{
+private:
+    int optimum;      // Milliseconds, 0 = no time limit
+    int maximum;
+    int moveOverhead; // Reserved per move for GUI / network lag
+    bool managed;     // Budgets come from a clock (dynamic stopping enabled)
+
+    // Iteration history
+    Move lastBestMove;
+    Score lastScore;
+    int stableIterations; // Consecutive depths with the same best move
+    double instability;   // Decaying count of best move changes
+
+public:
+    static constexpr int DEFAULT_MOVE_OVERHEAD = 30;
+
+    TimeManager();
+
+    // New search. timeLeft < 0 means no clock; moveTime > 0 is a fixed budget.
+    // movesToGo 0 = sudden death; gamePly is the number of half-moves played.
+    void init(int timeLeft, int increment, int movesToGo, int moveTime, int gamePly);
+
+    // After a completed depth: true if no further depth should be started.
+    // bestMoveNodeShare is the fraction of the depth's nodes spent on the best move.
+    bool stopAfterIteration(int depth, Move bestMove, Score score, double bestMoveNodeShare, int elapsedMs);
+
+    // Pondered move played after elapsedMs of pondering: the hard limit runs from
+    // now, the ponder time counts toward the optimum (already used up: stop at once)
+    void ponderhit(int elapsedMs);
+
+    int getOptimum() const { return optimum; }
+    int getMaximum() const { return maximum; }
+    bool isManaged() const { return managed; }
+
+    void setMoveOverhead(int ms) { moveOverhead = ms < 0 ? 0 : ms; }
+    int getMoveOverhead() const { return moveOverhead; }
+};
+
+#endif // TIMEMAN_H
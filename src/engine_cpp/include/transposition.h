@@ -2,33 +2,50 @@
 #define TRANSPOSITION_H
 
 #include "types.h"
-#include <vector>
+#include <atomic>
+#include <memory>
 
-// Transposition Table entry
+// Transposition Table entry (unpacked view returned by probe)
 struct TTEntry
 {
-    uint64_t hash;
     Move bestMove;
     Score score;
+    Score staticEval; // SCORE_NONE if not known
     int depth;
     uint8_t flag; // TT_EXACT, TT_ALPHA, TT_BETA
     uint8_t age;
 
-    TTEntry() : hash(0), bestMove(), score(0), depth(0), flag(0), age(0) {}
+    TTEntry() : bestMove(), score(0), staticEval(SCORE_NONE), depth(0), flag(0), age(0) {}
 };
 
+// Packed slot (16 bytes)
+// data bits 0-15: move, 16-31: score, 32-47: static eval,
+//           48-55: depth, 56-57: bound, 58-63: age
+// key = hash ^ data, so a slot torn by two threads writing at once
+// fails verification instead of returning another position's data.
+struct TTSlot
+{
+    std::atomic<uint64_t> key;
+    std::atomic<uint64_t> data;
+};
+
+// Cluster of slots filling one cache line
+constexpr int TT_CLUSTER_SIZE = 4;
+
+struct alignas(64) TTCluster
+{
+    TTSlot slots[TT_CLUSTER_SIZE];
+};
+
+static_assert(sizeof(TTCluster) == 64, "TTCluster must fill exactly one cache line");
+
 class TranspositionTable
 {
 private:
-    std::vector<TTEntry> table;
+    std::unique_ptr<TTCluster[]> table;
     size_t sizeMB;
-    size_t numEntries;
-    uint8_t currentAge;
-
-    // Statistics
-    uint64_t hits;
-    uint64_t misses;
-    uint64_t collisions;
+    size_t numClusters;
+    uint8_t currentAge; // 6-bit generation
 
 public:
     TranspositionTable(size_t sizeMB = 256);
@@ -37,35 +54,49 @@ public:
     // Resize table
     void resize(size_t sizeMB);
 
-    // Probe table
-    bool probe(uint64_t hash, int depth, Score alpha, Score beta, TTEntry &entry);
+    // Probe table: true if the position is stored (entry filled in)
+    bool probe(uint64_t hash, TTEntry &entry) const;
+
+    // Probe table: true if the stored bound allows a cutoff at this depth/window
+    bool probe(uint64_t hash, int depth, Score alpha, Score beta, TTEntry &entry) const;
 
     // Store entry
-    void store(uint64_t hash, const Move &bestMove, Score score, int depth, uint8_t flag);
+    void store(uint64_t hash, const Move &bestMove, Score score, int depth, uint8_t flag,
+               Score staticEval = SCORE_NONE);
 
     // Clear table
     void clear();
 
     // Age management
-    void incrementAge() { currentAge++; }
+    void incrementAge() { currentAge = (currentAge + 1) & 0x3F; }
     uint8_t getAge() const { return currentAge; }
 
-    // Statistics
-    uint64_t getHits() const { return hits; }
-    uint64_t getMisses() const { return misses; }
-    uint64_t getCollisions() const { return collisions; }
-    double getHitRate() const
-    {
-        uint64_t total = hits + misses;
-        return total > 0 ? (double)hits / total : 0.0;
-    }
+    // Permille of sampled slots written during the current search (UCI hashfull)
+    int hashfull() const;
 
     // Get table size
     size_t getSizeMB() const { return sizeMB; }
-    size_t getNumEntries() const { return numEntries; }
+    size_t getNumEntries() const { return numClusters * TT_CLUSTER_SIZE; }
+
+    // Raw words of slot index in the position's cluster (tests / debugging)
+    size_t getClusterIndex(uint64_t hash) const { return getIndex(hash); }
+    void getSlot(uint64_t hash, int index, uint64_t &key, uint64_t &data) const;
+    void setSlot(uint64_t hash, int index, uint64_t key, uint64_t data);
 
 private:
-    size_t getIndex(uint64_t hash) const { return hash % numEntries; }
+    // Multiply-shift: maps the hash onto [0, numClusters) without a division
+    size_t getIndex(uint64_t hash) const
+    {
+#if defined(_MSC_VER) && defined(_M_X64)
+        return (size_t)__umulh(hash, (uint64_t)numClusters);
+#else
+        return (size_t)(((unsigned __int128)hash * numClusters) >> 64);
+#endif
+    }
+
+    static uint64_t pack(const Move &move, Score score, Score staticEval, int depth,
+                         uint8_t flag, uint8_t age);
+    static void unpack(uint64_t data, TTEntry &entry);
 };
 
 #endif // TRANSPOSITION_H
@@ -16,6 +16,8 @@ constexpr int MAX_PLY = 128;
 constexpr Score SCORE_INFINITE = 32000;
 constexpr Score SCORE_MATE = 31000;
 constexpr Score SCORE_DRAW = 0;
+constexpr Score SCORE_TB_WIN = SCORE_MATE - 2 * MAX_PLY; // Tablebase win (below any mate score)
+constexpr Score SCORE_NONE = 32001; // "no score" marker (e.g. static eval not stored)
 
 // Piece types
 enum PieceType : uint8_t
@@ -203,9 +205,19 @@ public:
         return f == KING_CASTLE || f == QUEEN_CASTLE;
     }
     bool isEnPassant() const { return flags() == EN_PASSANT; }
+    PieceType promotionType() const { return PieceType(KNIGHT + (flags() & 0x3)); }
 
     bool isNull() const { return data == 0; }
 
+    // Raw 16-bit encoding (for packed storage)
+    uint16_t raw() const { return data; }
+    static Move fromRaw(uint16_t raw)
+    {
+        Move m;
+        m.data = raw;
+        return m;
+    }
+
     std::string toUCI() const;
     static Move fromUCI(const std::string &uci);
 
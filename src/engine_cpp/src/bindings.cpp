@@ -1,5 +1,7 @@
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
+#include <pybind11/numpy.h>
+#include <memory>
 #include "board.h"
 #include "types.h"
 #include "movegen.h"
@@ -8,6 +10,156 @@
 
 namespace py = pybind11;
 
+// Deleting an engine joins its search thread, whose info callback may be
+// waiting for the GIL: release it first.
+struct SearchEngineDeleter
+{
+     void operator()(SearchEngine *engine) const
+     {
+          py::gil_scoped_release release;
+          delete engine;
+     }
+};
+
+// Wrap a Python callable as an InfoCallback. The GIL is only taken once per
+// completed iteration; the callable is released under the GIL as well.
+static InfoCallback makeInfoCallback(const py::object &callback)
+{
+     if (callback.is_none())
+          return nullptr;
+
+     std::shared_ptr<py::object> holder(new py::object(callback), [](py::object *obj)
+                                        {
+          py::gil_scoped_acquire acquire;
+          delete obj; });
+
+     return [holder](const IterationInfo &info)
+     {
+          py::gil_scoped_acquire acquire;
+          try
+          {
+               (*holder)(info);
+          }
+          catch (py::error_already_set &e)
+          {
+               e.discard_as_unraisable("SearchEngine info callback");
+          }
+     };
+}
+
+// Install the info callback once no search thread can call the previous one.
+// Blocking searches wait for a running search (as the engine does); start_search
+// and start_ponder stop it first.
+static void installInfoCallback(SearchEngine &engine, const py::object &callback, bool stopRunning)
+{
+     {
+          py::gil_scoped_release release;
+          if (stopRunning)
+               engine.stop();
+          engine.wait();
+     }
+     engine.setInfoCallback(makeInfoCallback(callback));
+}
+
+// Search limits from the Python arguments; a clock (timeLeft >= 0) replaces the fixed time
+static SearchLimits makeLimits(int maxDepth, int timeLimit, int timeLeft, int increment, int movesToGo)
+{
+     SearchLimits limits;
+     limits.maxDepth = maxDepth;
+     if (timeLeft >= 0)
+     {
+          limits.timeLeft = timeLeft;
+          limits.increment = increment;
+          limits.movesToGo = movesToGo;
+     }
+     else
+     {
+          limits.timeLimit = timeLimit;
+     }
+     return limits;
+}
+
+// Packed positions held by any C-contiguous buffer (bytes, memoryview,
+// NumPy array, mmap): pointer to the first one and their number
+static const uint8_t *packedPositions(const py::buffer &buffer, size_t &count)
+{
+     py::buffer_info info = buffer.request();
+
+     py::ssize_t stride = info.itemsize;
+     for (py::ssize_t dim = info.ndim - 1; dim >= 0; dim--)
+     {
+          if (info.shape[dim] > 1 && info.strides[dim] != stride)
+               throw py::value_error("Packed positions must be in a contiguous buffer");
+          stride *= info.shape[dim];
+     }
+
+     size_t bytes = size_t(info.size) * size_t(info.itemsize);
+     if (bytes % PACKED_BOARD_SIZE != 0)
+          throw py::value_error("Packed positions buffer size must be a multiple of " +
+                                std::to_string(PACKED_BOARD_SIZE) + " bytes");
+     count = bytes / PACKED_BOARD_SIZE;
+     return static_cast<const uint8_t *>(info.ptr);
+}
+
+// Batch evaluation of FEN strings, Boards or packed positions (any buffer).
+// Fills an int16 score array, or a structured EvalBreakdown array if detailed.
+// The evaluation itself runs without the GIL.
+static py::array evaluatePositions(const py::object &positions, int threads, bool detailed)
+{
+     if (py::isinstance<py::str>(positions))
+          throw py::type_error("Expected a sequence of FENs or Boards, not a single string");
+
+     size_t count = 0;
+     const uint8_t *packed = nullptr;
+     if (py::isinstance<py::buffer>(positions))
+          packed = packedPositions(positions.cast<py::buffer>(), count);
+     else
+          count = py::len(positions);
+
+     py::array result = detailed ? py::array(py::array_t<Evaluator::EvalBreakdown>(count))
+                                 : py::array(py::array_t<Score>(count));
+     Score *scores = detailed ? nullptr : static_cast<Score *>(result.mutable_data());
+     auto *details = detailed ? static_cast<Evaluator::EvalBreakdown *>(result.mutable_data()) : nullptr;
+     if (count == 0)
+          return result;
+
+     if (packed)
+     {
+          long long invalid;
+          {
+               py::gil_scoped_release release;
+               invalid = Evaluator::evaluateBatch(packed, count, scores, details, threads);
+          }
+          if (invalid >= 0)
+               throw py::value_error("Invalid packed position at index " + std::to_string(invalid));
+          return result;
+     }
+
+     py::sequence sequence = positions.cast<py::sequence>();
+     if (py::isinstance<py::str>(sequence[0]))
+     {
+          std::vector<std::string> fens = sequence.cast<std::vector<std::string>>();
+          long long invalid;
+          {
+               py::gil_scoped_release release;
+               invalid = Evaluator::evaluateBatch(fens, scores, details, threads);
+          }
+          if (invalid >= 0)
+               throw py::value_error("Invalid FEN at index " + std::to_string(invalid) + ": " + fens[invalid]);
+          return result;
+     }
+
+     std::vector<const Board *> boards;
+     boards.reserve(count);
+     for (const py::handle &item : sequence)
+          boards.push_back(&item.cast<const Board &>());
+     {
+          py::gil_scoped_release release;
+          Evaluator::evaluateBatch(boards, scores, details, threads);
+     }
+     return result;
+}
+
 PYBIND11_MODULE(chess_engine, m)
 {
      m.doc() = "Fast C++ Chess Engine with bitboards, magic move generation, and advanced search";
@@ -87,6 +239,23 @@ PYBIND11_MODULE(chess_engine, m)
               py::arg("fen"))
          .def("to_fen", &Board::toFEN,
               "Get current position as FEN string")
+         .def("to_packed", [](const Board &board)
+              {
+            char data[PACKED_BOARD_SIZE];
+            if (!board.toPacked(reinterpret_cast<uint8_t *>(data)))
+                throw py::value_error("Cannot pack a position with more than 32 pieces");
+            return py::bytes(data, PACKED_BOARD_SIZE); },
+              "Position as 32 packed bytes")
+         .def("from_packed", [](Board &board, const py::buffer &buffer, size_t index)
+              {
+            size_t count;
+            const uint8_t *data = packedPositions(buffer, count);
+            if (index >= count)
+                throw py::index_error("Packed position index out of range");
+            return board.fromPacked(data + index * PACKED_BOARD_SIZE); },
+              "Set position from packed bytes (any buffer of one or more packed positions, read in place)",
+              py::arg("buffer"),
+              py::arg("index") = 0)
 
          // Move operations
          .def("make_move", &Board::makeMove,
@@ -100,6 +269,25 @@ PYBIND11_MODULE(chess_engine, m)
          .def("unmake_null_move", &Board::unmakeNullMove,
               "Unmake null move")
 
+         // Perft (runs on a copy of the board, without the GIL)
+         .def("perft", [](const Board &b, int depth)
+              {
+            Board copy = b;
+            py::gil_scoped_release release;
+            return MoveGenerator::perft(copy, depth); }, "Count leaf nodes of the legal move tree", py::arg("depth"))
+         .def("divide", [](const Board &b, int depth)
+              {
+            Board copy = b;
+            std::vector<std::pair<Move, uint64_t>> result;
+            {
+                py::gil_scoped_release release;
+                result = MoveGenerator::divide(copy, depth);
+            }
+            py::dict counts;
+            for (const auto &entry : result)
+                counts[py::str(entry.first.toUCI())] = entry.second;
+            return counts; }, "Perft count per root move as {uci: nodes}", py::arg("depth"))
+
          // Board queries
          .def("get_side_to_move", &Board::getSideToMove,
               "Get color of side to move")
@@ -113,6 +301,10 @@ PYBIND11_MODULE(chess_engine, m)
               "Get fullmove number")
          .def("get_hash", &Board::getHash,
               "Get Zobrist hash of position")
+         .def("get_pawn_key", &Board::getPawnKey,
+              "Get Zobrist hash of the pawns only")
+         .def("get_polyglot_key", &Board::getPolyglotKey,
+              "Get Polyglot opening-book key of position")
 
          // Piece queries
          .def("piece_type_at", &Board::pieceTypeAt,
@@ -171,45 +363,395 @@ PYBIND11_MODULE(chess_engine, m)
                        "Transposition table hits")
          .def_readonly("tt_misses", &SearchStats::ttMisses,
                        "Transposition table misses")
+         .def_readonly("pawn_hits", &SearchStats::pawnHits,
+                       "Pawn hash table hits")
+         .def_readonly("pawn_misses", &SearchStats::pawnMisses,
+                       "Pawn hash table misses")
+         .def_readonly("tb_hits", &SearchStats::tbHits,
+                       "Successful tablebase probes")
          .def_readonly("beta_cutoffs", &SearchStats::betaCutoffs,
                        "Number of beta cutoffs")
          .def_readonly("first_move_cutoffs", &SearchStats::firstMoveCutoffs,
                        "Beta cutoffs on first move")
          .def_readonly("max_depth_reached", &SearchStats::maxDepthReached,
                        "Maximum depth reached")
+         .def_readonly("sel_depth", &SearchStats::selDepth,
+                       "Deepest ply reached, quiescence included")
          .def_readonly("time_elapsed", &SearchStats::timeElapsed,
                        "Time elapsed in seconds")
          .def("get_nodes_per_second", &SearchStats::getNodesPerSecond,
               "Calculate nodes per second")
+         .def("get_pawn_hit_rate", &SearchStats::getPawnHitRate,
+              "Fraction of pawn hash probes that hit")
          .def("get_branching_factor", &SearchStats::getBranchingFactor,
               "Calculate effective branching factor")
          .def("__repr__", [](const SearchStats &s)
               { return "<SearchStats nodes=" + std::to_string(s.nodesSearched) +
                        " nps=" + std::to_string((int)s.getNodesPerSecond()) + ">"; });
 
-     py::class_<SearchEngine>(m, "SearchEngine")
+     py::class_<IterationInfo>(m, "IterationInfo")
+         .def_readonly("depth", &IterationInfo::depth,
+                       "Completed depth")
+         .def_readonly("seldepth", &IterationInfo::selDepth,
+                       "Deepest ply reached so far")
+         .def_readonly("score", &IterationInfo::score,
+                       "Score in centipawns (side to move)")
+         .def_readonly("nodes", &IterationInfo::nodes,
+                       "Nodes searched so far (main thread)")
+         .def_readonly("nps", &IterationInfo::nps,
+                       "Nodes per second")
+         .def_readonly("tb_hits", &IterationInfo::tbHits,
+                       "Tablebase hits so far (main thread)")
+         .def_readonly("time_ms", &IterationInfo::timeMs,
+                       "Elapsed time in milliseconds")
+         .def_readonly("pv", &IterationInfo::pv,
+                       "Principal variation")
+         .def_readonly("multipv", &IterationInfo::multiPV,
+                       "Line index (1 = best) in MultiPV mode")
+         .def("__repr__", [](const IterationInfo &i)
+              { return "<IterationInfo depth=" + std::to_string(i.depth) +
+                       " score=" + std::to_string(i.score) +
+                       " pv=" + (i.pv.empty() ? std::string("-") : i.pv[0].toUCI()) + ">"; });
+
+     py::class_<SearchResult>(m, "SearchResult")
+         .def_readonly("best_move", &SearchResult::bestMove)
+         .def_readonly("ponder_move", &SearchResult::ponderMove,
+                       "Expected reply (second PV move), null move if unknown")
+         .def_readonly("score", &SearchResult::score,
+                       "Score in centipawns or mate score (side to move, last completed depth)")
+         .def_readonly("is_mate", &SearchResult::isMate)
+         .def_readonly("mate_in", &SearchResult::mateIn,
+                       "Moves to mate if is_mate: > 0 side to move mates, <= 0 gets mated")
+         .def_readonly("depth", &SearchResult::depth,
+                       "Last completed depth")
+         .def_readonly("seldepth", &SearchResult::selDepth)
+         .def_readonly("pv", &SearchResult::pv,
+                       "Principal variation starting with best_move")
+         .def_readonly("nodes", &SearchResult::nodes,
+                       "Nodes searched by all threads")
+         .def_readonly("tb_hits", &SearchResult::tbHits)
+         .def_readonly("hashfull", &SearchResult::hashfull,
+                       "Permille of the transposition table in use")
+         .def_readonly("time_ms", &SearchResult::timeMs)
+         .def_readonly("from_book", &SearchResult::fromBook,
+                       "Move came from the opening book (no search)")
+         .def("__repr__", [](const SearchResult &r)
+              { return "<SearchResult " + r.bestMove.toUCI() +
+                       (r.isMate ? " mate=" + std::to_string(r.mateIn) : " score=" + std::to_string(r.score)) +
+                       " depth=" + std::to_string(r.depth) + " nodes=" + std::to_string(r.nodes) + ">"; });
+
+     py::class_<TimeManager>(m, "TimeManager")
+         .def(py::init<>())
+         .def("init", &TimeManager::init,
+              "Budgets for a new search (milliseconds). time_left < 0: no clock;\n"
+              "move_time > 0: fixed budget; moves_to_go 0: sudden death",
+              py::arg("time_left"),
+              py::arg("increment") = 0,
+              py::arg("moves_to_go") = 0,
+              py::arg("move_time") = 0,
+              py::arg("game_ply") = 0)
+         .def("stop_after_iteration", &TimeManager::stopAfterIteration,
+              "Feed a completed depth; True if no further depth should be started",
+              py::arg("depth"),
+              py::arg("best_move"),
+              py::arg("score"),
+              py::arg("best_move_node_share"),
+              py::arg("elapsed_ms"))
+         .def("ponderhit", &TimeManager::ponderhit,
+              "Pondered move played after elapsed_ms: the maximum counts from now,\n"
+              "ponder time counts toward the optimum",
+              py::arg("elapsed_ms"))
+         .def_property_readonly("optimum", &TimeManager::getOptimum,
+                                "Time a search normally uses (ms, 0 = unlimited)")
+         .def_property_readonly("maximum", &TimeManager::getMaximum,
+                                "Hard limit inside an iteration (ms, 0 = unlimited)")
+         .def_property_readonly("managed", &TimeManager::isManaged,
+                                "Budgets come from a clock")
+         .def_property("move_overhead", &TimeManager::getMoveOverhead, &TimeManager::setMoveOverhead)
+         .def("__repr__", [](const TimeManager &t)
+              { return "<TimeManager optimum=" + std::to_string(t.getOptimum()) +
+                       " maximum=" + std::to_string(t.getMaximum()) + ">"; });
+
+     py::class_<TTEntry>(m, "TTEntry")
+         .def_readonly("best_move", &TTEntry::bestMove)
+         .def_readonly("score", &TTEntry::score)
+         .def_readonly("static_eval", &TTEntry::staticEval,
+                       "Static evaluation (SCORE_NONE if not stored)")
+         .def_readonly("depth", &TTEntry::depth)
+         .def_readonly("flag", &TTEntry::flag,
+                       "TT_EXACT, TT_ALPHA (upper bound) or TT_BETA (lower bound)")
+         .def_readonly("age", &TTEntry::age)
+         .def("__repr__", [](const TTEntry &e)
+              { return "<TTEntry " + e.bestMove.toUCI() + " score=" + std::to_string(e.score) +
+                       " depth=" + std::to_string(e.depth) + ">"; });
+
+     py::class_<TranspositionTable>(m, "TranspositionTable")
          .def(py::init<size_t>(),
+              "Lockless table of 4-slot clusters (the search engine owns its own)",
+              py::arg("size_mb") = 16)
+         .def("probe", [](const TranspositionTable &tt, uint64_t hash) -> py::object
+              {
+            TTEntry entry;
+            return tt.probe(hash, entry) ? py::cast(entry) : py::object(py::none()); },
+              "TTEntry stored for the hash, None if missing (or failing the key check)",
+              py::arg("hash"))
+         .def("store", [](TranspositionTable &tt, uint64_t hash, const Move &bestMove, Score score, int depth,
+                          uint8_t flag, Score staticEval)
+              { tt.store(hash, bestMove, score, depth, flag, staticEval); },
+              py::arg("hash"),
+              py::arg("best_move"),
+              py::arg("score"),
+              py::arg("depth"),
+              py::arg("flag"),
+              py::arg("static_eval") = SCORE_NONE)
+         .def("clear", &TranspositionTable::clear)
+         .def("resize", &TranspositionTable::resize, py::arg("size_mb"))
+         .def("new_search", &TranspositionTable::incrementAge,
+              "Start a new search generation (older entries are replaced first)")
+         .def_property_readonly("age", &TranspositionTable::getAge)
+         .def("hashfull", &TranspositionTable::hashfull,
+              "Permille of sampled slots written during the current search")
+         .def_property_readonly("num_entries", &TranspositionTable::getNumEntries)
+         .def("cluster_index", &TranspositionTable::getClusterIndex,
+              "Cluster the hash maps to",
+              py::arg("hash"))
+         .def("get_slot", [](const TranspositionTable &tt, uint64_t hash, int index)
+              {
+            uint64_t key, data;
+            tt.getSlot(hash, index, key, data);
+            return py::make_tuple(key, data); },
+              "Raw (key, data) words of a slot in the hash's cluster (key = hash ^ data)",
+              py::arg("hash"),
+              py::arg("index"))
+         .def("set_slot", &TranspositionTable::setSlot,
+              "Overwrite the raw words of a slot (testing)",
+              py::arg("hash"),
+              py::arg("index"),
+              py::arg("key"),
+              py::arg("data"));
+
+     py::class_<PVLine>(m, "PVLine")
+         .def_readonly("move", &PVLine::move,
+                       "Root move of the line")
+         .def_readonly("score", &PVLine::score,
+                       "Score in centipawns (side to move)")
+         .def_readonly("depth", &PVLine::depth,
+                       "Depth the line was completed at")
+         .def_readonly("pv", &PVLine::pv,
+                       "Principal variation starting with move")
+         .def("__repr__", [](const PVLine &l)
+              { return "<PVLine " + l.move.toUCI() + " score=" + std::to_string(l.score) +
+                       " depth=" + std::to_string(l.depth) + ">"; });
+
+     py::class_<SearchEngine, std::unique_ptr<SearchEngine, SearchEngineDeleter>>(m, "SearchEngine")
+         .def(py::init<size_t, int>(),
               "Create search engine",
-              py::arg("tt_size_mb") = 256)
+              py::arg("tt_size_mb") = 256,
+              py::arg("threads") = 1)
 
-         // Main search interface
-         .def("get_best_move", &SearchEngine::getBestMove,
-              "Search for best move",
+         // Main search interface (GIL released while searching)
+         .def("get_best_move", [](SearchEngine &e, Board &board, int maxDepth, int timeLimit, py::object infoCallback)
+              {
+            installInfoCallback(e, infoCallback, false);
+            py::gil_scoped_release release;
+            return e.getBestMove(board, maxDepth, timeLimit); },
               py::arg("board"),
               py::arg("max_depth") = 6,
               py::arg("time_limit") = 5000,
+              py::arg("info_callback") = py::none(),
               "Search the position and return best move.\n"
+              "The GIL is released during the search.\n"
               "Args:\n"
               "    board: Board to search\n"
               "    max_depth: Maximum search depth (default 6)\n"
               "    time_limit: Time limit in milliseconds (default 5000)\n"
+              "    info_callback: Optional callable(IterationInfo) called after each depth\n"
               "Returns:\n"
               "    Best move found")
 
+         .def("search", [](SearchEngine &e, Board &board, int maxDepth, int timeLimit, int timeLeft, int increment,
+                           int movesToGo, py::object infoCallback)
+              {
+            installInfoCallback(e, infoCallback, false);
+            py::gil_scoped_release release;
+            return e.search(board, makeLimits(maxDepth, timeLimit, timeLeft, increment, movesToGo)); },
+              py::arg("board"),
+              py::arg("max_depth") = 6,
+              py::arg("time_limit") = 5000,
+              py::arg("time_left") = -1,
+              py::arg("increment") = 0,
+              py::arg("moves_to_go") = 0,
+              py::arg("info_callback") = py::none(),
+              "Search like get_best_move and return the full SearchResult\n"
+              "(best/ponder move, score or mate, PV, depth, seldepth, nodes, tbhits, hashfull, time).\n"
+              "With time_left >= 0 (milliseconds on the side to move's clock, plus increment and\n"
+              "moves_to_go, 0 = sudden death) the time manager budgets the move and time_limit is ignored.")
+         .def("get_result", &SearchEngine::getResult,
+              "SearchResult of the last finished search (call wait() first for start_search)")
+
+         // Time management
+         .def("set_move_overhead", &SearchEngine::setMoveOverhead,
+              "Milliseconds kept back per clock-based move for GUI / network lag",
+              py::arg("ms"))
+         .def("get_move_overhead", &SearchEngine::getMoveOverhead)
+         .def("get_time_manager", &SearchEngine::getTimeManager, py::return_value_policy::copy,
+              "Copy of the time manager of the last search (optimum/maximum budgets)")
+
+         // MultiPV
+         .def("set_multi_pv", &SearchEngine::setMultiPV,
+              "Number of root lines searched (1 = normal search); stops a running search",
+              py::call_guard<py::gil_scoped_release>(),
+              py::arg("lines"))
+         .def("get_multi_pv", &SearchEngine::getMultiPV)
+         .def("get_pv_lines", &SearchEngine::getPVLines,
+              "Root lines (PVLine) of the last search, best first")
+         .def("search_multi_pv", [](SearchEngine &e, Board &board, int lines, int maxDepth, int timeLimit, py::object infoCallback)
+              {
+            installInfoCallback(e, infoCallback, false);
+            py::gil_scoped_release release;
+            int previous = e.getMultiPV();
+            e.setMultiPV(lines);
+            e.getBestMove(board, maxDepth, timeLimit);
+            e.setMultiPV(previous);
+            return e.getPVLines(); },
+              py::arg("board"),
+              py::arg("lines") = 3,
+              py::arg("max_depth") = 6,
+              py::arg("time_limit") = 5000,
+              py::arg("info_callback") = py::none(),
+              "Search the best `lines` root moves in one iterative-deepening run.\n"
+              "Returns a list of PVLine (move, score, depth, pv), best first")
+
+         // Asynchronous search
+         .def("start_search", [](SearchEngine &e, const Board &board, int maxDepth, int timeLimit, int timeLeft,
+                                 int increment, int movesToGo, py::object infoCallback)
+              {
+            installInfoCallback(e, infoCallback, true);
+            py::gil_scoped_release release;
+            e.startSearch(board, makeLimits(maxDepth, timeLimit, timeLeft, increment, movesToGo)); },
+              py::arg("board"),
+              py::arg("max_depth") = 6,
+              py::arg("time_limit") = 5000,
+              py::arg("time_left") = -1,
+              py::arg("increment") = 0,
+              py::arg("moves_to_go") = 0,
+              py::arg("info_callback") = py::none(),
+              "Start searching a copy of the board on a background thread and return immediately.\n"
+              "Clock arguments as in search().\n"
+              "info_callback(IterationInfo), if given, is called from that thread after each depth.")
+         // Pondering
+         .def("start_ponder", [](SearchEngine &e, const Board &board, int maxDepth, int timeLimit, int timeLeft,
+                                 int increment, int movesToGo, py::object infoCallback)
+              {
+            installInfoCallback(e, infoCallback, true);
+            Move move;
+            {
+                py::gil_scoped_release release;
+                move = e.startPonder(board, makeLimits(maxDepth, timeLimit, timeLeft, increment, movesToGo));
+            }
+            return move.isNull() ? py::object(py::none()) : py::cast(move); },
+              py::arg("board"),
+              py::arg("max_depth") = 6,
+              py::arg("time_limit") = 5000,
+              py::arg("time_left") = -1,
+              py::arg("increment") = 0,
+              py::arg("moves_to_go") = 0,
+              py::arg("info_callback") = py::none(),
+              "After playing the last result's best move on board, search the expected reply\n"
+              "(SearchResult.ponder_move) in the background while the opponent thinks.\n"
+              "The limits (as in search()) apply from ponderhit().\n"
+              "Returns the pondered Move, or None if there is nothing to ponder on")
+         .def("ponderhit", &SearchEngine::ponderhit,
+              "The opponent played the pondered move: continue as a timed search\n"
+              "(ends at once if the ponder time already covers the budget); then wait()")
+         .def("ponder_miss", &SearchEngine::ponderMiss,
+              "The opponent played another move: abort the ponder search (TT entries are kept)",
+              py::call_guard<py::gil_scoped_release>())
+         .def("is_pondering", &SearchEngine::isPondering,
+              "True from start_ponder() until ponderhit() or ponder_miss()")
+         .def_property_readonly("ponder_move", [](const SearchEngine &e)
+                                {
+            Move move = e.getPonderMove();
+            return move.isNull() ? py::object(py::none()) : py::cast(move); },
+                                "Move the running ponder search assumes (None if not pondering)")
+
+         .def("wait", &SearchEngine::wait,
+              "Wait for the background search to finish and return its best move",
+              py::call_guard<py::gil_scoped_release>())
+         .def("is_searching", &SearchEngine::isSearching,
+              "True while a background search is running")
+
          // Stop search
          .def("stop", &SearchEngine::stop,
               "Stop search immediately")
 
+         // Opening book (set_book / clear_book stop a running search)
+         .def("set_book", &SearchEngine::setBook,
+              "Open a Polyglot book consulted before each search; False if it cannot be opened",
+              py::call_guard<py::gil_scoped_release>(),
+              py::arg("path"))
+         .def("clear_book", &SearchEngine::clearBook,
+              "Close the opening book",
+              py::call_guard<py::gil_scoped_release>())
+         .def("has_book", &SearchEngine::hasBook,
+              "True if an opening book is open")
+         .def("set_book_depth", &SearchEngine::setBookDepth,
+              "Use the book up to this game ply (half-move); 0 = no limit",
+              py::arg("plies"))
+         .def("get_book_depth", &SearchEngine::getBookDepth,
+              "Get book depth limit in plies")
+         .def("set_book_random", &SearchEngine::setBookRandom,
+              "Pick book moves at random by weight instead of the highest weight",
+              py::arg("random"))
+         .def("probe_book", &SearchEngine::probeBook,
+              "Book move for the position (null move if none)",
+              py::arg("board"))
+
+         // Syzygy tablebases
+         .def("set_syzygy_path", &SearchEngine::setSyzygyPath,
+              "Load Syzygy tables from directories (';'-separated, ':' also outside Windows); "
+              "returns the number of tables, empty path disables probing",
+              py::call_guard<py::gil_scoped_release>(),
+              py::arg("path"))
+         .def("set_syzygy_probe_depth", &SearchEngine::setSyzygyProbeDepth,
+              "Minimum depth for probing positions with the largest table size",
+              py::arg("depth"))
+         .def("get_syzygy_probe_depth", &SearchEngine::getSyzygyProbeDepth,
+              "Get tablebase probe depth")
+         .def("get_tb_cardinality", [](const SearchEngine &e)
+              { return e.getTablebases() ? e.getTablebases()->getMaxCardinality() : 0; },
+              "Largest number of pieces covered by the loaded tables (0 if none)")
+         .def("probe_wdl", [](SearchEngine &e, const Board &board) -> py::object
+              {
+            if (!e.getTablebases() || board.getCastlingRights() ||
+                board.getKingSquare(WHITE) == NO_SQUARE || board.getKingSquare(BLACK) == NO_SQUARE)
+                return py::none();
+            Board copy = board;
+            ProbeState result;
+            int wdl = e.getTablebases()->probeWDL(copy, result);
+            return result == PROBE_FAIL ? py::none() : py::object(py::int_(wdl)); },
+              "Tablebase WDL for the side to move (-2 loss .. 2 win), None if not in the tables",
+              py::arg("board"))
+         .def("probe_dtz", [](SearchEngine &e, const Board &board) -> py::object
+              {
+            if (!e.getTablebases() || board.getCastlingRights() ||
+                board.getKingSquare(WHITE) == NO_SQUARE || board.getKingSquare(BLACK) == NO_SQUARE)
+                return py::none();
+            Board copy = board;
+            ProbeState result;
+            int dtz = e.getTablebases()->probeDTZ(copy, result);
+            return result == PROBE_FAIL ? py::none() : py::object(py::int_(dtz)); },
+              "Tablebase distance to zeroing in plies (signed), None if not in the tables",
+              py::arg("board"))
+
+         // Lazy SMP
+         .def("set_threads", &SearchEngine::setThreads,
+              "Set number of search threads (helpers share the TT); stops a running search",
+              py::call_guard<py::gil_scoped_release>(),
+              py::arg("threads"))
+         .def("get_threads", &SearchEngine::getThreads,
+              "Get number of search threads")
+
          // Statistics
          .def("get_stats", &SearchEngine::getStats,
               "Get search statistics",
@@ -217,12 +759,16 @@ PYBIND11_MODULE(chess_engine, m)
          .def("get_nodes_searched", &SearchEngine::getNodesSearched,
               "Get total nodes searched")
 
-         // TT management
+         // TT management (a running search is stopped first)
          .def("clear_tt", &SearchEngine::clearTT,
-              "Clear transposition table")
+              "Clear transposition table",
+              py::call_guard<py::gil_scoped_release>())
          .def("resize_tt", &SearchEngine::resizeTT,
               "Resize transposition table",
+              py::call_guard<py::gil_scoped_release>(),
               py::arg("size_mb"))
+         .def("get_hashfull", &SearchEngine::getHashfull,
+              "Permille of the transposition table used by the current search")
 
          .def("__repr__", [](const SearchEngine &e)
               { return "<SearchEngine nodes=" +
@@ -232,6 +778,18 @@ PYBIND11_MODULE(chess_engine, m)
      // EVALUATION
      // ========================================================================
 
+     PYBIND11_NUMPY_DTYPE_EX(Evaluator::EvalBreakdown,
+                             material, "material",
+                             pst, "pst",
+                             pawnStructure, "pawn_structure",
+                             kingSafety, "king_safety",
+                             mobility, "mobility",
+                             threats, "threats",
+                             openingPrinciples, "opening_principles",
+                             endgame, "endgame",
+                             rooksOnOpenFile, "rooks_on_open_file",
+                             total, "total");
+
      py::class_<Evaluator::EvalBreakdown>(m, "EvalBreakdown")
          .def_readonly("material", &Evaluator::EvalBreakdown::material)
          .def_readonly("pst", &Evaluator::EvalBreakdown::pst)
@@ -247,14 +805,32 @@ PYBIND11_MODULE(chess_engine, m)
               { return "<EvalBreakdown total=" + std::to_string(e.total) + "cp>"; });
 
      py::class_<Evaluator>(m, "Evaluator")
-         .def_static("evaluate", &Evaluator::evaluate,
+         .def_static("evaluate", [](const Board &board)
+                     { return Evaluator::evaluate(board); },
                      "Evaluate position from side to move perspective",
                      py::arg("board"),
                      "Returns evaluation score in centipawns")
-         .def_static("evaluate_detailed", &Evaluator::evaluateDetailed,
+         .def_static("evaluate_detailed", [](const Board &board)
+                     { return Evaluator::evaluateDetailed(board); },
                      "Get detailed evaluation breakdown",
                      py::arg("board"),
-                     "Returns EvalBreakdown with component scores");
+                     "Returns EvalBreakdown with component scores")
+         .def_static("evaluate_batch", [](const py::object &positions, int threads)
+                     { return evaluatePositions(positions, threads, false); },
+                     "Evaluate many positions (FEN strings, Boards or a buffer of packed positions) "
+                     "without the GIL; "
+                     "threads=0 uses all cores. Returns an int16 array, side to move perspective",
+                     py::arg("positions"),
+                     py::arg("threads") = 1)
+         .def_static("evaluate_detailed_batch", [](const py::object &positions, int threads)
+                     { return evaluatePositions(positions, threads, true); },
+                     "Evaluation breakdowns of many positions as a structured array "
+                     "with one int16 field per EvalBreakdown component",
+                     py::arg("positions"),
+                     py::arg("threads") = 1)
+         .def_static("verify_incremental", &Evaluator::verifyIncremental,
+                     "Check the board's running material/PST sums against a full recompute",
+                     py::arg("board"));
 
      // ========================================================================
      // MOVE GENERATION
@@ -280,22 +856,41 @@ PYBIND11_MODULE(chess_engine, m)
                      "Generate all legal moves",
                      py::arg("board"),
                      py::arg("moves"))
+         .def_static("generate_legal_moves_slow", &MoveGenerator::generateLegalMovesSlow,
+                     "Generate all legal moves by trial make/check (reference, for cross-checking)",
+                     py::arg("board"),
+                     py::arg("moves"))
          .def_static("generate_captures", &MoveGenerator::generateCaptures,
-                     "Generate capture moves only",
+                     "Generate legal capture moves only",
                      py::arg("board"),
                      py::arg("moves"))
          .def_static("is_legal", &MoveGenerator::isLegal,
                      "Check if move is legal",
                      py::arg("board"),
-                     py::arg("move"));
+                     py::arg("move"))
+         .def_static("perft", &MoveGenerator::perft,
+                     "Count leaf nodes of the legal move tree (board is restored)",
+                     py::arg("board"),
+                     py::arg("depth"),
+                     py::call_guard<py::gil_scoped_release>())
+         .def_static("divide", &MoveGenerator::divide,
+                     "Perft count per root move as [(move, nodes)]",
+                     py::arg("board"),
+                     py::arg("depth"),
+                     py::call_guard<py::gil_scoped_release>());
 
      // ========================================================================
      // CONSTANTS
      // ========================================================================
 
      m.attr("SCORE_INFINITE") = SCORE_INFINITE;
+     m.attr("PACKED_BOARD_SIZE") = PACKED_BOARD_SIZE;
      m.attr("SCORE_MATE") = SCORE_MATE;
      m.attr("SCORE_DRAW") = SCORE_DRAW;
+     m.attr("SCORE_NONE") = SCORE_NONE;
+     m.attr("TT_EXACT") = (int)TT_EXACT;
+     m.attr("TT_ALPHA") = (int)TT_ALPHA;
+     m.attr("TT_BETA") = (int)TT_BETA;
 
      // Piece values
      m.attr("PAWN_VALUE") = PIECE_VALUES[PAWN];
@@ -314,6 +909,23 @@ PYBIND11_MODULE(chess_engine, m)
         AttackTables::init();
         Zobrist::init(); }, "Initialize attack tables and zobrist keys");
 
+     m.def("uses_pext", []()
+           {
+        if (!AttackTables::initialized) AttackTables::init();
+        return AttackTables::usesPext(); }, "True if slider attacks are indexed with BMI2 PEXT instead of magics");
+
+     m.def("set_pext", [](bool enable)
+           {
+        if (!AttackTables::initialized) AttackTables::init();
+        return AttackTables::setPext(enable); }, "Enable/disable PEXT indexing (ignored without BMI2); returns the mode in use", py::arg("enable"));
+
+     m.def("cpu_has_bmi2", &AttackTables::cpuHasBmi2, "True if the CPU supports BMI2 (PEXT)");
+
+     m.def("verify_attack_tables", []()
+           {
+        if (!AttackTables::initialized) AttackTables::init();
+        return AttackTables::verify(); }, "Check every slider table entry against the slow ray generators");
+
      m.def("square_to_string", [](Square sq) -> std::string
            {
         if (sq == NO_SQUARE) return "-";
@@ -1,5 +1,8 @@
 #include "board.h"
 #include "movegen.h"
+#include "evaluation.h"
+#include "polyglot.h"
+#include <algorithm>
 #include <random>
 #include <sstream>
 #include <iostream>
@@ -51,10 +54,24 @@ Board::Board()
     {
         Zobrist::init();
         AttackTables::init();
+        Evaluator::initTables();
         zobristInit = true;
     }
 
-    // Clear board
+    resetBoard();
+
+    sideToMove = WHITE;
+    castlingRights = NO_CASTLING;
+    enPassantSquare = NO_SQUARE;
+    halfMoveClock = 0;
+    fullMoveNumber = 1;
+    hash = 0;
+    pawnKey = 0;
+}
+
+// Helper: empty the board
+void Board::resetBoard()
+{
     for (int c = 0; c < 3; c++)
         occupied[c] = 0;
     for (int c = 0; c < 2; c++)
@@ -70,12 +87,37 @@ Board::Board()
         pieceColors[sq] = NO_COLOR;
     }
 
-    sideToMove = WHITE;
-    castlingRights = NO_CASTLING;
-    enPassantSquare = NO_SQUARE;
-    halfMoveClock = 0;
-    fullMoveNumber = 1;
+    materialScore = 0;
+    psqMg = 0;
+    psqEg = 0;
+    phase = 0;
+}
+
+// Recompute the Zobrist and pawn keys from scratch
+void Board::computeKeys()
+{
     hash = 0;
+    pawnKey = 0;
+    for (int sq = 0; sq < 64; sq++)
+    {
+        if (pieceTypes[sq] != NO_PIECE_TYPE)
+        {
+            hash ^= Zobrist::psq[pieceColors[sq]][pieceTypes[sq]][sq];
+        }
+        if (pieceTypes[sq] == PAWN)
+        {
+            pawnKey ^= Zobrist::psq[pieceColors[sq]][PAWN][sq];
+        }
+    }
+    hash ^= Zobrist::castling[castlingRights];
+    if (enPassantSquare != NO_SQUARE)
+    {
+        hash ^= Zobrist::enpassant[fileOf(enPassantSquare)];
+    }
+    if (sideToMove == BLACK)
+    {
+        hash ^= Zobrist::sideToMove;
+    }
 }
 
 // Initialize starting position
@@ -88,20 +130,7 @@ void Board::initStartPosition()
 bool Board::fromFEN(const std::string &fen)
 {
     // Clear board first
-    for (int c = 0; c < 3; c++)
-        occupied[c] = 0;
-    for (int c = 0; c < 2; c++)
-    {
-        for (int pt = 0; pt < 7; pt++)
-        {
-            pieces[c][pt] = 0;
-        }
-    }
-    for (int sq = 0; sq < 64; sq++)
-    {
-        pieceTypes[sq] = NO_PIECE_TYPE;
-        pieceColors[sq] = NO_COLOR;
-    }
+    resetBoard();
     history.clear();
 
     std::istringstream ss(fen);
@@ -150,6 +179,8 @@ bool Board::fromFEN(const std::string &fen)
                 return false;
             }
 
+            if (sq < 0 || sq >= 64)
+                return false;
             putPiece(color, pt, Square(sq));
             sq++;
         }
@@ -171,17 +202,20 @@ bool Board::fromFEN(const std::string &fen)
     if (token.find('q') != std::string::npos)
         castlingRights |= BLACK_OOO;
 
-    // Parse en passant
+    // Parse en passant (kept only if a pawn can capture, as in makeMove, so a
+    // dead en passant square does not change the hash)
     ss >> token;
-    if (token != "-")
+    enPassantSquare = NO_SQUARE;
+    if (token != "-" && token.size() >= 2)
     {
         int file = token[0] - 'a';
         int rank = token[1] - '1';
-        enPassantSquare = makeSquare(file, rank);
-    }
-    else
-    {
-        enPassantSquare = NO_SQUARE;
+        if (file >= 0 && file < 8 && rank >= 0 && rank < 8)
+        {
+            Square epSq = makeSquare(file, rank);
+            if (AttackTables::getPawnAttacks(~sideToMove, epSq) & pieces[sideToMove][PAWN])
+                enPassantSquare = epSq;
+        }
     }
 
     // Parse halfmove clock
@@ -196,24 +230,7 @@ bool Board::fromFEN(const std::string &fen)
     else
         fullMoveNumber = 1;
 
-    // Calculate hash
-    hash = 0;
-    for (int sq = 0; sq < 64; sq++)
-    {
-        if (pieceTypes[sq] != NO_PIECE_TYPE)
-        {
-            hash ^= Zobrist::psq[pieceColors[sq]][pieceTypes[sq]][sq];
-        }
-    }
-    hash ^= Zobrist::castling[castlingRights];
-    if (enPassantSquare != NO_SQUARE)
-    {
-        hash ^= Zobrist::enpassant[fileOf(enPassantSquare)];
-    }
-    if (sideToMove == BLACK)
-    {
-        hash ^= Zobrist::sideToMove;
-    }
+    computeKeys();
 
     return true;
 }
@@ -323,6 +340,87 @@ std::string Board::toFEN() const
     return fen.str();
 }
 
+// True if an en passant capture is legal (python-chess has_legal_en_passant),
+// so both encoders write the same record for the same position
+static bool hasLegalEnPassant(const Board &board)
+{
+    if (board.getEnPassantSquare() == NO_SQUARE)
+        return false;
+
+    MoveList moves;
+    MoveGenerator::generateLegalMoves(board, moves);
+    for (const Move &move : moves)
+    {
+        if (move.isEnPassant())
+            return true;
+    }
+    return false;
+}
+
+// Pack into the 32-byte format described in board.h
+bool Board::toPacked(uint8_t *out) const
+{
+    Bitboard occ = getAllOccupied();
+    if (popcount(occ) > 32)
+        return false;
+
+    std::fill(out, out + PACKED_BOARD_SIZE, uint8_t(0));
+    for (int i = 0; i < 8; i++)
+        out[i] = uint8_t(occ >> (8 * i));
+
+    int index = 0;
+    while (occ)
+    {
+        Square sq = popLsb(occ);
+        uint8_t code = uint8_t(pieceColors[sq] * 6 + pieceTypes[sq]);
+        out[8 + index / 2] |= (index & 1) ? uint8_t(code << 4) : code;
+        index++;
+    }
+
+    out[24] = uint8_t(sideToMove);
+    out[25] = castlingRights;
+    out[26] = uint8_t(hasLegalEnPassant(*this) ? enPassantSquare : NO_SQUARE);
+    out[27] = uint8_t(std::min<uint16_t>(halfMoveClock, 255));
+    out[28] = uint8_t(fullMoveNumber & 0xFF);
+    out[29] = uint8_t((fullMoveNumber >> 8) & 0xFF);
+    return true;
+}
+
+// Unpack the 32-byte format (no move history)
+bool Board::fromPacked(const uint8_t *data)
+{
+    resetBoard();
+    history.clear();
+
+    Bitboard occ = 0;
+    for (int i = 0; i < 8; i++)
+        occ |= Bitboard(data[i]) << (8 * i);
+    if (popcount(occ) > 32)
+        return false;
+
+    int index = 0;
+    while (occ)
+    {
+        Square sq = popLsb(occ);
+        uint8_t code = (data[8 + index / 2] >> ((index & 1) * 4)) & 0xF;
+        if (code >= 12)
+            return false;
+        putPiece(Color(code / 6), PieceType(code % 6), sq);
+        index++;
+    }
+
+    if (data[24] > 1 || data[25] > 15 || data[26] > NO_SQUARE)
+        return false;
+    sideToMove = Color(data[24]);
+    castlingRights = data[25];
+    enPassantSquare = Square(data[26]);
+    halfMoveClock = data[27];
+    fullMoveNumber = uint32_t(data[28]) | (uint32_t(data[29]) << 8);
+
+    computeKeys();
+    return true;
+}
+
 // Helper: put piece on square
 void Board::putPiece(Color c, PieceType pt, Square sq)
 {
@@ -330,6 +428,11 @@ void Board::putPiece(Color c, PieceType pt, Square sq)
     occupied[c] |= bit(sq);
     pieceTypes[sq] = pt;
     pieceColors[sq] = c;
+
+    materialScore += Evaluator::materialTable[c][pt];
+    psqMg += Evaluator::psqtMg[c][pt][sq];
+    psqEg += Evaluator::psqtEg[c][pt][sq];
+    phase += Evaluator::PHASE_WEIGHT[pt];
 }
 
 // Helper: clear square
@@ -344,6 +447,11 @@ void Board::clearSquare(Square sq)
         occupied[c] &= ~bit(sq);
         pieceTypes[sq] = NO_PIECE_TYPE;
         pieceColors[sq] = NO_COLOR;
+
+        materialScore -= Evaluator::materialTable[c][pt];
+        psqMg -= Evaluator::psqtMg[c][pt][sq];
+        psqEg -= Evaluator::psqtEg[c][pt][sq];
+        phase -= Evaluator::PHASE_WEIGHT[pt];
     }
 }
 
@@ -359,9 +467,49 @@ void Board::movePiece(Color c, PieceType pt, Square from, Square to)
     pieceColors[from] = NO_COLOR;
     pieceTypes[to] = pt;
     pieceColors[to] = c;
+
+    psqMg += Evaluator::psqtMg[c][pt][to] - Evaluator::psqtMg[c][pt][from];
+    psqEg += Evaluator::psqtEg[c][pt][to] - Evaluator::psqtEg[c][pt][from];
 }
 
-// Make move (template - needs full implementation)
+// Castling rights kept when a piece moves from or to a square
+static uint8_t castlingMask(Square sq)
+{
+    switch (sq)
+    {
+    case A1:
+        return ANY_CASTLING & ~WHITE_OOO;
+    case H1:
+        return ANY_CASTLING & ~WHITE_OO;
+    case E1:
+        return ANY_CASTLING & ~(WHITE_OO | WHITE_OOO);
+    case A8:
+        return ANY_CASTLING & ~BLACK_OOO;
+    case H8:
+        return ANY_CASTLING & ~BLACK_OO;
+    case E8:
+        return ANY_CASTLING & ~(BLACK_OO | BLACK_OOO);
+    default:
+        return ANY_CASTLING;
+    }
+}
+
+// Rook squares for a castling move
+static void castlingRookSquares(const Move &move, Square &rookFrom, Square &rookTo)
+{
+    if (move.flags() == KING_CASTLE)
+    {
+        rookFrom = Square(move.to() + 1);
+        rookTo = Square(move.to() - 1);
+    }
+    else
+    {
+        rookFrom = Square(move.to() - 2);
+        rookTo = Square(move.to() + 1);
+    }
+}
+
+// Make move
 void Board::makeMove(const Move &move)
 {
     // Save state for unmake
@@ -370,16 +518,16 @@ void Board::makeMove(const Move &move)
     state.enPassantSquare = enPassantSquare;
     state.halfMoveClock = halfMoveClock;
     state.hash = hash;
+    state.pawnKey = pawnKey;
     state.capturedPiece = NO_PIECE_TYPE;
-    history.push_back(state);
 
     Square from = move.from();
     Square to = move.to();
     PieceType pt = pieceTypeAt(from);
     Color us = sideToMove;
+    Color them = ~us;
 
-    // Update hash
-    hash ^= Zobrist::psq[us][pt][from];
+    // Remove old castling / en passant keys
     hash ^= Zobrist::castling[castlingRights];
     if (enPassantSquare != NO_SQUARE)
     {
@@ -387,39 +535,81 @@ void Board::makeMove(const Move &move)
     }
 
     // Handle capture
-    if (!isEmpty(to))
+    if (move.isEnPassant())
+    {
+        Square capSq = Square(us == WHITE ? to - 8 : to + 8);
+        state.capturedPiece = PAWN;
+        clearSquare(capSq);
+        hash ^= Zobrist::psq[them][PAWN][capSq];
+        pawnKey ^= Zobrist::psq[them][PAWN][capSq];
+    }
+    else if (!isEmpty(to))
     {
         PieceType captured = pieceTypeAt(to);
         state.capturedPiece = captured;
         clearSquare(to);
-        hash ^= Zobrist::psq[~us][captured][to];
-        halfMoveClock = 0;
+        hash ^= Zobrist::psq[them][captured][to];
+        if (captured == PAWN)
+            pawnKey ^= Zobrist::psq[them][PAWN][to];
     }
+
+    if (state.capturedPiece != NO_PIECE_TYPE || pt == PAWN)
+        halfMoveClock = 0;
     else
-    {
         halfMoveClock++;
-    }
 
     // Move piece
     movePiece(us, pt, from, to);
+    hash ^= Zobrist::psq[us][pt][from];
     hash ^= Zobrist::psq[us][pt][to];
+    if (pt == PAWN)
+        pawnKey ^= Zobrist::psq[us][PAWN][from] ^ Zobrist::psq[us][PAWN][to];
 
-    // Reset en passant
-    enPassantSquare = NO_SQUARE;
+    // Promotion: replace the pawn
+    if (move.isPromotion())
+    {
+        PieceType promo = move.promotionType();
+        clearSquare(to);
+        putPiece(us, promo, to);
+        hash ^= Zobrist::psq[us][PAWN][to];
+        hash ^= Zobrist::psq[us][promo][to];
+        pawnKey ^= Zobrist::psq[us][PAWN][to];
+    }
+
+    // Castling: move the rook as well
+    if (move.isCastling())
+    {
+        Square rookFrom, rookTo;
+        castlingRookSquares(move, rookFrom, rookTo);
+        movePiece(us, ROOK, rookFrom, rookTo);
+        hash ^= Zobrist::psq[us][ROOK][rookFrom];
+        hash ^= Zobrist::psq[us][ROOK][rookTo];
+    }
 
-    // Handle special moves (castling, en passant, promotion)
-    // TODO: Implement special move handling
+    // En passant square (only if an enemy pawn can actually capture)
+    enPassantSquare = NO_SQUARE;
+    if (move.flags() == DOUBLE_PAWN_PUSH)
+    {
+        Square epSq = Square((from + to) / 2);
+        if (AttackTables::getPawnAttacks(us, epSq) & pieces[them][PAWN])
+        {
+            enPassantSquare = epSq;
+            hash ^= Zobrist::enpassant[fileOf(epSq)];
+        }
+    }
 
     // Update castling rights
-    // TODO: Update based on piece movements
+    castlingRights &= castlingMask(from) & castlingMask(to);
+    hash ^= Zobrist::castling[castlingRights];
 
     // Switch side
-    sideToMove = ~sideToMove;
+    sideToMove = them;
     hash ^= Zobrist::sideToMove;
-    hash ^= Zobrist::castling[castlingRights];
 
     if (us == BLACK)
         fullMoveNumber++;
+
+    history.push_back(state);
 }
 
 // Unmake move
@@ -436,24 +626,86 @@ void Board::unmakeMove(const Move &move)
     enPassantSquare = state.enPassantSquare;
     halfMoveClock = state.halfMoveClock;
     hash = state.hash;
+    pawnKey = state.pawnKey;
 
     // Switch side back
     sideToMove = ~sideToMove;
+    Color us = sideToMove;
+
+    if (us == BLACK)
+        fullMoveNumber--;
 
     Square from = move.from();
     Square to = move.to();
-    PieceType pt = pieceTypeAt(to);
+
+    // Undo promotion
+    if (move.isPromotion())
+    {
+        clearSquare(to);
+        putPiece(us, PAWN, to);
+    }
+
+    // Undo castling rook move
+    if (move.isCastling())
+    {
+        Square rookFrom, rookTo;
+        castlingRookSquares(move, rookFrom, rookTo);
+        movePiece(us, ROOK, rookTo, rookFrom);
+    }
 
     // Move piece back
-    movePiece(sideToMove, pt, to, from);
+    movePiece(us, pieceTypeAt(to), to, from);
 
     // Restore captured piece
-    if (state.capturedPiece != NO_PIECE_TYPE)
+    if (move.isEnPassant())
+    {
+        putPiece(~us, PAWN, Square(us == WHITE ? to - 8 : to + 8));
+    }
+    else if (state.capturedPiece != NO_PIECE_TYPE)
+    {
+        putPiece(~us, state.capturedPiece, to);
+    }
+}
+
+// Polyglot key (standard random table, see polyglot.h)
+uint64_t Board::getPolyglotKey() const
+{
+    uint64_t key = 0;
+
+    for (int c = WHITE; c <= BLACK; c++)
     {
-        putPiece(~sideToMove, state.capturedPiece, to);
+        int white = (c == WHITE) ? 1 : 0;
+        for (int pt = PAWN; pt <= KING; pt++)
+        {
+            Bitboard bb = pieces[c][pt];
+            while (bb)
+            {
+                Square sq = popLsb(bb);
+                key ^= POLYGLOT_RANDOM[64 * (2 * pt + white) + sq];
+            }
+        }
     }
 
-    // TODO: Handle special moves unmake
+    if (castlingRights & WHITE_OO)
+        key ^= POLYGLOT_RANDOM[768];
+    if (castlingRights & WHITE_OOO)
+        key ^= POLYGLOT_RANDOM[769];
+    if (castlingRights & BLACK_OO)
+        key ^= POLYGLOT_RANDOM[770];
+    if (castlingRights & BLACK_OOO)
+        key ^= POLYGLOT_RANDOM[771];
+
+    // En passant only counts if a pawn of the side to move can capture
+    if (enPassantSquare != NO_SQUARE &&
+        (AttackTables::getPawnAttacks(~sideToMove, enPassantSquare) & pieces[sideToMove][PAWN]))
+    {
+        key ^= POLYGLOT_RANDOM[772 + fileOf(enPassantSquare)];
+    }
+
+    if (sideToMove == WHITE)
+        key ^= POLYGLOT_RANDOM[780];
+
+    return key;
 }
 
 // Get king square
@@ -609,15 +861,19 @@ void Board::makeNullMove()
 {
     BoardState state;
     state.hash = hash;
+    state.pawnKey = pawnKey;
     state.castlingRights = castlingRights;
     state.enPassantSquare = enPassantSquare;
     state.halfMoveClock = halfMoveClock;
+    state.capturedPiece = NO_PIECE_TYPE;
     history.push_back(state);
 
     sideToMove = Color(1 - sideToMove);
+    hash ^= Zobrist::sideToMove;
 
     if (enPassantSquare != NO_SQUARE)
     {
+        hash ^= Zobrist::enpassant[fileOf(enPassantSquare)];
         enPassantSquare = NO_SQUARE;
     }
 
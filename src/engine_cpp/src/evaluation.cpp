@@ -1,25 +1,65 @@
 #include "evaluation.h"
 #include "movegen.h"
+#include <algorithm>
+#include <atomic>
+#include <cstdlib>
+#include <iostream>
+#include <thread>
 
 // Game phase constants
-constexpr int PHASE_PAWN = 0;
-constexpr int PHASE_KNIGHT = 1;
-constexpr int PHASE_BISHOP = 1;
-constexpr int PHASE_ROOK = 2;
-constexpr int PHASE_QUEEN = 4;
-constexpr int PHASE_MAX = 16 * PHASE_PAWN + 4 * PHASE_KNIGHT + 4 * PHASE_BISHOP + 4 * PHASE_ROOK + 2 * PHASE_QUEEN;
+constexpr int PHASE_MAX = 4 * Evaluator::PHASE_WEIGHT[KNIGHT] + 4 * Evaluator::PHASE_WEIGHT[BISHOP] +
+                          4 * Evaluator::PHASE_WEIGHT[ROOK] + 2 * Evaluator::PHASE_WEIGHT[QUEEN];
+
+int Evaluator::materialTable[2][7];
+int Evaluator::psqtMg[2][7][64];
+int Evaluator::psqtEg[2][7][64];
+
+// Build the signed material/PST tables used by Board's running sums
+void Evaluator::initTables()
+{
+    for (Color c : {WHITE, BLACK})
+    {
+        int sign = (c == WHITE) ? 1 : -1;
+
+        for (int pt = 0; pt < 7; pt++)
+        {
+            const Score *mg = nullptr;
+            const Score *eg = nullptr;
+            if (pt <= KING)
+                getPSTTables(PieceType(pt), mg, eg);
+
+            materialTable[c][pt] = (pt < KING) ? sign * PIECE_VALUES[pt] : 0;
+
+            for (int sq = 0; sq < 64; sq++)
+            {
+                // Flip square for black
+                Square pstSq = (c == BLACK) ? flipSquare(Square(sq)) : Square(sq);
+                psqtMg[c][pt][sq] = mg ? sign * mg[pstSq] : 0;
+                psqtEg[c][pt][sq] = eg ? sign * eg[pstSq] : 0;
+            }
+        }
+    }
+}
 
 // Main evaluation function
-Score Evaluator::evaluate(const Board &board)
+Score Evaluator::evaluate(const Board &board, PawnHashTable *pawnTable)
 {
+#ifdef EVAL_DEBUG
+    if (!verifyIncremental(board))
+    {
+        std::cerr << "Incremental evaluation out of sync: " << board.toFEN() << std::endl;
+        std::abort();
+    }
+#endif
+
     Score score = 0;
 
-    // Material + position
+    // Material + position (running sums kept by Board)
     score += evaluateMaterial(board);
     score += evaluatePosition(board);
 
     // Positional factors
-    score += evaluatePawnStructure(board);
+    score += evaluatePawnStructure(board, pawnTable);
     score += evaluateKingSafety(board);
     score += evaluateMobility(board);
     score += evaluateThreats(board);
@@ -40,41 +80,28 @@ Score Evaluator::evaluate(const Board &board)
 // Evaluate material
 Score Evaluator::evaluateMaterial(const Board &board)
 {
-    Score score = 0;
+    Score score = board.getMaterialScore();
 
-    for (Color c : {WHITE, BLACK})
-    {
-        int sign = (c == WHITE) ? 1 : -1;
-
-        // Count pieces
-        int pawns = popcount(board.getPieces(c, PAWN));
-        int knights = popcount(board.getPieces(c, KNIGHT));
-        int bishops = popcount(board.getPieces(c, BISHOP));
-        int rooks = popcount(board.getPieces(c, ROOK));
-        int queens = popcount(board.getPieces(c, QUEEN));
-
-        // Add material value
-        score += sign * (pawns * PIECE_VALUES[PAWN] +
-                         knights * PIECE_VALUES[KNIGHT] +
-                         bishops * PIECE_VALUES[BISHOP] +
-                         rooks * PIECE_VALUES[ROOK] +
-                         queens * PIECE_VALUES[QUEEN]);
-
-        // Bishop pair bonus
-        if (bishops >= 2)
-        {
-            score += sign * 50;
-        }
-    }
+    // Bishop pair bonus
+    if (popcount(board.getPieces(WHITE, BISHOP)) >= 2)
+        score += 50;
+    if (popcount(board.getPieces(BLACK, BISHOP)) >= 2)
+        score -= 50;
 
     return score;
 }
 
 // Evaluate position using PST
+// The middlegame/endgame sums are tapered once for the whole board.
 Score Evaluator::evaluatePosition(const Board &board)
 {
-    Score score = 0;
-    int phase = getGamePhase(board);
+    return interpolateScore(board.getPsqMg(), board.getPsqEg(), getGamePhase(board));
+}
+
+// Recompute the running sums from the bitboards and compare
+bool Evaluator::verifyIncremental(const Board &board)
+{
+    int material = 0, mg = 0, eg = 0, phase = 0;
 
     for (Color c : {WHITE, BLACK})
     {
@@ -85,18 +112,49 @@ Score Evaluator::evaluatePosition(const Board &board)
             while (pieces)
             {
                 Square sq = popLsb(pieces);
-                score += getPSTValue(pt, sq, c, phase);
+                material += materialTable[c][pt];
+                mg += psqtMg[c][pt][sq];
+                eg += psqtEg[c][pt][sq];
+                phase += PHASE_WEIGHT[pt];
             }
         }
     }
 
-    return score;
+    return material == board.getMaterialScore() && mg == board.getPsqMg() &&
+           eg == board.getPsqEg() && phase == board.getPhase();
 }
 
-// Evaluate pawn structure
-Score Evaluator::evaluatePawnStructure(const Board &board)
+// Evaluate pawn structure (probing the pawn hash table first)
+Score Evaluator::evaluatePawnStructure(const Board &board, PawnHashTable *pawnTable)
+{
+    if (!pawnTable)
+    {
+        PawnEntry entry;
+        computePawnEntry(board, entry);
+        return entry.score;
+    }
+
+    uint64_t key = board.getPawnKey();
+    PawnEntry *entry = pawnTable->slot(key);
+
+    if (entry->key == key)
+    {
+        pawnTable->recordHit();
+        return entry->score;
+    }
+
+    pawnTable->recordMiss();
+    entry->key = key;
+    computePawnEntry(board, *entry);
+    return entry->score;
+}
+
+// Score isolated, doubled and passed pawns (depends on pawns only)
+void Evaluator::computePawnEntry(const Board &board, PawnEntry &entry)
 {
     Score score = 0;
+    entry.passed[WHITE] = 0;
+    entry.passed[BLACK] = 0;
 
     for (Color c : {WHITE, BLACK})
     {
@@ -151,11 +209,12 @@ Score Evaluator::evaluatePawnStructure(const Board &board)
             {
                 int passedRank = (c == WHITE) ? rank : (7 - rank);
                 score += sign * (20 + passedRank * 10); // Passed pawn
+                entry.passed[c] |= bit(sq);
             }
         }
     }
 
-    return score;
+    entry.score = score;
 }
 
 // Evaluate king safety
@@ -263,18 +322,7 @@ Score Evaluator::evaluateThreats(const Board &board)
 // Get game phase (0 = endgame, PHASE_MAX = opening)
 int Evaluator::getGamePhase(const Board &board)
 {
-    int phase = 0;
-
-    for (Color c : {WHITE, BLACK})
-    {
-        phase += popcount(board.getPieces(c, PAWN)) * PHASE_PAWN;
-        phase += popcount(board.getPieces(c, KNIGHT)) * PHASE_KNIGHT;
-        phase += popcount(board.getPieces(c, BISHOP)) * PHASE_BISHOP;
-        phase += popcount(board.getPieces(c, ROOK)) * PHASE_ROOK;
-        phase += popcount(board.getPieces(c, QUEEN)) * PHASE_QUEEN;
-    }
-
-    return std::min(phase, PHASE_MAX);
+    return std::min(board.getPhase(), PHASE_MAX);
 }
 
 // Interpolate between middlegame and endgame scores
@@ -283,49 +331,40 @@ Score Evaluator::interpolateScore(Score mg, Score eg, int phase)
     return (mg * phase + eg * (PHASE_MAX - phase)) / PHASE_MAX;
 }
 
-// Get PST value for a piece
-Score Evaluator::getPSTValue(PieceType pt, Square sq, Color c, int phase)
+// Get the PST pair for a piece type
+void Evaluator::getPSTTables(PieceType pt, const Score *&mg, const Score *&eg)
 {
-    // Flip square for black
-    if (c == BLACK)
-    {
-        sq = flipSquare(sq);
-    }
-
-    int sign = (c == WHITE) ? 1 : -1;
-    Score mg = 0, eg = 0;
-
     switch (pt)
     {
     case PAWN:
-        mg = PAWN_PST_MG[sq];
-        eg = PAWN_PST_EG[sq];
+        mg = PAWN_PST_MG;
+        eg = PAWN_PST_EG;
         break;
     case KNIGHT:
-        mg = KNIGHT_PST_MG[sq];
-        eg = KNIGHT_PST_EG[sq];
+        mg = KNIGHT_PST_MG;
+        eg = KNIGHT_PST_EG;
         break;
     case BISHOP:
-        mg = BISHOP_PST_MG[sq];
-        eg = BISHOP_PST_EG[sq];
+        mg = BISHOP_PST_MG;
+        eg = BISHOP_PST_EG;
         break;
     case ROOK:
-        mg = ROOK_PST_MG[sq];
-        eg = ROOK_PST_EG[sq];
+        mg = ROOK_PST_MG;
+        eg = ROOK_PST_EG;
         break;
     case QUEEN:
-        mg = QUEEN_PST_MG[sq];
-        eg = QUEEN_PST_EG[sq];
+        mg = QUEEN_PST_MG;
+        eg = QUEEN_PST_EG;
         break;
     case KING:
-        mg = KING_PST_MG[sq];
-        eg = KING_PST_EG[sq];
+        mg = KING_PST_MG;
+        eg = KING_PST_EG;
         break;
     default:
-        return 0;
+        mg = nullptr;
+        eg = nullptr;
+        break;
     }
-
-    return sign * interpolateScore(mg, eg, phase);
 }
 
 // ============================================================================
@@ -523,14 +562,14 @@ Score Evaluator::evaluateRookOnOpenFile(const Board &board)
 // DEBUG: Detailed Evaluation Breakdown
 // ============================================================================
 
-Evaluator::EvalBreakdown Evaluator::evaluateDetailed(const Board &board)
+Evaluator::EvalBreakdown Evaluator::evaluateDetailed(const Board &board, PawnHashTable *pawnTable)
 {
     EvalBreakdown breakdown;
 
     // Calculate each component
     breakdown.material = evaluateMaterial(board);
     breakdown.pst = evaluatePosition(board);
-    breakdown.pawnStructure = evaluatePawnStructure(board);
+    breakdown.pawnStructure = evaluatePawnStructure(board, pawnTable);
     breakdown.kingSafety = evaluateKingSafety(board);
     breakdown.mobility = evaluateMobility(board);
     breakdown.threats = evaluateThreats(board);
@@ -549,3 +588,125 @@ Evaluator::EvalBreakdown Evaluator::evaluateDetailed(const Board &board)
 
     return breakdown;
 }
+
+// ============================================================================
+// BATCH EVALUATION
+// ============================================================================
+
+// Run work(begin, end, pawnTable) over [0, count) in contiguous chunks,
+// one chunk and one pawn hash table per thread
+template <typename Work>
+static void runBatch(size_t count, int threads, Work work)
+{
+    if (threads <= 0)
+        threads = std::max(1u, std::thread::hardware_concurrency());
+    // Small batches are not worth a thread each
+    size_t numThreads = std::min<size_t>(threads, std::max<size_t>(1, count / 256));
+
+    if (numThreads <= 1)
+    {
+        PawnHashTable pawnTable;
+        work(0, count, pawnTable);
+        return;
+    }
+
+    std::vector<std::thread> workers;
+    size_t chunk = (count + numThreads - 1) / numThreads;
+    for (size_t begin = 0; begin < count; begin += chunk)
+    {
+        size_t end = std::min(count, begin + chunk);
+        workers.emplace_back([&work, begin, end]()
+                             {
+            PawnHashTable pawnTable;
+            work(begin, end, pawnTable); });
+    }
+    for (std::thread &worker : workers)
+        worker.join();
+}
+
+static void evaluateInto(const Board &board, size_t i, Score *scores,
+                         Evaluator::EvalBreakdown *details, PawnHashTable &pawnTable)
+{
+    if (details)
+    {
+        details[i] = Evaluator::evaluateDetailed(board, &pawnTable);
+        if (scores)
+            scores[i] = details[i].total;
+    }
+    else if (scores)
+    {
+        scores[i] = Evaluator::evaluate(board, &pawnTable);
+    }
+}
+
+void Evaluator::evaluateBatch(const std::vector<const Board *> &boards, Score *scores,
+                              EvalBreakdown *details, int threads)
+{
+    runBatch(boards.size(), threads, [&](size_t begin, size_t end, PawnHashTable &pawnTable)
+             {
+        for (size_t i = begin; i < end; i++)
+            evaluateInto(*boards[i], i, scores, details, pawnTable); });
+}
+
+// Both kings present (positions from untrusted input)
+static bool hasKings(const Board &board)
+{
+    return popcount(board.getPieces(WHITE, KING)) == 1 &&
+           popcount(board.getPieces(BLACK, KING)) == 1;
+}
+
+// Evaluate positions decoded by parse(i, board) in the workers.
+// Positions that fail to decode score 0; returns the first such index or -1.
+template <typename Parse>
+static long long evaluateDecoded(size_t count, Score *scores, Evaluator::EvalBreakdown *details,
+                                 int threads, Parse parse)
+{
+    std::atomic<long long> firstInvalid(-1);
+
+    runBatch(count, threads, [&](size_t begin, size_t end, PawnHashTable &pawnTable)
+             {
+        Board board;
+        for (size_t i = begin; i < end; i++)
+        {
+            if (parse(i, board) && hasKings(board))
+            {
+                evaluateInto(board, i, scores, details, pawnTable);
+                continue;
+            }
+
+            if (scores)
+                scores[i] = 0;
+            if (details)
+                details[i] = Evaluator::EvalBreakdown{};
+
+            long long expected = firstInvalid.load();
+            while ((expected < 0 || (long long)i < expected) &&
+                   !firstInvalid.compare_exchange_weak(expected, (long long)i))
+            {
+            }
+        } });
+
+    return firstInvalid.load();
+}
+
+long long Evaluator::evaluateBatch(const std::vector<std::string> &fens, Score *scores,
+                                   EvalBreakdown *details, int threads)
+{
+    return evaluateDecoded(fens.size(), scores, details, threads, [&](size_t i, Board &board)
+                           {
+        try
+        {
+            return board.fromFEN(fens[i]);
+        }
+        catch (const std::exception &)
+        {
+            return false; // Bad move counters
+        } });
+}
+
+long long Evaluator::evaluateBatch(const uint8_t *packed, size_t count, Score *scores,
+                                   EvalBreakdown *details, int threads)
+{
+    return evaluateDecoded(count, scores, details, threads, [&](size_t i, Board &board)
+                           { return board.fromPacked(packed + i * PACKED_BOARD_SIZE); });
+}
@@ -0,0 +1,107 @@
+#include "mappedfile.h"
+
+#ifdef _WIN32
+#ifndef WIN32_LEAN_AND_MEAN
+#define WIN32_LEAN_AND_MEAN
+#endif
+#ifndef NOMINMAX
+#define NOMINMAX
+#endif
+#include <windows.h>
+#else
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#endif
+
+MappedFile::MappedFile()
+#ifdef _WIN32
+    : data(nullptr), bytes(0), fileHandle(nullptr), mapHandle(nullptr)
+#else
+    : data(nullptr), bytes(0), fd(-1)
+#endif
+{
+}
+
+MappedFile::~MappedFile()
+{
+    close();
+}
+
+bool MappedFile::open(const std::string &path)
+{
+    close();
+
+#ifdef _WIN32
+    HANDLE file = CreateFileA(path.c_str(), GENERIC_READ, FILE_SHARE_READ, nullptr,
+                              OPEN_EXISTING, FILE_ATTRIBUTE_NORMAL, nullptr);
+    if (file == INVALID_HANDLE_VALUE)
+        return false;
+
+    LARGE_INTEGER fileSize;
+    if (!GetFileSizeEx(file, &fileSize) || fileSize.QuadPart == 0)
+    {
+        CloseHandle(file);
+        return false;
+    }
+
+    HANDLE mapping = CreateFileMappingA(file, nullptr, PAGE_READONLY, 0, 0, nullptr);
+    const void *view = mapping ? MapViewOfFile(mapping, FILE_MAP_READ, 0, 0, 0) : nullptr;
+    if (!view)
+    {
+        if (mapping)
+            CloseHandle(mapping);
+        CloseHandle(file);
+        return false;
+    }
+
+    fileHandle = file;
+    mapHandle = mapping;
+    bytes = (size_t)fileSize.QuadPart;
+#else
+    int file = ::open(path.c_str(), O_RDONLY);
+    if (file < 0)
+        return false;
+
+    struct stat st;
+    if (fstat(file, &st) != 0 || st.st_size == 0)
+    {
+        ::close(file);
+        return false;
+    }
+
+    void *view = mmap(nullptr, (size_t)st.st_size, PROT_READ, MAP_SHARED, file, 0);
+    if (view == MAP_FAILED)
+    {
+        ::close(file);
+        return false;
+    }
+
+    fd = file;
+    bytes = (size_t)st.st_size;
+#endif
+
+    data = static_cast<const uint8_t *>(view);
+    return true;
+}
+
+void MappedFile::close()
+{
+    if (!data)
+        return;
+
+#ifdef _WIN32
+    UnmapViewOfFile(data);
+    CloseHandle(mapHandle);
+    CloseHandle(fileHandle);
+    fileHandle = mapHandle = nullptr;
+#else
+    munmap(const_cast<uint8_t *>(data), bytes);
+    ::close(fd);
+    fd = -1;
+#endif
+
+    data = nullptr;
+    bytes = 0;
+}
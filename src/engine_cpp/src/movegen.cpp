@@ -1,6 +1,21 @@
 #include "movegen.h"
+#include <iostream>
 #include <random>
 
+// PEXT (BMI2) support: compiled in on x86-64, enabled at runtime if the CPU has it
+#if defined(__x86_64__) || defined(_M_X64)
+#include <immintrin.h>
+#define HAS_PEXT 1
+#ifdef _MSC_VER
+#include <intrin.h>
+#define BMI2_TARGET
+#else
+#define BMI2_TARGET __attribute__((target("bmi2")))
+#endif
+#else
+#define HAS_PEXT 0
+#endif
+
 // Attack tables storage
 Bitboard AttackTables::pawnAttacks[2][64];
 Bitboard AttackTables::knightAttacks[64];
@@ -13,6 +28,10 @@ uint64_t AttackTables::bishopMagics[64];
 uint64_t AttackTables::rookMagics[64];
 int AttackTables::bishopShifts[64];
 int AttackTables::rookShifts[64];
+bool AttackTables::usePext = false;
+bool AttackTables::initialized = false;
+Bitboard AttackTables::betweenBB[64][64];
+Bitboard AttackTables::lineBB[64][64];
 
 // Helper: Generate pawn attacks
 static Bitboard genPawnAttacks(Color c, Square sq)
@@ -229,12 +248,181 @@ static Bitboard genRookAttacksSlow(Square sq, Bitboard occupied)
     return attacks;
 }
 
-// Helper: Find magic number (simplified - uses pre-computed magics in practice)
+// Helper: parallel bit extract of 'b' under 'mask'
+#if HAS_PEXT
+static BMI2_TARGET inline uint64_t pext(uint64_t b, uint64_t mask)
+{
+    return _pext_u64(b, mask);
+}
+#else
+static inline uint64_t pext(uint64_t b, uint64_t mask)
+{
+    // Never used: usePext cannot be enabled without BMI2
+    (void)b;
+    (void)mask;
+    return 0;
+}
+#endif
+
+// Helper: table index of an occupancy for the current indexing mode
+static inline unsigned sliderIndex(Bitboard occupied, Bitboard mask, uint64_t magic, int shift, bool usePext)
+{
+    if (usePext)
+        return (unsigned)pext(occupied, mask);
+    return (unsigned)(((occupied & mask) * magic) >> shift);
+}
+
+// Helper: xorshift64* generator for the magic search
+struct MagicRNG
+{
+    uint64_t s;
+
+    explicit MagicRNG(uint64_t seed) : s(seed) {}
+
+    uint64_t next()
+    {
+        s ^= s >> 12;
+        s ^= s << 25;
+        s ^= s >> 27;
+        return s * 2685821657736338717ULL;
+    }
+
+    // Sparse candidates (about 1/8 of the bits set) find magics fastest
+    uint64_t sparse() { return next() & next() & next(); }
+};
+
+// Helper: Find a collision-free magic number by seeded random search
 static uint64_t findMagic(Square sq, bool isBishop)
 {
-    // In a real implementation, these would be found through brute force
-    // For now, return a simple hash based on square
-    return 0x0101010101010101ULL * (sq + (isBishop ? 64 : 0));
+    // Per-rank seeds known to converge quickly; fixed, so magics are reproducible
+    static const uint64_t seeds[8] = {728, 10316, 55013, 32803, 12281, 15100, 16645, 255};
+    MagicRNG rng(seeds[rankOf(sq)]);
+
+    Bitboard mask = isBishop ? genBishopMask(sq) : genRookMask(sq);
+    int bits = popcount(mask);
+    int shift = 64 - bits;
+
+    // All occupancy subsets of the mask (carry-rippler) and their attacks
+    static Bitboard occupancy[4096], reference[4096], used[4096];
+    static int epoch[4096], attempt = 0;
+    int size = 0;
+    Bitboard b = 0;
+    do
+    {
+        occupancy[size] = b;
+        reference[size] = isBishop ? genBishopAttacksSlow(sq, b) : genRookAttacksSlow(sq, b);
+        size++;
+        b = (b - mask) & mask;
+    } while (b);
+
+    while (true)
+    {
+        uint64_t magic = rng.sparse();
+        if (popcount((mask * magic) >> 56) < 6)
+            continue;
+
+        // Slots stamped with an older attempt count as free
+        attempt++;
+        bool ok = true;
+        for (int i = 0; i < size && ok; i++)
+        {
+            unsigned index = (unsigned)((occupancy[i] * magic) >> shift);
+            if (epoch[index] != attempt)
+            {
+                epoch[index] = attempt;
+                used[index] = reference[i];
+            }
+            else if (used[index] != reference[i])
+            {
+                ok = false;
+            }
+        }
+
+        if (ok)
+            return magic;
+    }
+}
+
+// Check whether the CPU supports BMI2 (PEXT)
+bool AttackTables::cpuHasBmi2()
+{
+#if HAS_PEXT && defined(_MSC_VER)
+    int info[4];
+    __cpuid(info, 0);
+    if (info[0] < 7)
+        return false;
+    __cpuidex(info, 7, 0);
+    return (info[1] & (1 << 8)) != 0;
+#elif HAS_PEXT
+    return __builtin_cpu_supports("bmi2");
+#else
+    return false;
+#endif
+}
+
+// Fill slider attack tables for the current indexing mode
+void AttackTables::fillSliderTables()
+{
+    for (int sq = 0; sq < 64; sq++)
+    {
+        Bitboard b = 0;
+        do
+        {
+            unsigned index = sliderIndex(b, bishopMasks[sq], bishopMagics[sq], bishopShifts[sq], usePext);
+            bishopAttacks[sq][index] = genBishopAttacksSlow(Square(sq), b);
+            b = (b - bishopMasks[sq]) & bishopMasks[sq];
+        } while (b);
+
+        b = 0;
+        do
+        {
+            unsigned index = sliderIndex(b, rookMasks[sq], rookMagics[sq], rookShifts[sq], usePext);
+            rookAttacks[sq][index] = genRookAttacksSlow(Square(sq), b);
+            b = (b - rookMasks[sq]) & rookMasks[sq];
+        } while (b);
+    }
+}
+
+// Switch between PEXT and magic indexing (returns the mode in use)
+bool AttackTables::setPext(bool enable)
+{
+    bool mode = enable && cpuHasBmi2();
+    if (mode != usePext)
+    {
+        usePext = mode;
+        fillSliderTables();
+    }
+    return usePext;
+}
+
+// Compare every slider table entry against the slow generators
+bool AttackTables::verify()
+{
+    std::mt19937_64 rng(0xC0FFEE);
+
+    for (int sq = 0; sq < 64; sq++)
+    {
+        Bitboard b = 0;
+        do
+        {
+            // Squares outside the mask must not change the result
+            Bitboard occupied = b | (rng() & ~bishopMasks[sq] & ~bit(Square(sq)));
+            if (getBishopAttacks(Square(sq), occupied) != genBishopAttacksSlow(Square(sq), occupied))
+                return false;
+            b = (b - bishopMasks[sq]) & bishopMasks[sq];
+        } while (b);
+
+        b = 0;
+        do
+        {
+            Bitboard occupied = b | (rng() & ~rookMasks[sq] & ~bit(Square(sq)));
+            if (getRookAttacks(Square(sq), occupied) != genRookAttacksSlow(Square(sq), occupied))
+                return false;
+            b = (b - rookMasks[sq]) & rookMasks[sq];
+        } while (b);
+    }
+
+    return true;
 }
 
 // Initialize attack tables
@@ -259,93 +447,73 @@ void AttackTables::init()
         kingAttacks[sq] = genKingAttacks(Square(sq));
     }
 
-    // Initialize bishop masks and attacks
+    // Initialize slider masks and magics
     for (int sq = 0; sq < 64; sq++)
     {
         bishopMasks[sq] = genBishopMask(Square(sq));
-        int bits = popcount(bishopMasks[sq]);
-        bishopShifts[sq] = 64 - bits;
-
-        // Generate all possible occupancy variations
-        int numVariations = 1 << bits;
-        for (int i = 0; i < numVariations; i++)
-        {
-            Bitboard occupied = 0;
-            Bitboard mask = bishopMasks[sq];
-            int count = 0;
-
-            // Create occupancy from index
-            while (mask)
-            {
-                Square s = popLsb(mask);
-                if (i & (1 << count))
-                {
-                    occupied |= bit(s);
-                }
-                count++;
-            }
+        bishopShifts[sq] = 64 - popcount(bishopMasks[sq]);
+        bishopMagics[sq] = findMagic(Square(sq), true);
 
-            // Generate attacks for this occupancy
-            Bitboard attacks = genBishopAttacksSlow(Square(sq), occupied);
+        rookMasks[sq] = genRookMask(Square(sq));
+        rookShifts[sq] = 64 - popcount(rookMasks[sq]);
+        rookMagics[sq] = findMagic(Square(sq), false);
+    }
 
-            // Store in table (simplified indexing)
-            bishopAttacks[sq][i] = attacks;
-        }
+    // Prefer PEXT indexing when the CPU supports it
+    usePext = cpuHasBmi2();
+    fillSliderTables();
 
-        bishopMagics[sq] = findMagic(Square(sq), true);
+    // Startup verification against the slow generators
+    if (!verify())
+    {
+        std::cerr << "AttackTables: slider table verification failed ("
+                  << (usePext ? "pext" : "magic") << "), falling back to magics" << std::endl;
+        usePext = false;
+        fillSliderTables();
     }
 
-    // Initialize rook masks and attacks
-    for (int sq = 0; sq < 64; sq++)
+    // Initialize between / line tables
+    for (int a = 0; a < 64; a++)
     {
-        rookMasks[sq] = genRookMask(Square(sq));
-        int bits = popcount(rookMasks[sq]);
-        rookShifts[sq] = 64 - bits;
-
-        // Generate all possible occupancy variations
-        int numVariations = 1 << bits;
-        for (int i = 0; i < numVariations && i < 4096; i++)
+        for (int b = 0; b < 64; b++)
         {
-            Bitboard occupied = 0;
-            Bitboard mask = rookMasks[sq];
-            int count = 0;
+            betweenBB[a][b] = 0;
+            lineBB[a][b] = 0;
 
-            // Create occupancy from index
-            while (mask)
-            {
-                Square s = popLsb(mask);
-                if (i & (1 << count))
-                {
-                    occupied |= bit(s);
-                }
-                count++;
-            }
+            if (a == b)
+                continue;
 
-            // Generate attacks for this occupancy
-            Bitboard attacks = genRookAttacksSlow(Square(sq), occupied);
+            Bitboard rookA = genRookAttacksSlow(Square(a), 0);
+            Bitboard bishopA = genBishopAttacksSlow(Square(a), 0);
 
-            // Store in table (simplified indexing)
-            rookAttacks[sq][i] = attacks;
+            if (rookA & bit(Square(b)))
+            {
+                lineBB[a][b] = (rookA & genRookAttacksSlow(Square(b), 0)) | bit(Square(a)) | bit(Square(b));
+                betweenBB[a][b] = genRookAttacksSlow(Square(a), bit(Square(b))) &
+                                  genRookAttacksSlow(Square(b), bit(Square(a)));
+            }
+            else if (bishopA & bit(Square(b)))
+            {
+                lineBB[a][b] = (bishopA & genBishopAttacksSlow(Square(b), 0)) | bit(Square(a)) | bit(Square(b));
+                betweenBB[a][b] = genBishopAttacksSlow(Square(a), bit(Square(b))) &
+                                  genBishopAttacksSlow(Square(b), bit(Square(a)));
+            }
         }
-
-        rookMagics[sq] = findMagic(Square(sq), false);
     }
+
+    initialized = true;
 }
 
-// Get bishop attacks using magic bitboards
+// Get bishop attacks using magic bitboards (or PEXT)
 Bitboard AttackTables::getBishopAttacks(Square sq, Bitboard occupied)
 {
-    occupied &= bishopMasks[sq];
-    int index = (occupied * bishopMagics[sq]) >> bishopShifts[sq];
-    return bishopAttacks[sq][index & 511];
+    return bishopAttacks[sq][sliderIndex(occupied, bishopMasks[sq], bishopMagics[sq], bishopShifts[sq], usePext)];
 }
 
-// Get rook attacks using magic bitboards
+// Get rook attacks using magic bitboards (or PEXT)
 Bitboard AttackTables::getRookAttacks(Square sq, Bitboard occupied)
 {
-    occupied &= rookMasks[sq];
-    int index = (occupied * rookMagics[sq]) >> rookShifts[sq];
-    return rookAttacks[sq][index & 4095];
+    return rookAttacks[sq][sliderIndex(occupied, rookMasks[sq], rookMagics[sq], rookShifts[sq], usePext)];
 }
 
 // Get queen attacks (bishop + rook)
@@ -358,8 +526,49 @@ Bitboard AttackTables::getQueenAttacks(Square sq, Bitboard occupied)
 // MOVE GENERATION
 // ============================================================================
 
+// Helper: attackers of a square for a given occupancy
+// (pieces missing from 'occupied' are treated as removed)
+static Bitboard attackersWithOccupancy(const Board &board, Square sq, Color c, Bitboard occupied)
+{
+    Bitboard attackers = 0;
+    Bitboard queens = board.getPieces(c, QUEEN);
+
+    attackers |= AttackTables::getPawnAttacks(~c, sq) & board.getPieces(c, PAWN);
+    attackers |= AttackTables::getKnightAttacks(sq) & board.getPieces(c, KNIGHT);
+    attackers |= AttackTables::getKingAttacks(sq) & board.getPieces(c, KING);
+    attackers |= AttackTables::getBishopAttacks(sq, occupied) & (board.getPieces(c, BISHOP) | queens);
+    attackers |= AttackTables::getRookAttacks(sq, occupied) & (board.getPieces(c, ROOK) | queens);
+
+    return attackers & occupied;
+}
+
+// Helper: attacks of a knight/bishop/rook/queen
+static Bitboard pieceAttacks(PieceType pt, Square sq, Bitboard occupied)
+{
+    switch (pt)
+    {
+    case KNIGHT:
+        return AttackTables::getKnightAttacks(sq);
+    case BISHOP:
+        return AttackTables::getBishopAttacks(sq, occupied);
+    case ROOK:
+        return AttackTables::getRookAttacks(sq, occupied);
+    case QUEEN:
+        return AttackTables::getQueenAttacks(sq, occupied);
+    default:
+        return 0;
+    }
+}
+
 // Generate all legal moves
 void MoveGenerator::generateLegalMoves(const Board &board, MoveList &moves)
+{
+    moves.clear();
+    generateLegal(board, moves, false);
+}
+
+// Generate legal moves by trial make (reference implementation)
+void MoveGenerator::generateLegalMovesSlow(const Board &board, MoveList &moves)
 {
     moves.clear();
     MoveList pseudoLegal;
@@ -370,7 +579,9 @@ void MoveGenerator::generateLegalMoves(const Board &board, MoveList &moves)
     {
         Board copy = board;
         copy.makeMove(move);
-        if (!copy.isCheck())
+
+        Square kingSq = copy.getKingSquare(board.getSideToMove());
+        if (kingSq == NO_SQUARE || !copy.isSquareAttacked(kingSq, copy.getSideToMove()))
         {
             moves.add(move);
         }
@@ -381,7 +592,7 @@ void MoveGenerator::generateLegalMoves(const Board &board, MoveList &moves)
 void MoveGenerator::generateCaptures(const Board &board, MoveList &moves)
 {
     moves.clear();
-    generatePseudoLegalMoves(board, moves, true);
+    generateLegal(board, moves, true);
 }
 
 // Generate quiet moves only
@@ -389,7 +600,7 @@ void MoveGenerator::generateQuietMoves(const Board &board, MoveList &moves)
 {
     moves.clear();
     MoveList all;
-    generatePseudoLegalMoves(board, all, false);
+    generateLegal(board, all, false);
 
     // Filter out captures
     for (const Move &move : all)
@@ -401,11 +612,165 @@ void MoveGenerator::generateQuietMoves(const Board &board, MoveList &moves)
     }
 }
 
-// Generate pseudo-legal moves (may leave king in check)
-void MoveGenerator::generatePseudoLegalMoves(const Board &board, MoveList &moves, bool capturesOnly)
+// Legal move generation
+// Checkers and pinned pieces are computed once; every non-king move is
+// masked by the check mask (capture the checker or block) and, for a
+// pinned piece, by the line through king and piece. Only king moves and
+// en passant need an explicit attack test.
+void MoveGenerator::generateLegal(const Board &board, MoveList &moves, bool capturesOnly)
 {
     Color us = board.getSideToMove();
+    Color them = ~us;
+    Square ksq = board.getKingSquare(us);
 
+    // Positions without a king (analysis setups): nothing can be illegal
+    if (ksq == NO_SQUARE)
+    {
+        generatePseudoLegalMoves(board, moves, capturesOnly);
+        return;
+    }
+
+    Bitboard ours = board.getOccupied(us);
+    Bitboard enemies = board.getOccupied(them);
+    Bitboard occupied = ours | enemies;
+    Bitboard targetMask = capturesOnly ? enemies : ~ours;
+    Bitboard checkers = board.getAttackers(ksq, them);
+
+    // King moves: the destination must be safe once the king has left ksq
+    Bitboard occupiedNoKing = occupied ^ bit(ksq);
+    Bitboard kingTargets = AttackTables::getKingAttacks(ksq) & targetMask;
+    while (kingTargets)
+    {
+        Square to = popLsb(kingTargets);
+        if (!attackersWithOccupancy(board, to, them, occupiedNoKing))
+        {
+            moves.add(Move(ksq, to, (enemies & bit(to)) ? CAPTURE : QUIET));
+        }
+    }
+
+    // Double check: only the king can move
+    if (moreThanOne(checkers))
+        return;
+
+    Bitboard checkMask = checkers ? (checkers | AttackTables::getBetween(ksq, lsb(checkers))) : ~0ULL;
+
+    // Pinned pieces: our single blocker between the king and an enemy slider
+    Bitboard pinned = 0;
+    Bitboard snipers = (AttackTables::getRookAttacks(ksq, enemies) &
+                        (board.getPieces(them, ROOK) | board.getPieces(them, QUEEN))) |
+                       (AttackTables::getBishopAttacks(ksq, enemies) &
+                        (board.getPieces(them, BISHOP) | board.getPieces(them, QUEEN)));
+    while (snipers)
+    {
+        Square sniper = popLsb(snipers);
+        Bitboard blockers = AttackTables::getBetween(ksq, sniper) & occupied;
+        if (blockers && !moreThanOne(blockers) && (blockers & ours))
+        {
+            pinned |= blockers;
+        }
+    }
+
+    // Pawn moves
+    int forward = (us == WHITE) ? 8 : -8;
+    int promoRank = (us == WHITE) ? 7 : 0;
+    int startRank = (us == WHITE) ? 1 : 6;
+    Square epSquare = board.getEnPassantSquare();
+    Bitboard pawns = board.getPieces(us, PAWN);
+
+    while (pawns)
+    {
+        Square from = popLsb(pawns);
+        Bitboard allowed = checkMask;
+        if (pinned & bit(from))
+            allowed &= AttackTables::getLine(ksq, from);
+
+        // Captures
+        Bitboard attacks = AttackTables::getPawnAttacks(us, from) & enemies & allowed;
+        while (attacks)
+        {
+            Square to = popLsb(attacks);
+
+            if (rankOf(to) == promoRank)
+            {
+                moves.add(Move(from, to, QUEEN_PROMO_CAPTURE));
+                moves.add(Move(from, to, KNIGHT_PROMO_CAPTURE));
+                moves.add(Move(from, to, ROOK_PROMO_CAPTURE));
+                moves.add(Move(from, to, BISHOP_PROMO_CAPTURE));
+            }
+            else
+            {
+                moves.add(Move(from, to, CAPTURE));
+            }
+        }
+
+        // En passant: two pawns leave their squares, so test the king directly
+        if (epSquare != NO_SQUARE && (AttackTables::getPawnAttacks(us, from) & bit(epSquare)))
+        {
+            Square capSq = Square(epSquare - forward);
+            Bitboard occupiedAfter = (occupied ^ bit(from) ^ bit(capSq)) | bit(epSquare);
+            if (!attackersWithOccupancy(board, ksq, them, occupiedAfter))
+            {
+                moves.add(Move(from, epSquare, EN_PASSANT));
+            }
+        }
+
+        if (capturesOnly)
+            continue;
+
+        // Forward moves
+        Square to = Square(from + forward);
+        if (!(occupied & bit(to)))
+        {
+            if (allowed & bit(to))
+            {
+                if (rankOf(to) == promoRank)
+                {
+                    moves.add(Move(from, to, QUEEN_PROMOTION));
+                    moves.add(Move(from, to, KNIGHT_PROMOTION));
+                    moves.add(Move(from, to, ROOK_PROMOTION));
+                    moves.add(Move(from, to, BISHOP_PROMOTION));
+                }
+                else
+                {
+                    moves.add(Move(from, to, QUIET));
+                }
+            }
+
+            // Double push
+            Square to2 = Square(to + forward);
+            if (rankOf(from) == startRank && !(occupied & bit(to2)) && (allowed & bit(to2)))
+            {
+                moves.add(Move(from, to2, DOUBLE_PAWN_PUSH));
+            }
+        }
+    }
+
+    // Knight, bishop, rook and queen moves
+    for (PieceType pt : {KNIGHT, BISHOP, ROOK, QUEEN})
+    {
+        Bitboard pieces = board.getPieces(us, pt);
+        while (pieces)
+        {
+            Square from = popLsb(pieces);
+            Bitboard targets = pieceAttacks(pt, from, occupied) & targetMask & checkMask;
+            if (pinned & bit(from))
+                targets &= AttackTables::getLine(ksq, from);
+
+            addMovesFromBitboard(moves, from, targets & enemies, CAPTURE);
+            addMovesFromBitboard(moves, from, targets & ~occupied, QUIET);
+        }
+    }
+
+    // Castling
+    if (!capturesOnly && !checkers)
+    {
+        generateCastlingMoves(board, moves);
+    }
+}
+
+// Generate pseudo-legal moves (may leave king in check)
+void MoveGenerator::generatePseudoLegalMoves(const Board &board, MoveList &moves, bool capturesOnly)
+{
     generatePawnMoves(board, moves, capturesOnly);
     generateKnightMoves(board, moves, capturesOnly);
     generateBishopMoves(board, moves, capturesOnly);
@@ -413,7 +778,7 @@ void MoveGenerator::generatePseudoLegalMoves(const Board &board, MoveList &moves
     generateQueenMoves(board, moves, capturesOnly);
     generateKingMoves(board, moves, capturesOnly);
 
-    if (!capturesOnly)
+    if (!capturesOnly && !board.isCheck())
     {
         generateCastlingMoves(board, moves);
     }
@@ -512,8 +877,8 @@ void MoveGenerator::generateKnightMoves(const Board &board, MoveList &moves, boo
         Square from = popLsb(knights);
         Bitboard attacks = AttackTables::getKnightAttacks(from) & targets;
 
-        addMovesFromBitboard(moves, from, attacks,
-                             capturesOnly ? CAPTURE : QUIET);
+        addMovesFromBitboard(moves, from, attacks & board.getOccupied(~us), CAPTURE);
+        addMovesFromBitboard(moves, from, attacks & ~board.getAllOccupied(), QUIET);
     }
 }
 
@@ -530,8 +895,8 @@ void MoveGenerator::generateBishopMoves(const Board &board, MoveList &moves, boo
         Square from = popLsb(bishops);
         Bitboard attacks = AttackTables::getBishopAttacks(from, occupied) & targets;
 
-        addMovesFromBitboard(moves, from, attacks,
-                             capturesOnly ? CAPTURE : QUIET);
+        addMovesFromBitboard(moves, from, attacks & board.getOccupied(~us), CAPTURE);
+        addMovesFromBitboard(moves, from, attacks & ~board.getAllOccupied(), QUIET);
     }
 }
 
@@ -548,8 +913,8 @@ void MoveGenerator::generateRookMoves(const Board &board, MoveList &moves, bool
         Square from = popLsb(rooks);
         Bitboard attacks = AttackTables::getRookAttacks(from, occupied) & targets;
 
-        addMovesFromBitboard(moves, from, attacks,
-                             capturesOnly ? CAPTURE : QUIET);
+        addMovesFromBitboard(moves, from, attacks & board.getOccupied(~us), CAPTURE);
+        addMovesFromBitboard(moves, from, attacks & ~board.getAllOccupied(), QUIET);
     }
 }
 
@@ -566,8 +931,8 @@ void MoveGenerator::generateQueenMoves(const Board &board, MoveList &moves, bool
         Square from = popLsb(queens);
         Bitboard attacks = AttackTables::getQueenAttacks(from, occupied) & targets;
 
-        addMovesFromBitboard(moves, from, attacks,
-                             capturesOnly ? CAPTURE : QUIET);
+        addMovesFromBitboard(moves, from, attacks & board.getOccupied(~us), CAPTURE);
+        addMovesFromBitboard(moves, from, attacks & ~board.getAllOccupied(), QUIET);
     }
 }
 
@@ -582,71 +947,46 @@ void MoveGenerator::generateKingMoves(const Board &board, MoveList &moves, bool
     Bitboard targets = capturesOnly ? board.getOccupied(~us) : ~board.getOccupied(us);
     Bitboard attacks = AttackTables::getKingAttacks(from) & targets;
 
-    addMovesFromBitboard(moves, from, attacks,
-                         capturesOnly ? CAPTURE : QUIET);
+    addMovesFromBitboard(moves, from, attacks & board.getOccupied(~us), CAPTURE);
+    addMovesFromBitboard(moves, from, attacks & ~board.getAllOccupied(), QUIET);
 }
 
-// Generate castling moves
+// Generate castling moves (caller ensures the king is not in check)
 void MoveGenerator::generateCastlingMoves(const Board &board, MoveList &moves)
 {
     Color us = board.getSideToMove();
-
-    if (board.isCheck())
-        return; // Can't castle out of check
-
+    Color them = ~us;
     uint8_t rights = board.getCastlingRights();
     Bitboard occupied = board.getAllOccupied();
+    Bitboard rooks = board.getPieces(us, ROOK);
 
-    if (us == WHITE)
-    {
-        // White king-side
-        if (rights & WHITE_OO)
-        {
-            if (!(occupied & ((1ULL << F1) | (1ULL << G1))))
-            {
-                if (!board.isSquareAttacked(F1, BLACK))
-                {
-                    moves.add(Move(E1, G1, KING_CASTLE));
-                }
-            }
-        }
+    Square kingFrom = (us == WHITE) ? E1 : E8;
+    uint8_t kingSide = (us == WHITE) ? WHITE_OO : BLACK_OO;
+    uint8_t queenSide = (us == WHITE) ? WHITE_OOO : BLACK_OOO;
+    int base = (us == WHITE) ? 0 : 56;
 
-        // White queen-side
-        if (rights & WHITE_OOO)
-        {
-            if (!(occupied & ((1ULL << D1) | (1ULL << C1) | (1ULL << B1))))
-            {
-                if (!board.isSquareAttacked(D1, BLACK))
-                {
-                    moves.add(Move(E1, C1, QUEEN_CASTLE));
-                }
-            }
-        }
-    }
-    else
+    if (!(board.getPieces(us, KING) & bit(kingFrom)))
+        return;
+
+    // King-side: F and G empty and not attacked
+    if ((rights & kingSide) && (rooks & bit(Square(base + 7))))
     {
-        // Black king-side
-        if (rights & BLACK_OO)
+        Square f = Square(base + 5), g = Square(base + 6);
+        if (!(occupied & (bit(f) | bit(g))) &&
+            !board.isSquareAttacked(f, them) && !board.isSquareAttacked(g, them))
         {
-            if (!(occupied & ((1ULL << F8) | (1ULL << G8))))
-            {
-                if (!board.isSquareAttacked(F8, WHITE))
-                {
-                    moves.add(Move(E8, G8, KING_CASTLE));
-                }
-            }
+            moves.add(Move(kingFrom, g, KING_CASTLE));
         }
+    }
 
-        // Black queen-side
-        if (rights & BLACK_OOO)
+    // Queen-side: B, C and D empty, C and D not attacked
+    if ((rights & queenSide) && (rooks & bit(Square(base))))
+    {
+        Square b = Square(base + 1), c = Square(base + 2), d = Square(base + 3);
+        if (!(occupied & (bit(b) | bit(c) | bit(d))) &&
+            !board.isSquareAttacked(d, them) && !board.isSquareAttacked(c, them))
         {
-            if (!(occupied & ((1ULL << D8) | (1ULL << C8) | (1ULL << B8))))
-            {
-                if (!board.isSquareAttacked(D8, WHITE))
-                {
-                    moves.add(Move(E8, C8, QUEEN_CASTLE));
-                }
-            }
+            moves.add(Move(kingFrom, c, QUEEN_CASTLE));
         }
     }
 }
@@ -657,12 +997,7 @@ void MoveGenerator::addMovesFromBitboard(MoveList &moves, Square from, Bitboard
     while (targets)
     {
         Square to = popLsb(targets);
-        uint8_t flags = baseFlags;
-
-        // Determine if capture (more accurate check would look at target square)
-        // For now, assuming baseFlags is correct
-
-        moves.add(Move(from, to, flags));
+        moves.add(Move(from, to, baseFlags));
     }
 }
 
@@ -680,3 +1015,50 @@ bool MoveGenerator::isLegal(const Board &board, const Move &move)
 
     return false;
 }
+
+// ============================================================================
+// PERFT
+// ============================================================================
+
+// Count leaf nodes (bulk counting: the last ply is the size of the move list)
+uint64_t MoveGenerator::perft(Board &board, int depth)
+{
+    if (depth <= 0)
+        return 1;
+
+    MoveList moves;
+    generateLegalMoves(board, moves);
+
+    if (depth == 1)
+        return moves.size();
+
+    uint64_t nodes = 0;
+    for (const Move &move : moves)
+    {
+        board.makeMove(move);
+        nodes += perft(board, depth - 1);
+        board.unmakeMove(move);
+    }
+
+    return nodes;
+}
+
+// Perft split by root move
+std::vector<std::pair<Move, uint64_t>> MoveGenerator::divide(Board &board, int depth)
+{
+    std::vector<std::pair<Move, uint64_t>> result;
+    if (depth <= 0)
+        return result;
+
+    MoveList moves;
+    generateLegalMoves(board, moves);
+
+    for (const Move &move : moves)
+    {
+        board.makeMove(move);
+        result.emplace_back(move, perft(board, depth - 1));
+        board.unmakeMove(move);
+    }
+
+    return result;
+}
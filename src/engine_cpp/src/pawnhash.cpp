@@ -0,0 +1,20 @@
+#include "pawnhash.h"
+
+PawnHashTable::PawnHashTable(size_t entries)
+    : numEntries(1), hits(0), misses(0)
+{
+    // Round down to a power of two so the index is a mask
+    while (numEntries * 2 <= entries)
+        numEntries *= 2;
+
+    table.reset(new PawnEntry[numEntries]);
+}
+
+void PawnHashTable::clear()
+{
+    for (size_t i = 0; i < numEntries; i++)
+    {
+        table[i] = PawnEntry();
+    }
+    clearStats();
+}
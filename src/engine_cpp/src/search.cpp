@@ -4,84 +4,566 @@
 #include <algorithm>
 #include <cstring>
 #include <iostream>
+#include <thread>
+
+// Half-moves played before the position
+static int gamePly(const Board &board)
+{
+    return 2 * ((int)board.getFullMoveNumber() - 1) + (board.getSideToMove() == BLACK ? 1 : 0);
+}
 
 // Constructor
-SearchEngine::SearchEngine(size_t ttSizeMB) : tt(ttSizeMB), stopSearch(false)
+SearchEngine::SearchEngine(size_t ttSizeMB, int threads)
+    : ownedTT(new TranspositionTable(ttSizeMB)), tt(ownedTT.get()), bestMoveNodes(0),
+      tablebases(nullptr), tbProbeDepth(1), tbCardinality(0), multiPV(1),
+      stopSearch(false), stopSignal(&stopSearch), pondering(false), ponderHitTime(-1), threadId(0), searching(false),
+      bookDepth(0), bookRandom(false)
 {
     clearKillerMoves();
     clearHistory();
+    setThreads(threads);
+}
+
+// Helper constructor (Lazy SMP): shares TT and stop flag, owns killers/history/PV
+SearchEngine::SearchEngine(SearchEngine &master, int threadId)
+    : tt(master.tt), bestMoveNodes(0), tablebases(master.tablebases), tbProbeDepth(master.tbProbeDepth), tbCardinality(0),
+      multiPV(1), stopSearch(false), stopSignal(&master.stopSearch), pondering(false), ponderHitTime(-1),
+      threadId(threadId), searching(false), bookDepth(0), bookRandom(false)
+{
+    clearKillerMoves();
+    clearHistory();
+}
+
+// Destructor: never leave an asynchronous search running
+SearchEngine::~SearchEngine()
+{
+    stop();
+    wait();
+}
+
+// Set number of search threads
+void SearchEngine::setThreads(int threads)
+{
+    // The running search's helpers are about to be destroyed
+    stop();
+    wait();
+
+    threads = std::max(1, threads);
+
+    helpers.clear();
+    for (int i = 1; i < threads; i++)
+    {
+        helpers.emplace_back(new SearchEngine(*this, i));
+    }
 }
 
 // Main search interface
 Move SearchEngine::getBestMove(Board &board, int maxDepth, int timeLimit)
 {
-    // Initialize search
+    // One search at a time per engine
+    wait();
+
+    SearchLimits searchLimits;
+    searchLimits.maxDepth = maxDepth;
+    searchLimits.timeLimit = timeLimit;
+
+    prepareSearch(board, searchLimits);
+    return runSearch(board);
+}
+
+SearchResult SearchEngine::search(Board &board, const SearchLimits &searchLimits)
+{
+    wait();
+
+    prepareSearch(board, searchLimits);
+    runSearch(board);
+    return result;
+}
+
+// Open a Polyglot book (replaces the current one)
+bool SearchEngine::setBook(const std::string &path)
+{
+    stop();
+    wait();
+
+    std::unique_ptr<PolyglotBook> newBook(new PolyglotBook());
+    if (!newBook->open(path))
+        return false;
+
+    book = std::move(newBook);
+    return true;
+}
+
+void SearchEngine::clearBook()
+{
+    stop();
+    wait();
+    book.reset();
+}
+
+Move SearchEngine::probeBook(const Board &board)
+{
+    if (!book)
+        return Move();
+
+    if (bookDepth > 0 && gamePly(board) >= bookDepth)
+        return Move();
+
+    return book->getMove(board, bookRandom);
+}
+
+// Load Syzygy tables (replaces the current ones)
+int SearchEngine::setSyzygyPath(const std::string &path)
+{
+    stop();
+    wait();
+
+    tablebases = nullptr;
+    ownedTablebases.reset();
+
+    std::unique_ptr<Tablebases> newTablebases(new Tablebases());
+    if (path.empty() || newTablebases->init(path) == 0)
+        return 0;
+
+    ownedTablebases = std::move(newTablebases);
+    tablebases = ownedTablebases.get();
+    return tablebases->getNumTables();
+}
+
+void SearchEngine::setMultiPV(int lines)
+{
+    stop();
+    wait();
+    multiPV = std::max(1, std::min(lines, MAX_MOVES));
+}
+
+// Clear / resize the transposition table (never under a running search)
+void SearchEngine::clearTT()
+{
+    stop();
+    wait();
+    tt->clear();
+}
+
+void SearchEngine::resizeTT(size_t sizeMB)
+{
+    stop();
+    wait();
+    tt->resize(sizeMB);
+}
+
+// Start a search on its own thread
+void SearchEngine::startSearch(const Board &board, int maxDepth, int timeLimit)
+{
+    SearchLimits searchLimits;
+    searchLimits.maxDepth = maxDepth;
+    searchLimits.timeLimit = timeLimit;
+
+    startSearch(board, searchLimits);
+}
+
+void SearchEngine::startSearch(const Board &board, const SearchLimits &searchLimits)
+{
+    stop();
+    wait();
+
+    // Reset before the thread starts, so an immediate stop() is not lost
+    prepareSearch(board, searchLimits);
+    searchBoard = board;
+    searching = true;
+
+    searchThread = std::thread([this]()
+                               {
+        lastBestMove = runSearch(searchBoard);
+        searching = false; });
+}
+
+// Wait for the asynchronous search
+Move SearchEngine::wait()
+{
+    if (searchThread.joinable() && searchThread.get_id() != std::this_thread::get_id())
+    {
+        searchThread.join();
+    }
+    return lastBestMove;
+}
+
+// Search the expected reply to the move just played
+Move SearchEngine::startPonder(const Board &board, const SearchLimits &searchLimits)
+{
+    Move expected = result.ponderMove;
+    if (expected.isNull())
+        return Move();
+
+    MoveList moves;
+    MoveGenerator::generateLegalMoves(board, moves);
+    if (std::find(moves.begin(), moves.end(), expected) == moves.end())
+        return Move();
+
+    Board ponderBoard = board;
+    ponderBoard.makeMove(expected);
+
+    SearchLimits ponderLimits = searchLimits;
+    ponderLimits.ponder = true;
+    startSearch(ponderBoard, ponderLimits);
+    ponderMove = expected;
+    return expected;
+}
+
+// Switch from pondering to the normal time limit
+void SearchEngine::ponderhit()
+{
+    // The search thread applies the hit to its time manager (applyPonderhit);
+    // stored before pondering is cleared, so it is seen once pondering is false
+    ponderHitTime = getElapsedTime();
+    pondering = false;
+    ponderMove = Move();
+}
+
+// Wrong guess: the ponder search is of no further use
+void SearchEngine::ponderMiss()
+{
+    stop();
+    wait();
+    pondering = false;
+    ponderMove = Move();
+}
+
+// Reset state for a new search
+void SearchEngine::prepareSearch(const Board &board, const SearchLimits &searchLimits)
+{
     stats.clear();
+    pawnTable.clearStats();
     stopSearch = false;
     startTime = std::chrono::steady_clock::now();
-    limits.maxDepth = maxDepth;
-    limits.timeLimit = timeLimit;
-    limits.maxNodes = 0;
-    limits.infinite = false;
+    limits = searchLimits;
+    limits.maxDepth = std::min(std::max(limits.maxDepth, 1), MAX_PLY - 1);
+    pondering = limits.ponder;
+    ponderHitTime = -1;
+    ponderMove = Move();
+    timeManager.init(limits.timeLeft, limits.increment, limits.movesToGo, limits.timeLimit, gamePly(board));
 
     clearKillerMoves();
-    tt.incrementAge();
+    tt->incrementAge();
+}
+
+// Run the prepared search (main thread plus Lazy SMP helpers)
+Move SearchEngine::runSearch(Board &board)
+{
+    int maxDepth = limits.maxDepth;
+
+    // Book move: no search (analysis and pondering always search)
+    if (!limits.infinite && !limits.ponder)
+    {
+        Move bookMove = probeBook(board);
+        if (!bookMove.isNull())
+        {
+            pvTable[0][0] = bookMove;
+            pvLength[0] = 1;
+            pvLines.assign(1, PVLine());
+            pvLines[0].move = bookMove;
+            pvLines[0].pv.push_back(bookMove);
+            stats.timeElapsed = getElapsedTime() / 1000.0;
+            fillResult(bookMove, true);
+            return bookMove;
+        }
+    }
+
+    rankRootMoves(board);
+
+    // No stale best move if the root has no legal moves
+    pvTable[0][0] = Move();
+    pvLength[0] = 0;
+
+    // Lazy SMP: helpers search their own board copy until the main thread is done.
+    // They have no time limit of their own and stop on the shared flag.
+    std::vector<std::thread> workers;
+    for (auto &helper : helpers)
+    {
+        SearchEngine *h = helper.get();
+        h->stats.clear();
+        h->pawnTable.clearStats();
+        h->startTime = startTime;
+        h->limits = limits;
+        h->limits.timeLimit = 0;
+        h->limits.infinite = true;
+        h->tablebases = tablebases;
+        h->tbProbeDepth = tbProbeDepth;
+        h->tbCardinality = tbCardinality;
+        h->rootMoves = rootMoves;
+        h->clearKillerMoves();
+
+        workers.emplace_back([h, board, maxDepth]() mutable
+                             { h->iterativeDeepening(board, maxDepth); });
+    }
 
     // Iterative deepening
-    Score score = iterativeDeepening(board, maxDepth);
+    iterativeDeepening(board, maxDepth);
 
-    // Get best move from PV
-    Move bestMove = pvTable[0][0];
+    // Best move of the last completed depth (main thread result is reported); a
+    // move found in an interrupted depth has no score or depth of its own
+    Move bestMove = pvLines.empty() ? pvTable[0][0] : pvLines[0].move;
+    stats.pawnHits = pawnTable.getHits();
+    stats.pawnMisses = pawnTable.getMisses();
+
+    // Stop and collect helpers
+    stopSearch = true;
+    for (std::thread &worker : workers)
+    {
+        worker.join();
+    }
+    for (auto &helper : helpers)
+    {
+        stats.nodesSearched += helper->stats.nodesSearched;
+        stats.qNodesSearched += helper->stats.qNodesSearched;
+        stats.ttHits += helper->stats.ttHits;
+        stats.ttMisses += helper->stats.ttMisses;
+        stats.pawnHits += helper->pawnTable.getHits();
+        stats.pawnMisses += helper->pawnTable.getMisses();
+        stats.tbHits += helper->stats.tbHits;
+        stats.selDepth = std::max(stats.selDepth, helper->stats.selDepth);
+    }
 
     // Calculate statistics
     stats.timeElapsed = getElapsedTime() / 1000.0;
 
+    fillResult(bestMove, false);
     return bestMove;
 }
 
+// Summarize the finished search; score and PV come from the last completed depth
+void SearchEngine::fillResult(Move bestMove, bool fromBook)
+{
+    result = SearchResult();
+    result.bestMove = bestMove;
+    result.fromBook = fromBook;
+
+    if (!pvLines.empty() && pvLines[0].move == bestMove)
+    {
+        result.score = pvLines[0].score;
+        result.depth = pvLines[0].depth;
+        result.pv = pvLines[0].pv;
+    }
+    else if (!bestMove.isNull())
+    {
+        // Stopped before the first depth completed: no score, depth or reply
+        result.pv.push_back(bestMove);
+    }
+
+    if (result.pv.size() >= 2)
+        result.ponderMove = result.pv[1];
+    result.isMate = isMateScore(result.score);
+    if (result.isMate)
+        result.mateIn = result.score > 0 ? (SCORE_MATE - result.score + 1) / 2
+                                         : -(SCORE_MATE + result.score) / 2;
+    result.selDepth = stats.selDepth;
+    result.nodes = stats.nodesSearched;
+    result.tbHits = stats.tbHits;
+    result.hashfull = tt->hashfull();
+    result.timeMs = (int)(stats.timeElapsed * 1000);
+}
+
+// Tablebase root: keep only the moves that preserve the best DTZ (or WDL) outcome
+void SearchEngine::rankRootMoves(Board &board)
+{
+    rootMoves.clear();
+    tbCardinality = tablebases ? tablebases->getMaxCardinality() : 0;
+
+    if (tbCardinality == 0 || popcount(board.getAllOccupied()) > tbCardinality || board.getCastlingRights())
+        return;
+
+    std::vector<std::pair<Move, int>> ranked;
+    bool dtzUsed;
+    if (!tablebases->rankRootMoves(board, ranked, dtzUsed) || ranked.empty())
+        return;
+
+    stats.tbHits += ranked.size();
+
+    int bestRank = ranked[0].second;
+    for (const auto &entry : ranked)
+        bestRank = std::max(bestRank, entry.second);
+    for (const auto &entry : ranked)
+    {
+        if (entry.second == bestRank)
+            rootMoves.push_back(entry.first);
+    }
+
+    // DTZ already keeps the result; with WDL only, probe on while winning
+    if (dtzUsed || bestRank <= 0)
+        tbCardinality = 0;
+}
+
 // Iterative deepening
 Score SearchEngine::iterativeDeepening(Board &board, int maxDepth)
 {
     Score score = 0;
-    Move bestMove;
+    pvLines.clear();
 
-    for (int depth = 1; depth <= maxDepth; depth++)
+    // MultiPV on the main thread only, never more lines than root moves
+    int numLines = 1;
+    if (threadId == 0 && multiPV > 1)
+    {
+        MoveList moves;
+        MoveGenerator::generateLegalMoves(board, moves);
+        int rootCount = rootMoves.empty() ? moves.size() : (int)rootMoves.size();
+        numLines = std::max(1, std::min(multiPV, rootCount));
+    }
+
+    // Odd helper threads start one ply deeper so threads spread over depths
+    int startDepth = 1 + (threadId & 1);
+
+    for (int depth = startDepth; depth <= maxDepth; depth++)
     {
         if (shouldStop())
             break;
 
+        if (numLines > 1)
+        {
+            std::vector<PVLine> lines;
+            bool complete = searchMultiPV(board, depth, numLines, lines);
+
+            // An interrupted depth is only used if nothing completed before it
+            if (complete || pvLines.empty())
+            {
+                std::stable_sort(lines.begin(), lines.end(), [](const PVLine &a, const PVLine &b)
+                                 { return a.score > b.score; });
+                pvLines = lines;
+            }
+
+            // Best line back into the PV table (later lines overwrote it)
+            if (!pvLines.empty())
+            {
+                pvLength[0] = (int)pvLines[0].pv.size();
+                std::copy(pvLines[0].pv.begin(), pvLines[0].pv.end(), pvTable[0]);
+                score = pvLines[0].score;
+            }
+
+            if (!complete)
+                break;
+
+            stats.maxDepthReached = depth;
+            for (size_t i = 0; i < pvLines.size(); i++)
+                reportIteration(depth, pvLines[i].score, (int)i + 1, pvLines[i].pv.data(), (int)pvLines[i].pv.size());
+
+            if (timeUp(depth, pvLines[0].move, score, 0.0))
+                break;
+            continue;
+        }
+
         pvLength[0] = 0;
+        bestMoveNodes = 0;
+        uint64_t depthStartNodes = stats.nodesSearched;
         score = alphaBeta(board, depth, -SCORE_INFINITE, SCORE_INFINITE, true, 0);
 
-        if (stopSearch)
+        if (stopped())
             break;
 
         stats.maxDepthReached = depth;
-        bestMove = pvTable[0][0];
+        pvLines.assign(1, PVLine());
+        pvLines[0].move = pvTable[0][0];
+        pvLines[0].score = score;
+        pvLines[0].depth = depth;
+        pvLines[0].pv.assign(pvTable[0], pvTable[0] + pvLength[0]);
 
-        // Print info (optional)
-        if (depth >= 3)
-        {
-            std::cout << "info depth " << depth
-                      << " score cp " << score
-                      << " nodes " << stats.nodesSearched
-                      << " nps " << (int)stats.getNodesPerSecond()
-                      << " time " << getElapsedTime()
-                      << " pv " << bestMove.toUCI()
-                      << std::endl;
-        }
+        reportIteration(depth, score, 1, pvTable[0], pvLength[0]);
+
+        uint64_t depthNodes = stats.nodesSearched - depthStartNodes;
+        if (timeUp(depth, pvTable[0][0], score, depthNodes > 0 ? (double)bestMoveNodes / depthNodes : 0.0))
+            break;
     }
 
     return score;
 }
 
+// Clock-based searches: ask the time manager whether to start another depth
+bool SearchEngine::timeUp(int depth, Move bestMove, Score score, double bestMoveNodeShare)
+{
+    if (threadId != 0)
+        return false;
+
+    // Read before the hit is applied (see ponderhit)
+    bool stillPondering = pondering;
+    applyPonderhit();
+
+    // Always fed, so the history is complete when a ponder search turns into a timed one
+    bool stop = timeManager.stopAfterIteration(depth, bestMove, score, bestMoveNodeShare, getElapsedTime());
+    return stop && !limits.infinite && !stillPondering;
+}
+
+// One MultiPV depth: the best line, then the best line without its root move, ...
+bool SearchEngine::searchMultiPV(Board &board, int depth, int numLines, std::vector<PVLine> &lines)
+{
+    excludedRootMoves.clear();
+
+    for (int i = 0; i < numLines; i++)
+    {
+        pvLength[0] = 0;
+        Score score = alphaBeta(board, depth, -SCORE_INFINITE, SCORE_INFINITE, true, 0);
+
+        if (stopped() || pvLength[0] == 0)
+            break;
+
+        PVLine line;
+        line.move = pvTable[0][0];
+        line.score = score;
+        line.depth = depth;
+        line.pv.assign(pvTable[0], pvTable[0] + pvLength[0]);
+        lines.push_back(line);
+        excludedRootMoves.push_back(line.move);
+    }
+
+    excludedRootMoves.clear();
+    return (int)lines.size() == numLines;
+}
+
+// Report a completed line (main thread only)
+void SearchEngine::reportIteration(int depth, Score score, int multiPVIndex, const Move *pv, int pvLen)
+{
+    if (threadId != 0)
+        return;
+
+    if (infoCallback)
+    {
+        IterationInfo info;
+        info.depth = depth;
+        info.selDepth = stats.selDepth;
+        info.score = score;
+        info.nodes = stats.nodesSearched;
+        info.timeMs = getElapsedTime();
+        info.nps = info.nodes * 1000 / std::max(1, info.timeMs);
+        info.tbHits = stats.tbHits;
+        info.multiPV = multiPVIndex;
+        info.pv.assign(pv, pv + pvLen);
+        infoCallback(info);
+    }
+    else if (depth >= 3)
+    {
+        std::cout << "info depth " << depth;
+        if (multiPV > 1)
+            std::cout << " multipv " << multiPVIndex;
+        std::cout << " score cp " << score
+                  << " nodes " << stats.nodesSearched
+                  << " nps " << (int)stats.getNodesPerSecond()
+                  << " time " << getElapsedTime()
+                  << " pv " << (pvLen > 0 ? pv[0].toUCI() : std::string("0000"))
+                  << std::endl;
+    }
+}
+
 // Alpha-beta search
 Score SearchEngine::alphaBeta(Board &board, int depth, Score alpha, Score beta, bool pvNode, int ply)
 {
+    pvLength[ply] = 0;
+    stats.selDepth = std::max(stats.selDepth, ply + 1);
+
+    // Hard ply limit (killer/PV tables)
+    if (ply >= MAX_PLY - 1)
+        return Evaluator::evaluate(board, &pawnTable);
+
     // Check time
     if ((stats.nodesSearched & 4095) == 0 && shouldStop())
     {
-        stopSearch = true;
+        *stopSignal = true;
         return 0;
     }
 
@@ -111,7 +593,13 @@ Score SearchEngine::alphaBeta(Board &board, int depth, Score alpha, Score beta,
 
     // Transposition table probe
     TTEntry ttEntry;
-    bool ttHit = tt.probe(board.getHash(), depth, alpha, beta, ttEntry);
+    bool ttFound = tt->probe(board.getHash(), ttEntry);
+    bool ttHit = ttFound && ttEntry.depth >= depth;
+
+    if (ttFound)
+        stats.ttHits++;
+    else
+        stats.ttMisses++;
 
     if (ttHit && !pvNode)
     {
@@ -129,7 +617,39 @@ Score SearchEngine::alphaBeta(Board &board, int depth, Score alpha, Score beta,
         }
     }
 
-    Move ttMove = ttHit ? ttEntry.bestMove : Move();
+    Move ttMove = ttFound ? ttEntry.bestMove : Move();
+    Score staticEval = ttFound ? ttEntry.staticEval : SCORE_NONE;
+
+    // Tablebase probe right after a capture or pawn move
+    if (ply > 0 && tbCardinality > 0 && board.getHalfMoveClock() == 0 && !board.getCastlingRights())
+    {
+        int pieceCount = popcount(board.getAllOccupied());
+        if (pieceCount < tbCardinality || (pieceCount == tbCardinality && depth >= tbProbeDepth))
+        {
+            ProbeState result;
+            WDLScore wdl = tablebases->probeWDL(board, result);
+
+            if (result != PROBE_FAIL)
+            {
+                stats.tbHits++;
+
+                // Cursed wins / blessed losses are draws under the 50-move rule
+                Score tbScore = wdl > WDL_CURSED_WIN     ? Score(SCORE_TB_WIN - ply)
+                                : wdl < WDL_BLESSED_LOSS ? Score(-SCORE_TB_WIN + ply)
+                                                         : Score(SCORE_DRAW + 2 * wdl);
+                uint8_t tbFlag = wdl > WDL_CURSED_WIN     ? TT_BETA
+                                 : wdl < WDL_BLESSED_LOSS ? TT_ALPHA
+                                                          : TT_EXACT;
+
+                if (tbFlag == TT_EXACT || (tbFlag == TT_BETA ? tbScore >= beta : tbScore <= alpha))
+                {
+                    tt->store(board.getHash(), Move(), scoreToTT(tbScore, ply),
+                              std::min(MAX_PLY - 1, depth + 6), tbFlag);
+                    return tbScore;
+                }
+            }
+        }
+    }
 
     // NEW: Probcut - prove beta cutoff with shallow search
     // DISABLED FOR SEGFAULT DEBUG
@@ -187,6 +707,19 @@ Score SearchEngine::alphaBeta(Board &board, int depth, Score alpha, Score beta,
         return inCheck ? Score(-SCORE_MATE + ply) : SCORE_DRAW;
     }
 
+    // Root moves filtered by the tablebases and by earlier MultiPV lines
+    if (ply == 0 && (!rootMoves.empty() || !excludedRootMoves.empty()))
+    {
+        MoveList allowed;
+        for (const Move &move : moves)
+        {
+            if ((rootMoves.empty() || std::find(rootMoves.begin(), rootMoves.end(), move) != rootMoves.end()) &&
+                std::find(excludedRootMoves.begin(), excludedRootMoves.end(), move) == excludedRootMoves.end())
+                allowed.add(move);
+        }
+        moves = allowed;
+    }
+
     // Move ordering
     orderMoves(board, moves, ttMove, killerMoves[ply][0], killerMoves[ply][1], ply);
 
@@ -203,13 +736,17 @@ Score SearchEngine::alphaBeta(Board &board, int depth, Score alpha, Score beta,
         // Futility pruning
         if (!pvNode && !inCheck && depth <= 3 && moveCount > 1)
         {
-            if (canFutilityPrune(depth, alpha, Evaluator::evaluate(board)))
+            if (staticEval == SCORE_NONE)
+                staticEval = Evaluator::evaluate(board, &pawnTable);
+
+            if (canFutilityPrune(depth, alpha, staticEval))
             {
                 continue;
             }
         }
 
         // Make move
+        uint64_t nodesBefore = stats.nodesSearched;
         board.makeMove(move);
 
         Score score;
@@ -264,7 +801,7 @@ Score SearchEngine::alphaBeta(Board &board, int depth, Score alpha, Score beta,
         // Unmake move
         board.unmakeMove(move);
 
-        if (stopSearch)
+        if (stopped())
             return 0;
 
         // Update best score
@@ -279,6 +816,9 @@ Score SearchEngine::alphaBeta(Board &board, int depth, Score alpha, Score beta,
                 ttFlag = TT_EXACT;
                 storePV(move, ply);
 
+                if (ply == 0)
+                    bestMoveNodes = stats.nodesSearched - nodesBefore;
+
                 // Beta cutoff
                 if (score >= beta)
                 {
@@ -303,8 +843,9 @@ Score SearchEngine::alphaBeta(Board &board, int depth, Score alpha, Score beta,
         }
     }
 
-    // Store in transposition table
-    tt.store(board.getHash(), bestMove, scoreToTT(bestScore, ply), depth, ttFlag);
+    // Store in transposition table (not a root searched without its best moves)
+    if (ply > 0 || excludedRootMoves.empty())
+        tt->store(board.getHash(), bestMove, scoreToTT(bestScore, ply), depth, ttFlag, staticEval);
 
     return bestScore;
 }
@@ -313,9 +854,14 @@ Score SearchEngine::alphaBeta(Board &board, int depth, Score alpha, Score beta,
 Score SearchEngine::quiescence(Board &board, Score alpha, Score beta, int ply)
 {
     stats.qNodesSearched++;
+    pvLength[ply] = 0;
+    stats.selDepth = std::max(stats.selDepth, ply + 1);
+
+    if (ply >= MAX_PLY - 1)
+        return Evaluator::evaluate(board, &pawnTable);
 
     // Stand pat
-    Score standPat = Evaluator::evaluate(board);
+    Score standPat = Evaluator::evaluate(board, &pawnTable);
 
     if (standPat >= beta)
     {
@@ -530,19 +1076,28 @@ int SearchEngine::getReduction(int depth, int moveIndex, bool pvNode)
     return reduction;
 }
 
+// New budgets after a ponderhit() from another thread (search thread only)
+void SearchEngine::applyPonderhit()
+{
+    int hitTime = ponderHitTime.exchange(-1);
+    if (hitTime >= 0)
+        timeManager.ponderhit(hitTime);
+}
+
 // Time management
 bool SearchEngine::shouldStop()
 {
-    if (stopSearch)
+    if (stopped())
         return true;
 
-    if (limits.infinite)
+    if (limits.infinite || pondering)
         return false;
+    applyPonderhit();
 
-    if (limits.timeLimit > 0)
+    if (timeManager.getMaximum() > 0)
     {
         int elapsed = getElapsedTime();
-        if (elapsed >= limits.timeLimit)
+        if (elapsed >= timeManager.getMaximum())
         {
             return true;
         }
@@ -767,7 +1322,7 @@ Move SearchEngine::doInternalIterativeDeepening(Board &board, int depth, Score a
 
     // Probe TT for best move from shallow search
     TTEntry ttEntry;
-    if (tt.probe(board.getHash(), iidDepth, alpha, beta, ttEntry))
+    if (tt->probe(board.getHash(), iidDepth, alpha, beta, ttEntry))
     {
         return ttEntry.bestMove;
     }
@@ -0,0 +1,1072 @@
+#include "tablebase.h"
+#include "mappedfile.h"
+#include "movegen.h"
+#include <algorithm>
+#include <atomic>
+#include <cstdlib>
+#include <cstring>
+#include <fstream>
+#include <sstream>
+
+// Syzygy table layout (as written by the generator):
+//  - positions are indexed by piece groups (leading pawns/pieces first),
+//    with the board mirrored so the leading piece is in a canonical region;
+//  - values are Huffman-coded symbols ("recursive pairing": a symbol may
+//    stand for a pair of symbols) stored in fixed-size blocks, with a
+//    sparse index pointing into the per-block value counts.
+// One table per side to move (WDL only) and, with pawns, per file a-d
+// of the leading pawn.
+
+namespace
+{
+    enum TBFlag
+    {
+        TB_STM = 1,
+        TB_MAPPED = 2,
+        TB_WIN_PLIES = 4,
+        TB_LOSS_PLIES = 8,
+        TB_WIDE = 16,
+        TB_SINGLE_VALUE = 128
+    };
+
+    const uint8_t WDL_MAGIC[4] = {0x71, 0xE8, 0x23, 0x5D};
+    const uint8_t DTZ_MAGIC[4] = {0xD7, 0x66, 0x0C, 0xA5};
+
+    const char PIECE_CHARS[] = "PNBRQK";
+
+    // Encoding tables (built once)
+    int MapPawns[64];
+    int MapB1H1H7[64];
+    int MapA1D1D4[64];
+    int MapKK[10][64];
+    uint64_t Binomial[6][64];   // [k][n]: ways to choose k of n
+    int LeadPawnIdx[6][64];     // [lead pawns][square]
+    uint64_t LeadPawnsSize[6][4]; // [lead pawns][file a-d]
+
+    inline int offA1H8(int sq) { return (sq >> 3) - (sq & 7); }
+    inline bool pawnsBefore(int a, int b) { return MapPawns[a] < MapPawns[b]; }
+
+    inline uint16_t readLE16(const uint8_t *p) { return uint16_t(p[0] | (p[1] << 8)); }
+    inline uint32_t readLE32(const uint8_t *p)
+    {
+        return uint32_t(p[0]) | (uint32_t(p[1]) << 8) | (uint32_t(p[2]) << 16) | (uint32_t(p[3]) << 24);
+    }
+    inline uint32_t readBE32(const uint8_t *p)
+    {
+        return (uint32_t(p[0]) << 24) | (uint32_t(p[1]) << 16) | (uint32_t(p[2]) << 8) | uint32_t(p[3]);
+    }
+    inline uint64_t readBE64(const uint8_t *p) { return (uint64_t(readBE32(p)) << 32) | readBE32(p + 4); }
+
+    // Piece code used in the files: 1-6 white pawn..king, 9-14 black
+    inline uint8_t tbPiece(Color c, PieceType pt) { return uint8_t((pt + 1) | (c == BLACK ? 8 : 0)); }
+
+    // Material signature: 4 bits per (side, pawn..queen), side 0 = white unless mirrored
+    uint64_t materialKey(const Board &board, bool mirror)
+    {
+        uint64_t key = 0;
+        for (int c = WHITE; c <= BLACK; c++)
+        {
+            int side = mirror ? 1 - c : c;
+            for (int pt = PAWN; pt <= QUEEN; pt++)
+                key |= uint64_t(popcount(board.getPieces(Color(c), PieceType(pt)))) << (4 * (pt + 5 * side));
+        }
+        return key;
+    }
+
+    // Value that the previous (zeroing) move had in DTZ terms
+    int dtzBeforeZeroing(WDLScore wdl)
+    {
+        return wdl == WDL_WIN           ? 1
+               : wdl == WDL_CURSED_WIN   ? 101
+               : wdl == WDL_BLESSED_LOSS ? -101
+               : wdl == WDL_LOSS         ? -1
+                                         : 0;
+    }
+
+    inline int signOf(int value) { return (value > 0) - (value < 0); }
+
+    void initEncodingTables()
+    {
+        static bool initialized = false;
+        if (initialized)
+            return;
+
+        // Squares below the a1-h8 diagonal -> 0..27
+        int code = 0;
+        for (int sq = 0; sq < 64; sq++)
+        {
+            if (offA1H8(sq) < 0)
+                MapB1H1H7[sq] = code++;
+        }
+
+        // a1-d1-d4 triangle -> 0..9 (diagonal squares last)
+        std::vector<int> diagonal;
+        code = 0;
+        for (int sq : {A1, B1, C1, D1, A2, B2, C2, D2, A3, B3, C3, D3, A4, B4, C4, D4})
+        {
+            if (offA1H8(sq) < 0)
+                MapA1D1D4[sq] = code++;
+            else if (offA1H8(sq) == 0)
+                diagonal.push_back(sq);
+        }
+        for (int sq : diagonal)
+            MapA1D1D4[sq] = code++;
+
+        // The 462 legal king pairs with the first king in the triangle
+        std::vector<std::pair<int, int>> bothOnDiagonal;
+        code = 0;
+        for (int idx = 0; idx < 10; idx++)
+        {
+            for (int s1 = A1; s1 <= D4; s1++)
+            {
+                if (MapA1D1D4[s1] != idx || (idx == 0 && s1 != B1)) // B1 maps to 0
+                    continue;
+
+                for (int s2 = 0; s2 < 64; s2++)
+                {
+                    bool touching = std::abs((s1 & 7) - (s2 & 7)) <= 1 && std::abs((s1 >> 3) - (s2 >> 3)) <= 1;
+                    if (touching)
+                        continue;
+                    if (!offA1H8(s1) && offA1H8(s2) > 0)
+                        continue; // First on the diagonal, second above it
+                    if (!offA1H8(s1) && !offA1H8(s2))
+                        bothOnDiagonal.emplace_back(idx, s2);
+                    else
+                        MapKK[idx][s2] = code++;
+                }
+            }
+        }
+        for (const auto &pair : bothOnDiagonal)
+            MapKK[pair.first][pair.second] = code++;
+
+        // Binomial coefficients (Pascal's rule)
+        Binomial[0][0] = 1;
+        for (int n = 1; n < 64; n++)
+        {
+            for (int k = 0; k < 6 && k <= n; k++)
+            {
+                Binomial[k][n] = (k > 0 ? Binomial[k - 1][n - 1] : 0) + (k < n ? Binomial[k][n - 1] : 0);
+            }
+        }
+
+        // Pawn squares a2-h7 -> 0..47; the highest value is the leading pawn
+        // (nearest the edge, then lowest rank)
+        int availableSquares = 47;
+        for (int leadPawns = 1; leadPawns <= 5; leadPawns++)
+        {
+            for (int file = 0; file < 4; file++)
+            {
+                int idx = 0;
+                for (int rank = 1; rank <= 6; rank++)
+                {
+                    int sq = rank * 8 + file;
+                    if (leadPawns == 1)
+                    {
+                        MapPawns[sq] = availableSquares--;
+                        MapPawns[sq ^ 7] = availableSquares--;
+                    }
+                    LeadPawnIdx[leadPawns][sq] = idx;
+                    idx += (int)Binomial[leadPawns - 1][MapPawns[sq]];
+                }
+                LeadPawnsSize[leadPawns][file] = idx;
+            }
+        }
+
+        initialized = true;
+    }
+}
+
+// Decoding data of one sub-table (side to move / leading file)
+struct PairsData
+{
+    uint8_t flags;
+    size_t sizeofBlock;
+    size_t span;                 // One sparse index entry per span values
+    uint32_t numBlocks;
+    int maxSymLen;
+    int minSymLen;               // Single value tables: the value itself
+    const uint8_t *lowestSym;    // LE uint16 per symbol length
+    const uint8_t *btree;        // 3 bytes per symbol: left/right children (12 bits each)
+    const uint8_t *blockLength;  // LE uint16 per block: values in block - 1
+    uint32_t blockLengthSize;
+    const uint8_t *sparseIndex;  // 6 bytes per entry: LE uint32 block, LE uint16 offset
+    size_t sparseIndexSize;
+    const uint8_t *data;         // Compressed blocks
+    std::vector<uint64_t> base64; // Lowest code of each length, left-aligned to 64 bits
+    std::vector<uint8_t> symlen;  // Values per symbol - 1
+    uint8_t pieces[TB_PIECES];
+    uint64_t groupIdx[TB_PIECES + 1];
+    int groupLen[TB_PIECES + 1];
+    uint16_t mapIdx[4]; // DTZ value maps for win, loss, cursed win, blessed loss
+
+    PairsData()
+        : flags(0), sizeofBlock(0), span(0), numBlocks(0), maxSymLen(0), minSymLen(0),
+          lowestSym(nullptr), btree(nullptr), blockLength(nullptr), blockLengthSize(0),
+          sparseIndex(nullptr), sparseIndexSize(0), data(nullptr),
+          pieces{}, groupIdx{}, groupLen{}, mapIdx{} {}
+
+    int symLeft(int sym) const { return ((btree[3 * sym + 1] & 0xF) << 8) | btree[3 * sym]; }
+    int symRight(int sym) const { return (btree[3 * sym + 2] << 4) | (btree[3 * sym + 1] >> 4); }
+};
+
+// One .rtbw or .rtbz file
+struct TBTable
+{
+    bool dtz;
+    std::string name; // e.g. "KRvKN" (white = stronger side)
+    std::string path;
+    std::atomic<bool> ready;
+    bool valid;
+    MappedFile file;
+    const uint8_t *valueMap; // DTZ value maps
+    uint64_t key;            // Material key with the stronger side white
+    uint64_t key2;           // ... with colors swapped
+    int pieceCount;
+    bool hasPawns;
+    bool hasUniquePieces;
+    uint8_t pawnCount[2]; // [leading color / other color]
+    PairsData items[2][4]; // [side to move][leading pawn file]
+
+    TBTable() : dtz(false), ready(false), valid(false), valueMap(nullptr), key(0), key2(0),
+                pieceCount(0), hasPawns(false), hasUniquePieces(false), pawnCount{0, 0} {}
+
+    PairsData *get(int stm, int file) { return &items[dtz ? 0 : stm % 2][hasPawns ? file : 0]; }
+};
+
+namespace
+{
+    // Decompress the value at index idx of a sub-table
+    int decompressPairs(const PairsData *d, uint64_t idx)
+    {
+        if (d->flags & TB_SINGLE_VALUE)
+            return d->minSymLen;
+
+        // Nearest sparse index entry, then walk blocks to the one holding idx
+        uint32_t k = uint32_t(idx / d->span);
+        uint32_t block = readLE32(d->sparseIndex + 6 * k);
+        int offset = readLE16(d->sparseIndex + 6 * k + 4);
+        offset += int(idx % d->span) - int(d->span / 2);
+
+        while (offset < 0)
+            offset += readLE16(d->blockLength + 2 * (--block)) + 1;
+        while (offset > readLE16(d->blockLength + 2 * block))
+            offset -= readLE16(d->blockLength + 2 * (block++)) + 1;
+
+        // Decode symbols until the one covering offset
+        const uint8_t *ptr = d->data + uint64_t(block) * d->sizeofBlock;
+        uint64_t buf64 = readBE64(ptr);
+        ptr += 8;
+        int buf64Size = 64;
+        int sym;
+
+        while (true)
+        {
+            int len = 0; // Symbol length - minSymLen
+            while (buf64 < d->base64[len])
+                len++;
+
+            sym = int((buf64 - d->base64[len]) >> (64 - len - d->minSymLen));
+            sym += readLE16(d->lowestSym + 2 * len);
+
+            if (offset < d->symlen[sym] + 1)
+                break;
+
+            offset -= d->symlen[sym] + 1;
+            len += d->minSymLen;
+            buf64 <<= len;
+            buf64Size -= len;
+
+            if (buf64Size <= 32)
+            {
+                buf64Size += 32;
+                buf64 |= uint64_t(readBE32(ptr)) << (64 - buf64Size);
+                ptr += 4;
+            }
+        }
+
+        // Expand paired symbols down to the leaf holding the value
+        while (d->symlen[sym])
+        {
+            int left = d->symLeft(sym);
+            if (offset < d->symlen[left] + 1)
+            {
+                sym = left;
+            }
+            else
+            {
+                offset -= d->symlen[left] + 1;
+                sym = d->symRight(sym);
+            }
+        }
+
+        return d->symLeft(sym);
+    }
+
+    // Piece groups and their index multipliers
+    void setGroups(const TBTable &e, PairsData *d, const int order[2], int file)
+    {
+        int n = 0;
+        int firstLen = e.hasPawns ? 0 : e.hasUniquePieces ? 3 : 2;
+        d->groupLen[n] = 1;
+
+        for (int i = 1; i < e.pieceCount; i++)
+        {
+            if (--firstLen > 0 || d->pieces[i] == d->pieces[i - 1])
+                d->groupLen[n]++;
+            else
+                d->groupLen[++n] = 1;
+        }
+        d->groupLen[++n] = 0;
+
+        bool pp = e.hasPawns && e.pawnCount[1]; // Pawns on both sides
+        int next = pp ? 2 : 1;
+        int freeSquares = 64 - d->groupLen[0] - (pp ? d->groupLen[1] : 0);
+        uint64_t idx = 1;
+
+        for (int k = 0; next < n || k == order[0] || k == order[1]; k++)
+        {
+            if (k == order[0]) // Leading pawns or pieces
+            {
+                d->groupIdx[0] = idx;
+                idx *= e.hasPawns ? LeadPawnsSize[d->groupLen[0]][file] : e.hasUniquePieces ? 31332 : 462;
+            }
+            else if (k == order[1]) // Remaining pawns
+            {
+                d->groupIdx[1] = idx;
+                idx *= Binomial[d->groupLen[1]][48 - d->groupLen[0]];
+            }
+            else // Remaining pieces
+            {
+                d->groupIdx[next] = idx;
+                idx *= Binomial[d->groupLen[next]][freeSquares];
+                freeSquares -= d->groupLen[next++];
+            }
+        }
+
+        d->groupIdx[n] = idx;
+    }
+
+    uint8_t setSymlen(PairsData *d, int sym, std::vector<bool> &visited)
+    {
+        visited[sym] = true;
+        int right = d->symRight(sym);
+        if (right == 0xFFF)
+            return 0;
+
+        int left = d->symLeft(sym);
+        if (!visited[left])
+            d->symlen[left] = setSymlen(d, left, visited);
+        if (!visited[right])
+            d->symlen[right] = setSymlen(d, right, visited);
+
+        return uint8_t(d->symlen[left] + d->symlen[right] + 1);
+    }
+
+    const uint8_t *setSizes(PairsData *d, const uint8_t *data)
+    {
+        d->flags = *data++;
+
+        if (d->flags & TB_SINGLE_VALUE)
+        {
+            d->minSymLen = *data++; // The single value
+            return data;
+        }
+
+        int groups = 0;
+        while (d->groupLen[groups])
+            groups++;
+        uint64_t tbSize = d->groupIdx[groups];
+
+        d->sizeofBlock = size_t(1) << *data++;
+        d->span = size_t(1) << *data++;
+        d->sparseIndexSize = size_t((tbSize + d->span - 1) / d->span);
+        int padding = *data++;
+        d->numBlocks = readLE32(data);
+        data += 4;
+        d->blockLengthSize = d->numBlocks + padding;
+        d->maxSymLen = *data++;
+        d->minSymLen = *data++;
+        d->lowestSym = data;
+        d->base64.assign(d->maxSymLen - d->minSymLen + 1, 0);
+
+        // Canonical Huffman: longer codes have lower values
+        for (int i = (int)d->base64.size() - 2; i >= 0; i--)
+        {
+            d->base64[i] = (d->base64[i + 1] + readLE16(d->lowestSym + 2 * i) - readLE16(d->lowestSym + 2 * (i + 1))) / 2;
+        }
+        for (size_t i = 0; i < d->base64.size(); i++)
+        {
+            d->base64[i] <<= 64 - i - d->minSymLen;
+        }
+
+        data += d->base64.size() * 2;
+        d->symlen.assign(readLE16(data), 0);
+        data += 2;
+        d->btree = data;
+
+        std::vector<bool> visited(d->symlen.size());
+        for (size_t sym = 0; sym < d->symlen.size(); sym++)
+        {
+            if (!visited[sym])
+                d->symlen[sym] = setSymlen(d, (int)sym, visited);
+        }
+
+        return data + d->symlen.size() * 3 + (d->symlen.size() & 1);
+    }
+
+    const uint8_t *setDtzMap(TBTable &e, const uint8_t *data, int maxFile)
+    {
+        e.valueMap = data;
+
+        for (int f = 0; f <= maxFile; f++)
+        {
+            PairsData *d = e.get(0, f);
+            if (!(d->flags & TB_MAPPED))
+                continue;
+
+            if (d->flags & TB_WIDE)
+            {
+                data += (uintptr_t)data & 1; // Word alignment
+                for (int i = 0; i < 4; i++)
+                {
+                    d->mapIdx[i] = uint16_t((data - e.valueMap) / 2 + 1);
+                    data += 2 * readLE16(data) + 2;
+                }
+            }
+            else
+            {
+                for (int i = 0; i < 4; i++)
+                {
+                    d->mapIdx[i] = uint16_t(data - e.valueMap + 1);
+                    data += *data + 1;
+                }
+            }
+        }
+
+        return data + ((uintptr_t)data & 1);
+    }
+
+    // Read the table header of a just-mapped file
+    void setup(TBTable &e, const uint8_t *data)
+    {
+        data++; // Flags: split (two sides), has pawns
+
+        int sides = (!e.dtz && e.key != e.key2) ? 2 : 1;
+        int maxFile = e.hasPawns ? 3 : 0;
+        bool pp = e.hasPawns && e.pawnCount[1];
+
+        for (int f = 0; f <= maxFile; f++)
+        {
+            for (int i = 0; i < sides; i++)
+                *e.get(i, f) = PairsData();
+
+            int order[2][2] = {{*data & 0xF, pp ? *(data + 1) & 0xF : 0xF},
+                               {*data >> 4, pp ? *(data + 1) >> 4 : 0xF}};
+            data += 1 + pp;
+
+            for (int k = 0; k < e.pieceCount; k++, data++)
+            {
+                for (int i = 0; i < sides; i++)
+                    e.get(i, f)->pieces[k] = uint8_t(i ? *data >> 4 : *data & 0xF);
+            }
+
+            for (int i = 0; i < sides; i++)
+                setGroups(e, e.get(i, f), order[i], f);
+        }
+
+        data += (uintptr_t)data & 1;
+
+        for (int f = 0; f <= maxFile; f++)
+            for (int i = 0; i < sides; i++)
+                data = setSizes(e.get(i, f), data);
+
+        if (e.dtz)
+            data = setDtzMap(e, data, maxFile);
+
+        for (int f = 0; f <= maxFile; f++)
+            for (int i = 0; i < sides; i++)
+            {
+                PairsData *d = e.get(i, f);
+                d->sparseIndex = data;
+                data += d->sparseIndexSize * 6;
+            }
+
+        for (int f = 0; f <= maxFile; f++)
+            for (int i = 0; i < sides; i++)
+            {
+                PairsData *d = e.get(i, f);
+                d->blockLength = data;
+                data += d->blockLengthSize * 2;
+            }
+
+        for (int f = 0; f <= maxFile; f++)
+            for (int i = 0; i < sides; i++)
+            {
+                data = (const uint8_t *)(((uintptr_t)data + 0x3F) & ~uintptr_t(0x3F)); // 64-byte alignment
+                PairsData *d = e.get(i, f);
+                d->data = data;
+                data += d->numBlocks * d->sizeofBlock;
+            }
+    }
+
+    // DTZ values are stored per WDL class, possibly remapped and in moves
+    int mapDtzScore(TBTable &e, int file, int value, WDLScore wdl)
+    {
+        static const int WDLMap[] = {1, 3, 0, 2, 0};
+
+        const PairsData *d = e.get(0, file);
+        if (d->flags & TB_MAPPED)
+        {
+            int idx = d->mapIdx[WDLMap[wdl + 2]] + value;
+            value = (d->flags & TB_WIDE) ? readLE16(e.valueMap + 2 * idx) : e.valueMap[idx];
+        }
+
+        if ((wdl == WDL_WIN && !(d->flags & TB_WIN_PLIES)) ||
+            (wdl == WDL_LOSS && !(d->flags & TB_LOSS_PLIES)) ||
+            wdl == WDL_CURSED_WIN || wdl == WDL_BLESSED_LOSS)
+        {
+            value *= 2;
+        }
+
+        return value + 1;
+    }
+}
+
+Tablebases::Tablebases() : maxCardinality(0)
+{
+    initEncodingTables();
+}
+
+Tablebases::~Tablebases() = default;
+
+void Tablebases::clear()
+{
+    byMaterial.clear();
+    tables.clear();
+    paths.clear();
+    maxCardinality = 0;
+}
+
+int Tablebases::init(const std::string &pathList)
+{
+    clear();
+
+#ifdef _WIN32
+    const char separator = ';';
+#else
+    const char separator = ':';
+#endif
+    std::stringstream ss(pathList);
+    std::string path;
+    while (std::getline(ss, path, separator))
+    {
+        if (!path.empty())
+            paths.push_back(path);
+    }
+    if (paths.empty())
+        return 0;
+
+    // Every material combination up to 6 pieces, stronger side first
+    std::vector<std::string> codes;
+    const std::string pieces = "QRBNP";
+    for (int total = 2; total <= 6; total++)
+    {
+        // Non-king pieces as a multiset over QRBNP, split between the sides
+        std::vector<std::string> sets = {""};
+        for (int n = 0; n < total - 2; n++)
+        {
+            std::vector<std::string> longer;
+            for (const std::string &s : sets)
+                for (size_t p = s.empty() ? 0 : pieces.find(s.back()); p < pieces.size(); p++)
+                    longer.push_back(s + pieces[p]);
+            sets.swap(longer);
+        }
+
+        for (const std::string &set : sets)
+        {
+            // Every split into two sorted halves (each a subsequence of set)
+            int n = (int)set.size();
+            for (int mask = 0; mask < (1 << n); mask++)
+            {
+                std::string white = "K", black = "K";
+                for (int i = 0; i < n; i++)
+                    ((mask >> i) & 1 ? white : black) += set[i];
+                codes.push_back(white + "v" + black);
+            }
+        }
+    }
+
+    std::sort(codes.begin(), codes.end());
+    codes.erase(std::unique(codes.begin(), codes.end()), codes.end());
+    for (const std::string &code : codes)
+        addTable(code);
+
+    return getNumTables();
+}
+
+void Tablebases::addTable(const std::string &code)
+{
+    std::string found;
+    for (const std::string &dir : paths)
+    {
+        std::string candidate = dir + "/" + code + ".rtbw";
+        if (std::ifstream(candidate).good())
+        {
+            found = dir + "/" + code;
+            break;
+        }
+    }
+    if (found.empty())
+        return;
+
+    // Piece counts per side from the name
+    size_t v = code.find('v');
+    int counts[2][6] = {};
+    for (size_t i = 0; i < code.size(); i++)
+    {
+        const char *p = std::strchr(PIECE_CHARS, code[i]);
+        if (p && code[i] != 'v')
+            counts[i < v ? 0 : 1][p - PIECE_CHARS]++;
+    }
+
+    uint64_t key = 0, key2 = 0;
+    for (int pt = PAWN; pt <= QUEEN; pt++)
+    {
+        key |= uint64_t(counts[0][pt]) << (4 * pt) | uint64_t(counts[1][pt]) << (4 * (pt + 5));
+        key2 |= uint64_t(counts[1][pt]) << (4 * pt) | uint64_t(counts[0][pt]) << (4 * (pt + 5));
+    }
+
+    TBTable *wdl = nullptr, *dtz = nullptr;
+    for (int type = 0; type < 2; type++)
+    {
+        std::unique_ptr<TBTable> table(new TBTable());
+        table->dtz = (type == 1);
+        table->name = code;
+        table->path = found + (table->dtz ? ".rtbz" : ".rtbw");
+        table->key = key;
+        table->key2 = key2;
+        table->pieceCount = (int)code.size() - 1;
+        table->hasPawns = counts[0][PAWN] + counts[1][PAWN] > 0;
+        for (int c = 0; c < 2; c++)
+            for (int pt = PAWN; pt < KING; pt++)
+                if (counts[c][pt] == 1)
+                    table->hasUniquePieces = true;
+
+        // Leading color: the side with fewer pawns (but some), white on ties
+        bool whiteLeads = !counts[1][PAWN] || (counts[0][PAWN] && counts[1][PAWN] >= counts[0][PAWN]);
+        table->pawnCount[0] = uint8_t(counts[whiteLeads ? 0 : 1][PAWN]);
+        table->pawnCount[1] = uint8_t(counts[whiteLeads ? 1 : 0][PAWN]);
+
+        (table->dtz ? dtz : wdl) = table.get();
+        tables.push_back(std::move(table));
+    }
+
+    maxCardinality = std::max(maxCardinality, wdl->pieceCount);
+    byMaterial[key] = std::make_pair(wdl, dtz);
+    byMaterial[key2] = std::make_pair(wdl, dtz);
+}
+
+// Map a table on first use (thread-safe); false if the file is missing or invalid
+bool Tablebases::mapTable(TBTable &table)
+{
+    if (table.ready.load(std::memory_order_acquire))
+        return table.valid;
+
+    std::lock_guard<std::mutex> lock(mapMutex);
+    if (table.ready.load(std::memory_order_relaxed))
+        return table.valid;
+
+    const uint8_t *magic = table.dtz ? DTZ_MAGIC : WDL_MAGIC;
+    if (table.file.open(table.path) && table.file.size() % 64 == 16 &&
+        std::memcmp(table.file.getData(), magic, 4) == 0)
+    {
+        setup(table, table.file.getData() + 4);
+        table.valid = true;
+    }
+    else
+    {
+        table.file.close();
+    }
+
+    table.ready.store(true, std::memory_order_release);
+    return table.valid;
+}
+
+int Tablebases::probeTable(const Board &board, bool dtz, WDLScore wdl, ProbeState &result)
+{
+    if (popcount(board.getAllOccupied()) == 2) // KvK
+        return dtz ? 0 : WDL_DRAW;
+
+    auto it = byMaterial.find(materialKey(board, false));
+    if (it == byMaterial.end())
+    {
+        result = PROBE_FAIL;
+        return 0;
+    }
+
+    TBTable *table = dtz ? it->second.second : it->second.first;
+    if (!mapTable(*table))
+    {
+        result = PROBE_FAIL;
+        return 0;
+    }
+
+    return probeTable(board, *table, wdl, result);
+}
+
+// Index the position in the table and decode its value
+int Tablebases::probeTable(const Board &board, TBTable &e, WDLScore wdl, ProbeState &result)
+{
+    int squares[TB_PIECES];
+    uint8_t pieces[TB_PIECES];
+    int size = 0, leadPawnsCnt = 0;
+    Bitboard leadPawns = 0;
+    int tbFile = 0;
+    Color us = board.getSideToMove();
+
+    // Tables are stored with the stronger side as white, and symmetric
+    // tables only for white to move: otherwise flip colors and squares.
+    bool symmetricBlackToMove = (e.key == e.key2 && us == BLACK);
+    bool blackStronger = (materialKey(board, false) != e.key);
+    bool flip = symmetricBlackToMove || blackStronger;
+    int flipColor = flip ? 8 : 0;
+    int flipSquares = flip ? 56 : 0;
+    int stm = (flip ? 1 : 0) ^ (us == BLACK ? 1 : 0);
+
+    // With pawns, the sub-table depends on the file of the leading pawn
+    if (e.hasPawns)
+    {
+        uint8_t pc = uint8_t(e.get(0, 0)->pieces[0] ^ flipColor);
+        Color leadColor = (pc & 8) ? BLACK : WHITE;
+
+        Bitboard b = leadPawns = board.getPieces(leadColor, PAWN);
+        while (b)
+            squares[size++] = popLsb(b) ^ flipSquares;
+        leadPawnsCnt = size;
+
+        std::swap(squares[0], *std::max_element(squares, squares + leadPawnsCnt, pawnsBefore));
+
+        int f = squares[0] & 7;
+        tbFile = std::min(f, 7 - f);
+    }
+
+    // DTZ tables hold one side to move only
+    if (e.dtz)
+    {
+        int flags = e.get(stm, tbFile)->flags;
+        if ((flags & TB_STM) != stm && !(e.key == e.key2 && !e.hasPawns))
+        {
+            result = PROBE_CHANGE_STM;
+            return 0;
+        }
+    }
+
+    Bitboard b = board.getAllOccupied() ^ leadPawns;
+    while (b)
+    {
+        Square sq = popLsb(b);
+        squares[size] = sq ^ flipSquares;
+        pieces[size++] = uint8_t(tbPiece(board.pieceColorAt(sq), board.pieceTypeAt(sq)) ^ flipColor);
+    }
+
+    PairsData *d = e.get(stm, tbFile);
+
+    // Order the pieces as the table does
+    for (int i = leadPawnsCnt; i < size - 1; i++)
+    {
+        for (int j = i + 1; j < size; j++)
+        {
+            if (d->pieces[i] == pieces[j])
+            {
+                std::swap(pieces[i], pieces[j]);
+                std::swap(squares[i], squares[j]);
+                break;
+            }
+        }
+    }
+
+    // Leading piece on files a-d
+    if ((squares[0] & 7) > 3)
+    {
+        for (int i = 0; i < size; i++)
+            squares[i] ^= 7;
+    }
+
+    uint64_t idx;
+    if (e.hasPawns)
+    {
+        idx = LeadPawnIdx[leadPawnsCnt][squares[0]];
+        std::stable_sort(squares + 1, squares + leadPawnsCnt, pawnsBefore);
+        for (int i = 1; i < leadPawnsCnt; i++)
+            idx += Binomial[i][MapPawns[squares[i]]];
+    }
+    else
+    {
+        // Leading piece on ranks 1-4, then below the a1-h8 diagonal
+        if ((squares[0] >> 3) > 3)
+        {
+            for (int i = 0; i < size; i++)
+                squares[i] ^= 56;
+        }
+
+        for (int i = 0; i < d->groupLen[0]; i++)
+        {
+            if (!offA1H8(squares[i]))
+                continue;
+            if (offA1H8(squares[i]) > 0)
+            {
+                for (int j = i; j < size; j++)
+                    squares[j] = ((squares[j] >> 3) | (squares[j] << 3)) & 63;
+            }
+            break;
+        }
+
+        if (e.hasUniquePieces)
+        {
+            // Three unique leading pieces, placed together
+            int adjust1 = squares[1] > squares[0];
+            int adjust2 = (squares[2] > squares[0]) + (squares[2] > squares[1]);
+
+            if (offA1H8(squares[0]))
+                idx = (uint64_t(MapA1D1D4[squares[0]]) * 63 + (squares[1] - adjust1)) * 62 + squares[2] - adjust2;
+            else if (offA1H8(squares[1]))
+                idx = (6 * 63 + uint64_t(squares[0] >> 3) * 28 + MapB1H1H7[squares[1]]) * 62 + squares[2] - adjust2;
+            else if (offA1H8(squares[2]))
+                idx = 6 * 63 * 62 + 4 * 28 * 62 + uint64_t(squares[0] >> 3) * 7 * 28 +
+                      ((squares[1] >> 3) - adjust1) * 28 + MapB1H1H7[squares[2]];
+            else
+                idx = 6 * 63 * 62 + 4 * 28 * 62 + 4 * 7 * 28 + uint64_t(squares[0] >> 3) * 7 * 6 +
+                      ((squares[1] >> 3) - adjust1) * 6 + ((squares[2] >> 3) - adjust2);
+        }
+        else
+        {
+            // Only the two kings lead
+            idx = MapKK[MapA1D1D4[squares[0]]][squares[1]];
+        }
+    }
+
+    // Remaining groups: combinations of squares not taken by earlier groups
+    idx *= d->groupIdx[0];
+    int *groupSq = squares + d->groupLen[0];
+    bool remainingPawns = e.hasPawns && e.pawnCount[1];
+
+    for (int next = 1; d->groupLen[next]; next++)
+    {
+        std::stable_sort(groupSq, groupSq + d->groupLen[next]);
+        uint64_t n = 0;
+
+        for (int i = 0; i < d->groupLen[next]; i++)
+        {
+            int adjust = 0;
+            for (int *s = squares; s < groupSq; s++)
+                adjust += groupSq[i] > *s;
+            n += Binomial[i + 1][groupSq[i] - adjust - 8 * remainingPawns];
+        }
+
+        remainingPawns = false;
+        idx += n * d->groupIdx[next];
+        groupSq += d->groupLen[next];
+    }
+
+    int value = decompressPairs(d, idx);
+    return e.dtz ? mapDtzScore(e, tbFile, value, wdl) : value - 2;
+}
+
+// WDL with captures (and, for DTZ, pawn moves) resolved by a 1-ply search:
+// tables may store "don't care" values where such a move is best
+WDLScore Tablebases::search(Board &board, bool checkZeroingMoves, ProbeState &result)
+{
+    WDLScore bestValue = WDL_LOSS;
+    WDLScore value;
+
+    MoveList moves;
+    MoveGenerator::generateLegalMoves(board, moves);
+    int moveCount = 0;
+    bool failedCapture = false; // Tables may hold "don't care" values there
+    bool failedPawnMove = false; // Matters only if the position is won (DTZ)
+
+    for (const Move &move : moves)
+    {
+        if (!move.isCapture() && (!checkZeroingMoves || board.pieceTypeAt(move.from()) != PAWN))
+            continue;
+
+        moveCount++;
+
+        board.makeMove(move);
+        value = WDLScore(-search(board, false, result));
+        board.unmakeMove(move);
+
+        // A missing table after one move does not matter if another one wins
+        if (result == PROBE_FAIL)
+        {
+            (move.isCapture() ? failedCapture : failedPawnMove) = true;
+            result = PROBE_OK;
+            continue;
+        }
+
+        if (value > bestValue)
+        {
+            bestValue = value;
+            if (value >= WDL_WIN)
+            {
+                result = PROBE_ZEROING_BEST_MOVE;
+                return value;
+            }
+        }
+    }
+
+    if (failedCapture)
+    {
+        result = PROBE_FAIL;
+        return WDL_DRAW;
+    }
+
+    // All legal moves searched: the stored value may be wrong (e.g. en passant)
+    bool noMoreMoves = moveCount && moveCount == moves.size() && !failedPawnMove;
+    if (noMoreMoves)
+    {
+        value = bestValue;
+    }
+    else
+    {
+        value = WDLScore(probeTable(board, false, WDL_DRAW, result));
+        if (result == PROBE_FAIL)
+            return WDL_DRAW;
+    }
+
+    if (failedPawnMove && std::max(value, bestValue) > WDL_DRAW)
+    {
+        result = PROBE_FAIL;
+        return WDL_DRAW;
+    }
+
+    if (bestValue >= value)
+    {
+        result = (bestValue > WDL_DRAW || noMoreMoves) ? PROBE_ZEROING_BEST_MOVE : PROBE_OK;
+        return bestValue;
+    }
+
+    result = PROBE_OK;
+    return value;
+}
+
+WDLScore Tablebases::probeWDL(Board &board, ProbeState &result)
+{
+    result = PROBE_OK;
+    return search(board, false, result);
+}
+
+int Tablebases::probeDTZ(Board &board, ProbeState &result)
+{
+    result = PROBE_OK;
+    WDLScore wdl = search(board, true, result);
+
+    if (result == PROBE_FAIL || wdl == WDL_DRAW) // Draws are not stored
+        return 0;
+
+    if (result == PROBE_ZEROING_BEST_MOVE)
+        return dtzBeforeZeroing(wdl);
+
+    int dtz = probeTable(board, true, wdl, result);
+    if (result == PROBE_FAIL)
+        return 0;
+
+    if (result != PROBE_CHANGE_STM)
+        return (dtz + 100 * (wdl == WDL_BLESSED_LOSS || wdl == WDL_CURSED_WIN)) * signOf(wdl);
+
+    // Stored for the other side: 1-ply search for the best DTZ
+    int minDTZ = 0xFFFF;
+    MoveList moves;
+    MoveGenerator::generateLegalMoves(board, moves);
+
+    for (const Move &move : moves)
+    {
+        bool zeroing = move.isCapture() || board.pieceTypeAt(move.from()) == PAWN;
+
+        board.makeMove(move);
+
+        dtz = zeroing ? -dtzBeforeZeroing(search(board, false, result)) : -probeDTZ(board, result);
+
+        // A mating move has DTZ 1
+        if (dtz == 1 && board.isCheckmate())
+            minDTZ = 1;
+
+        if (!zeroing)
+            dtz += signOf(dtz);
+
+        if (dtz < minDTZ && signOf(dtz) == signOf(wdl))
+            minDTZ = dtz;
+
+        board.unmakeMove(move);
+
+        if (result == PROBE_FAIL)
+            return 0;
+    }
+
+    return minDTZ == 0xFFFF ? -1 : minDTZ;
+}
+
+bool Tablebases::rankRootMoves(Board &board, std::vector<std::pair<Move, int>> &rankedMoves, bool &dtzUsed)
+{
+    static const int WDL_TO_RANK[] = {-1000, -899, 0, 899, 1000};
+
+    MoveList moves;
+    MoveGenerator::generateLegalMoves(board, moves);
+    int cnt50 = board.getHalfMoveClock();
+    bool repeated = board.isRepetition();
+    ProbeState result = PROBE_OK;
+
+    // DTZ ranking: prefer moves that win within the 50-move rule
+    rankedMoves.clear();
+    dtzUsed = true;
+    for (const Move &move : moves)
+    {
+        board.makeMove(move);
+
+        int dtz;
+        if (board.getHalfMoveClock() == 0)
+        {
+            dtz = dtzBeforeZeroing(WDLScore(-probeWDL(board, result)));
+        }
+        else
+        {
+            dtz = -probeDTZ(board, result);
+            dtz = dtz > 0 ? dtz + 1 : dtz < 0 ? dtz - 1 : dtz;
+        }
+
+        if (dtz == 2 && board.isCheckmate())
+            dtz = 1;
+
+        board.unmakeMove(move);
+
+        if (result == PROBE_FAIL)
+            break;
+
+        int rank = dtz > 0   ? (dtz + cnt50 <= 99 && !repeated ? 1000 : 1000 - (dtz + cnt50))
+                   : dtz < 0 ? (-dtz * 2 + cnt50 < 100 ? -1000 : -1000 + (-dtz + cnt50))
+                             : 0;
+        rankedMoves.emplace_back(move, rank);
+    }
+
+    if (result != PROBE_FAIL)
+        return true;
+
+    // No DTZ table: rank by WDL
+    rankedMoves.clear();
+    dtzUsed = false;
+    for (const Move &move : moves)
+    {
+        board.makeMove(move);
+        WDLScore wdl = WDLScore(-probeWDL(board, result));
+        board.unmakeMove(move);
+
+        if (result == PROBE_FAIL)
+        {
+            rankedMoves.clear();
+            return false;
+        }
+        rankedMoves.emplace_back(move, WDL_TO_RANK[wdl + 2]);
+    }
+
+    return true;
+}
@@ -0,0 +1,80 @@
+#include "timeman.h"
+#include <algorithm>
+
+TimeManager::TimeManager()
+    : optimum(0), maximum(0), moveOverhead(DEFAULT_MOVE_OVERHEAD), managed(false),
+      lastScore(0), stableIterations(0), instability(0.0)
+{
+}
+
+void TimeManager::init(int timeLeft, int increment, int movesToGo, int moveTime, int gamePly)
+{
+    optimum = 0;
+    maximum = 0;
+    managed = false;
+    lastBestMove = Move();
+    lastScore = 0;
+    stableIterations = 0;
+    instability = 0.0;
+
+    if (moveTime > 0)
+    {
+        optimum = maximum = moveTime;
+        return;
+    }
+    if (timeLeft < 0)
+        return;
+
+    managed = true;
+
+    // Sudden death: assume fewer moves remain as the game goes on
+    int mtg = movesToGo > 0 ? std::min(movesToGo, 50) : std::max(20, 50 - gamePly / 4);
+    int safeTime = std::max(1, timeLeft - moveOverhead);
+
+    // Even share of the time until the next control, increments included
+    long long available = (long long)safeTime + (long long)std::max(0, increment) * (mtg - 1);
+    long long share = available / mtg;
+
+    // Never more than a fraction of the clock on one move (nearly all of it on the last)
+    long long cap = mtg == 1 ? safeTime * 9LL / 10 : safeTime * 2LL / 5;
+    maximum = (int)std::max(1LL, std::min(share * 5, cap));
+    optimum = (int)std::max(1LL, std::min(share, (long long)maximum));
+}
+
+bool TimeManager::stopAfterIteration(int depth, Move bestMove, Score score, double bestMoveNodeShare, int elapsedMs)
+{
+    if (!managed)
+        return false;
+
+    bool first = lastBestMove.isNull();
+    bool changed = !first && !(bestMove == lastBestMove);
+
+    // Best move instability: recent changes count more than old ones
+    instability = instability * 0.5 + (changed ? 1.0 : 0.0);
+    stableIterations = changed || first ? 0 : stableIterations + 1;
+    double scale = 1.0 + instability;
+
+    // Root fail-low: give a dropping score time to find a better move
+    if (!first && score < lastScore)
+        scale *= 1.0 + std::min(1.0, (lastScore - score) / 100.0);
+
+    // Same best move for several depths, or one move takes nearly all the nodes
+    if (stableIterations >= 3)
+        scale *= 0.7;
+    if (depth >= 6 && bestMoveNodeShare > 0.9)
+        scale *= 0.5;
+
+    lastBestMove = bestMove;
+    lastScore = score;
+
+    int budget = std::min(maximum, (int)(optimum * scale));
+
+    // The next depth usually costs more than all earlier ones together
+    return elapsedMs >= budget * 0.6;
+}
+
+void TimeManager::ponderhit(int elapsedMs)
+{
+    if (optimum > 0)
+        maximum = elapsedMs >= optimum ? elapsedMs : maximum + elapsedMs;
+}
@@ -1,9 +1,8 @@
 #include "transposition.h"
-#include <cstring>
 #include <algorithm>
 
 TranspositionTable::TranspositionTable(size_t sizeMB)
-    : sizeMB(0), numEntries(0), currentAge(0), hits(0), misses(0), collisions(0)
+    : sizeMB(0), numClusters(0), currentAge(0)
 {
     resize(sizeMB);
 }
@@ -12,47 +11,77 @@ void TranspositionTable::resize(size_t sizeMB)
 {
     this->sizeMB = sizeMB;
 
-    // Calculate number of entries
+    // Calculate number of clusters (at least one)
     size_t sizeBytes = sizeMB * 1024 * 1024;
-    numEntries = sizeBytes / sizeof(TTEntry);
+    numClusters = std::max<size_t>(1, sizeBytes / sizeof(TTCluster));
 
-    // Resize table
-    table.clear();
-    table.resize(numEntries);
+    // Reallocate table
+    table.reset();
+    table.reset(new TTCluster[numClusters]);
 
-    // Reset statistics
-    hits = 0;
-    misses = 0;
-    collisions = 0;
-    currentAge = 0;
+    clear();
+}
+
+uint64_t TranspositionTable::pack(const Move &move, Score score, Score staticEval, int depth,
+                                  uint8_t flag, uint8_t age)
+{
+    uint64_t d = (uint64_t)std::min(std::max(depth, 0), 255);
+
+    return (uint64_t)move.raw() |
+           ((uint64_t)(uint16_t)score << 16) |
+           ((uint64_t)(uint16_t)staticEval << 32) |
+           (d << 48) |
+           ((uint64_t)(flag & 0x3) << 56) |
+           ((uint64_t)(age & 0x3F) << 58);
 }
 
-bool TranspositionTable::probe(uint64_t hash, int depth, Score alpha, Score beta, TTEntry &entry)
+void TranspositionTable::unpack(uint64_t data, TTEntry &entry)
 {
-    size_t index = getIndex(hash);
-    const TTEntry &stored = table[index];
+    entry.bestMove = Move::fromRaw((uint16_t)data);
+    entry.score = (Score)(uint16_t)(data >> 16);
+    entry.staticEval = (Score)(uint16_t)(data >> 32);
+    entry.depth = (int)((data >> 48) & 0xFF);
+    entry.flag = (uint8_t)((data >> 56) & 0x3);
+    entry.age = (uint8_t)(data >> 58);
+}
+
+bool TranspositionTable::probe(uint64_t hash, TTEntry &entry) const
+{
+    const TTCluster &cluster = table[getIndex(hash)];
 
-    // Check if entry exists and matches
-    if (stored.hash != hash)
+    for (const TTSlot &slot : cluster.slots)
     {
-        misses++;
-        return false;
+        uint64_t data = slot.data.load(std::memory_order_relaxed);
+        uint64_t key = slot.key.load(std::memory_order_relaxed);
+
+        // XOR check: fails for other positions and for torn writes
+        if (data != 0 && (key ^ data) == hash)
+        {
+            unpack(data, entry);
+            return true;
+        }
     }
 
-    // Entry found
-    hits++;
-    entry = stored;
+    return false;
+}
+
+bool TranspositionTable::probe(uint64_t hash, int depth, Score alpha, Score beta, TTEntry &entry) const
+{
+    if (!probe(hash, entry))
+    {
+        return false;
+    }
 
     // Check if depth is sufficient
-    if (stored.depth < depth)
+    if (entry.depth < depth)
     {
         return false;
     }
 
     // Check if score is useful
-    Score score = stored.score;
+    Score score = entry.score;
 
-    switch (stored.flag)
+    switch (entry.flag)
     {
     case TT_EXACT:
         // Exact score, always useful
@@ -81,42 +110,126 @@ bool TranspositionTable::probe(uint64_t hash, int depth, Score alpha, Score beta
     return false;
 }
 
-void TranspositionTable::store(uint64_t hash, const Move &bestMove, Score score, int depth, uint8_t flag)
+void TranspositionTable::store(uint64_t hash, const Move &bestMove, Score score, int depth, uint8_t flag,
+                               Score staticEval)
 {
-    size_t index = getIndex(hash);
-    TTEntry &entry = table[index];
-
-    // Replace if:
-    // 1. Entry is empty (hash == 0)
-    // 2. Same position (hash matches)
-    // 3. Deeper search
-    // 4. Older entry
-    bool replace = (entry.hash == 0) ||
-                   (entry.hash == hash) ||
-                   (depth >= entry.depth) ||
-                   (entry.age != currentAge);
-
-    if (replace)
+    TTCluster &cluster = table[getIndex(hash)];
+    TTSlot *replace = &cluster.slots[0];
+    int replaceWorth = 1 << 30;
+    uint64_t oldData = 0;
+    bool samePosition = false;
+
+    for (TTSlot &slot : cluster.slots)
+    {
+        uint64_t data = slot.data.load(std::memory_order_relaxed);
+        uint64_t key = slot.key.load(std::memory_order_relaxed);
+
+        // Same position: always reuse its slot
+        if (data != 0 && (key ^ data) == hash)
+        {
+            replace = &slot;
+            oldData = data;
+            samePosition = true;
+            break;
+        }
+
+        // Otherwise replace the least valuable slot: empty first, then
+        // shallow entries, with each search generation of age costing 8 plies
+        int worth;
+        if (data == 0)
+        {
+            worth = -(1 << 30);
+        }
+        else
+        {
+            int slotDepth = (int)((data >> 48) & 0xFF);
+            int relativeAge = (currentAge - (int)(data >> 58)) & 0x3F;
+            worth = slotDepth - 8 * relativeAge;
+        }
+
+        if (worth < replaceWorth)
+        {
+            replace = &slot;
+            replaceWorth = worth;
+        }
+    }
+
+    Move move = bestMove;
+
+    if (samePosition)
     {
-        if (entry.hash != 0 && entry.hash != hash)
+        TTEntry old;
+        unpack(oldData, old);
+
+        // Keep a deeper bound from this search unless the new result is exact
+        if (flag != TT_EXACT && old.age == currentAge && depth + 4 <= old.depth)
         {
-            collisions++;
+            return;
         }
 
-        entry.hash = hash;
-        entry.bestMove = bestMove;
-        entry.score = score;
-        entry.depth = depth;
-        entry.flag = flag;
-        entry.age = currentAge;
+        // Keep the old move when the new search did not find one
+        if (move.isNull())
+        {
+            move = old.bestMove;
+        }
+        if (staticEval == SCORE_NONE)
+        {
+            staticEval = old.staticEval;
+        }
     }
+
+    uint64_t data = pack(move, score, staticEval, depth, flag, currentAge);
+    replace->key.store(hash ^ data, std::memory_order_relaxed);
+    replace->data.store(data, std::memory_order_relaxed);
 }
 
 void TranspositionTable::clear()
 {
-    std::fill(table.begin(), table.end(), TTEntry());
-    hits = 0;
-    misses = 0;
-    collisions = 0;
+    for (size_t i = 0; i < numClusters; i++)
+    {
+        for (TTSlot &slot : table[i].slots)
+        {
+            slot.key.store(0, std::memory_order_relaxed);
+            slot.data.store(0, std::memory_order_relaxed);
+        }
+    }
     currentAge = 0;
 }
+
+int TranspositionTable::hashfull() const
+{
+    size_t sample = std::min<size_t>(numClusters, 1000);
+    if (sample == 0)
+    {
+        return 0;
+    }
+
+    size_t used = 0;
+    for (size_t i = 0; i < sample; i++)
+    {
+        for (const TTSlot &slot : table[i].slots)
+        {
+            uint64_t data = slot.data.load(std::memory_order_relaxed);
+            if (data != 0 && (uint8_t)(data >> 58) == currentAge)
+            {
+                used++;
+            }
+        }
+    }
+
+    return (int)(used * 1000 / (sample * TT_CLUSTER_SIZE));
+}
+
+void TranspositionTable::getSlot(uint64_t hash, int index, uint64_t &key, uint64_t &data) const
+{
+    const TTSlot &slot = table[getIndex(hash)].slots[index & (TT_CLUSTER_SIZE - 1)];
+    key = slot.key.load(std::memory_order_relaxed);
+    data = slot.data.load(std::memory_order_relaxed);
+}
+
+void TranspositionTable::setSlot(uint64_t hash, int index, uint64_t key, uint64_t data)
+{
+    TTSlot &slot = table[getIndex(hash)].slots[index & (TT_CLUSTER_SIZE - 1)];
+    slot.key.store(key, std::memory_order_relaxed);
+    slot.data.store(data, std::memory_order_relaxed);
+}
@@ -0,0 +1,369 @@
+// UCI protocol front-end for the C++ engine
+//
+// Reads commands from stdin; searches run on the engine's own thread so that
+// "stop" and "ponderhit" are handled immediately. The best move is printed by
+// a waiter thread once the search is over (held back while pondering or in
+// infinite mode until the GUI says stop / ponderhit, as the protocol requires).
+
+#include "board.h"
+#include "movegen.h"
+#include "search.h"
+#include <algorithm>
+#include <condition_variable>
+#include <iostream>
+#include <mutex>
+#include <sstream>
+#include <string>
+#include <thread>
+
+namespace
+{
+    const char *ENGINE_NAME = "Eury C++ 2.0";
+    const char *ENGINE_AUTHOR = "Chess AI Team";
+
+    constexpr int DEFAULT_HASH_MB = 16;
+    constexpr int MAX_HASH_MB = 4096;
+    constexpr int MAX_THREADS = 64;
+
+    constexpr int MAX_MOVE_OVERHEAD = 5000;
+
+    std::mutex outputMutex;
+
+    void send(const std::string &line)
+    {
+        std::lock_guard<std::mutex> lock(outputMutex);
+        std::cout << line << std::endl;
+    }
+
+    std::string scoreToUCI(Score score)
+    {
+        if (score >= SCORE_MATE - MAX_PLY)
+            return "mate " + std::to_string((SCORE_MATE - score + 1) / 2);
+        if (score <= -SCORE_MATE + MAX_PLY)
+            return "mate " + std::to_string(-(SCORE_MATE + score) / 2);
+        return "cp " + std::to_string(score);
+    }
+
+    // Find the legal move matching a UCI string
+    Move parseMove(const Board &board, const std::string &uci)
+    {
+        MoveList moves;
+        MoveGenerator::generateLegalMoves(board, moves);
+
+        for (const Move &move : moves)
+        {
+            if (move.toUCI() == uci)
+                return move;
+        }
+        return Move();
+    }
+
+    class UCI
+    {
+    public:
+        UCI() : engine(DEFAULT_HASH_MB, 1), ownBook(false), holdBestMove(false)
+        {
+            board.initStartPosition();
+            engine.setInfoCallback([this](const IterationInfo &info)
+                                   { onIteration(info); });
+        }
+
+        ~UCI() { stopSearch(); }
+
+        void loop()
+        {
+            std::string line;
+            while (std::getline(std::cin, line))
+            {
+                if (!handle(line))
+                    break;
+            }
+            stopSearch();
+        }
+
+    private:
+        SearchEngine engine;
+        Board board;
+
+        // Opening book (OwnBook / BookFile options)
+        bool ownBook;
+        std::string bookFile;
+
+        // Best move output
+        std::thread waiter;
+        std::mutex holdMutex;
+        std::condition_variable holdCondition;
+        bool holdBestMove;
+
+        bool handle(const std::string &line)
+        {
+            std::istringstream ss(line);
+            std::string token;
+            if (!(ss >> token))
+                return true;
+
+            if (token == "uci")
+            {
+                send(std::string("id name ") + ENGINE_NAME);
+                send(std::string("id author ") + ENGINE_AUTHOR);
+                send("option name Hash type spin default " + std::to_string(DEFAULT_HASH_MB) +
+                     " min 1 max " + std::to_string(MAX_HASH_MB));
+                send("option name Threads type spin default 1 min 1 max " + std::to_string(MAX_THREADS));
+                send("option name Ponder type check default false");
+                send("option name Move Overhead type spin default " +
+                     std::to_string(TimeManager::DEFAULT_MOVE_OVERHEAD) + " min 0 max " + std::to_string(MAX_MOVE_OVERHEAD));
+                send("option name MultiPV type spin default 1 min 1 max " + std::to_string(MAX_MOVES));
+                send("option name OwnBook type check default false");
+                send("option name BookFile type string default <empty>");
+                send("option name SyzygyPath type string default <empty>");
+                send("option name SyzygyProbeDepth type spin default 1 min 1 max 100");
+                send("uciok");
+            }
+            else if (token == "isready")
+            {
+                send("readyok");
+            }
+            else if (token == "setoption")
+            {
+                setOption(ss);
+            }
+            else if (token == "ucinewgame")
+            {
+                stopSearch();
+                engine.clearTT();
+                board.initStartPosition();
+            }
+            else if (token == "position")
+            {
+                stopSearch();
+                position(ss);
+            }
+            else if (token == "go")
+            {
+                go(ss);
+            }
+            else if (token == "stop")
+            {
+                releaseBestMove();
+                engine.stop();
+            }
+            else if (token == "ponderhit")
+            {
+                engine.ponderhit();
+                releaseBestMove();
+            }
+            else if (token == "d")
+            {
+                board.print();
+            }
+            else if (token == "quit")
+            {
+                return false;
+            }
+
+            return true;
+        }
+
+        void setOption(std::istringstream &ss)
+        {
+            std::string token, name, value;
+
+            ss >> token; // "name"
+            while (ss >> token && token != "value")
+                name += (name.empty() ? "" : " ") + token;
+            std::getline(ss >> std::ws, value); // Book paths may contain spaces
+
+            stopSearch();
+
+            try
+            {
+                if (name == "Hash")
+                    engine.resizeTT(std::min(std::max(std::stoi(value), 1), MAX_HASH_MB));
+                else if (name == "Threads")
+                    engine.setThreads(std::min(std::max(std::stoi(value), 1), MAX_THREADS));
+                else if (name == "Move Overhead")
+                    engine.setMoveOverhead(std::min(std::max(std::stoi(value), 0), MAX_MOVE_OVERHEAD));
+                else if (name == "MultiPV")
+                    engine.setMultiPV(std::stoi(value));
+                else if (name == "OwnBook")
+                    ownBook = (value == "true");
+                else if (name == "BookFile")
+                    bookFile = (value == "<empty>") ? "" : value;
+                else if (name == "SyzygyPath")
+                {
+                    int found = engine.setSyzygyPath(value == "<empty>" ? "" : value);
+                    send("info string " + std::to_string(found) + " tablebases found");
+                }
+                else if (name == "SyzygyProbeDepth")
+                    engine.setSyzygyProbeDepth(std::min(std::max(std::stoi(value), 1), 100));
+
+                if (name == "OwnBook" || name == "BookFile")
+                    updateBook();
+            }
+            catch (const std::exception &)
+            {
+                send("info string invalid value for option " + name);
+            }
+        }
+
+        void updateBook()
+        {
+            if (!ownBook || bookFile.empty())
+                engine.clearBook();
+            else if (!engine.setBook(bookFile))
+                send("info string cannot open book " + bookFile);
+        }
+
+        void position(std::istringstream &ss)
+        {
+            std::string token;
+            ss >> token;
+
+            if (token == "startpos")
+            {
+                board.initStartPosition();
+                ss >> token; // "moves" (if any)
+            }
+            else if (token == "fen")
+            {
+                std::string fen;
+                while (ss >> token && token != "moves")
+                    fen += token + " ";
+                board.fromFEN(fen);
+            }
+            else
+            {
+                return;
+            }
+
+            while (ss >> token)
+            {
+                Move move = parseMove(board, token);
+                if (move.isNull())
+                {
+                    send("info string illegal move " + token);
+                    break;
+                }
+                board.makeMove(move);
+            }
+        }
+
+        void go(std::istringstream &ss)
+        {
+            stopSearch();
+
+            SearchLimits limits;
+            int wtime = -1, btime = -1, winc = 0, binc = 0, movestogo = 0, movetime = 0;
+            std::string token;
+
+            while (ss >> token)
+            {
+                if (token == "wtime")
+                    ss >> wtime;
+                else if (token == "btime")
+                    ss >> btime;
+                else if (token == "winc")
+                    ss >> winc;
+                else if (token == "binc")
+                    ss >> binc;
+                else if (token == "movestogo")
+                    ss >> movestogo;
+                else if (token == "movetime")
+                    ss >> movetime;
+                else if (token == "depth")
+                    ss >> limits.maxDepth;
+                else if (token == "nodes")
+                    ss >> limits.maxNodes;
+                else if (token == "infinite")
+                    limits.infinite = true;
+                else if (token == "ponder")
+                    limits.ponder = true;
+            }
+
+            // Clock budgets are allocated by the engine's time manager
+            if (movetime > 0)
+            {
+                limits.timeLimit = std::max(1, movetime - engine.getMoveOverhead());
+            }
+            else
+            {
+                limits.timeLeft = (board.getSideToMove() == WHITE) ? wtime : btime;
+                limits.increment = (board.getSideToMove() == WHITE) ? winc : binc;
+                limits.movesToGo = movestogo;
+            }
+
+            {
+                std::lock_guard<std::mutex> lock(holdMutex);
+                holdBestMove = limits.infinite || limits.ponder;
+            }
+
+            engine.startSearch(board, limits);
+            waiter = std::thread([this]()
+                                 { reportBestMove(); });
+        }
+
+        // Waiter thread: print bestmove once the search is over
+        void reportBestMove()
+        {
+            Move best = engine.wait();
+
+            {
+                std::unique_lock<std::mutex> lock(holdMutex);
+                holdCondition.wait(lock, [this]()
+                                   { return !holdBestMove; });
+            }
+
+            std::string line = "bestmove " + best.toUCI();
+            const SearchResult &result = engine.getResult();
+            if (!result.ponderMove.isNull() && result.bestMove == best)
+                line += " ponder " + result.ponderMove.toUCI();
+            send(line);
+        }
+
+        void releaseBestMove()
+        {
+            {
+                std::lock_guard<std::mutex> lock(holdMutex);
+                holdBestMove = false;
+            }
+            holdCondition.notify_all();
+        }
+
+        // Stop any running search and wait until its bestmove is out
+        void stopSearch()
+        {
+            releaseBestMove();
+            engine.stop();
+            if (waiter.joinable())
+                waiter.join();
+        }
+
+        void onIteration(const IterationInfo &info)
+        {
+            std::string line = "info depth " + std::to_string(info.depth) +
+                               " seldepth " + std::to_string(info.selDepth);
+            if (engine.getMultiPV() > 1)
+                line += " multipv " + std::to_string(info.multiPV);
+            line += " score " + scoreToUCI(info.score) +
+                               " nodes " + std::to_string(info.nodes) +
+                               " nps " + std::to_string(info.nps) +
+                               " time " + std::to_string(info.timeMs) +
+                               " hashfull " + std::to_string(engine.getHashfull()) +
+                               " tbhits " + std::to_string(info.tbHits) +
+                               " pv";
+            for (const Move &move : info.pv)
+                line += " " + move.toUCI();
+            send(line);
+        }
+    };
+}
+
+int main()
+{
+    std::ios::sync_with_stdio(false);
+
+    UCI uci;
+    uci.loop();
+
+    return 0;
+}
@@ -175,6 +175,11 @@ class ChessClock:
         if self.black_clock_label:
             self.black_clock_label.hide()
     
+    def get_time_control(self, color):
+        """Thời gian còn lại và increment (giây) của một bên, cho time manager của AI"""
+        time_left = self.white_time if color == chess.WHITE else self.black_time
+        return time_left, self.increment
+    
     def get_times(self):
         """Lấy thời gian hiện tại của cả hai bên"""
         return {
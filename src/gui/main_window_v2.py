@@ -23,8 +23,8 @@ from src.gui.components.evaluation_bar import EvaluationBar
 from src.gui.components.analysis_panel import AnalysisPanel
 
 # AI - UPDATED to v2.6 with all Stockfish techniques
-from src.ai.minimax_v2_6 import get_best_move  # USE v2.6: All Stockfish techniques integrated (+380-540 Elo)
-from src.ai.opening_book import OpeningBook
+from src.ai.minimax_v2_6 import get_best_move_and_ponder, Ponderer  # USE v2.6: All Stockfish techniques integrated (+380-540 Elo)
+from src.ai.opening_book import get_book_service
 from src.ai.analysis_engine import AnalysisEngine
 
 # Add path
@@ -40,19 +40,16 @@ BG_COLOR = (28, 28, 28)
 SIDEBAR_COLOR = (40, 40, 40)
 TEXT_COLOR = (220, 220, 220)
 
-# Opening book
-BOOK_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "opening_bin", "gm2600.bin")
-BOOK_PATH = os.path.normpath(BOOK_PATH)
-
-opening_book = None
-if os.path.exists(BOOK_PATH):
-    opening_book = OpeningBook(BOOK_PATH)
-else:
+# Opening books (every book in opening_bin/, merged by priority and mapped once)
+opening_book = get_book_service()
+if not opening_book.books:
     print(f"⚠️  Warning: Opening book not found")
+    opening_book = None
 
 # Global AI state
-ai_move_queue = queue.Queue()
+ai_move_queue = queue.Queue()  # (move, expected reply)
 ai_thinking = False
+ponderer = Ponderer()  # Searches the expected reply while the player thinks
 
 
 def load_pieces():
@@ -76,18 +73,27 @@ def load_pieces():
     return pieces
 
 
-def ai_move_threaded(board_copy, depth=4, time_limit=5.0):
-    """Run AI in background thread - Python engine only"""
+def ai_move_threaded(board_copy, depth=4, time_limit=5.0, time_left=None, increment=0.0, ponder_hit=False):
+    """Run AI in background thread - Python engine only (time_left/increment: AI clock)"""
     global ai_thinking
     ai_thinking = True
     
     def run_ai():
         try:
+            # Player made the expected move: the ponder search already has the answer (or soon will)
+            if ponder_hit:
+                move, ponder_move = ponderer.wait()
+                if move:
+                    print(f"[Ponder] Hit: {move}")
+                    ai_move_queue.put((move, ponder_move))
+                    return
+            
             # Try opening book first
             move = None
+            ponder_move = None
             if opening_book:
                 try:
-                    move = opening_book.get_move(board_copy)
+                    move = opening_book.get_move(board_copy, mode='weighted')
                     if move:
                         print(f"[Opening] Book move: {move}")
                 except:
@@ -95,14 +101,15 @@ def ai_move_threaded(board_copy, depth=4, time_limit=5.0):
             
             # If no book move, use Python engine v2.6
             if not move:
-                # v2.6 engine uses time_limit and returns only move
-                move = get_best_move(board_copy, depth=depth, time_limit=time_limit)
+                # v2.6 engine budgets from the clock (time_limit caps the move)
+                move, ponder_move = get_best_move_and_ponder(board_copy, depth=depth, time_limit=time_limit,
+                                                             time_left=time_left, increment=increment)
                 print(f"[Python v2.6] Move: {move} (depth {depth})")
             
-            ai_move_queue.put(move)
+            ai_move_queue.put((move, ponder_move))
         except Exception as e:
             print(f"[Error] AI error: {e}")
-            ai_move_queue.put(None)
+            ai_move_queue.put((None, None))
     
     thread = threading.Thread(target=run_ai, daemon=True)
     thread.start()
@@ -375,6 +382,7 @@ class ChessGame:
         self.current_screen = "game"
         self.game_active = True
         self.game_result = None
+        ponderer.ponder_miss()
         
         # Reset board
         self.board = chess.Board()
@@ -410,9 +418,31 @@ class ChessGame:
         # Get AI settings
         depth, time_limit = self.ai_levels[self.selected_ai_level]
         
+        # AI clock feeds the time manager
+        time_left, increment = self.chess_clock.get_time_control(self.board.turn)
+        
+        # Pondering: continue the search if the player made the expected move
+        ponder_hit = False
+        if ponderer.is_pondering:
+            if self.board.move_stack and self.board.peek() == ponderer.ponder_move:
+                ponderer.ponderhit()
+                ponder_hit = True
+            else:
+                ponderer.ponder_miss()
+        
         # Run AI in thread
         board_copy = self.board.copy()
-        ai_move_threaded(board_copy, depth, time_limit)
+        ai_move_threaded(board_copy, depth, time_limit, time_left, increment, ponder_hit)
+    
+    def start_pondering(self, ponder_move):
+        """Search the expected reply on the AI's clock while the player thinks"""
+        if not self.game_active or ponder_move is None:
+            return
+        
+        depth, time_limit = self.ai_levels[self.selected_ai_level]
+        time_left, increment = self.chess_clock.get_time_control(not self.board.turn)
+        if ponderer.start(self.board, ponder_move, depth, time_limit, time_left, increment):
+            print(f"[Ponder] Expecting {ponder_move}")
     
     def handle_move_made(self):
         """Handle after a move is made"""
@@ -443,6 +473,7 @@ class ChessGame:
     def end_game(self):
         """End the game"""
         self.game_active = False
+        ponderer.ponder_miss()
         self.chess_clock.stop()
         self.control_panel.show_finished()
         
@@ -505,7 +536,7 @@ class ChessGame:
         
         # Check for AI move completion
         if not ai_move_queue.empty():
-            move = ai_move_queue.get()
+            move, ponder_move = ai_move_queue.get()
             ai_thinking = False
             
             if move and move in self.board.legal_moves:
@@ -517,6 +548,9 @@ class ChessGame:
                 self.board_widget.set_board(self.board)
                 self.handle_move_made()
                 
+                # Think on the player's time
+                self.start_pondering(ponder_move)
+                
                 # Update analysis if in analysis mode
                 if self.analysis_mode:
                     self._analyze_current_position()
@@ -762,6 +796,7 @@ class ChessGame:
         elif button == self.control_panel.home_button:
             self.current_screen = "home"
             self.game_active = False
+            ponderer.ponder_miss()
             self.analysis_mode = False
             self.chess_clock.hide()
             self.control_panel.hide_all()
@@ -874,6 +909,7 @@ class ChessGame:
             self.update(time_delta)
             self.draw()
         
+        ponderer.ponder_miss()
         pygame.quit()
 
 
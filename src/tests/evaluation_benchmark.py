@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Evaluation benchmark: evaluate_incremental vs evaluate_bitboard.
+
+Collects positions from seeded random playouts (plus the perft positions),
+evaluates all of them with both functions, reports evaluations/sec and the
+speedup, and exits with status 1 if any score differs.
+
+Usage:
+    python src/tests/evaluation_benchmark.py
+    python src/tests/evaluation_benchmark.py --positions 20000 --repeat 5
+"""
+
+import sys
+import os
+import time
+import random
+import argparse
+import chess
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.ai.perft import PERFT_POSITIONS
+from src.ai.evaluation_optimized import evaluate_incremental
+from src.ai.evaluation_bitboard import evaluate_bitboard
+
+EVALUATORS = [('incremental', evaluate_incremental), ('bitboard', evaluate_bitboard)]
+
+
+def collect_positions(count, seed):
+    """Perft positions plus positions from random playouts."""
+    rng = random.Random(seed)
+    positions = [chess.Board(pos['fen']) for pos in PERFT_POSITIONS]
+    while len(positions) < count:
+        board = chess.Board()
+        for _ in range(rng.randint(1, 120)):
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            board.push(rng.choice(moves))
+            positions.append(board.copy(stack=False))
+    return positions[:count]
+
+
+def run_evaluator(evaluate, positions, repeat):
+    """Evaluate every position repeat times; returns (scores, seconds)."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        scores = [evaluate(board) for board in positions]
+    return scores, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluation speed: evaluate_incremental vs evaluate_bitboard")
+    parser.add_argument('--positions', type=int, default=5000,
+                        help="Number of positions (default: 5000)")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="Passes over the positions per evaluator (default: 3)")
+    parser.add_argument('--seed', type=int, default=1,
+                        help="Random playout seed (default: 1)")
+    args = parser.parse_args(argv)
+
+    positions = collect_positions(args.positions, args.seed)
+
+    print("\n" + "=" * 80)
+    print(" " * 28 + "EVALUATION BENCHMARK")
+    print("=" * 80)
+    print(f"{len(positions):,} positions x {args.repeat} passes\n")
+
+    results = {}
+    for name, evaluate in EVALUATORS:
+        scores, elapsed = run_evaluator(evaluate, positions, args.repeat)
+        evals = len(positions) * args.repeat
+        eps = evals / elapsed if elapsed > 0 else 0
+        results[name] = (scores, eps)
+        print(f"  {name:<12} {evals:>10,} evals  {elapsed:8.3f}s  {eps:>12,.0f} evals/sec")
+
+    baseline = results['incremental'][1]
+    speedup = results['bitboard'][1] / baseline if baseline else 0
+    print("\n" + "=" * 80)
+    print(f"Speedup: {speedup:.2f}x")
+    print("=" * 80)
+
+    mismatches = [board.fen() for board, a, b in zip(positions, results['incremental'][0], results['bitboard'][0])
+                  if a != b]
+    if mismatches:
+        for fen in mismatches[:10]:
+            print(f"  MISMATCH {fen}")
+        print(f"\n❌ {len(mismatches)} score mismatch(es)")
+        return 1
+
+    print("\n✅ All scores match")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
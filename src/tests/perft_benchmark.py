@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Perft benchmark for the C++ and Python move generators.
+
+Runs the standard perft positions (start, Kiwipete, positions 3-6), reports
+nodes/sec per engine and exits with status 1 on any node count mismatch.
+
+Usage:
+    python src/tests/perft_benchmark.py
+    python src/tests/perft_benchmark.py --depth 5 --python-depth 3
+    python src/tests/perft_benchmark.py --engine cpp --divide
+"""
+
+import sys
+import os
+import time
+import argparse
+import chess
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.ai.perft import PERFT_POSITIONS, perft, divide
+
+try:
+    import chess_engine
+except ImportError:
+    chess_engine = None
+
+
+def run_cpp(fen, depth):
+    """Run C++ perft; returns (nodes, seconds)."""
+    board = chess_engine.Board()
+    board.from_fen(fen)
+    start = time.perf_counter()
+    nodes = board.perft(depth)
+    return nodes, time.perf_counter() - start
+
+
+def run_python(fen, depth):
+    """Run python-chess perft; returns (nodes, seconds)."""
+    board = chess.Board(fen)
+    start = time.perf_counter()
+    nodes = perft(board, depth)
+    return nodes, time.perf_counter() - start
+
+
+def print_divide_diff(fen, depth):
+    """Show root moves whose counts differ between the engines."""
+    if chess_engine is None:
+        return
+
+    board = chess_engine.Board()
+    board.from_fen(fen)
+    cpp_counts = board.divide(depth)
+    py_counts = divide(chess.Board(fen), depth)
+
+    for uci in sorted(set(cpp_counts) | set(py_counts)):
+        cpp_nodes = cpp_counts.get(uci)
+        py_nodes = py_counts.get(uci)
+        if cpp_nodes != py_nodes:
+            print(f"      {uci}: cpp={cpp_nodes} python={py_nodes}")
+
+
+def run_benchmark(engines, depth, python_depth, show_divide=False):
+    """
+    Run perft on all standard positions.
+
+    Returns:
+        Number of mismatching counts
+    """
+    runners = {'cpp': run_cpp, 'python': run_python}
+    max_depth = {'cpp': depth, 'python': python_depth}
+    totals = {engine: [0, 0.0] for engine in engines}
+    failures = 0
+
+    print("\n" + "=" * 80)
+    print(" " * 30 + "PERFT BENCHMARK")
+    print("=" * 80)
+
+    for pos in PERFT_POSITIONS:
+        print(f"\n{pos['name']}: {pos['fen']}")
+
+        for engine in engines:
+            d = min(max_depth[engine], max(pos['nodes']))
+            expected = pos['nodes'][d]
+            nodes, elapsed = runners[engine](pos['fen'], d)
+            nps = nodes / elapsed if elapsed > 0 else 0
+            totals[engine][0] += nodes
+            totals[engine][1] += elapsed
+
+            status = "OK" if nodes == expected else f"MISMATCH (expected {expected})"
+            print(f"  {engine:<7} depth {d}: {nodes:>12,} nodes  "
+                  f"{elapsed:8.3f}s  {nps:>14,.0f} nps  {status}")
+
+            if nodes != expected:
+                failures += 1
+                if show_divide:
+                    print_divide_diff(pos['fen'], d)
+
+    print("\n" + "=" * 80)
+    for engine, (nodes, elapsed) in totals.items():
+        nps = nodes / elapsed if elapsed > 0 else 0
+        print(f"{engine:<7} total: {nodes:>14,} nodes in {elapsed:.3f}s ({nps:,.0f} nps)")
+    print("=" * 80)
+
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Perft benchmark for the move generators")
+    parser.add_argument('--engine', choices=['cpp', 'python', 'both'], default='both',
+                        help="Move generator(s) to run (default: both)")
+    parser.add_argument('--depth', type=int, default=5,
+                        help="Maximum perft depth for the C++ engine (default: 5)")
+    parser.add_argument('--python-depth', type=int, default=3,
+                        help="Maximum perft depth for python-chess (default: 3)")
+    parser.add_argument('--divide', action='store_true',
+                        help="Print per-move differences for mismatching positions")
+    args = parser.parse_args(argv)
+
+    engines = ['cpp', 'python'] if args.engine == 'both' else [args.engine]
+    if 'cpp' in engines and chess_engine is None:
+        print("⚠️  C++ engine (chess_engine) not available, skipping it")
+        engines.remove('cpp')
+    if not engines:
+        return 1
+
+    failures = run_benchmark(engines, args.depth, args.python_depth, args.divide)
+
+    if failures:
+        print(f"\n❌ {failures} perft count mismatch(es)")
+        return 1
+
+    print("\n✅ All perft counts match")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Shared vs isolated transposition tables for the multiprocess Python search.
+
+Runs minimax.get_best_move on a few positions twice per mode: once with all
+workers writing into one SharedTranspositionTable, once with a private table
+per task (the old behaviour, where each worker got its own copy), and
+reports nodes, time and the node saving of the shared table.
+
+Modes:
+    root  One task per root move (few transpositions between the tasks)
+    smp   Lazy-SMP style: every worker searches the whole root, starting at
+          a different move, and finds the others' results in the table
+
+Usage:
+    python src/tests/shared_tt_benchmark.py
+    python src/tests/shared_tt_benchmark.py --depth 3 --workers 8 --mode smp
+"""
+
+import sys
+import os
+import time
+import argparse
+import chess
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.ai import minimax
+
+POSITIONS = [
+    ("Starting position", chess.STARTING_FEN),
+    ("Italian Game", "r1bqkbnr/pppp1ppp/2n5/4p3/2B1P3/5N2/PPPP1PPP/RNB1K2R b KQkq - 3 3"),
+    ("Queens Gambit Declined", "rnbqkb1r/pp2pppp/5n2/2pp4/3P4/2N2N2/PPP1PPPP/R1BQKB1R w KQkq - 0 4"),
+]
+
+
+def run_search(fen, depth, shared_tt, workers, lazy_smp):
+    """Multiprocess search; returns (move, nodes, seconds)."""
+    board = chess.Board(fen)
+    start = time.perf_counter()
+    move = minimax.get_best_move(board, depth, shared_tt=shared_tt, max_workers=workers, lazy_smp=lazy_smp)
+    return move, minimax.last_search_nodes, time.perf_counter() - start
+
+
+def run_benchmark(depth, workers, mode):
+    totals = {True: [0, 0.0], False: [0, 0.0]}
+    lazy_smp = mode == 'smp'
+
+    print("\n" + "=" * 80)
+    print(" " * 18 + f"SHARED TT BENCHMARK ({'lazy SMP' if lazy_smp else 'root split'}, {workers} workers)")
+    print("=" * 80)
+
+    for name, fen in POSITIONS:
+        print(f"\n{name}: {fen}")
+        for shared_tt in (False, True):
+            move, nodes, elapsed = run_search(fen, depth, shared_tt, workers, lazy_smp)
+            totals[shared_tt][0] += nodes
+            totals[shared_tt][1] += elapsed
+            label = "shared" if shared_tt else "isolated"
+            print(f"  {label:<9} depth {depth}: {move}  {nodes:>10,} nodes  {elapsed:8.3f}s")
+
+    isolated_nodes, isolated_time = totals[False]
+    shared_nodes, shared_time = totals[True]
+    saving = 100.0 * (isolated_nodes - shared_nodes) / isolated_nodes if isolated_nodes else 0.0
+
+    print("\n" + "=" * 80)
+    print(f"isolated total: {isolated_nodes:>12,} nodes in {isolated_time:.3f}s")
+    print(f"shared total:   {shared_nodes:>12,} nodes in {shared_time:.3f}s")
+    print(f"📊 Node saving with the shared table: {saving:.1f}%")
+    print("=" * 80)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shared vs isolated TT for the multiprocess search")
+    parser.add_argument('--depth', type=int, default=2,
+                        help="Search depth (default: 2)")
+    parser.add_argument('--workers', type=int, default=4,
+                        help="Worker processes (default: 4)")
+    parser.add_argument('--mode', choices=['root', 'smp', 'both'], default='both',
+                        help="Parallel search mode(s) to run (default: both)")
+    args = parser.parse_args(argv)
+
+    for mode in (['root', 'smp'] if args.mode == 'both' else [args.mode]):
+        run_benchmark(args.depth, args.workers, mode)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,453 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the C++ engine Python API (chess_engine module)
+"""
+
+import sys
+import os
+import time
+import random
+import chess
+import chess.syzygy
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+try:
+    import chess_engine
+except ImportError:
+    chess_engine = None
+
+
+def _start_board():
+    board = chess_engine.Board()
+    board.init_start_position()
+    return board
+
+
+SYZYGY_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'syzygy')
+
+
+def test_async_search():
+    """start_search returns immediately; stop/wait return a move."""
+    if chess_engine is None:
+        print("chess_engine not available, skipping")
+        return
+
+    engine = chess_engine.SearchEngine(16)
+    infos = []
+
+    engine.start_search(_start_board(), max_depth=64, time_limit=0,
+                        info_callback=infos.append)
+    assert engine.is_searching()
+
+    # The GIL is released: Python keeps running while the engine thinks
+    time.sleep(0.2)
+    engine.stop()
+    move = engine.wait()
+
+    assert not engine.is_searching()
+    assert not move.is_null()
+    assert infos, "no per-iteration info received"
+    assert [info.depth for info in infos] == list(range(1, len(infos) + 1))
+    assert move.to_uci() in {m.uci() for m in chess.Board().legal_moves}
+    assert move == engine.get_result().best_move
+
+
+def test_blocking_search_callback():
+    """get_best_move calls the info callback once per depth."""
+    if chess_engine is None:
+        print("chess_engine not available, skipping")
+        return
+
+    engine = chess_engine.SearchEngine(16)
+    depths = []
+    move = engine.get_best_move(_start_board(), 4, 0,
+                                info_callback=lambda info: depths.append(info.depth))
+
+    assert not move.is_null()
+    assert depths == [1, 2, 3, 4]
+
+
+def test_lazy_smp():
+    """Helper threads share the TT: legal moves, mates found, prompt stop."""
+    if chess_engine is None:
+        print("chess_engine not available, skipping")
+        return
+
+    engine = chess_engine.SearchEngine(16, 4)
+    assert engine.get_threads() == 4
+
+    italian = "r1bqkbnr/pppp1ppp/2n5/4p3/2B1P3/5N2/PPPP1PPP/RNB1K2R b KQkq - 3 3"
+    board = chess_engine.Board()
+    board.from_fen(italian)
+    result = engine.search(board, 6, 0, info_callback=lambda info: None)
+    assert result.best_move.to_uci() in {m.uci() for m in chess.Board(italian).legal_moves}
+    assert result.depth == 6
+    assert result.nodes == engine.get_stats().nodes_searched > 0
+    assert engine.get_hashfull() > 0
+
+    board.from_fen("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+    result = engine.search(board, 5, 0, info_callback=lambda info: None)
+    assert result.best_move.to_uci() == "a1a8" and result.is_mate and result.mate_in == 1
+
+    # stop() ends the main thread and the helpers at once
+    engine.start_search(_start_board(), max_depth=64, time_limit=0, info_callback=lambda info: None)
+    time.sleep(0.3)
+    start = time.time()
+    engine.stop()
+    move = engine.wait()
+    assert time.time() - start < 0.5
+    assert not engine.is_searching() and not move.is_null()
+
+    engine.set_threads(2)
+    assert engine.get_threads() == 2
+    assert not engine.get_best_move(_start_board(), 4, 0, info_callback=lambda info: None).is_null()
+
+
+def test_transposition_table():
+    """Lockless 4-slot clusters: round trip, key check, replacement, hashfull."""
+    if chess_engine is None:
+        print("chess_engine not available, skipping")
+        return
+
+    tt = chess_engine.TranspositionTable(1)
+    e2e4 = chess_engine.Move.from_uci("e2e4")
+    key = 0x9E3779B97F4A7C15
+
+    # Round trip (negative scores and the static eval included)
+    assert tt.probe(key) is None and tt.hashfull() == 0
+    tt.store(key, e2e4, -250, 5, chess_engine.TT_EXACT, static_eval=12)
+    entry = tt.probe(key)
+    assert (entry.best_move, entry.score, entry.static_eval, entry.depth, entry.flag, entry.age) == \
+        (e2e4, -250, 12, 5, chess_engine.TT_EXACT, 0)
+    assert tt.probe(key ^ 1) is None
+
+    # Same position: a shallower bound keeps the deeper entry; no new move keeps the old one
+    tt.store(key, chess_engine.Move(), 40, 1, chess_engine.TT_ALPHA)
+    assert tt.probe(key).depth == 5
+    tt.store(key, chess_engine.Move(), 40, 6, chess_engine.TT_BETA)
+    entry = tt.probe(key)
+    assert entry.depth == 6 and entry.best_move == e2e4 and entry.static_eval == 12
+
+    # Corrupted slot (e.g. a torn write): the key ^ data check rejects it
+    index = next(i for i in range(4) if tt.get_slot(key, i)[1] != 0)
+    slot_key, data = tt.get_slot(key, index)
+    assert slot_key ^ data == key
+    tt.set_slot(key, index, slot_key, data ^ (1 << 16))
+    assert tt.probe(key) is None
+
+    # Replacement within one cluster (nearby hashes share it)
+    tt.clear()
+    base = 5 << 50
+    hashes = [base + i for i in range(8)]
+    assert len({tt.cluster_index(h) for h in hashes}) == 1
+    for h, depth in zip(hashes[:4], (10, 2, 8, 6)):
+        tt.store(h, e2e4, 0, depth, chess_engine.TT_EXACT)
+    tt.store(hashes[4], e2e4, 0, 1, chess_engine.TT_EXACT)  # Shallowest entry goes
+    assert tt.probe(hashes[1]) is None
+    assert all(tt.probe(h) is not None for h in hashes[:1] + hashes[2:5])
+
+    # Each older generation counts as 8 plies less depth
+    tt.new_search()
+    tt.store(hashes[5], e2e4, 0, 3, chess_engine.TT_EXACT)  # Replaces depth 1 (old)
+    assert tt.probe(hashes[4]) is None
+    tt.store(hashes[6], e2e4, 0, 0, chess_engine.TT_EXACT)  # Old depth 6 before new depth 3
+    assert tt.probe(hashes[3]) is None and tt.probe(hashes[5]).depth == 3
+    assert tt.probe(hashes[0]).depth == 10
+
+    # hashfull counts slots of the current generation
+    tt.clear()
+    rng = random.Random(3)
+    for _ in range(40000):
+        tt.store(rng.getrandbits(64), e2e4, 0, 1, chess_engine.TT_EXACT)
+    full = tt.hashfull()
+    assert 500 < full <= 1000
+    tt.new_search()
+    assert tt.hashfull() == 0
+    tt.clear()
+    assert tt.hashfull() == 0 and tt.age == 0
+
+
+def test_incremental_eval():
+    """Running material/PST sums survive make/unmake and match evaluate_detailed."""
+    if chess_engine is None:
+        print("chess_engine not available, skipping")
+        return
+
+    board = chess_engine.Board()
+    board.from_fen("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+    start_eval = chess_engine.Evaluator.evaluate(board)
+    rng = random.Random(7)
+    played = []
+
+    for _ in range(60):
+        moves = chess_engine.MoveList()
+        chess_engine.MoveGenerator.generate_legal_moves(board, moves)
+        if len(moves) == 0:
+            break
+        move = rng.choice(list(moves))
+        board.make_move(move)
+        played.append(move)
+
+        assert chess_engine.Evaluator.verify_incremental(board)
+        assert (chess_engine.Evaluator.evaluate(board) ==
+                chess_engine.Evaluator.evaluate_detailed(board).total)
+
+    for move in reversed(played):
+        board.unmake_move(move)
+        assert chess_engine.Evaluator.verify_incremental(board)
+
+    assert chess_engine.Evaluator.evaluate(board) == start_eval
+
+
+def test_pawn_hash():
+    """Pawn key is restored by unmake; searches report pawn hash hits."""
+    if chess_engine is None:
+        print("chess_engine not available, skipping")
+        return
+
+    board = _start_board()
+    start_key = board.get_pawn_key()
+
+    moves = chess_engine.MoveList()
+    chess_engine.MoveGenerator.generate_legal_moves(board, moves)
+    knight_move = next(m for m in moves if m.to_uci() == "g1f3")
+    pawn_move = next(m for m in moves if m.to_uci() == "e2e4")
+
+    board.make_move(knight_move)
+    assert board.get_pawn_key() == start_key
+    board.unmake_move(knight_move)
+
+    board.make_move(pawn_move)
+    assert board.get_pawn_key() != start_key
+    board.unmake_move(pawn_move)
+    assert board.get_pawn_key() == start_key
+
+    engine = chess_engine.SearchEngine(16)
+    engine.get_best_move(board, 5, 0, info_callback=lambda info: None)
+    stats = engine.get_stats()
+    assert stats.pawn_hits > stats.pawn_misses > 0
+    assert 0.5 < stats.get_pawn_hit_rate() <= 1.0
+
+
+def test_syzygy():
+    """Native WDL/DTZ probes match python-chess; root moves keep the win."""
+    if chess_engine is None:
+        print("chess_engine not available, skipping")
+        return
+
+    engine = chess_engine.SearchEngine(16)
+    assert engine.set_syzygy_path(SYZYGY_DIR) > 0
+    assert engine.get_tb_cardinality() == 5
+
+    reference = chess.syzygy.open_tablebase(SYZYGY_DIR)
+    board = chess_engine.Board()
+    rng = random.Random(5)
+
+    # Random positions with a white bishop plus one more piece
+    for color, piece_type in ((chess.WHITE, chess.PAWN), (chess.WHITE, chess.BISHOP), (chess.BLACK, chess.PAWN)):
+        checked = 0
+        while checked < 100:
+            pos = chess.Board(None)
+            squares = rng.sample(range(8, 56), 4)
+            pos.set_piece_at(squares[0], chess.Piece(chess.KING, chess.WHITE))
+            pos.set_piece_at(squares[1], chess.Piece(chess.KING, chess.BLACK))
+            pos.set_piece_at(squares[2], chess.Piece(chess.BISHOP, chess.WHITE))
+            pos.set_piece_at(squares[3], chess.Piece(piece_type, color))
+            pos.turn = rng.random() < 0.5
+            if not pos.is_valid():
+                continue
+
+            try:
+                wdl, dtz = reference.probe_wdl(pos), reference.probe_dtz(pos)
+            except chess.syzygy.MissingTableError:
+                continue
+
+            board.from_fen(pos.fen())
+            assert engine.probe_wdl(board) == wdl, pos.fen()
+            assert engine.probe_dtz(board) == dtz, pos.fen()
+            checked += 1
+
+    # Castling rights are never in the tables
+    board.from_fen("4k3/8/8/8/8/8/8/R3K3 w Q - 0 1")
+    assert engine.probe_wdl(board) is None
+
+    # The chosen move keeps the win and tablebase hits are counted
+    fen = "8/8/8/4k3/8/8/2P5/KB6 w - - 10 40"
+    board.from_fen(fen)
+    move = engine.get_best_move(board, 6, 0, info_callback=lambda info: None)
+    after = chess.Board(fen)
+    after.push_uci(move.to_uci())
+    assert reference.probe_wdl(after) == -2
+    assert engine.get_stats().tb_hits > 0
+
+    assert engine.set_syzygy_path("") == 0
+    assert engine.get_tb_cardinality() == 0
+
+
+def test_evaluate_batch():
+    """Batch evaluation matches per-position calls, for FENs and Boards, on any thread count."""
+    if chess_engine is None:
+        print("chess_engine not available, skipping")
+        return
+
+    rng = random.Random(3)
+    fens = []
+    for _ in range(40):
+        board = chess.Board()
+        for _ in range(40):
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            board.push(rng.choice(moves))
+            fens.append(board.fen())
+
+    boards = []
+    for fen in fens:
+        board = chess_engine.Board()
+        board.from_fen(fen)
+        boards.append(board)
+    expected = np.array([chess_engine.Evaluator.evaluate(board) for board in boards])
+
+    scores = chess_engine.Evaluator.evaluate_batch(fens)
+    assert scores.dtype == np.int16 and np.array_equal(scores, expected)
+    assert np.array_equal(chess_engine.Evaluator.evaluate_batch(fens, threads=4), expected)
+    assert np.array_equal(chess_engine.Evaluator.evaluate_batch(boards, threads=0), expected)
+
+    details = chess_engine.Evaluator.evaluate_detailed_batch(fens[:50], threads=2)
+    assert np.array_equal(details['total'], expected[:50])
+    single = chess_engine.Evaluator.evaluate_detailed(boards[7])
+    assert details[7]['pawn_structure'] == single.pawn_structure
+    assert details[7]['king_safety'] == single.king_safety
+
+    assert len(chess_engine.Evaluator.evaluate_batch([])) == 0
+    try:
+        chess_engine.Evaluator.evaluate_batch(fens[:3] + ["8/8/8/8/8/8/8/8 w - - 0 1"])
+        assert False, "missing kings accepted"
+    except ValueError as e:
+        assert "index 3" in str(e)
+
+
+def test_multi_pv():
+    """MultiPV returns distinct legal lines, best first, from one search."""
+    if chess_engine is None:
+        print("chess_engine not available, skipping")
+        return
+
+    fen = "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3"
+    engine = chess_engine.SearchEngine(16)
+    board = chess_engine.Board()
+    board.from_fen(fen)
+
+    infos = []
+    lines = engine.search_multi_pv(board, 4, 4, 0, info_callback=infos.append)
+    assert len(lines) == 4
+    assert len({line.move.to_uci() for line in lines}) == 4
+    assert all(a.score >= b.score for a, b in zip(lines, lines[1:]))
+    assert [(i.depth, i.multipv) for i in infos if i.depth == 4] == [(4, k) for k in range(1, 5)]
+    for line in lines:
+        assert line.depth == 4 and line.pv[0] == line.move
+        position = chess.Board(fen)
+        for move in line.pv:
+            position.push_uci(move.to_uci())
+
+    # Back to a single line afterwards; fewer root moves than lines requested
+    assert engine.get_multi_pv() == 1
+    board.from_fen("7k/8/8/8/8/8/8/K6q w - - 0 1")
+    assert len(engine.search_multi_pv(board, 5, 3, 0, info_callback=lambda info: None)) == 2
+
+    # A mate in one is the best line
+    board.from_fen("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+    engine.set_multi_pv(3)
+    move = engine.get_best_move(board, 3, 0, info_callback=lambda info: None)
+    lines = engine.get_pv_lines()
+    assert move.to_uci() == lines[0].move.to_uci() == "a1a8"
+    assert lines[0].score > chess_engine.SCORE_MATE - 10 > lines[1].score
+
+
+def test_search_result():
+    """search() reports the score, PV and counters of the search it ran."""
+    if chess_engine is None:
+        print("chess_engine not available, skipping")
+        return
+
+    engine = chess_engine.SearchEngine(16)
+    board = _start_board()
+    infos = []
+    result = engine.search(board, 5, 0, info_callback=infos.append)
+
+    assert result.best_move == result.pv[0] and result.ponder_move == result.pv[1]
+    assert result.score == infos[-1].score and result.depth == 5
+    assert result.seldepth >= 5 and not result.is_mate and not result.from_book
+    assert result.nodes == engine.get_stats().nodes_searched > 0
+    assert engine.get_result().best_move == result.best_move
+
+    # Mate in one, and a side already mated (no stale move from the last search)
+    board.from_fen("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+    result = engine.search(board, 4, 0, info_callback=lambda info: None)
+    assert result.is_mate and result.mate_in == 1 and result.best_move.to_uci() == "a1a8"
+
+    board.from_fen("R5k1/5ppp/8/8/8/8/8/6K1 b - - 0 1")
+    result = engine.search(board, 4, 0, info_callback=lambda info: None)
+    assert result.best_move.is_null() and result.is_mate and result.mate_in == 0
+
+    # Asynchronous searches fill the result too
+    engine.start_search(_start_board(), 4, 0, info_callback=lambda info: None)
+    move = engine.wait()
+    assert engine.get_result().best_move == move and engine.get_result().depth == 4
+
+    # A stopped search reports the last completed depth's move, score and PV together
+    infos = []
+    engine.start_search(_start_board(), max_depth=64, time_limit=0, info_callback=infos.append)
+    time.sleep(0.2)
+    engine.stop()
+    move = engine.wait()
+    result = engine.get_result()
+    assert infos and result.best_move == move
+    assert result.depth == infos[-1].depth and result.score == infos[-1].score
+    assert list(result.pv) == list(infos[-1].pv)
+
+
+def test_reconfigure_during_search():
+    """Setters stop a running background search before changing the engine."""
+    if chess_engine is None:
+        print("chess_engine not available, skipping")
+        return
+
+    engine = chess_engine.SearchEngine(64, 4)
+    setters = [
+        lambda: engine.resize_tt(1),
+        lambda: engine.set_threads(1),
+        lambda: engine.set_threads(3),
+        lambda: engine.clear_tt(),
+        lambda: engine.set_multi_pv(2),
+        lambda: engine.set_syzygy_path(""),
+        lambda: engine.clear_book(),
+    ]
+    for setter in setters:
+        engine.start_search(_start_board(), max_depth=64, time_limit=3000, info_callback=lambda info: None)
+        time.sleep(0.1)
+        setter()
+        assert not engine.is_searching()
+
+    # The reconfigured engine still searches
+    move = engine.get_best_move(_start_board(), 3, 0, info_callback=lambda info: None)
+    assert not move.is_null() and engine.get_threads() == 3
+
+
+if __name__ == "__main__":
+    test_async_search()
+    test_blocking_search_callback()
+    test_lazy_smp()
+    test_transposition_table()
+    test_incremental_eval()
+    test_pawn_hash()
+    test_syzygy()
+    test_evaluate_batch()
+    test_multi_pv()
+    test_search_result()
+    test_reconfigure_during_search()
+    print("✅ All C++ engine tests passed")
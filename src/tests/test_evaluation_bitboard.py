@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the bitboard evaluation (same scores as evaluate_incremental)
+"""
+
+import sys
+import os
+import random
+import chess
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.ai import evaluation_optimized
+from src.ai import evaluation_bitboard
+from src.ai.evaluation_optimized import evaluate_incremental
+from src.ai.evaluation_bitboard import evaluate_bitboard, legal_move_count
+from src.ai.zobrist import HashedBoard
+
+# Special cases for the move counting and the pawn / king terms
+POSITIONS = [
+    chess.STARTING_FEN,
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",  # Kiwipete
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",                             # Pins along the rank
+    "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",      # Promotions, check
+    "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3",          # En passant
+    "4k3/8/8/2KPp2r/8/8/8/8 w - e6 0 1",                                      # En passant pinned on the rank
+    "4k3/4r3/8/8/8/8/4B3/4K3 w - - 0 1",                                      # Pinned bishop
+    "4k3/8/8/8/8/8/3q4/4K3 w - - 0 1",                                        # Check by an adjacent queen
+    "7k/5Q2/6K1/8/8/8/8/8 b - - 0 1",                                         # Stalemate
+    "r1bqkb1r/pppp1ppp/2n2n2/4p2Q/2B1P3/8/PPPP1PPP/RNB1K1NR w KQkq - 4 4",
+]
+
+
+def random_positions(count, seed=1):
+    """Positions from random playouts (captures, promotions and checks included)."""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board = chess.Board()
+        for _ in range(rng.randint(1, 150)):
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            board.push(rng.choice(moves))
+            positions.append(board.copy())
+    return positions[:count]
+
+
+def test_legal_move_count():
+    """Move counts match python-chess for both colors, whoever is to move."""
+    boards = [chess.Board(fen) for fen in POSITIONS] + random_positions(2000, seed=2)
+    for board in boards:
+        fen = board.fen()
+        for color in chess.COLORS:
+            board.turn = color
+            expected = board.legal_moves.count()
+            board.set_fen(fen)
+            assert legal_move_count(board, color) == expected, (fen, color)
+        assert board.fen() == fen
+
+
+def test_terms_match_reference():
+    """Every evaluation term gives the reference value."""
+    terms = ['evaluate_mobility', 'evaluate_king_safety', 'evaluate_pawn_structure', 'evaluate_rooks',
+             'evaluate_bishops', 'evaluate_center_control', 'evaluate_development',
+             'evaluate_castling_rights', 'evaluate_opening_principles']
+    for board in [chess.Board(fen) for fen in POSITIONS] + random_positions(500, seed=3):
+        phase = evaluation_optimized.game_phase(board)
+        assert evaluation_bitboard.game_phase(board) == phase
+        assert (evaluation_bitboard.evaluate_piece_square_tables(board, phase)
+                == evaluation_optimized.evaluate_piece_square_tables(board, phase))
+        for name in terms:
+            assert getattr(evaluation_bitboard, name)(board) == getattr(evaluation_optimized, name)(board), \
+                (name, board.fen())
+
+
+def test_evaluate_bitboard_matches_reference():
+    """evaluate_bitboard == evaluate_incremental on crafted and random positions."""
+    for board in [chess.Board(fen) for fen in POSITIONS] + random_positions(3000):
+        assert evaluate_bitboard(board) == evaluate_incremental(board), board.fen()
+
+
+def test_hashed_board():
+    """Same score on a HashedBoard, and its hash is left untouched."""
+    for board in random_positions(200, seed=4):
+        hashed = HashedBoard.from_board(board)
+        key = hashed.zobrist_hash()
+        assert evaluate_bitboard(hashed) == evaluate_incremental(board)
+        assert hashed.zobrist_hash() == key
+
+
+if __name__ == "__main__":
+    test_legal_move_count()
+    test_terms_match_reference()
+    test_evaluate_bitboard_matches_reference()
+    test_hashed_board()
+    print("✅ All bitboard evaluation tests passed")
@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the memory-mapped opening book service
+"""
+
+import sys
+import os
+import random
+import chess
+import chess.polyglot
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.ai.opening_book import OpeningBookService, OpeningBook, DEFAULT_BOOK_DIR
+
+try:
+    import chess_engine
+except ImportError:
+    chess_engine = None
+
+GM_BOOK = os.path.join(DEFAULT_BOOK_DIR, "gm2600.bin")
+VARIED_BOOK = os.path.join(DEFAULT_BOOK_DIR, "varied.bin")
+
+OPENING = ["e2e4", "e7e5", "g1f3", "b8c6", "f1b5"]
+
+
+def test_matches_python_chess_reader():
+    """Book moves and weights match chess.polyglot along an opening line."""
+    service = OpeningBookService([GM_BOOK])
+    board = chess.Board()
+
+    with chess.polyglot.open_reader(GM_BOOK) as reader:
+        for uci in OPENING:
+            expected = sorted((e.move.uci(), e.weight) for e in reader.find_all(board))
+            assert sorted((m.uci(), w) for m, w in service.get_moves(board)) == expected
+            assert service.get_move(board) == reader.find(board).move
+            board.push_uci(uci)
+
+    service.close()
+
+
+def test_priority_and_cache():
+    """The first book that knows a position answers; repeats hit the LRU."""
+    board = chess.Board()
+    service = OpeningBookService([VARIED_BOOK, GM_BOOK], cache_size=2)
+    only_varied = OpeningBookService([VARIED_BOOK])
+
+    assert service.get_moves(board) == only_varied.get_moves(board)
+    service.get_moves(board)
+    assert service.get_stats()['hits'] == 1
+
+    for uci in OPENING[:3]:
+        board.push_uci(uci)
+        service.get_moves(board)
+    assert service.get_stats()['cached'] == 2
+
+    service.close()
+    only_varied.close()
+
+
+def test_missing_directory():
+    """A missing book directory gives a service without books."""
+    service = OpeningBookService.from_directory(os.path.join(DEFAULT_BOOK_DIR, "missing"))
+    assert not service.books
+    assert service.get_move(chess.Board()) is None
+    service.close()
+
+
+def test_selection_modes():
+    """Weighted and random picks are legal book moves."""
+    service = OpeningBookService([GM_BOOK], seed=1)
+    board = chess.Board()
+    book_moves = {move for move, _ in service.get_moves(board)}
+
+    for mode in ('weighted', 'random'):
+        for _ in range(20):
+            assert service.get_move(board, mode) in book_moves
+
+    # Out of book
+    board = chess.Board("8/8/8/4k3/8/8/8/4K3 w - - 0 1")
+    assert service.get_move(board) is None
+    service.close()
+
+    # Legacy wrapper
+    assert OpeningBook(GM_BOOK).get_move(chess.Board()) is not None
+
+
+def test_cpp_board():
+    """C++ boards are accepted and answered with UCI strings."""
+    if chess_engine is None:
+        print("chess_engine not available, skipping")
+        return
+
+    service = OpeningBookService([GM_BOOK])
+    board = chess_engine.Board()
+    board.init_start_position()
+
+    assert service.get_move_uci(board) == service.get_move(chess.Board()).uci()
+    service.close()
+
+
+def test_native_polyglot_key():
+    """C++ Board.get_polyglot_key matches chess.polyglot along random games."""
+    if chess_engine is None:
+        print("chess_engine not available, skipping")
+        return
+
+    rng = random.Random(7)
+    cpp_board = chess_engine.Board()
+
+    for _ in range(20):
+        board = chess.Board()
+        for _ in range(80):
+            assert cpp_board.from_fen(board.fen())
+            assert cpp_board.get_polyglot_key() == chess.polyglot.zobrist_hash(board), board.fen()
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            board.push(rng.choice(moves))
+
+
+def test_native_book():
+    """The C++ engine answers from its own book, within the book depth."""
+    if chess_engine is None:
+        print("chess_engine not available, skipping")
+        return
+
+    engine = chess_engine.SearchEngine(16)
+    assert not engine.set_book(os.path.join(DEFAULT_BOOK_DIR, "missing.bin"))
+    assert engine.set_book(GM_BOOK)
+
+    board = chess.Board()
+    cpp_board = chess_engine.Board()
+    with chess.polyglot.open_reader(GM_BOOK) as reader:
+        for uci in OPENING:
+            cpp_board.from_fen(board.fen())
+            move = engine.get_best_move(cpp_board, 20, 60000)
+            assert move.to_uci() == reader.find(board).move.uci()
+            board.push_uci(uci)
+
+        # Weighted-random picks stay in the book
+        cpp_board.from_fen(chess.STARTING_FEN)
+        engine.set_book_random(True)
+        book_moves = {entry.move.uci() for entry in reader.find_all(chess.Board())}
+        for _ in range(20):
+            assert engine.probe_book(cpp_board).to_uci() in book_moves
+
+    # Past the book depth the engine searches
+    engine.set_book_depth(2)
+    cpp_board.from_fen(board.fen())
+    assert engine.probe_book(cpp_board).is_null()
+    engine.get_best_move(cpp_board, 2, 0)
+    assert engine.get_stats().nodes_searched > 0
+
+    engine.clear_book()
+    assert not engine.has_book()
+
+
+if __name__ == "__main__":
+    test_matches_python_chess_reader()
+    test_priority_and_cache()
+    test_missing_directory()
+    test_selection_modes()
+    test_cpp_board()
+    test_native_polyglot_key()
+    test_native_book()
+    print("✅ All opening book tests passed")
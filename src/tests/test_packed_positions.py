@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the packed 32-byte position format
+"""
+
+import sys
+import os
+import random
+import tempfile
+import chess
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.ai.packed_positions import (PackedPositionFile, pack_board, unpack_board,
+                                     write_packed, PACKED_SIZE)
+
+try:
+    import chess_engine
+except ImportError:
+    chess_engine = None
+
+# En passant square with no pawn to capture, with only a pinned capture, and a live one
+DEAD_EP_FEN = "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1"
+PINNED_EP_FEN = "4k3/8/8/2KPp2r/8/8/8/8 w - e6 0 1"
+LIVE_EP_FEN = "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3"
+
+
+def _random_positions(count, seed=5):
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board = chess.Board()
+        for _ in range(rng.randint(1, 120)):
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            board.push(rng.choice(moves))
+        positions.append(board.copy(stack=False))
+    return positions
+
+
+def test_round_trip():
+    """pack_board / unpack_board preserve the FEN, castling and en passant included."""
+    positions = _random_positions(300)
+    positions.append(chess.Board("r3k2r/8/8/3pP3/8/8/8/R3K2R w Kq d6 12 40"))
+
+    for board in positions:
+        data = pack_board(board)
+        assert len(data) == PACKED_SIZE
+        assert unpack_board(data).fen() == board.fen()
+
+    try:
+        unpack_board(b"\xff" * PACKED_SIZE)
+        assert False, "malformed record accepted"
+    except ValueError:
+        pass
+
+
+def test_memory_mapped_file():
+    """Records written to disk are read back through the mapping."""
+    positions = _random_positions(50, seed=9)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "positions.bin")
+        assert write_packed(path, positions[:20]) == 20
+        assert write_packed(path, [board.fen() for board in positions[20:]], append=True) == 30
+
+        packed = PackedPositionFile(path)
+        assert len(packed) == 50
+        assert packed[3].shape == (PACKED_SIZE,)
+        assert list(packed.fens(45)) == [board.fen() for board in positions[45:]]
+        assert packed.board(7).fen() == positions[7].fen()
+        packed.close()
+
+
+def test_cpp_packed():
+    """C++ to_packed/from_packed agree byte for byte with the Python encoder."""
+    if chess_engine is None:
+        print("chess_engine not available, skipping")
+        return
+
+    positions = _random_positions(300, seed=11)
+    board = chess_engine.Board()
+    for position in positions:
+        board.from_fen(position.fen())
+        data = board.to_packed()
+        assert data == pack_board(position), position.fen()
+
+        other = chess_engine.Board()
+        assert other.from_packed(bytearray(data))
+        assert other.to_fen() == position.fen()
+        assert other.get_hash() == board.get_hash()
+
+    assert not board.from_packed(b"\x00" * 24 + b"\x07" + b"\x00" * 7)
+
+    # En passant squares without a legal capture are not written (nor kept by from_fen
+    # when no pawn can capture at all), so each position has one record
+    for fen, dead_ep in ((DEAD_EP_FEN, True), (PINNED_EP_FEN, False), (LIVE_EP_FEN, False)):
+        board.from_fen(fen)
+        assert board.to_packed() == pack_board(chess.Board(fen)), fen
+        if dead_ep:
+            assert board.to_fen() == chess.Board(fen).fen()
+            same = chess_engine.Board()
+            same.from_fen(fen.replace(" e3 ", " - "))
+            assert board.get_hash() == same.get_hash()
+    board.from_fen(LIVE_EP_FEN)
+    assert board.to_packed()[26] == chess.F6
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "positions.bin")
+        write_packed(path, positions)
+        packed = PackedPositionFile(path)
+
+        # Boards are read in place from the mapping
+        assert packed.cpp_board(42).to_fen() == positions[42].fen()
+
+        # Batch evaluation straight from the mapped records
+        expected = chess_engine.Evaluator.evaluate_batch([p.fen() for p in positions])
+        assert np.array_equal(packed.evaluate(), expected)
+        assert np.array_equal(packed.evaluate(10, 20, threads=2), expected[10:20])
+        assert np.array_equal(packed.evaluate(detailed=True)['total'], expected)
+        packed.close()
+
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_memory_mapped_file()
+    test_cpp_packed()
+    print("✅ All packed position tests passed")
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the process-pool v2.6 search (ParallelSearch)
+"""
+
+import sys
+import os
+import io
+import time
+import contextlib
+import chess
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.ai.parallel_search import ParallelSearch
+from src.ai.minimax_v2_6 import Ponderer
+
+ITALIAN = "r1bqkbnr/pppp1ppp/2n5/4p3/2B1P3/5N2/PPPP1PPP/RNB1K2R b KQkq - 3 3"
+
+
+def test_parallel_search():
+    """The pool starts once, finds mates, merges PV/statistics and keeps its time limit."""
+    with ParallelSearch(workers=2, tt_size_mb=16) as search, contextlib.redirect_stdout(io.StringIO()):
+        assert len(search.pids) == 2
+
+        board = chess.Board("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+        move, _ = search.search(board, depth=3, time_limit=30.0)
+        assert move == chess.Move.from_uci("a1a8")
+
+        board = chess.Board(ITALIAN)
+        move, reply = search.search(board, depth=3, time_limit=30.0)
+        assert move in board.legal_moves and search.pv[0] == move
+        board.push(move)
+        assert reply is None or reply in board.legal_moves
+        assert search.nodes > 0 and search.stats['lmp_cutoffs'] >= 0
+
+        # Clock search on the same (already running) pool stops in time
+        start = time.time()
+        move = search.get_best_move(chess.Board(), depth=30, time_limit=1.0)
+        assert move in chess.Board().legal_moves
+        assert time.time() - start < 1.5
+
+
+def test_parallel_ponder():
+    """A ponder miss stops every worker at once; a ponderhit keeps the result."""
+    board = chess.Board()
+    board.push_san("e4")
+    reply = chess.Move.from_uci("e7e5")
+
+    with ParallelSearch(workers=2, tt_size_mb=16) as search, contextlib.redirect_stdout(io.StringIO()):
+        ponderer = Ponderer(search)
+        assert ponderer.start(board, reply, depth=30, time_limit=60.0, time_left=600.0)
+        time.sleep(0.3)
+        start = time.time()
+        ponderer.ponder_miss()
+        assert time.time() - start < 0.5
+
+        assert ponderer.start(board, reply, depth=30, time_limit=5.0, time_left=10.0)
+        time.sleep(1.0)
+        ponderer.ponderhit()
+        move, _ = ponderer.wait()
+
+    board.push(reply)
+    assert move in board.legal_moves
+
+
+if __name__ == "__main__":
+    test_parallel_search()
+    test_parallel_ponder()
+    print("✅ All parallel search tests passed")
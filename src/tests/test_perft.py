@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Perft tests for the C++ and Python move generators
+"""
+
+import sys
+import os
+import chess
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.ai.perft import PERFT_POSITIONS, perft, divide
+
+try:
+    import chess_engine
+except ImportError:
+    chess_engine = None
+
+
+def test_python_perft():
+    """python-chess perft matches the reference counts (shallow)."""
+    for pos in PERFT_POSITIONS:
+        board = chess.Board(pos['fen'])
+        for depth in (1, 2):
+            assert perft(board, depth) == pos['nodes'][depth], (pos['name'], depth)
+        assert board.fen() == pos['fen']
+
+
+def test_python_divide():
+    """divide sums to perft."""
+    board = chess.Board(PERFT_POSITIONS[1]['fen'])
+    counts = divide(board, 2)
+    assert len(counts) == 48
+    assert sum(counts.values()) == 2039
+
+
+def test_cpp_perft():
+    """C++ perft matches the reference counts."""
+    if chess_engine is None:
+        print("chess_engine not available, skipping")
+        return
+
+    for pos in PERFT_POSITIONS:
+        board = chess_engine.Board()
+        board.from_fen(pos['fen'])
+        for depth in (1, 2, 3):
+            assert board.perft(depth) == pos['nodes'][depth], (pos['name'], depth)
+        assert board.to_fen() == pos['fen']
+
+
+def test_cpp_divide_matches_python():
+    """Per-move counts agree between the engines."""
+    if chess_engine is None:
+        print("chess_engine not available, skipping")
+        return
+
+    for pos in PERFT_POSITIONS:
+        board = chess_engine.Board()
+        board.from_fen(pos['fen'])
+        assert board.divide(2) == divide(chess.Board(pos['fen']), 2), pos['name']
+
+
+if __name__ == "__main__":
+    test_python_perft()
+    test_python_divide()
+    test_cpp_perft()
+    test_cpp_divide_matches_python()
+    print("✅ All perft tests passed")
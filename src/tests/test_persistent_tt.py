@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the persistent v2.6 search state and TT save/load
+"""
+
+import sys
+import os
+import io
+import tempfile
+import contextlib
+import chess
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.ai.transposition_table import TranspositionTable
+from src.ai.minimax_v2_6 import SearchEngine
+
+ITALIAN = "r1bqkbnr/pppp1ppp/2n5/4p3/2B1P3/5N2/PPPP1PPP/RNB1K2R b KQkq - 3 3"
+
+
+def _search(engine, board, depth=4):
+    with contextlib.redirect_stdout(io.StringIO()):
+        move, _ = engine.search(board, depth=depth, time_limit=60.0)
+    return move, engine.info.nodes
+
+
+def test_save_load_roundtrip():
+    """A saved table maps back with the same entries; bad files are rejected."""
+    tt = TranspositionTable(1)
+    key = 0x9D39247E33776D41
+    move = chess.Move.from_uci("g8f6")
+    tt.new_search()
+    tt.store(key, 5, 37, TranspositionTable.LOWER_BOUND, move)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tt.bin")
+        tt.save(path)
+        loaded = TranspositionTable.load(path)
+        assert loaded.capacity == tt.capacity and loaded.current_age == tt.current_age
+        entry = loaded.probe(key)
+        assert (entry['depth'], entry['score'], entry['bound'], entry['best_move']) == \
+            (5, 37, TranspositionTable.LOWER_BOUND, move)
+
+        # Copy-on-write: storing into the loaded table leaves the file alone
+        loaded.store(key + 1, 9, 0, TranspositionTable.EXACT)
+        assert loaded.probe(key + 1) is not None
+        assert TranspositionTable.load(path).probe(key + 1) is None
+        del loaded
+
+        with open(path, 'r+b') as f:
+            f.truncate(100)
+        try:
+            TranspositionTable.load(path)
+            assert False, "truncated file accepted"
+        except ValueError:
+            pass
+
+
+def test_state_kept_between_searches():
+    """Repeating a search reuses the TT and histories instead of starting cold."""
+    engine = SearchEngine(tt_size_mb=16)
+    board = chess.Board(ITALIAN)
+    move, cold = _search(engine, board)
+    assert move in board.legal_moves
+    assert engine.info.history
+
+    again, warm = _search(engine, board)
+    assert again in board.legal_moves
+    assert warm < cold
+
+    engine.clear()
+    assert not engine.info.history
+    _, cleared = _search(engine, board)
+    assert cleared > warm
+
+
+def test_save_tt_warm_start():
+    """A TT saved by one engine gives another a warm start."""
+    board = chess.Board(ITALIAN)
+    first = SearchEngine(tt_size_mb=16)
+    _, cold = _search(first, board)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "v26.tt")
+        first.save_tt(path)
+
+        second = SearchEngine(tt_size_mb=16)
+        second.load_tt(path)
+        assert second.tt.capacity == first.tt.capacity
+        move, warm = _search(second, board)
+        assert move in board.legal_moves
+        assert warm < cold
+        del second
+
+
+if __name__ == "__main__":
+    test_save_load_roundtrip()
+    test_state_kept_between_searches()
+    test_save_tt_warm_start()
+    print("✅ All persistent TT tests passed")
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for pondering (Python v2.6 Ponderer and C++ SearchEngine)
+"""
+
+import sys
+import os
+import io
+import time
+import contextlib
+import chess
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.ai.minimax_v2_6 import Ponderer, get_best_move_and_ponder
+from src.ai.time_manager import TimeManager
+
+try:
+    import chess_engine
+except ImportError:
+    chess_engine = None
+
+ITALIAN = "r1bqkbnr/pppp1ppp/2n5/4p3/2B1P3/5N2/PPPP1PPP/RNB1K2R b KQkq - 3 3"
+
+
+def test_time_manager_ponderhit():
+    """No limit while pondering; ponderhit starts the hard limit and may stop at once."""
+    tm = TimeManager(time_left=60.0, ponder=True)
+    tm.start_time = time.time() - 1000
+    assert not tm.hard_limit_reached()
+    assert not tm.stop_after_iteration(1, chess.Move.from_uci("e2e4"), 0)
+
+    # Ponder time past the optimum: stop now
+    assert tm.ponderhit()
+    assert tm.hard_limit_reached()
+
+    # Short ponder: the full maximum remains from now on
+    tm = TimeManager(time_left=60.0, ponder=True)
+    maximum = tm.maximum
+    assert not tm.ponderhit()
+    assert not tm.hard_limit_reached() and tm.maximum >= maximum
+
+
+def test_python_ponderer():
+    """Ponder hit returns the pondered search's move; a miss aborts quickly."""
+    board = chess.Board(ITALIAN)
+    with contextlib.redirect_stdout(io.StringIO()):
+        move, reply = get_best_move_and_ponder(board, depth=3, time_limit=5.0)
+    assert move in board.legal_moves
+
+    board.push(move)
+    assert reply is None or reply in board.legal_moves
+    expected = reply or next(iter(board.legal_moves))
+    ponderer = Ponderer()
+    assert not ponderer.start(board, chess.Move.from_uci("a1a8"))
+    assert not ponderer.is_pondering
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert ponderer.start(board, expected, depth=3, time_limit=5.0, time_left=60.0)
+        assert ponderer.is_pondering and ponderer.ponder_move == expected
+        time.sleep(0.5)
+        ponderer.ponderhit()
+        answer, _ = ponderer.wait()
+
+    after = board.copy()
+    after.push(expected)
+    assert answer in after.legal_moves
+    assert not ponderer.is_pondering
+
+    # Miss: a deep ponder search is abandoned without waiting for it
+    with contextlib.redirect_stdout(io.StringIO()):
+        ponderer.start(board, expected, depth=30, time_limit=60.0, time_left=600.0)
+        time.sleep(0.3)
+        start = time.time()
+        ponderer.ponder_miss()
+    assert time.time() - start < 0.5
+    assert not ponderer.is_pondering and ponderer.ponder_move is None
+
+
+def test_cpp_pondering():
+    """start_ponder searches the expected reply; ponderhit / ponder_miss end it."""
+    if chess_engine is None:
+        print("chess_engine not available, skipping")
+        return
+
+    engine = chess_engine.SearchEngine(16)
+    board = chess_engine.Board()
+    board.from_fen(ITALIAN)
+    result = engine.search(board, max_depth=6, time_limit=0, info_callback=lambda info: None)
+    assert not result.ponder_move.is_null()
+
+    # Nothing to ponder on if the reply does not fit the board
+    assert engine.start_ponder(board, info_callback=lambda info: None) is None
+
+    board.make_move(result.best_move)
+    pondered = engine.start_ponder(board, max_depth=64, time_left=30000, info_callback=lambda info: None)
+    assert pondered == result.ponder_move
+    assert engine.is_pondering() and engine.ponder_move == pondered
+
+    # Ponder time beyond the optimum: the answer comes back at once
+    time.sleep(1.0)
+    start = time.time()
+    engine.ponderhit()
+    answer = engine.wait()
+    assert time.time() - start < 0.5
+    assert not answer.is_null() and not engine.is_pondering()
+    assert engine.get_result().depth > 1
+
+    board.make_move(pondered)
+    board.make_move(answer)
+    if engine.start_ponder(board, max_depth=64, time_left=30000, info_callback=lambda info: None) is not None:
+        time.sleep(0.2)
+        start = time.time()
+        engine.ponder_miss()
+        assert time.time() - start < 0.5
+        assert not engine.is_searching() and not engine.is_pondering()
+
+
+if __name__ == "__main__":
+    test_time_manager_ponderhit()
+    test_python_ponderer()
+    test_cpp_pondering()
+    print("✅ All pondering tests passed")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the shared-memory transposition table
+"""
+
+import sys
+import os
+import pickle
+import chess
+from concurrent.futures import ProcessPoolExecutor
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.ai.shared_tt import SharedTranspositionTable
+from src.ai import minimax
+
+
+def _store_in_worker(table, key, score):
+    """Runs in a worker process: write one entry and read one back."""
+    table.store(key, 4, score, SharedTranspositionTable.UPPER_BOUND, chess.Move.from_uci("e7e5"))
+    entry = table.probe(key - 1)
+    return entry['score'] if entry else None
+
+
+def test_store_probe():
+    """Stored fields (float scores included) come back unchanged; unknown keys miss."""
+    with SharedTranspositionTable(1) as tt:
+        move = chess.Move.from_uci("g1f3")
+        tt.store(2**64 - 1, 7, -12.3, SharedTranspositionTable.LOWER_BOUND, move)
+
+        entry = tt.probe(2**64 - 1)
+        assert entry['depth'] == 7
+        assert entry['score'] == -12.3
+        assert entry['bound'] == SharedTranspositionTable.LOWER_BOUND
+        assert entry['best_move'] == move
+        assert tt.probe(12345) is None and tt.probe(0) is None
+
+        # Re-storing without a move keeps the old one
+        tt.store(2**64 - 1, 8, 50, SharedTranspositionTable.EXACT)
+        assert tt.probe(2**64 - 1)['best_move'] == move
+
+        tt.new_search()
+        assert tt.current_age == 1
+        tt.clear()
+        assert tt.probe(2**64 - 1) is None
+
+
+def test_torn_slot_is_a_miss():
+    """A slot whose words do not XOR back to the key is never returned."""
+    with SharedTranspositionTable(1) as tt:
+        tt.store(0xDEADBEEF, 5, 100, SharedTranspositionTable.EXACT)
+        slot = int(tt.slots['data'].nonzero()[0][0])
+
+        # Half-written entry: new score, old check word
+        tt.slots['score'][slot] = -100.0
+        assert tt.probe(0xDEADBEEF) is None
+
+        tt.store(0xDEADBEEF, 5, 100, SharedTranspositionTable.EXACT)
+        assert tt.probe(0xDEADBEEF)['score'] == 100
+
+
+def test_shared_between_processes():
+    """Workers attach by name and see each other's entries."""
+    with SharedTranspositionTable(1) as tt:
+        assert len(pickle.dumps(tt)) < 200  # The name, not the table
+        tt.store(41, 3, 2.5, SharedTranspositionTable.EXACT)
+
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            assert executor.submit(_store_in_worker, tt, 42, -7.25).result() == 2.5
+
+        entry = tt.probe(42)
+        assert entry['score'] == -7.25 and entry['best_move'] == chess.Move.from_uci("e7e5")
+
+
+def test_minimax_root_split():
+    """The old root-split search works with a shared or an isolated table."""
+    board = chess.Board()
+    shared = minimax.get_best_move(board, 2)
+    shared_nodes = minimax.last_search_nodes
+    isolated = minimax.get_best_move(board, 2, shared_tt=False)
+
+    assert shared in board.legal_moves and isolated in board.legal_moves
+    assert shared_nodes > 0 and minimax.last_search_nodes > 0
+    assert minimax.transposition_table is None  # Freed after the search
+
+
+def test_minimax_lazy_smp():
+    """Lazy-SMP workers find each other's results: far fewer nodes than isolated ones."""
+    board = chess.Board()
+    move = minimax.get_best_move(board, 2, max_workers=3, lazy_smp=True)
+    shared_nodes = minimax.last_search_nodes
+    minimax.get_best_move(board, 2, shared_tt=False, max_workers=3, lazy_smp=True)
+
+    assert move in board.legal_moves
+    assert shared_nodes < minimax.last_search_nodes * 0.8
+
+
+if __name__ == "__main__":
+    test_store_probe()
+    test_torn_slot_is_a_miss()
+    test_shared_between_processes()
+    test_minimax_root_split()
+    test_minimax_lazy_smp()
+    print("✅ All shared TT tests passed")
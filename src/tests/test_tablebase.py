@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the shared Syzygy tablebase service
+"""
+
+import sys
+import os
+import chess
+import chess.syzygy
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.ai.tablebase import TablebaseService, get_tablebase_service, resolve_syzygy_path
+from src.ai.zobrist import HashedBoard
+from src.ai.evaluation_optimized import evaluate_incremental
+
+SYZYGY_DIR = resolve_syzygy_path()
+
+KBN_WIN = "8/8/8/4k3/8/8/8/KBN5 w - - 0 1"
+KBB_WIN = "8/8/8/4k3/8/8/8/KBB5 w - - 0 1"
+
+
+def test_matches_python_chess():
+    """Probes agree with chess.syzygy and repeats hit the cache."""
+    service = TablebaseService(SYZYGY_DIR)
+    board = chess.Board(KBB_WIN)
+
+    with chess.syzygy.open_tablebase(SYZYGY_DIR) as reference:
+        assert service.probe_wdl(board) == reference.probe_wdl(board) == 2
+        assert service.probe_dtz(board) == reference.probe_dtz(board)
+
+    assert service.probe_wdl(HashedBoard(KBB_WIN)) == 2
+    stats = service.get_stats()
+    assert stats['hits'] == 1 and stats['misses'] == 2
+
+    # KBNvK DTZ searches into KNvK, which is not shipped: unknown, and cached as such
+    assert service.probe_dtz(chess.Board(KBN_WIN)) is None
+    assert service.probe_dtz(chess.Board(KBN_WIN)) is None
+    assert service.get_stats()['hits'] == 2
+    service.close()
+
+
+def test_material_filter():
+    """Positions without a table file are skipped before python-chess is opened."""
+    service = TablebaseService(SYZYGY_DIR)
+
+    for fen in (chess.STARTING_FEN,                   # Too many pieces
+                "8/8/8/4k3/8/8/8/KQ6 w - - 0 1",      # KQvK is not shipped
+                "r3k3/8/8/8/8/8/8/4K3 b q - 0 1"):    # Castling rights
+        assert service.probe_wdl(chess.Board(fen)) is None
+
+    assert service.get_stats()['skipped'] == 3
+    assert service._tablebase is None
+
+    # Missing directory disables probing
+    assert TablebaseService(os.path.join(SYZYGY_DIR, "missing")).probe_wdl(chess.Board(KBN_WIN)) is None
+
+
+def test_evaluation_uses_service():
+    """evaluate_incremental returns tablebase scores through the shared service."""
+    service = get_tablebase_service()
+    hits = service.hits
+
+    board = chess.Board(KBN_WIN)
+    assert evaluate_incremental(board) == 20000
+    assert evaluate_incremental(board) == 20000
+    assert service.hits > hits
+
+
+if __name__ == "__main__":
+    test_matches_python_chess()
+    test_material_filter()
+    test_evaluation_uses_service()
+    print("✅ All tablebase tests passed")
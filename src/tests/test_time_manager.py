@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for clock-based time management (Python and C++ time managers)
+"""
+
+import sys
+import os
+import time
+import chess
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.ai.time_manager import TimeManager, game_ply
+from src.ai import minimax_v2_6
+
+try:
+    import chess_engine
+except ImportError:
+    chess_engine = None
+
+
+def _elapsed(tm, seconds):
+    """Pretend the move has been running for `seconds`."""
+    tm.start_time = time.time() - seconds
+    return tm
+
+
+def test_budgets():
+    """Clock, increment and moves-to-go give sane optimum/maximum budgets."""
+    sudden_death = TimeManager(time_left=60.0)
+    assert 1.0 < sudden_death.optimum < 1.5
+    assert sudden_death.optimum * 4 < sudden_death.maximum <= 60.0 * 0.4
+
+    with_increment = TimeManager(time_left=60.0, increment=2.0)
+    assert with_increment.optimum > sudden_death.optimum + 1.5
+
+    # Later in the game fewer moves are assumed to remain
+    late = TimeManager(time_left=60.0, game_ply=120)
+    assert late.optimum > sudden_death.optimum
+
+    # Last move before the control may use nearly all the time, never more
+    last_move = TimeManager(time_left=10.0, moves_to_go=1)
+    assert 8.0 < last_move.maximum < 10.0
+
+    # Difficulty cap, and a fixed move time without a clock
+    assert TimeManager(time_left=600.0, max_time=2.0).maximum == 2.0
+    fixed = TimeManager(move_time=3.0)
+    assert not fixed.managed and fixed.optimum == fixed.maximum == 3.0
+
+    board = chess.Board()
+    board.push_san("e4")
+    assert game_ply(board) == 1
+
+
+def test_iteration_decisions():
+    """Stable best moves stop early; instability and fail-lows extend the budget."""
+    e4, d4, c4 = (chess.Move.from_uci(uci) for uci in ("e2e4", "d2d4", "c2c4"))
+
+    # Same move every depth, one move takes nearly all nodes: stops well before the optimum
+    tm = TimeManager(time_left=100.0, moves_to_go=10)
+    _elapsed(tm, tm.optimum * 0.3)
+    stops = [tm.stop_after_iteration(depth, e4, 30, 0.95) for depth in range(1, 8)]
+    assert not stops[0] and stops[-1]
+
+    # Best move changing every depth: keeps searching past the optimum
+    tm = TimeManager(time_left=100.0, moves_to_go=10)
+    _elapsed(tm, tm.optimum * 0.8)
+    for depth, move in enumerate((e4, d4, c4, e4, d4, c4), 1):
+        stop = tm.stop_after_iteration(depth, move, 30, 0.3)
+    assert not stop
+
+    # Root score dropping sharply (fail-low) extends as well
+    tm = TimeManager(time_left=100.0, moves_to_go=10)
+    _elapsed(tm, tm.optimum * 0.8)
+    assert tm.stop_after_iteration(1, e4, 50, 0.5)
+    assert not tm.stop_after_iteration(2, e4, -100, 0.5)
+
+    # Without a clock the old 80% rule applies
+    tm = _elapsed(TimeManager(move_time=1.0), 0.85)
+    assert tm.stop_after_iteration(3, e4, 0)
+
+
+def test_python_clock_search():
+    """minimax v2.6 spends a small share of a short clock and returns a legal move."""
+    board = chess.Board("r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3")
+    start = time.time()
+    move = minimax_v2_6.get_best_move(board, depth=20, time_limit=5.0, time_left=3.0)
+    elapsed = time.time() - start
+
+    assert move in board.legal_moves
+    assert elapsed < 3.0 * 0.4 + 0.5
+
+
+def test_cpp_time_manager():
+    """The C++ time manager matches the Python budgets and drives clock searches."""
+    if chess_engine is None:
+        print("chess_engine not available, skipping")
+        return
+
+    for time_left, increment, moves_to_go, ply in ((60.0, 0.0, 0, 0), (60.0, 2.0, 0, 40), (10.0, 0.0, 1, 80),
+                                                   (5.0, 10.0, 0, 20), (300.0, 0.0, 40, 0)):
+        native = chess_engine.TimeManager()
+        native.init(int(time_left * 1000), int(increment * 1000), moves_to_go, 0, ply)
+        python = TimeManager(time_left, increment, moves_to_go, game_ply=ply)
+        assert native.managed
+        assert abs(native.optimum - python.optimum * 1000) <= 2, (native, python)
+        assert abs(native.maximum - python.maximum * 1000) <= 2, (native, python)
+
+    native = chess_engine.TimeManager()
+    native.init(-1, 0, 0, 1500)
+    assert not native.managed and native.optimum == native.maximum == 1500
+    assert not native.stop_after_iteration(10, chess_engine.Move(), 0, 1.0, 1400)
+
+    native.init(100000, 0, 10)
+    e4 = chess_engine.Move(12, 28)
+    stops = [native.stop_after_iteration(depth, e4, 30, 0.95, native.optimum // 3) for depth in range(1, 8)]
+    assert not stops[0] and stops[-1]
+
+    # Clock search: stays within the maximum and far below the clock
+    engine = chess_engine.SearchEngine(16)
+    board = chess_engine.Board()
+    board.from_fen("r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3")
+    result = engine.search(board, max_depth=64, time_left=2000, info_callback=lambda info: None)
+    budgets = engine.get_time_manager()
+    assert budgets.managed and budgets.maximum < 2000 * 0.4
+    assert not result.best_move.is_null() and result.time_ms <= budgets.maximum + 50
+
+    # Move overhead comes off the clock first
+    engine.set_move_overhead(500)
+    engine.search(board, max_depth=1, time_left=2000, info_callback=lambda info: None)
+    assert engine.get_time_manager().maximum < budgets.maximum
+
+
+if __name__ == "__main__":
+    test_budgets()
+    test_iteration_decisions()
+    test_python_clock_search()
+    test_cpp_time_manager()
+    print("✅ All time manager tests passed")
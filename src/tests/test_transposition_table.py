@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the array-backed Python transposition table
+"""
+
+import sys
+import os
+import chess
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.ai.transposition_table import TranspositionTable, pack_move, unpack_move
+
+
+def test_move_packing():
+    """Moves (with promotions) survive packing."""
+    for uci in ("e2e4", "a7a8q", "h2h1n", "e1g1"):
+        move = chess.Move.from_uci(uci)
+        assert unpack_move(pack_move(move)) == move
+    assert pack_move(None) == 0
+    assert unpack_move(0) is None
+
+
+def test_store_probe():
+    """Stored fields come back unchanged; unknown keys miss."""
+    tt = TranspositionTable(1)
+    move = chess.Move.from_uci("g1f3")
+    tt.store(2**64 - 1, 7, -1234, TranspositionTable.LOWER_BOUND, move)
+
+    entry = tt.probe(2**64 - 1)
+    assert entry['depth'] == 7
+    assert entry['score'] == -1234
+    assert entry['bound'] == TranspositionTable.LOWER_BOUND
+    assert entry['best_move'] == move
+    assert tt.probe(12345) is None
+
+    # Re-storing without a move keeps the old one
+    tt.store(2**64 - 1, 8, 50, TranspositionTable.EXACT)
+    assert tt.probe(2**64 - 1)['best_move'] == move
+
+
+def test_fixed_capacity():
+    """Capacity never grows; deep entries of the current search survive."""
+    tt = TranspositionTable(1)
+    capacity = tt.capacity
+    deep_key = 2 * tt.num_buckets  # Same bucket as the keys below
+    tt.store(deep_key, 20, 1, TranspositionTable.EXACT)
+
+    for key in range(1, 4 * capacity, 7):
+        tt.store(key * tt.num_buckets, 1, key, TranspositionTable.EXACT)
+
+    assert tt.capacity == capacity == len(tt.keys)
+    assert tt.probe(deep_key)['depth'] == 20
+
+    # An older generation gives way to new entries
+    tt.new_search()
+    tt.store(5 * tt.num_buckets, 1, 0, TranspositionTable.EXACT)
+    assert tt.probe(5 * tt.num_buckets) is not None
+    assert tt.get_stats()['size'] <= capacity
+
+
+if __name__ == "__main__":
+    test_move_packing()
+    test_store_probe()
+    test_fixed_capacity()
+    print("✅ All transposition table tests passed")
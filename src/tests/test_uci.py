@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the C++ UCI executable (chess_engine_uci), driven over stdin/stdout
+"""
+
+import sys
+import os
+import time
+import queue
+import shutil
+import threading
+import subprocess
+import chess
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+try:
+    import chess_engine
+except ImportError:
+    chess_engine = None
+
+UCI_NAME = "chess_engine_uci.exe" if os.name == "nt" else "chess_engine_uci"
+
+
+def find_uci_binary():
+    """CMake puts the executable in src/, next to the Python module."""
+    candidates = [os.path.join(os.path.dirname(__file__), '..', UCI_NAME)]
+    if chess_engine is not None and getattr(chess_engine, '__file__', None):
+        candidates.append(os.path.join(os.path.dirname(chess_engine.__file__), UCI_NAME))
+    for path in candidates:
+        if os.path.isfile(path):
+            return path
+    return shutil.which(UCI_NAME)
+
+
+class UCISession:
+    """Engine process with a reader thread collecting its output lines."""
+
+    def __init__(self, path):
+        self.process = subprocess.Popen([path], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                        universal_newlines=True, bufsize=1)
+        self.lines = queue.Queue()
+        self.reader = threading.Thread(target=self._read, daemon=True)
+        self.reader.start()
+
+    def _read(self):
+        for line in self.process.stdout:
+            self.lines.put(line.strip())
+
+    def send(self, command):
+        self.process.stdin.write(command + "\n")
+        self.process.stdin.flush()
+
+    def expect(self, prefix, timeout=10.0):
+        """First line starting with prefix (earlier lines are skipped)."""
+        deadline = time.time() + timeout
+        while True:
+            remaining = deadline - time.time()
+            assert remaining > 0, f"no '{prefix}' within {timeout}s"
+            try:
+                line = self.lines.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if line.startswith(prefix):
+                return line
+
+    def assert_silent(self, prefix, seconds):
+        """No line starting with prefix for the given time."""
+        deadline = time.time() + seconds
+        while time.time() < deadline:
+            try:
+                line = self.lines.get(timeout=max(0.0, deadline - time.time()))
+            except queue.Empty:
+                return
+            assert not line.startswith(prefix), f"unexpected '{line}'"
+
+    def quit(self):
+        self.send("quit")
+        try:
+            self.process.wait(timeout=10)
+        finally:
+            if self.process.poll() is None:
+                self.process.kill()
+
+
+def best_move(line):
+    """Move of a 'bestmove <move> [ponder <move>]' line."""
+    return chess.Move.from_uci(line.split()[1])
+
+
+def test_uci_session():
+    """Handshake, a depth search, go infinite + stop and go ponder + ponderhit."""
+    path = find_uci_binary()
+    if path is None:
+        print("chess_engine_uci not available, skipping")
+        return
+
+    session = UCISession(path)
+    try:
+        session.send("uci")
+        session.expect("uciok")
+        session.send("isready")
+        session.expect("readyok")
+
+        # Fixed depth
+        board = chess.Board()
+        board.push_uci("e2e4")
+        session.send("position startpos moves e2e4")
+        session.send("go depth 4")
+        assert best_move(session.expect("bestmove")) in board.legal_moves
+
+        # Infinite: bestmove only after stop
+        session.send("go infinite")
+        session.assert_silent("bestmove", 0.5)
+        start = time.time()
+        session.send("stop")
+        assert best_move(session.expect("bestmove", timeout=2.0)) in board.legal_moves
+        assert time.time() - start < 2.0
+
+        # Ponder: a finished ponder search still waits for ponderhit
+        board.push_uci("e7e5")
+        session.send("position startpos moves e2e4 e7e5")
+        session.send("go ponder depth 3")
+        session.assert_silent("bestmove", 1.0)
+        session.send("ponderhit")
+        assert best_move(session.expect("bestmove", timeout=2.0)) in board.legal_moves
+
+        session.send("isready")
+        session.expect("readyok")
+    finally:
+        session.quit()
+
+    assert session.process.returncode == 0
+
+
+if __name__ == "__main__":
+    test_uci_session()
+    print("✅ All UCI tests passed")
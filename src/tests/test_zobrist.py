@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for incremental Zobrist hashing (HashedBoard)
+"""
+
+import sys
+import os
+import random
+import chess
+import chess.polyglot
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.ai import zobrist
+from src.ai.zobrist import HashedBoard
+
+FENS = [
+    chess.STARTING_FEN,
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+]
+
+
+def test_random_games():
+    """Key matches chess.polyglot.zobrist_hash after every push and pop."""
+    rng = random.Random(2024)
+
+    for game in range(60):
+        board = HashedBoard(FENS[game % len(FENS)])
+
+        for _ in range(120):
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            if rng.random() < 0.05 and not board.is_check():
+                board.push(chess.Move.null())
+            else:
+                board.push(rng.choice(moves))
+            assert board.zobrist_hash() == chess.polyglot.zobrist_hash(board), board.fen()
+
+        while board.move_stack:
+            board.pop()
+            assert board.zobrist_hash() == chess.polyglot.zobrist_hash(board), board.fen()
+
+
+def test_copy_and_reset():
+    """copy() keeps the key history; set_fen() rehashes."""
+    board = HashedBoard.from_board(chess.Board(FENS[1]))
+    for uci in ("e1g1", "h3g2", "d5e6"):
+        board.push_uci(uci)
+
+    copy = board.copy()
+    assert copy.zobrist_hash() == board.zobrist_hash()
+    copy.pop()
+    assert copy.zobrist_hash() == chess.polyglot.zobrist_hash(copy)
+
+    board.set_fen(FENS[3])
+    assert board.zobrist_hash() == chess.polyglot.zobrist_hash(board)
+
+
+def test_internals_check():
+    """The installed python-chess passes the internals check; the fallback hashes fully."""
+    assert zobrist.INCREMENTAL, "python-chess internals changed: HashedBoard falls back to full hashing"
+
+    board = HashedBoard(FENS[1])
+    zobrist.INCREMENTAL = False
+    try:
+        for move in list(board.legal_moves)[:10]:
+            board.push(move)
+            copy = board.copy()
+            assert board.zobrist_hash() == copy.zobrist_hash() == chess.polyglot.zobrist_hash(board)
+            board.pop()
+    finally:
+        zobrist.INCREMENTAL = True
+    assert board.zobrist_hash() == chess.polyglot.zobrist_hash(board)
+
+
+if __name__ == "__main__":
+    test_random_games()
+    test_copy_and_reset()
+    test_internals_check()
+    print("✅ All Zobrist tests passed")
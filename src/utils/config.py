@@ -17,10 +17,14 @@ AI_CONFIG = {
     # Endgame tablebases
     'use_endgame_tb': True,
     'syzygy_path': r'syzygy',
+    'tb_cache_size': 65536,      # Positions kept in the tablebase result cache
     
     # Transposition table
     'tt_size_mb': 256,           # Transposition table size in MB
     
+    # Parallel search (v2.6): worker processes, 1 = search in the GUI process
+    'search_workers': 1,
+    
     # Search techniques
     'use_null_move': True,
     'null_move_r': 2,            # Null move reduction (2 or 3)